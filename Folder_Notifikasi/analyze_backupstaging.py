@@ -5,12 +5,16 @@ Script untuk analisis lengkap file backup SQL Server
 """
 
 import os
+import sys
 import subprocess
 import json
 from datetime import datetime
 from typing import Dict, List, Tuple
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from mtf_parser import parse_filelistonly_output, parse_headeronly_output, parse_mtf
+
 class BackupAnalyzer:
     def __init__(self):
         self.bak_path = r"D:\Gawean Rebinmas\App_Auto_Backup\Backup\BackupStaging.bak"
@@ -47,6 +51,13 @@ class BackupAnalyzer:
             'has_incomplete_metadata': False
         }
 
+        # Parser MTF native: tanpa sqlcmd/restore
+        native = self._read_mtf()
+        if native and native['header']:
+            header_info.update(self._header_info_from_row(native['header']))
+            print(f"[SUCCESS] Backup header read from MTF descriptor blocks")
+            return header_info
+
         try:
             # SQL command to get backup header
             sql_query = f"RESTORE HEADERONLY FROM DISK='{self.bak_path}'"
@@ -72,35 +83,10 @@ class BackupAnalyzer:
                     with open('backup_header.txt', 'r', encoding='utf-8') as f:
                         header_data = f.read().strip()
 
-                    # Parse header data (comma-separated)
-                    if header_data:
-                        columns = header_data.split(',')
-                        if len(columns) >= 50:  # RESTORE HEADERONLY returns many columns
-                            header_info.update({
-                                'backup_name': columns[0].strip() if columns[0] else '',
-                                'backup_description': columns[1].strip() if columns[1] else '',
-                                'backup_type': self.get_backup_type_name(int(columns[2]) if columns[2].isdigit() else 0),
-                                'database_name': columns[3].strip() if columns[3] else '',
-                                'server_name': columns[4].strip() if columns[4] else '',
-                                'machine_name': columns[5].strip() if columns[5] else '',
-                                'backup_start_date': self.parse_sql_datetime(columns[6]) if columns[6] else None,
-                                'backup_finish_date': self.parse_sql_datetime(columns[7]) if columns[7] else None,
-                                'backup_size': int(columns[8]) if columns[8].isdigit() else 0,
-                                'compressed_backup_size': int(columns[15]) if columns[15].isdigit() else 0,
-                                'database_version': columns[12].strip() if columns[12] else '',
-                                'collation': columns[18].strip() if columns[18] else '',
-                                'recovery_model': self.get_recovery_model_name(int(columns[19]) if columns[19].isdigit() else 0),
-                                'position': int(columns[21]) if columns[21].isdigit() else 1,
-                                'first_lsn': columns[27].strip() if columns[27] else '',
-                                'last_lsn': columns[28].strip() if columns[28] else '',
-                                'checkpoint_lsn': columns[29].strip() if columns[29] else '',
-                                'database_backup_lsn': columns[30].strip() if columns[30] else '',
-                                'is_password_protected': columns[22].strip() == '1',
-                                'has_bulk_logged_data': columns[23].strip() == '1',
-                                'is_snapshot': columns[24].strip() == '1',
-                                'is_readonly': columns[25].strip() == '1',
-                                'has_incomplete_metadata': columns[26].strip() == '1'
-                            })
+                    # Parse header data (comma-separated, urutan kolom RESTORE HEADERONLY)
+                    rows = parse_headeronly_output(header_data) if header_data else []
+                    if rows:
+                        header_info.update(self._header_info_from_row(rows[0]))
 
                     print(f"[SUCCESS] Backup header analysis completed")
 
@@ -120,6 +106,13 @@ class BackupAnalyzer:
 
         filelist = []
 
+        # Parser MTF native: tanpa sqlcmd/restore
+        native = self._read_mtf()
+        if native and native['files']:
+            filelist = [self._file_info_from_row(row) for row in native['files']]
+            print(f"[SUCCESS] Found {len(filelist)} files in MTF descriptor blocks")
+            return filelist
+
         try:
             # SQL command to get filelist
             sql_query = f"RESTORE FILELISTONLY FROM DISK='{self.bak_path}'"
@@ -142,23 +135,9 @@ class BackupAnalyzer:
                     with open('backup_filelist.txt', 'r', encoding='utf-8') as f:
                         filelist_data = f.read().strip()
 
-                    # Parse filelist data
-                    lines = filelist_data.split('\n')
-                    for line in lines:
-                        if line.strip():
-                            columns = line.split(',')
-                            if len(columns) >= 6:
-                                file_info = {
-                                    'logical_name': columns[0].strip() if columns[0] else '',
-                                    'physical_name': columns[1].strip() if columns[1] else '',
-                                    'file_type': columns[2].strip() if columns[2] else '',
-                                    'file_group': columns[3].strip() if columns[3] else '',
-                                    'size': int(columns[4]) if columns[4].isdigit() else 0,
-                                    'max_size': int(columns[5]) if columns[5].isdigit() else 0,
-                                    'growth': int(columns[6]) if columns[6].isdigit() else 0,
-                                    'usage': columns[7].strip() if len(columns) > 7 else ''
-                                }
-                                filelist.append(file_info)
+                    # Parse filelist data (urutan kolom RESTORE FILELISTONLY)
+                    filelist = [self._file_info_from_row(row)
+                                for row in parse_filelistonly_output(filelist_data)]
 
                     print(f"[SUCCESS] Found {len(filelist)} files in backup")
 
@@ -170,6 +149,62 @@ class BackupAnalyzer:
 
         return filelist
 
+    def _read_mtf(self) -> Dict:
+        """Baca header dan file list backup set pertama dari descriptor block MTF (di-cache)"""
+        if 'mtf' not in self.analysis_results:
+            native = None
+            try:
+                parsed = parse_mtf(self.bak_path)
+                if parsed['backup_sets']:
+                    native = parsed['backup_sets'][0]
+            except Exception as e:
+                print(f"[WARNING] MTF header parse failed: {str(e)}")
+            self.analysis_results['mtf'] = native
+        return self.analysis_results['mtf']
+
+    def _header_info_from_row(self, row: Dict) -> Dict:
+        """Mapping baris RESTORE HEADERONLY (sqlcmd maupun MTF) ke header_info"""
+        def text(column):
+            return str(row[column]) if row.get(column) is not None else ''
+
+        return {
+            'backup_name': text('BackupName'),
+            'backup_description': text('BackupDescription'),
+            'backup_type': self.get_backup_type_name(row.get('BackupType') or 0),
+            'database_name': text('DatabaseName'),
+            'server_name': text('ServerName'),
+            'machine_name': text('MachineName'),
+            'backup_start_date': row.get('BackupStartDate'),
+            'backup_finish_date': row.get('BackupFinishDate'),
+            'backup_size': row.get('BackupSize') or 0,
+            'compressed_backup_size': row.get('CompressedBackupSize') or 0,
+            'database_version': text('DatabaseVersion'),
+            'collation': text('Collation'),
+            'recovery_model': text('RecoveryModel'),
+            'position': row.get('Position') or 1,
+            'first_lsn': text('FirstLSN'),
+            'last_lsn': text('LastLSN'),
+            'checkpoint_lsn': text('CheckpointLSN'),
+            'database_backup_lsn': text('DatabaseBackupLSN'),
+            'has_bulk_logged_data': bool(row.get('HasBulkLoggedData')),
+            'is_snapshot': bool(row.get('IsSnapshot')),
+            'is_readonly': bool(row.get('IsReadOnly')),
+            'has_incomplete_metadata': bool(row.get('HasIncompleteMetaData'))
+        }
+
+    def _file_info_from_row(self, row: Dict) -> Dict:
+        """Mapping baris RESTORE FILELISTONLY (sqlcmd maupun MTF) ke file_info"""
+        return {
+            'logical_name': row.get('LogicalName') or '',
+            'physical_name': row.get('PhysicalName') or '',
+            'file_type': row.get('Type') or '',
+            'file_group': row.get('FileGroupName') or '',
+            'size': row.get('Size') or 0,
+            'max_size': row.get('MaxSize') or 0,
+            'growth': 0,
+            'usage': ''
+        }
+
     def estimate_database_size(self) -> Dict:
         """Estimasi ukuran database"""
         print("\n=== Estimating Database Size ===")
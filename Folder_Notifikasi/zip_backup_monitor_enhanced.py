@@ -13,7 +13,6 @@ import json
 import zipfile
 import sqlite3
 import subprocess
-import smtplib
 from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -26,6 +25,18 @@ from pathlib import Path
 import configparser
 from typing import Dict, List, Tuple, Optional
 import re
+import sys
+
+# Verifier ZIP bersama dari modul src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from zip_verifier import get_default_verifier
+from mtf_parser import parse_mtf
+from folder_watcher import FolderWatcher
+from dir_scanner import scan_directory, filter_latest_date
+from stability_gate import StabilityGate, STATE_PENDING
+from mail_transport import get_transport, transport_options
+from html_templates import render_template
+from email_report_model import DeepBakRow, DeepZipRow, top_failures
 
 class ZipBackupMonitorEnhanced:
     def __init__(self, root):
@@ -37,6 +48,7 @@ class ZipBackupMonitorEnhanced:
         self.monitoring_path = tk.StringVar()
         self.is_monitoring = False
         self.summary_data = {}
+        self.pending_files = {}  # path -> alasan ditunda (file masih ditulis)
         self.config_file = "config.ini"
 
         # Setup logging
@@ -45,6 +57,12 @@ class ZipBackupMonitorEnhanced:
         # Load configuration
         self.load_config()
 
+        # Arsip yang masih ditulis job backup ditahan sampai stabil
+        self.stability_gate = StabilityGate(
+            self.config.getfloat('MONITORING', 'stability_window_seconds', fallback=60),
+            self.config.getfloat('MONITORING', 'max_pending_seconds', fallback=3600)
+        )
+
         # Create GUI
         self.create_gui()
 
@@ -82,6 +100,11 @@ class ZipBackupMonitorEnhanced:
 
         self.config['MONITORING'] = {
             'check_interval': '300',
+            'watch_backend': 'auto',
+            'watch_debounce_seconds': '5',
+            'watch_poll_interval': '2',
+            'stability_window_seconds': '60',
+            'max_pending_seconds': '3600',
             'max_age_days': '7',
             'extract_files': 'true',
             'exclude_plantware': 'true',
@@ -229,25 +252,51 @@ class ZipBackupMonitorEnhanced:
         self.update_log("Monitoring dihentikan.")
 
     def monitoring_loop(self):
-        """Loop monitoring utama"""
-        while self.is_monitoring:
-            try:
-                # Check if monitoring is still active
-                if not self.is_monitoring:
-                    break
+        """
+        Loop monitoring utama: satu deep scan awal, lalu hanya arsip yang
+        baru/berubah (dari FolderWatcher) yang dianalisis ulang
+        """
+        self._deep_scan_thread()
+
+        path = self.monitoring_path.get()
+        if not path or not os.path.exists(path):
+            return
 
-                # Auto-scan every 5 minutes
-                self.deep_scan_files()
+        try:
+            watcher = FolderWatcher(
+                path,
+                debounce_seconds=self.config.getfloat('MONITORING', 'watch_debounce_seconds', fallback=5.0),
+                poll_interval=self.config.getfloat('MONITORING', 'watch_poll_interval', fallback=2.0),
+                full_rescan_interval=self.config.getfloat('MONITORING', 'check_interval', fallback=300),
+                backend=self.config.get('MONITORING', 'watch_backend', fallback='auto')
+            )
+            watcher.start()
+        except Exception as e:
+            self.logger.error(f"Error starting folder watcher: {str(e)}")
+            self.update_log(f"Error starting folder watcher: {str(e)}")
+            return
 
-                # Wait for next check
-                for _ in range(300):  # 5 minutes
-                    if not self.is_monitoring:
-                        break
-                    time.sleep(1)
+        self.update_log(f"Watcher aktif ({watcher.backend}): {path}")
+        try:
+            while self.is_monitoring:
+                try:
+                    changed_files = watcher.wait_for_changes(timeout=1.0)
+                    # Arsip yang sebelumnya pending dicek ulang sampai lolos stability gate
+                    changed_files += [f for f in list(self.pending_files)
+                                      if f not in changed_files and self.stability_gate.is_ready(f)]
+                    if not changed_files or not self.is_monitoring:
+                        continue
 
-            except Exception as e:
-                self.logger.error(f"Error dalam monitoring loop: {str(e)}")
-                time.sleep(5)
+                    self.update_log(f"Terdeteksi {len(changed_files)} file ZIP baru/berubah")
+                    self.deep_analyze_files_threaded(changed_files, reset=False)
+                    self.update_summary()
+                    self.update_status("Analisis file baru selesai")
+
+                except Exception as e:
+                    self.logger.error(f"Error dalam monitoring loop: {str(e)}")
+                    time.sleep(5)
+        finally:
+            watcher.stop()
 
     def deep_scan_files(self):
         """Deep scan folder untuk file ZIP dengan analisis BAK mendalam"""
@@ -267,22 +316,23 @@ class ZipBackupMonitorEnhanced:
             self.update_log(f"Memulai DEEP SCAN: {path}")
             self.update_status("Deep scanning file...")
 
-            # Find ZIP files
-            zip_files = self.find_zip_files(path)
+            # Find ZIP files (satu scandir, mtime dipakai ulang untuk filter tanggal)
+            records = scan_directory(path, recursive=True)
 
-            if not zip_files:
+            if not records:
                 self.update_log("Tidak ada file ZIP ditemukan.")
                 self.update_status("Tidak ada file")
                 return
 
             # Get latest date and filter files
-            latest_date = self.get_latest_date(zip_files)
-            filtered_files = [f for f in zip_files if self.is_file_date(f, latest_date)]
+            latest_records, latest_date = filter_latest_date(records)
+            filtered_files = [record.path for record in latest_records]
 
             self.update_log(f"Ditemukan {len(filtered_files)} file ZIP untuk deep analysis")
 
             # Analyze files with progress updates
-            self.deep_analyze_files_threaded(filtered_files)
+            self.deep_analyze_files_threaded(filtered_files,
+                                             stat_results={record.path: record.stat for record in latest_records})
 
             # Update summary
             self.update_summary()
@@ -296,12 +346,7 @@ class ZipBackupMonitorEnhanced:
 
     def find_zip_files(self, path: str) -> List[str]:
         """Cari semua file ZIP dalam folder"""
-        zip_files = []
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.lower().endswith('.zip'):
-                    zip_files.append(os.path.join(root, file))
-        return zip_files
+        return [record.path for record in scan_directory(path, recursive=True)]
 
     def get_latest_date(self, files: List[str]) -> str:
         """Dapatkan tanggal terbaru dari waktu modifikasi file"""
@@ -320,9 +365,14 @@ class ZipBackupMonitorEnhanced:
         file_date = datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d')
         return file_date == target_date
 
-    def deep_analyze_files_threaded(self, files: List[str]):
-        """Deep analyze files dengan BAK analysis mendalam"""
-        self.summary_data = {}
+    def deep_analyze_files_threaded(self, files: List[str], reset: bool = True,
+                                    stat_results: Optional[Dict[str, os.stat_result]] = None):
+        """
+        Deep analyze files dengan BAK analysis mendalam
+        reset=False: tambahkan ke summary yang ada; stat_results: hasil scan yang dipakai ulang
+        """
+        if reset:
+            self.summary_data = {}
 
         for i, file_path in enumerate(files):
             try:
@@ -338,7 +388,16 @@ class ZipBackupMonitorEnhanced:
                     continue
 
                 # Basic file info
-                stat_info = os.stat(file_path)
+                stat_info = (stat_results or {}).get(file_path) or os.stat(file_path)
+
+                # Tunda arsip yang masih ditulis agar tidak dilaporkan rusak
+                state, reason = self.stability_gate.check(file_path, stat_info)
+                if state == STATE_PENDING:
+                    if file_path not in self.pending_files:
+                        self.update_log(f"Menunggu file selesai ditulis: {os.path.basename(file_path)} ({reason})")
+                    self.pending_files[file_path] = reason
+                    continue
+                self.pending_files.pop(file_path, None)
                 file_info = {
                     'path': file_path,
                     'size': stat_info.st_size,
@@ -394,12 +453,13 @@ class ZipBackupMonitorEnhanced:
 
         try:
             with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                # Test integritas ZIP
-                bad_file = zip_ref.testzip()
-                if bad_file:
+                # Test integritas ZIP (single-pass, hasil per member dipakai di bawah)
+                record = get_default_verifier().verify(file_path, zip_ref=zip_ref)
+                if record['error'] or record['bad_file']:
                     analysis['corrupt'] = True
                     analysis['status'] = 'Corrupt'
                     return analysis
+                verified = {m['filename']: m for m in record['members']}
 
                 # Get file list
                 file_list = zip_ref.namelist()
@@ -422,7 +482,9 @@ class ZipBackupMonitorEnhanced:
                         'extension': os.path.splitext(file)[1].lower(),
                         'is_bak': file.lower().endswith('.bak'),
                         'backup_type': self.detect_backup_type_from_filename(file),
-                        'can_extract': True  # Asumsi bisa diekstrak
+                        'can_extract': verified.get(file, {}).get('crc_ok', False),
+                        'file_format': verified.get(file, {}).get('file_format', 'unknown'),
+                        'sha256': verified.get(file, {}).get('digest')
                     }
 
                     analysis['bak_files'].append(file_analysis)
@@ -609,6 +671,11 @@ class ZipBackupMonitorEnhanced:
     def analyze_with_sql_server(self, bak_path: str, backup_type: str) -> Dict:
         """Analyze BAK file dengan SQL Server commands"""
         try:
+            # Header MTF dibaca langsung dari file, sqlcmd hanya fallback
+            native = self.analyze_mtf_header(bak_path, backup_type)
+            if native:
+                return native
+
             if not self.is_sql_server_available():
                 return {
                     'status': 'SQL Server Unavailable',
@@ -648,6 +715,32 @@ class ZipBackupMonitorEnhanced:
                 'backup_type': backup_type
             }
 
+    def analyze_mtf_header(self, bak_path: str, backup_type: str) -> Optional[Dict]:
+        """Setara RESTORE HEADERONLY/FILELISTONLY tanpa SQL Server (parser MTF native)"""
+        parsed = parse_mtf(bak_path)
+        if not parsed['backup_sets']:
+            return None
+
+        backup_set = parsed['backup_sets'][0]
+        header = backup_set['header']
+        return {
+            'status': 'SQL Analysis Complete',
+            'source': 'mtf_header',
+            'backup_type': backup_type,
+            'database_name': header['DatabaseName'] or '',
+            'backup_date': header['BackupStartDate'].isoformat() if header['BackupStartDate'] else '',
+            'backup_finish_date': header['BackupFinishDate'].isoformat() if header['BackupFinishDate'] else '',
+            'backup_size': header['BackupSize'] or 0,
+            'position': header['Position'] or 0,
+            'server_name': header['ServerName'] or '',
+            'backup_type_description': header['BackupTypeDescription'],
+            'file_list': [
+                {'logical_name': f['LogicalName'], 'physical_name': f['PhysicalName'], 'type': f['Type']}
+                for f in backup_set['files']
+            ],
+            'warnings': parsed['errors']
+        }
+
     def is_sql_server_available(self) -> bool:
         """Check if SQL Server is available"""
         try:
@@ -954,7 +1047,8 @@ class ZipBackupMonitorEnhanced:
             'files': list(self.summary_data.values()),
             'total_zip_files': len(self.summary_data),
             'valid_zip_files': sum(1 for f in self.summary_data.values() if f.get('status') == 'Valid'),
-            'corrupted_zip_files': sum(1 for f in self.summary_data.values() if f.get('status') == 'Corrupted')
+            'corrupted_zip_files': sum(1 for f in self.summary_data.values() if f.get('status') == 'Corrupted'),
+            'pending_zip_files': [os.path.basename(f) for f in self.pending_files]
         }
 
         zip_summary = self.generate_zip_summary(scan_results)
@@ -1243,603 +1337,23 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
         total_files = len(self.summary_data)
         valid_files = sum(1 for f in self.summary_data.values() if f['status'] == 'Valid')
-        extracted_files = sum(1 for f in self.summary_data.values() if f['extracted'])
 
         # Get current summaries
         zip_summary = getattr(self, 'zip_summary', {})
         bak_summary = getattr(self, 'bak_summary', {})
-
-        # Calculate critical alerts
-        critical_alerts = len(bak_summary.get('age_analysis', {}).get('outdated_files', [])) + len(bak_summary.get('size_validation', {}).get('size_warnings', []))
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="id">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Laporan Analisis Backup Database</title>
-    <style>
-        @media screen {{
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f8f9fa;
-                color: #333;
-                line-height: 1.6;
-            }}
-            .container {{
-                max-width: 1000px;
-                margin: 0 auto;
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                box-shadow: 0 0 20px rgba(0,0,0,0.1);
-            }}
-            .header {{
-                background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-                color: white;
-                padding: 25px;
-                text-align: center;
-                border-radius: 8px 8px 0 0;
-            }}
-            .header h1 {{
-                margin: 0;
-                font-size: 24px;
-                font-weight: 600;
-                letter-spacing: 0.5px;
-            }}
-            .header p {{
-                margin: 8px 0 0 0;
-                opacity: 0.9;
-                font-size: 14px;
-            }}
-            .section {{
-                margin: 25px;
-                padding: 20px;
-                border-radius: 6px;
-                border-left: 4px solid #2c3e50;
-                background-color: #ffffff;
-                border: 1px solid #e9ecef;
-            }}
-            .section h2 {{
-                color: #2c3e50;
-                margin-top: 0;
-                font-size: 18px;
-                font-weight: 600;
-                border-bottom: 2px solid #e9ecef;
-                padding-bottom: 8px;
-                margin-bottom: 20px;
-            }}
-            .executive-summary {{
-                background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-                border-left-color: #007bff;
-                border-top: 3px solid #007bff;
-            }}
-            .executive-summary h2 {{
-                color: #007bff;
-            }}
-            .file-card {{
-                background-color: #ffffff;
-                border: 1px solid #dee2e6;
-                border-radius: 4px;
-                padding: 15px;
-                margin: 12px 0;
-                box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-            }}
-            .file-name {{
-                font-weight: 600;
-                color: #2c3e50;
-                font-size: 16px;
-                margin-bottom: 10px;
-                border-bottom: 1px solid #e9ecef;
-                padding-bottom: 5px;
-            }}
-            .file-details {{
-                font-size: 13px;
-            }}
-            .detail-row {{
-                display: flex;
-                justify-content: space-between;
-                margin: 4px 0;
-                padding: 2px 0;
-            }}
-            .detail-label {{
-                color: #6c757d;
-                font-weight: 500;
-            }}
-            .detail-value {{
-                font-weight: 600;
-                color: #2c3e50;
-            }}
-            .status-badge {{
-                padding: 3px 8px;
-                border-radius: 3px;
-                font-size: 11px;
-                font-weight: 600;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-            }}
-            .status-valid {{
-                background-color: #d4edda;
-                color: #155724;
-                border: 1px solid #c3e6cb;
-            }}
-            .status-warning {{
-                background-color: #fff3cd;
-                color: #856404;
-                border: 1px solid #ffeaa7;
-            }}
-            .status-invalid {{
-                background-color: #f8d7da;
-                color: #721c24;
-                border: 1px solid #f5c6cb;
-            }}
-            .status-outdated {{
-                background-color: #f8d7da;
-                color: #721c24;
-                border: 1px solid #f5c6cb;
-            }}
-            .status-current {{
-                background-color: #d4edda;
-                color: #155724;
-                border: 1px solid #c3e6cb;
-            }}
-            .stats-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 15px;
-                margin: 20px 0;
-            }}
-            .stat-card {{
-                background-color: #ffffff;
-                padding: 15px;
-                border-radius: 6px;
-                border: 1px solid #dee2e6;
-                text-align: center;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }}
-            .stat-number {{
-                font-size: 20px;
-                font-weight: 700;
-                color: #007bff;
-                margin-bottom: 5px;
-            }}
-            .stat-label {{
-                color: #6c757d;
-                font-size: 12px;
-                font-weight: 500;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-            }}
-            .alert-section {{
-                background-color: #fff3cd;
-                border-left-color: #ffc107;
-                border: 1px solid #ffeaa7;
-            }}
-            .alert-section h2 {{
-                color: #856404;
-            }}
-            .recommendations {{
-                background-color: #d4edda;
-                border-left-color: #28a745;
-                border: 1px solid #c3e6cb;
-            }}
-            .recommendations h2 {{
-                color: #155724;
-            }}
-            .recommendations ul {{
-                margin: 15px 0;
-                padding-left: 20px;
-            }}
-            .recommendations li {{
-                margin: 6px 0;
-                line-height: 1.5;
-            }}
-            .footer {{
-                background-color: #2c3e50;
-                color: white;
-                text-align: center;
-                padding: 15px;
-                font-size: 12px;
-            }}
-            .critical-alerts {{
-                background-color: #f8d7da;
-                border: 1px solid #f5c6cb;
-                border-radius: 6px;
-                padding: 15px;
-                margin: 15px 0;
-                text-align: center;
-            }}
-            .critical-alerts .alert-number {{
-                font-size: 20px;
-                font-weight: bold;
-                color: #721c24;
-                margin-bottom: 5px;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin: 15px 0;
-                background-color: white;
-                border: 1px solid #dee2e6;
-            }}
-            th, td {{
-                border: 1px solid #dee2e6;
-                padding: 10px;
-                text-align: left;
-                font-size: 13px;
-            }}
-            th {{
-                background-color: #f8f9fa;
-                color: #2c3e50;
-                font-weight: 600;
-                border-bottom: 2px solid #dee2e6;
-            }}
-            tr:nth-child(even) {{
-                background-color: #f8f9fa;
-            }}
-            h3 {{
-                color: #2c3e50;
-                font-size: 16px;
-                font-weight: 600;
-                margin: 20px 0 10px 0;
-                border-bottom: 1px solid #e9ecef;
-                padding-bottom: 5px;
-            }}
-        }}
-
-        /* Print-friendly styles */
-        @media print {{
-            body {{
-                background-color: white;
-                font-family: Arial, sans-serif;
-            }}
-            .container {{
-                box-shadow: none;
-                border: 1px solid #ccc;
-            }}
-            .header {{
-                background: #2c3e50 !important;
-                -webkit-print-color-adjust: exact;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>SISTEM MONITORING BACKUP DATABASE</h1>
-            <p>LAPORAN ANALISIS LENGKAP</p>
-        </div>
-
-        <div class="section executive-summary">
-            <h2>📊 Ringkasan Eksekutif</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-                    <div class="stat-label">Laporan Dibuat</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{total_files}</div>
-                    <div class="stat-label">Total Arsip ZIP</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{valid_files}</div>
-                    <div class="stat-label">File ZIP Valid</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{(valid_files/total_files*100):.1f}%</div>
-                    <div class="stat-label">Tingkat Keberhasilan</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('total_bak_files', 0)}</div>
-                    <div class="stat-label">Total File BAK</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number status-{'active' if valid_files > 0 else 'inactive'}">{'AKTIF' if valid_files > 0 else 'TIDAK AKTIF'}</div>
-                    <div class="stat-label">Status Sistem</div>
-                </div>
-            </div>
-
-            {f'<div class="critical-alerts"><div class="alert-number">{critical_alerts}</div><div>Item Memerlukan Perhatian Segera</div></div>' if critical_alerts > 0 else ''}
-        </div>
-
-        <div class="section">
-            <h2>📁 Analisis Arsip ZIP</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{total_files}</div>
-                    <div class="stat-label">Total File ZIP</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{valid_files}</div>
-                    <div class="stat-label">Arsip Valid</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{total_files - valid_files}</div>
-                    <div class="stat-label">Arsip Rusak</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{zip_summary.get('total_size_formatted', 'N/A')}</div>
-                    <div class="stat-label">Total Ukuran Arsip</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{zip_summary.get('average_size_formatted', 'N/A')}</div>
-                    <div class="stat-label">Ukuran Rata-rata</div>
-                </div>
-            </div>
-
-            <h3>Detail File per Arsip:</h3>
-"""
-
-        # Detailed ZIP file analysis with names, dates, and status
-        for file_path, file_info in self.summary_data.items():
-            filename = os.path.basename(file_path)
-            backup_type = file_info.get('backup_type', 'Unknown')
-            size = self.format_size(file_info.get('size', 0))
-            status = file_info.get('status', 'Unknown')
-
-            # Get file modification date for outdated calculation
-            try:
-                mod_time = os.path.getmtime(file_path)
-                mod_date = datetime.fromtimestamp(mod_time)
-                current_date = datetime.now()
-                days_diff = (current_date - mod_date).days
-                # Consider outdated if modification date is not today
-                is_outdated = mod_date.date() != current_date.date()
-                outdated_status = "KADALUARSA" if is_outdated else "MASIH BERLAKU"
-                status_class = "status-outdated" if is_outdated else "status-current"
-            except:
-                days_diff = 0
-                is_outdated = False
-                outdated_status = "TIDAK DIKETAHUI"
-                status_class = "status-warning"
-
-            status_class_zip = "status-valid" if status == "Valid" else "status-invalid" if status == "Corrupted" else "status-warning"
-
-            body += f"""
-            <div class="file-card">
-                <div class="file-name">{filename}</div>
-                <div class="file-details">
-                    <div class="detail-item">
-                        <span class="detail-label">Tipe Backup:</span>
-                        <span class="detail-value">{backup_type}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Ukuran File:</span>
-                        <span class="detail-value">{size}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Status:</span>
-                        <span class="detail-value"><span class="status-badge {status_class_zip}">{status}</span></span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Terakhir Dimodifikasi:</span>
-                        <span class="detail-value">{mod_date.strftime('%Y-%m-%d %H:%M') if 'mod_date' in locals() else 'Tidak Diketahui'}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Usia:</span>
-                        <span class="detail-value">{days_diff} hari</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Status Arsip:</span>
-                        <span class="detail-value"><span class="status-badge {status_class}">{outdated_status}</span></span>
-                    </div>
-                </div>
-            </div>
-"""
-
-        body += f"""
-        </div>
-
-        <div class="section">
-            <h2>🗄️ Analisis File Backup Database</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('total_bak_files', 0)}</div>
-                    <div class="stat-label">Total File BAK</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('analyzed_bak_files', 0)}</div>
-                    <div class="stat-label">File BAK Dianalisis</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('total_bak_size_formatted', 'N/A')}</div>
-                    <div class="stat-label">Total Ukuran BAK</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('average_bak_size_formatted', 'N/A')}</div>
-                    <div class="stat-label">Ukuran Rata-rata BAK</div>
-                </div>
-            </div>
-
-            <h3>Detail File Backup:</h3>
-"""
-
-        # Detailed BAK file analysis
-        for file_path, file_info in self.summary_data.items():
-            deep_analysis = file_info.get('deep_analysis', {})
-            extracted_files = deep_analysis.get('extracted_files', [])
-
-            if extracted_files:
-                for bak_file in extracted_files:
-                    if bak_file.get('excluded', False):
-                        continue
-
-                    bak_filename = bak_file.get('filename', 'Unknown')
-                    bak_size = self.format_size(bak_file.get('size', 0))
-                    bak_type = bak_file.get('backup_type', 'Unknown')
-
-                    # Size validation with minimum requirements
-                    size_warning = bak_file.get('size_warning', False)
-                    size_status = "DI BAWAH MINIMUM" if size_warning else "DI ATAS MINIMUM"
-                    size_class = "status-warning" if size_warning else "status-valid"
-
-                    # Age analysis
-                    is_outdated_bak = bak_file.get('is_outdated', False)
-                    days_since_backup = bak_file.get('days_since_backup', 0)
-                    outdated_status_bak = "KADALUARSA" if is_outdated_bak else "MASIH BERLAKU"
-                    age_class = "status-outdated" if is_outdated_bak else "status-current"
-
-                    # File readability and validity
-                    can_be_extracted = not bak_file.get('extraction_failed', True)
-                    dbatools_readable = bak_file.get('dbatools_analysis', {}).get('status') == 'Analyzed'
-
-                    extraction_status = "DAPAT DIBACA" if can_be_extracted else "TIDAK DAPAT DIBACA"
-                    extraction_class = "status-valid" if can_be_extracted else "status-invalid"
-
-                    dbatools_status = "DAPAT DIBACA" if dbatools_readable else "TIDAK DAPAT DIBACA"
-                    dbatools_class = "status-valid" if dbatools_readable else "status-invalid"
-
-                    body += f"""
-            <div class="file-card">
-                <div class="file-name">{bak_filename}</div>
-                <div class="file-details">
-                    <div class="detail-item">
-                        <span class="detail-label">Tipe Backup:</span>
-                        <span class="detail-value">{bak_type}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Ukuran File:</span>
-                        <span class="detail-value">{bak_size}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Validasi Ukuran:</span>
-                        <span class="detail-value"><span class="status-badge {size_class}">{size_status}</span></span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Status Usia:</span>
-                        <span class="detail-value"><span class="status-badge {age_class}">{outdated_status_bak}</span> ({days_since_backup} hari)</span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Kemampuan Ekstraksi:</span>
-                        <span class="detail-value"><span class="status-badge {extraction_class}">{extraction_status}</span></span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Kemampuan Baca DBATools:</span>
-                        <span class="detail-value"><span class="status-badge {dbatools_class}">{dbatools_status}</span></span>
-                    </div>
-                    <div class="detail-item">
-                        <span class="detail-label">Perbedaan Satu Hari:</span>
-                        <span class="detail-value">{'YA' if bak_file.get('file_date_one_day_different', False) else 'TIDAK'}</span>
-                    </div>
-                </div>
-            </div>
-"""
-
-        body += f"""
-        </div>
-
-        <div class="section">
-            <h2>📋 Ringkasan Validasi & Analisis</h2>
-
-            <h3>Validasi Ukuran:</h3>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('size_validation', {}).get('above_minimum', 0)}</div>
-                    <div class="stat-label">Di Atas Minimum</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number status-warning">{bak_summary.get('size_validation', {}).get('below_minimum', 0)}</div>
-                    <div class="stat-label">Di Bawah Minimum</div>
-                </div>
-            </div>
-
-            <h3>Persyaratan Ukuran Minimum:</h3>
-            <table>
-                <tr><th>Tipe Backup</th><th>Ukuran Minimum</th></tr>
-                <tr><td>BackupStaging</td><td>2.3 GB</td></tr>
-                <tr><td>BackupVenus</td><td>8.7 GB</td></tr>
-                <tr><td>PlantwareP3</td><td>35.0 GB</td></tr>
-            </table>
-
-            <h3>Analisis Usia:</h3>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('age_analysis', {}).get('recent_24h', 0)}</div>
-                    <div class="stat-label">24 Jam Terakhir</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('age_analysis', {}).get('last_7_days', 0)}</div>
-                    <div class="stat-label">7 Hari Terakhir</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('age_analysis', {}).get('older_than_7_days', 0)}</div>
-                    <div class="stat-label">Lebih dari 7 Hari</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number status-warning">{len(bak_summary.get('age_analysis', {}).get('outdated_files', []))}</div>
-                    <div class="stat-label">File Tidak Modifikasi Hari Ini</div>
-                </div>
-            </div>
-
-            <h3>Performa Checklist Validasi:</h3>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('checklist_summary', {}).get('total_checklists', 0)}</div>
-                    <div class="stat-label">Total Checklist</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('checklist_summary', {}).get('perfect_scores', 0)}</div>
-                    <div class="stat-label">Skor Sempurna</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{bak_summary.get('checklist_summary', {}).get('average_score', 0):.1f}%</div>
-                    <div class="stat-label">Skor Rata-rata</div>
-                </div>
-            </div>
-"""
-
-        # Add critical issues section
-        has_critical_issues = (bak_summary.get('size_validation', {}).get('size_warnings') or
-                              bak_summary.get('age_analysis', {}).get('outdated_files') or
-                              bak_summary.get('checklist_summary', {}).get('common_failures'))
-
-        if has_critical_issues:
-            body += """
-            <div class="alert-section">
-                <h2>⚠️ Masalah Kritis yang Memerlukan Perhatian Segera</h2>
-"""
-
-            # Add size warnings
-            if bak_summary.get('size_validation', {}).get('size_warnings'):
-                body += "<h3>Peringatan Validasi Ukuran:</h3><ul>"
-                for warning in bak_summary['size_validation']['size_warnings']:
-                    body += f"<li>{warning['filename']} ({warning['size']}) - {warning['backup_type']} - Di bawah ukuran minimum</li>"
-                body += "</ul>"
-
-            # Add outdated files
-            if bak_summary.get('age_analysis', {}).get('outdated_files'):
-                body += "<h3>File Tidak Dimodifikasi Hari Ini:</h3><ul>"
-                for outdated in bak_summary['age_analysis']['outdated_files']:
-                    body += f"<li>{outdated['filename']} (modifikasi {outdated['days_outdated']} hari lalu) - {outdated['backup_type']}</li>"
-                body += "</ul>"
-
-            # Add common validation failures
-            if bak_summary.get('checklist_summary', {}).get('common_failures'):
-                body += "<h3>Kegagalan Validasi Umum:</h3><ul>"
-                for failure, count in sorted(bak_summary['checklist_summary']['common_failures'].items(),
-                                         key=lambda x: x[1], reverse=True)[:5]:
-                    body += f"<li>{failure}: {count} kejadian</li>"
-                body += "</ul>"
-
-            body += "</div>"
-
-        body += f"""
-        <div class="recommendations">
-            <h2>💡 Rekomendasi</h2>
-            <ul>
-"""
+        size_validation = bak_summary.get('size_validation', {})
+        age_analysis = bak_summary.get('age_analysis', {})
+        checklist_summary = bak_summary.get('checklist_summary', {})
+        size_warnings = size_validation.get('size_warnings', [])
+        outdated_files = age_analysis.get('outdated_files', [])
 
         # Generate recommendations based on analysis
         recommendations = []
 
-        if len(bak_summary.get('age_analysis', {}).get('outdated_files', [])) > 0:
+        if len(outdated_files) > 0:
             recommendations.append("Periksa file backup yang tidak dimodifikasi hari ini - pastikan proses backup berjalan setiap hari")
 
-        if len(bak_summary.get('size_validation', {}).get('size_warnings', [])) > 0:
+        if len(size_warnings) > 0:
             recommendations.append("Selidiki file di bawah ukuran minimum - potensi backup tidak lengkap")
 
         if bak_summary.get('dbatools_analysis', {}).get('failed', 0) > 0:
@@ -1852,42 +1366,67 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             recommendations.append("Semua sistem backup beroperasi dalam parameter normal")
             recommendations.append("Lanjutkan prosedur pemantauan dan perawatan rutin")
 
-        for rec in recommendations:
-            body += f"<li>{rec}</li>"
-
-        body += f"""
-            </ul>
-        </div>
-
-        <div class="section">
-            <h2>⚙️ Informasi Sistem</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{'AKTIF' if self.config.getboolean('MONITORING', 'exclude_plantware', fallback=True) else 'TIDAK AKTIF'}</div>
-                    <div class="stat-label">Pengecualian PlantwareP3</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{'AKTIF' if hasattr(self, 'monitoring_active') and self.monitoring_active else 'TIDAK AKTIF'}</div>
-                    <div class="stat-label">Pemantauan Real-time</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">Enhanced Backup Monitor v3.0</div>
-                    <div class="stat-label">Versi Sistem</div>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <div class="footer">
-        <p><strong>Sistem Monitoring Backup Database</strong></p>
-        <p>Dibuat: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p>Enhanced Backup Monitor v3.0 - Analisis Real-time dengan 12 Parameter Validasi</p>
-    </div>
-</body>
-</html>
-"""
+        return render_template(
+            'deep_analysis_email.html',
+            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            total_files=total_files,
+            valid_files=valid_files,
+            success_rate=valid_files / total_files * 100,
+            critical_alerts=len(outdated_files) + len(size_warnings),
+            zip_summary=zip_summary,
+            bak_summary=bak_summary,
+            size_validation=size_validation,
+            age_analysis=age_analysis,
+            checklist_summary=checklist_summary,
+            size_warnings=size_warnings,
+            outdated_files=outdated_files,
+            common_failures=top_failures(checklist_summary.get('common_failures', {})),
+            zip_rows=self._deep_analysis_zip_rows(),
+            bak_rows=self._deep_analysis_bak_rows(),
+            recommendations=recommendations,
+            exclude_plantware=self.config.getboolean('MONITORING', 'exclude_plantware', fallback=True),
+            monitoring_active=getattr(self, 'monitoring_active', False)
+        )
 
-        return body
+    def _deep_analysis_zip_rows(self) -> List[DeepZipRow]:
+        """Baris arsip ZIP untuk email deep analysis (usia dihitung dari mtime file)"""
+        rows = []
+        current_date = datetime.now()
+        for file_path, file_info in self.summary_data.items():
+            status = file_info.get('status', 'Unknown')
+            try:
+                mod_date = datetime.fromtimestamp(os.path.getmtime(file_path))
+                days_diff = (current_date - mod_date).days
+                modified = mod_date.strftime('%Y-%m-%d %H:%M')
+                # Consider outdated if modification date is not today
+                is_outdated = mod_date.date() != current_date.date()
+                age_status = "KADALUARSA" if is_outdated else "MASIH BERLAKU"
+                age_class = "status-outdated" if is_outdated else "status-current"
+            except OSError:
+                days_diff = 0
+                modified = 'Tidak Diketahui'
+                age_status = "TIDAK DIKETAHUI"
+                age_class = "status-warning"
+
+            rows.append(DeepZipRow(
+                filename=os.path.basename(file_path),
+                backup_type=file_info.get('backup_type', 'Unknown'),
+                size=self.format_size(file_info.get('size', 0)),
+                status=status,
+                status_class="status-valid" if status == "Valid" else "status-invalid" if status == "Corrupted" else "status-warning",
+                modified=modified,
+                days_old=days_diff,
+                age_status=age_status,
+                age_class=age_class
+            ))
+        return rows
+
+    def _deep_analysis_bak_rows(self) -> List[DeepBakRow]:
+        """Baris file BAK (yang tidak dikecualikan) untuk email deep analysis"""
+        return [DeepBakRow.from_extracted(bak_file, self.format_size)
+                for file_info in self.summary_data.values()
+                for bak_file in file_info.get('deep_analysis', {}).get('extracted_files', [])
+                if not bak_file.get('excluded', False)]
 
     def generate_plain_text_version(self) -> str:
         """Generate plain text version dari HTML email untuk fallback"""
@@ -2007,13 +1546,11 @@ Enhanced Backup Monitor v3.0 - Analisis Real-time dengan 12 Parameter Validasi
                 )
                 msg.attach(part)
 
-            # Send email
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(sender_email, sender_password)
+            # Send email lewat koneksi SMTP bersama (reconnect + retry di MailTransport)
+            transport = get_transport(smtp_server, smtp_port, sender_email, sender_password,
+                                      **transport_options(self.config['EMAIL']))
             text = msg.as_string()
-            server.sendmail(sender_email, recipient_email, text)
-            server.quit()
+            transport.sendmail(sender_email, recipient_email, text)
 
         except Exception as e:
             self.logger.error(f"Error mengirim email: {str(e)}")
@@ -7,6 +7,7 @@ Aplikasi monitoring backup database dengan interface PyQt5
 import sys
 import os
 import json
+import hashlib
 import zipfile
 import threading
 import logging
@@ -33,10 +34,17 @@ from PyQt5.QtGui import *
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.zip_metadata_viewer import ZipMetadataViewer
-from src.email_notifier import EmailNotifier
-from src.bak_metadata_analyzer import BAKMetadataAnalyzer
-from src.pdf_report_generator import PDFReportGenerator
+from src.dir_scanner import scan_directory
+from src.email_report_model import BackupSummary
+from src.html_templates import render_template
+from src.zip_central_directory import COMPRESSION_NAMES, read_central_directory
+from src.lazy_import import LazyAttribute
+
+# Subsystem berat (ReportLab, email, analyzer BAK) di-import saat pertama dipakai
+ZipMetadataViewer = LazyAttribute('src.zip_metadata_viewer', 'ZipMetadataViewer')
+EmailNotifier = LazyAttribute('src.email_notifier', 'EmailNotifier')
+BAKMetadataAnalyzer = LazyAttribute('src.bak_metadata_analyzer', 'BAKMetadataAnalyzer')
+PDFReportGenerator = LazyAttribute('src.pdf_report_generator', 'PDFReportGenerator')
 
 class WorkerSignals(QObject):
     """Signals for worker threads"""
@@ -435,7 +443,6 @@ class BackupAnalysisWorker(QRunnable):
     def _get_zip_metadata_display(self):
         """Get ZIP metadata for display before extraction"""
         try:
-            import zipfile
             from datetime import datetime
 
             # Get basic file info
@@ -444,44 +451,26 @@ class BackupAnalysisWorker(QRunnable):
             modified_date = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d')
             modified_time = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
 
-            # Get ZIP file information
-            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
-                file_list = zip_ref.namelist()
-                total_files = len(file_list)
-
-                # Calculate file types and sizes
-                file_types = {}
-                total_size = 0
-                largest_file = {'name': '', 'size': 0}
-
-                for file_name in file_list:
-                    file_info = zip_ref.getinfo(file_name)
-                    file_size = file_info.file_size
-                    total_size += file_size
-
-                    # Get file extension
-                    ext = os.path.splitext(file_name)[1].lower()
-                    file_types[ext] = file_types.get(ext, 0) + 1
-
-                    # Track largest file
-                    if file_size > largest_file['size']:
-                        largest_file = {'name': file_name, 'size': file_size}
-
-                # Get ZIP file info
-                zip_info = zip_ref.infolist()
-                compression_methods = set()
-                for info in zip_info:
-                    compression_methods.add(info.compress_type)
-
-            # Determine compression method names
-            compression_names = {
-                0: 'Stored',
-                8: 'Deflated',
-                12: 'BZIP2',
-                14: 'LZMA'
-            }
+            # Get ZIP file information from the central directory only (member data is not read)
+            entries = read_central_directory(self.zip_path).entries
+            total_files = len(entries)
 
-            compression_used = [compression_names.get(m, f'Unknown({m})') for m in compression_methods]
+            # Calculate file types and sizes
+            file_types = {}
+            total_size = 0
+            largest_file = {'name': '', 'size': 0}
+            compression_methods = set()
+
+            for entry in entries:
+                total_size += entry.file_size
+                file_types[entry.extension] = file_types.get(entry.extension, 0) + 1
+                compression_methods.add(entry.compress_type)
+
+                # Track largest file
+                if entry.file_size > largest_file['size']:
+                    largest_file = {'name': entry.filename, 'size': entry.file_size}
+
+            compression_used = [COMPRESSION_NAMES.get(m, f'Unknown({m})') for m in compression_methods]
 
             return {
                 'file_info': {
@@ -1172,11 +1161,13 @@ class BackupMonitorWindow(QMainWindow):
         self.setWindowTitle("Backup Monitor - PyQt5 Edition")
         self.setGeometry(100, 100, 1200, 800)
 
-        # Initialize components
-        self.zip_viewer = ZipMetadataViewer()
-        self.email_notifier = EmailNotifier()
-        self.bak_analyzer = BAKMetadataAnalyzer()
-        self.pdf_generator = PDFReportGenerator()
+        # Components (zip_viewer, email_notifier, bak_analyzer, pdf_generator)
+        # dibuat saat pertama kali dipakai, lihat property di bawah
+        self._zip_viewer = None
+        self._email_notifier = None
+        self._bak_analyzer = None
+        self._pdf_generator = None
+        self._notification_outbox = None
 
         # Thread pool for background tasks
         self.thread_pool = QThreadPool()
@@ -1184,6 +1175,7 @@ class BackupMonitorWindow(QMainWindow):
 
         # Variables
         self.current_zip_files = []
+        self.current_zip_info = []
         self.selected_zip_index = None
         self.extraction_directory = ""  # User-selected extraction directory
         self.zip_metadata_cache = {}  # Cache for ZIP metadata
@@ -1201,6 +1193,62 @@ class BackupMonitorWindow(QMainWindow):
         # Load default folder
         self.load_default_folder()
 
+        # Sender outbox email dimulai setelah window tampil (kirim ulang antrian sesi sebelumnya)
+        from PyQt5.QtCore import QTimer
+        QTimer.singleShot(3000, lambda: self.notification_outbox)
+
+    @property
+    def zip_viewer(self):
+        if self._zip_viewer is None:
+            self._zip_viewer = ZipMetadataViewer()
+        return self._zip_viewer
+
+    @property
+    def email_notifier(self):
+        if self._email_notifier is None:
+            self._email_notifier = EmailNotifier()
+        return self._email_notifier
+
+    @property
+    def notification_outbox(self):
+        """Outbox email persisten; dikirim oleh sender asyncio di thread background"""
+        if self._notification_outbox is None:
+            from src.notification_outbox import NotificationOutbox, load_outbox_config
+            self._notification_outbox = NotificationOutbox(
+                self._deliver_queued_email, on_result=self._on_outbox_result, **load_outbox_config())
+            self._notification_outbox.start()
+        return self._notification_outbox
+
+    def _deliver_queued_email(self, subject, message, attachment_path=None):
+        """Sender outbox (thread background): hanya baca email_config, tanpa akses widget"""
+        email_config = dict(self.email_config)
+        email_notifier = EmailNotifier()
+        email_notifier.sender_email = email_config.get('sender_email', '')
+        email_notifier.sender_password = email_config.get('sender_password', '')
+        email_notifier.receiver_email = email_config.get('receiver_email', '')
+        return email_notifier.send_notification(subject, message, attachment_path)
+
+    @staticmethod
+    def _on_outbox_result(notification, success, message):
+        if success:
+            logger.info(f"Queued email sent: {notification['subject']}")
+        elif notification['status'] == 'failed':
+            logger.error(f"Queued email failed permanently after {notification['attempts']} attempts: {message}")
+        else:
+            logger.warning(f"Queued email failed (attempt {notification['attempts']}), will retry: {message}")
+
+    @property
+    def bak_analyzer(self):
+        if self._bak_analyzer is None:
+            self._bak_analyzer = BAKMetadataAnalyzer()
+        return self._bak_analyzer
+
+    @property
+    def pdf_generator(self):
+        if self._pdf_generator is None:
+            self._pdf_generator = PDFReportGenerator()
+        return self._pdf_generator
+
     def setup_ui(self):
         """Setup the user interface"""
         # Central widget
@@ -2609,28 +2657,18 @@ class BackupMonitorWindow(QMainWindow):
         if not folder or not os.path.exists(folder):
             self.zip_table.setRowCount(0)
             self.current_zip_files = []
+            self.current_zip_info = []
             return
 
         try:
-            # Get all ZIP files
-            zip_files = []
-            for file in os.listdir(folder):
-                if file.lower().endswith('.zip'):
-                    file_path = os.path.join(folder, file)
-                    stat = os.stat(file_path)
-                    zip_files.append({
-                        'name': file,
-                        'path': file_path,
-                        'size': stat.st_size,
-                        'modified': stat.st_mtime
-                    })
-
-            # Sort by modification time (newest first)
-            zip_files.sort(key=lambda x: x['modified'], reverse=True)
+            # Get all ZIP files (satu scandir, sudah terurut dari yang terbaru)
+            zip_files = [record.to_dict() for record in scan_directory(folder)]
 
             # Update table widget
             self.zip_table.setRowCount(len(zip_files))
             self.current_zip_files = []
+            # File info hasil scan dipakai ulang agar tidak stat ulang setiap file
+            self.current_zip_info = zip_files
 
             for row, zip_info in enumerate(zip_files):
                 # Column 0: File name
@@ -2703,11 +2741,12 @@ class BackupMonitorWindow(QMainWindow):
         self.show_progress("Analyzing latest backup files...")
 
         # Group files by date
+        scanned = {info['path']: info['modified'] for info in self.current_zip_info}
         files_by_date = {}
         for zip_path in self.current_zip_files:
             try:
-                stat = os.stat(zip_path)
-                file_date = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d')
+                mod_time = scanned[zip_path] if zip_path in scanned else os.stat(zip_path).st_mtime
+                file_date = datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d')
                 if file_date not in files_by_date:
                     files_by_date[file_date] = []
                 files_by_date[file_date].append(zip_path)
@@ -2969,9 +3008,13 @@ class BackupMonitorWindow(QMainWindow):
             self.status_bar.showMessage("No ZIP files found for processing")
             return
         
-        # Convert file paths to file info objects for filtering
+        # Convert file paths to file info objects for filtering (pakai hasil scan terakhir)
+        scanned = {info['path']: info for info in self.current_zip_info}
         zip_files = []
         for zip_path in self.current_zip_files:
+            if zip_path in scanned:
+                zip_files.append(scanned[zip_path])
+                continue
             try:
                 stat = os.stat(zip_path)
                 zip_files.append({
@@ -3967,15 +4010,9 @@ class BackupMonitorWindow(QMainWindow):
     def _send_automated_email_report(self, report_data: Dict[str, Any]):
         """Send automated email report after batch extraction"""
         try:
-            # Load email configuration
+            # Load email configuration (dipakai sender outbox saat mengirim)
             self.update_email_config()
             
-            # Create email notifier
-            email_notifier = EmailNotifier()
-            email_notifier.sender_email = self.email_config.get('sender_email', '')
-            email_notifier.sender_password = self.email_config.get('sender_password', '')
-            email_notifier.receiver_email = self.email_config.get('receiver_email', '')
-            
             # Generate email content
             subject = f"Laporan Analisis Backup Otomatis - {report_data['report_date']}"
             
@@ -4014,6 +4051,10 @@ DETAIL BACKUP:
      Status: {db['status']}
 """
             
+            # Dedup per isi laporan (tanpa footer waktu): laporan yang sama tidak
+            # dikirim dua kali, laporan baru di hari yang sama tetap dikirim
+            content_hash = hashlib.sha256((subject + body).encode('utf-8')).hexdigest()[:16]
+
             body += f"""
 
 Laporan ini dibuat secara otomatis oleh sistem monitoring backup.
@@ -4024,23 +4065,15 @@ Backup Monitor System
 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
             
-            # Send email directly using EmailNotifier
-            success, message = email_notifier.send_notification(subject, body)
-            
-            if success:
-                logger.info("Automated email report sent successfully")
-                QMessageBox.information(
-                    self,
-                    "Email Sent",
-                    "Laporan analisis otomatis berhasil dikirim via email."
-                )
+            # Queue ke outbox; dikirim di background dengan retry jika SMTP lambat / mati
+            notification_id = self.notification_outbox.enqueue(subject, body,
+                                                               dedup_key=f"auto-report:{content_hash}")
+            if notification_id is None:
+                logger.info("Automated email report skipped: identical report already in outbox")
+                self.status_bar.showMessage("Laporan yang sama sudah ada di antrian email, tidak dikirim ulang")
             else:
-                logger.error(f"Failed to send automated email report: {message}")
-                QMessageBox.warning(
-                    self,
-                    "Email Error", 
-                    f"Gagal mengirim laporan email: {message}"
-                )
+                logger.info(f"Automated email report queued (#{notification_id})")
+                self.status_bar.showMessage("Laporan analisis otomatis masuk antrian email")
             
         except Exception as e:
             logger.error(f"Failed to send automated email report: {str(e)}")
@@ -4861,190 +4894,9 @@ Backup Monitor System
 
     def _generate_backup_summary_html(self, zip_results=None, bak_results=None):
         """Generate HTML content for backup summary email"""
-
-        # Generate executive summary first
-        executive_summary = self._generate_executive_summary(zip_results, bak_results)
-
-        # ZIP Analysis Summary
-        zip_summary = self._generate_zip_analysis_summary(zip_results)
-
-        # BAK Analysis Summary
-        bak_summary = self._generate_bak_analysis_summary(bak_results)
-
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background-color: #f0f0f0; padding: 20px; border-radius: 5px; }}
-                .executive-summary {{ background-color: #e8f5e8; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                .summary-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 15px 0; }}
-                .summary-card {{ background-color: white; padding: 15px; border-radius: 5px; border: 1px solid #ddd; }}
-                .summary-card h4 {{ margin: 0 0 10px 0; color: #333; }}
-                .summary-card .value {{ font-size: 24px; font-weight: bold; color: #2196F3; }}
-                .summary-card .label {{ font-size: 12px; color: #666; }}
-                .section {{ margin: 20px 0; }}
-                .summary-table {{ border-collapse: collapse; width: 100%; }}
-                .summary-table th, .summary-table td {{
-                    border: 1px solid #ddd; padding: 8px; text-align: left;
-                }}
-                .summary-table th {{ background-color: #f2f2f2; }}
-                .status-valid {{ color: green; font-weight: bold; }}
-                .status-invalid {{ color: red; font-weight: bold; }}
-                .status-warning {{ color: orange; font-weight: bold; }}
-                .file-info {{ background-color: #f9f9f9; padding: 10px; border-radius: 3px; margin: 5px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>LAPORAN SUMMARY ANALISIS BACKUP DATABASE</h2>
-                <p><strong>Tanggal Analisis:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            </div>
-
-            {executive_summary}
-
-            <div class="section">
-                <h3>📦 DETAIL ANALISIS ZIP FILE</h3>
-                {zip_summary}
-            </div>
-
-            <div class="section">
-                <h3>💾 DETAIL ANALISIS BAK FILE</h3>
-                {bak_summary}
-            </div>
-
-            <div class="section">
-                <h3>📊 REKOMENDASI</h3>
-                {self._generate_recommendations(zip_results, bak_results)}
-            </div>
-
-            <hr>
-            <p><em>Laporan ini dibuat otomatis oleh sistem monitoring backup database</em></p>
-        </body>
-        </html>
-        """
-
-        return html_content
-
-    def _generate_executive_summary(self, zip_results=None, bak_results=None):
-        """Generate executive summary with key metrics"""
-        # Support BAK-only analysis by synthesizing minimal ZIP context
-        if not zip_results:
-            if bak_results:
-                zip_results = [{
-                    'zip_file': 'BAK-only analysis',
-                    'file_size_mb': 0,
-                    'integrity_check': {'is_valid': True},
-                    'bak_analyses': bak_results,
-                    'metadata': {}
-                }]
-            else:
-                return "<div class='executive-summary'><h3>📊 EXECUTIVE SUMMARY</h3><p>Tidak ada data analisis yang tersedia</p></div>"
-
-        zip_entries = [r for r in zip_results if str(r.get('zip_file', '')).lower().endswith('.zip')]
-        total_zip_files = len(zip_entries)
-        total_zip_size = sum(r.get('file_size_mb', 0) for r in zip_entries)
-
-        all_baks = []
-        for r in zip_results:
-            all_baks.extend(r.get('bak_analyses', []))
-        total_bak_files = len(all_baks)
-
-        def _bak_size_mb(b):
-            if 'file_size_mb' in b:
-                return b.get('file_size_mb', 0) or 0
-            if 'file_size' in b:
-                try:
-                    return (b.get('file_size', 0) or 0) / (1024 * 1024)
-                except Exception:
-                    return 0
-            return 0
-
-        total_bak_size = sum(_bak_size_mb(b) for b in all_baks)
-
-        valid_zips = sum(1 for r in zip_entries if r.get('integrity_check', {}).get('is_valid', False))
-
-        def _is_bak_valid(b):
-            if b.get('analysis_status') == 'success':
-                v = b.get('validation', {})
-                if 'is_valid_bak' in v:
-                    return bool(v.get('is_valid_bak'))
-                return True
-            analysis = b.get('analysis', {})
-            if analysis.get('error'):
-                return False
-            return analysis.get('backup_date', 'Unknown') != 'Unknown'
-
-        valid_baks = sum(1 for b in all_baks if _is_bak_valid(b))
-
-        file_info_html = ""
-        for i, result in enumerate(zip_entries, 1):
-            zip_path = result.get('zip_file', 'Unknown')
-            file_size = result.get('file_size_mb', 0)
-            modified_date = self._get_file_modified_date(zip_path)
-            bak_count = len(result.get('bak_analyses', []))
-            integrity = result.get('integrity_check', {}).get('is_valid', False)
-            status_icon = "✅" if integrity else "❌"
-            extract_text = "Bisa" if integrity else "Tidak"
-            file_info_html += f"""
-            <div class=\"file-info\">
-                <strong>📁 File {i}:</strong> {os.path.basename(zip_path)}<br>
-                <strong>📅 Tanggal Modified:</strong> {modified_date}<br>
-                <strong>📏 Ukuran:</strong> {file_size:.2f} MB<br>
-                <strong>🗃️ Jumlah BAK:</strong> {bak_count}<br>
-                <strong>🔍 Status Integrity:</strong> {status_icon} {'Valid' if integrity else 'Invalid'}<br>
-                <strong>🔓 Ekstraksi:</strong> {extract_text}
-            </div>
-            """
-
-        html = f"""
-        <div class=\"executive-summary\">
-            <h3>📊 EXECUTIVE SUMMARY</h3>
-
-            <div class=\"summary-grid\">
-                <div class=\"summary-card\">
-                    <h4>Total File ZIP</h4>
-                    <div class=\"value\">{total_zip_files}</div>
-                    <div class=\"label\">File yang dianalisis</div>
-                </div>
-
-                <div class=\"summary-card\">
-                    <h4>Total Ukuran ZIP</h4>
-                    <div class=\"value\">{total_zip_size:.1f}</div>
-                    <div class=\"label\">MB</div>
-                </div>
-
-                <div class=\"summary-card\">
-                    <h4>Total File BAK</h4>
-                    <div class=\"value\">{total_bak_files}</div>
-                    <div class=\"label\">Database backup</div>
-                </div>
-
-                <div class=\"summary-card\">
-                    <h4>Total Ukuran BAK</h4>
-                    <div class=\"value\">{total_bak_size:.1f}</div>
-                    <div class=\"label\">MB</div>
-                </div>
-
-                <div class=\"summary-card\">
-                    <h4>ZIP Valid</h4>
-                    <div class=\"value\">{valid_zips}/{total_zip_files if total_zip_files > 0 else 1}</div>
-                    <div class=\"label\">File integrity OK</div>
-                </div>
-
-                <div class=\"summary-card\">
-                    <h4>BAK Valid</h4>
-                    <div class=\"value\">{valid_baks}/{total_bak_files if total_bak_files > 0 else 1}</div>
-                    <div class=\"label\">Database valid</div>
-                </div>
-            </div>
-
-            <h4>📋 Informasi File yang Dianalisis:</h4>
-            {file_info_html}
-        </div>
-        """
-
-        return html
+        summary = BackupSummary.from_results(zip_results, bak_results,
+                                             modified_date=self._get_file_modified_date)
+        return render_template('backup_summary_email.html', summary=summary)
 
     def _get_file_modified_date(self, file_path):
         """Get file modified date"""
@@ -5057,177 +4909,6 @@ Backup Monitor System
         except Exception as e:
             return f"Error: {str(e)}"
 
-    def _generate_zip_analysis_summary(self, zip_results=None):
-        """Generate ZIP analysis summary table"""
-        if not zip_results:
-            return "<p>Tidak ada data analisis ZIP</p>"
-
-        zip_entries = [r for r in zip_results if str(r.get('zip_file', '')).lower().endswith('.zip')]
-        if not zip_entries:
-            return "<p>Tidak ada file ZIP yang valid untuk ditampilkan</p>"
-
-        html = """
-        <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; margin: 10px 0;">
-            <thead>
-                <tr style="background-color: #f2f2f2;">
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">No</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Nama File ZIP</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Ukuran (MB)</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Status Integrity</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Jumlah BAK</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Tanggal Modified</th>
-                </tr>
-            </thead>
-            <tbody>
-        """
-
-        for i, result in enumerate(zip_entries, 1):
-            zip_name = os.path.basename(result.get('zip_file', 'Unknown'))
-            file_size = result.get('file_size_mb', 0)
-            integrity = result.get('integrity_check', {}).get('is_valid', False)
-            bak_count = len(result.get('bak_analyses', []))
-            modified_date = self._get_file_modified_date(result.get('zip_file', ''))
-
-            status_color = 'green' if integrity else 'red'
-            status_text = 'Valid' if integrity else 'Invalid'
-
-            html += f"""
-                <tr>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{i}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{zip_name}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{file_size:.2f}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px; color: {status_color}; font-weight: bold;">{status_text}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{bak_count}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{modified_date}</td>
-                </tr>
-            """
-
-        html += """
-            </tbody>
-        </table>
-        """
-
-        return html
-
-    def _generate_bak_analysis_summary(self, bak_results=None):
-        """Generate BAK analysis summary table"""
-        if not bak_results:
-            return "<p>Tidak ada data analisis BAK</p>"
-
-        html = """
-        <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; margin: 10px 0;">
-            <thead>
-                <tr style="background-color: #f2f2f2;">
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">No</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Nama File BAK</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Tipe Database</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Nama Database</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Tanggal Backup</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Status</th>
-                    <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Jumlah Record</th>
-                </tr>
-            </thead>
-            <tbody>
-        """
-
-        for i, result in enumerate(bak_results, 1):
-            bak_name = result.get('file_name') or result.get('filename') or 'Unknown'
-            analysis = result.get('analysis') or {}
-            if not analysis:
-                db_info = result.get('database_info', {})
-                backup_date_val = db_info.get('backup_date') or result.get('backup_header', {}).get('backup_finish_date') or 'Unknown'
-                analysis = {
-                    'backup_type': db_info.get('backup_type', 'Unknown'),
-                    'database_name': db_info.get('database_name', 'Unknown'),
-                    'backup_date': backup_date_val,
-                    'database_info': db_info
-                }
-
-            db_type = analysis.get('backup_type', 'Unknown')
-            db_name = analysis.get('database_name', 'Unknown')
-            backup_date = analysis.get('backup_date', 'Unknown')
-            record_count = analysis.get('database_info', {}).get('record_count')
-            if record_count is None:
-                record_count = analysis.get('database_info', {}).get('estimated_rows', 'N/A')
-
-            if result.get('error') or result.get('analysis_status') == 'failed':
-                status_color = 'red'
-                status_text = 'Error'
-            elif backup_date == 'Unknown':
-                status_color = 'orange'
-                status_text = 'Warning'
-            else:
-                status_color = 'green'
-                status_text = 'Valid'
-
-            html += f"""
-                <tr>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{i}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{bak_name}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{db_type}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{db_name}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{backup_date}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px; color: {status_color}; font-weight: bold;">{status_text}</td>
-                    <td style="border: 1px solid #ddd; padding: 8px;">{record_count}</td>
-                </tr>
-            """
-
-        html += """
-            </tbody>
-        </table>
-        """
-
-        return html
-
-    def _generate_recommendations(self, zip_results=None, bak_results=None):
-        """Generate recommendations based on analysis results"""
-        recommendations = []
-
-        # ZIP recommendations
-        if zip_results:
-            invalid_zips = [r for r in zip_results if not r.get('integrity_check', {}).get('is_valid', False)]
-            if invalid_zips:
-                recommendations.append(f"🔍 Terdapat {len(invalid_zips)} file ZIP dengan integrity yang tidak valid. Disarankan untuk memeriksa ulang file backup tersebut.")
-
-        # BAK recommendations
-        if bak_results:
-            problematic_baks = [r for r in bak_results if 'error' in r.get('analysis', {})]
-            if problematic_baks:
-                recommendations.append(f"⚠️ Terdapat {len(problematic_baks)} file BAK yang mengalami error saat analisis. Disarankan untuk memeriksa struktur file backup.")
-
-            old_backups = [r for r in bak_results if self._is_old_backup(r.get('analysis', {}).get('backup_date', ''))]
-            if old_backups:
-                recommendations.append(f"📅 Terdapat {len(old_backups)} file backup yang sudah cukup lama. Disarankan untuk membuat backup baru.")
-
-        if not recommendations:
-            recommendations.append("✅ Semua file backup dalam kondisi baik dan layak digunakan.")
-
-        html = "<ul>"
-        for rec in recommendations:
-            html += f"<li>{rec}</li>"
-        html += "</ul>"
-
-        return html
-
-    def _is_old_backup(self, backup_date_str):
-        """Check if backup is older than 30 days"""
-        try:
-            if backup_date_str == 'Unknown':
-                return False
-
-            # Parse various date formats
-            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y']:
-                try:
-                    backup_date = datetime.strptime(backup_date_str, fmt)
-                    days_old = (datetime.now() - backup_date).days
-                    return days_old > 30
-                except ValueError:
-                    continue
-
-            return False
-        except:
-            return False
-
 def main():
     """Main function"""
     app = QApplication(sys.argv)
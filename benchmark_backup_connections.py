@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Backup Connection Benchmark
+Ukur query GWSCANNER DatabaseValidator._analyze_staging_database (COUNT,
+tanggal terbaru, record 7 hari + jumlah tabel pendukung) pada database
+staging yang dianalisis beberapa kali (beberapa validator, file yang sama):
+sqlite3.connect biasa dibandingkan koneksi read-only immutable dengan pragma
+analitik (src/backup_connection.py), tanpa dan dengan pool per file.
+
+Usage:
+    python benchmark_backup_connections.py                  # 500.000 baris, 5 putaran
+    python benchmark_backup_connections.py --rows 2000000 --rounds 10
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from analysis_cache import AnalysisCache
+from backup_connection import BackupConnectionPool, connect_backup
+from database_validator import DatabaseValidator
+from table_stats import TableStatistics
+
+DEFAULT_ROWS = 500000
+DEFAULT_ROUNDS = 5
+
+
+def create_staging_database(path: str, rows: int) -> str:
+    """Database staging dengan GWSCANNER (record kronologis) dan tabel pendukung"""
+    start = datetime.now() - timedelta(days=365)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, SCAN_DATE TEXT, CREATED_DATE TEXT, "
+                 "TIMESTAMP TEXT, SCANNER_ID INTEGER, PAYLOAD TEXT)")
+    conn.execute("CREATE TABLE GW_LOG (ID INTEGER PRIMARY KEY, LOG_DATE TEXT, MESSAGE TEXT)")
+    conn.execute("CREATE TABLE SCANNER_DATA (ID INTEGER PRIMARY KEY, PAYLOAD TEXT)")
+    step = 365 * 24 * 3600 / max(rows, 1)
+    conn.executemany(
+        "INSERT INTO GWSCANNER (SCAN_DATE, CREATED_DATE, TIMESTAMP, SCANNER_ID, PAYLOAD) VALUES (?, ?, ?, ?, ?)",
+        (((start + timedelta(seconds=i * step)).strftime('%Y-%m-%d %H:%M:%S'),
+          (start + timedelta(seconds=i * step)).strftime('%Y-%m-%d'), None, i % 50, 'x' * (20 + i % 60))
+         for i in range(rows))
+    )
+    conn.executemany("INSERT INTO GW_LOG (LOG_DATE, MESSAGE) VALUES (?, ?)",
+                     (('2025-10-04', 'ok') for _ in range(rows // 10)))
+    conn.executemany("INSERT INTO SCANNER_DATA (PAYLOAD) VALUES (?)", (('y' * 40,) for _ in range(rows // 10)))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _time_rounds(validator: DatabaseValidator, connect: Callable, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        conn = connect()
+        stats = TableStatistics(conn.cursor())
+        validator._analyze_staging_database(stats)
+        stats.close()
+        conn.close()
+    return time.perf_counter() - started
+
+
+def run_benchmark(rows: int = DEFAULT_ROWS, rounds: int = DEFAULT_ROUNDS) -> Dict:
+    """Wall time analisis staging: sqlite3.connect vs read-only immutable vs pool"""
+    with tempfile.TemporaryDirectory(prefix='backup_connection_benchmark_') as folder:
+        db_path = create_staging_database(os.path.join(folder, 'staging.bak'), rows)
+        validator = DatabaseValidator(cache=AnalysisCache(cache_path=os.path.join(folder, 'cache.db')))
+
+        plain_seconds = _time_rounds(validator, lambda: sqlite3.connect(db_path), rounds)
+        read_only_seconds = _time_rounds(validator, lambda: connect_backup(db_path), rounds)
+        pool = BackupConnectionPool()
+        pooled_seconds = _time_rounds(validator, lambda: pool.connect(db_path), rounds)
+        opened = pool.opened
+        pool.close_all()
+
+        # Tidak ada file journal/-shm yang dibuat di samping backup
+        side_files = sorted(name for name in os.listdir(folder) if name.startswith('staging.bak-'))
+
+    return {
+        'rows': rows,
+        'rounds': rounds,
+        'plain_seconds': plain_seconds,
+        'read_only_seconds': read_only_seconds,
+        'pooled_seconds': pooled_seconds,
+        'pool_connections_opened': opened,
+        'side_files': side_files
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark koneksi backup (query GWSCANNER staging)')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='Jumlah baris GWSCANNER')
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help='Analisis berulang pada file yang sama')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.rows, args.rounds)
+    print(f"GWSCANNER:                 {result['rows']:,} rows x {result['rounds']} rounds")
+    print(f"sqlite3.connect:           {result['plain_seconds']:.2f} s")
+    print(f"read-only immutable:       {result['read_only_seconds']:.2f} s")
+    print(f"read-only + pool:          {result['pooled_seconds']:.2f} s "
+          f"({result['pool_connections_opened']} connection opened)")
+    print(f"Side files next to backup: {', '.join(result['side_files']) or 'none'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Email Template Benchmark
+Ukur waktu render email digest auto analysis (EnhancedEmailNotifier) dari
+template terkompilasi: render pertama (termasuk kompilasi template) dan
+rata-rata render berikutnya dari cache, untuk sejumlah hasil analisis sintetis.
+
+Usage:
+    python benchmark_email_templates.py                    # digest 200 arsip, 50 render
+    python benchmark_email_templates.py --archives 500 --iterations 20
+"""
+
+import sys
+import time
+import argparse
+from typing import Any, Dict, List
+
+from src.enhanced_email_notifier import EnhancedEmailNotifier
+from src.html_templates import get_default_loader
+
+DEFAULT_ARCHIVES = 200
+DEFAULT_ITERATIONS = 50
+
+
+def synthetic_results(count: int) -> List[Dict[str, Any]]:
+    """Hasil analisis sintetis dengan bentuk yang sama seperti EnhancedZipAnalyzer"""
+    results = []
+    for index in range(count):
+        corrupted = index % 17 == 0
+        results.append({
+            'analysis_status': 'failed' if index % 29 == 0 else 'completed',
+            'analysis_time': '2025-10-04 08:00:00',
+            'zip_info': {
+                'filename': f"BackupStaging_{20250101 + index}.zip",
+                'file_size_mb': 2300.0 + index,
+                'backup_date_from_filename': '2025-10-04',
+                'database_type_from_filename': 'Staging',
+                'total_files': 3,
+                'compression_ratio': 61.5
+            },
+            'validation': {
+                'is_valid_zip': not corrupted,
+                'can_be_extracted': not corrupted,
+                'file_integrity': 'Corrupted' if corrupted else 'Good',
+                'corruption_detected': corrupted,
+                'warnings': ['CRC mismatch'] if corrupted else []
+            },
+            'bak_analysis': {
+                'total_bak_files': 2,
+                'summary': {'total_size_mb': 4200.0, 'valid_bak_files': 2, 'corrupted_bak_files': 0,
+                            'databases_found': ['staging_PTRJ_iFES_Plantware', 'db_ptrj']},
+                'bak_analyses': []
+            },
+            'recommendations': ['Backup terbaru valid', 'Jadwalkan verifikasi restore', 'Periksa ukuran minimum',
+                                'Arsip lama bisa dihapus']
+        })
+    return results
+
+
+def run_benchmark(archives: int = DEFAULT_ARCHIVES, iterations: int = DEFAULT_ITERATIONS) -> Dict:
+    """Waktu render pertama (cold) dan rata-rata render dari cache (warm), dalam ms"""
+    notifier = EnhancedEmailNotifier()
+    results = synthetic_results(archives)
+    get_default_loader().clear()
+
+    started = time.perf_counter()
+    html = notifier._generate_multi_file_html_report(results)
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        notifier._generate_multi_file_html_report(results)
+    warm_ms = (time.perf_counter() - started) * 1000 / iterations
+
+    return {
+        'archives': archives,
+        'iterations': iterations,
+        'cold_ms': cold_ms,
+        'warm_ms': warm_ms,
+        'html_bytes': len(html.encode('utf-8')),
+        'compile_count': get_default_loader().compile_count
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark render email digest dari template terkompilasi')
+    parser.add_argument('--archives', type=int, default=DEFAULT_ARCHIVES)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    result = run_benchmark(args.archives, args.iterations)
+    print(f"Archives:   {result['archives']} ({result['html_bytes'] / 1024:.0f} KB HTML)")
+    print(f"Cold:       {result['cold_ms']:.2f} ms (termasuk kompilasi template)")
+    print(f"Warm:       {result['warm_ms']:.2f} ms rata-rata dari {result['iterations']} render")
+    print(f"Kompilasi:  {result['compile_count']}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
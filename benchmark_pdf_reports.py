@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+PDF Report Benchmark
+Bandingkan wall time PDFReportGenerator serial (satu proses) dengan mode
+paralel (analisis arsip di process pool) untuk sejumlah arsip sintetis
+dari create_test_zip.py.
+
+Usage:
+    python benchmark_pdf_reports.py                       # 50 arsip, workers = jumlah CPU
+    python benchmark_pdf_reports.py --archives 100 --workers 4 --payload-kb 2048
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import Dict, List
+
+from create_test_zip import create_test_zip
+
+DEFAULT_ARCHIVES = 50
+DEFAULT_PAYLOAD_KB = 1024
+
+
+def create_archives(folder: str, count: int, payload_kb: int, prefix: str) -> List[str]:
+    """
+    Buat arsip sintetis dengan isi unik per arsip, supaya cache analisis
+    (per path/ukuran/mtime dan per isi BAK) tidak menguntungkan salah satu mode
+    """
+    paths = []
+    for index in range(count):
+        zip_path = os.path.join(folder, f"{prefix}_{index:03d}.zip")
+        create_test_zip(zip_path, payload_kb=payload_kb, seed=f"{prefix}-{index}", verbose=False)
+        paths.append(zip_path)
+    return paths
+
+
+def time_report(zip_files: List[str], output_path: str, workers: int) -> float:
+    from src.pdf_report_generator import PDFReportGenerator
+
+    started = time.perf_counter()
+    if not PDFReportGenerator().generate_report(zip_files, output_path, workers=workers):
+        raise RuntimeError(f"Generate report gagal (workers={workers})")
+    return time.perf_counter() - started
+
+
+def run_benchmark(archives: int = DEFAULT_ARCHIVES, workers: int = 0,
+                  payload_kb: int = DEFAULT_PAYLOAD_KB) -> Dict:
+    """Wall time serial vs paralel untuk arsip sintetis di folder sementara"""
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix='pdf_benchmark_') as folder:
+        serial_files = create_archives(folder, archives, payload_kb, 'serial')
+        parallel_files = create_archives(folder, archives, payload_kb, 'parallel')
+
+        serial_seconds = time_report(serial_files, os.path.join(folder, 'serial.pdf'), 1)
+        parallel_seconds = time_report(parallel_files, os.path.join(folder, 'parallel.pdf'), workers)
+        sizes = (os.path.getsize(os.path.join(folder, 'serial.pdf')),
+                 os.path.getsize(os.path.join(folder, 'parallel.pdf')))
+
+    return {
+        'archives': archives,
+        'workers': workers,
+        'payload_kb': payload_kb,
+        'serial_seconds': serial_seconds,
+        'parallel_seconds': parallel_seconds,
+        'speedup': serial_seconds / parallel_seconds if parallel_seconds else 0.0,
+        'pdf_bytes': sizes
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark PDF report serial vs paralel')
+    parser.add_argument('--archives', type=int, default=DEFAULT_ARCHIVES)
+    parser.add_argument('--workers', type=int, default=0, help='Jumlah proses (default: jumlah CPU)')
+    parser.add_argument('--payload-kb', type=int, default=DEFAULT_PAYLOAD_KB,
+                        help='Data acak tambahan per file BAK (KB)')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.archives, args.workers, args.payload_kb)
+    print(f"Archives: {result['archives']} (BAK payload {result['payload_kb']} KB)")
+    print(f"Serial:   {result['serial_seconds']:.2f} s")
+    print(f"Parallel: {result['parallel_seconds']:.2f} s ({result['workers']} workers)")
+    print(f"Speedup:  {result['speedup']:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
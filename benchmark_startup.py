@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Ukur waktu import modul aplikasi di proses Python baru dan pastikan
+subsystem berat tidak ikut ter-load saat startup.
+
+Usage:
+    python benchmark_startup.py                         # backup_monitor_qt, budget 1 detik
+    python benchmark_startup.py --module monitor_daemon --budget 0.5
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODULE = 'backup_monitor_qt'
+DEFAULT_BUDGET = 1.0  # detik
+DEFAULT_RUNS = 3
+
+# Modul yang hanya boleh di-load saat fitur terkait dipakai
+HEAVY_MODULES = ('reportlab', 'pandas', 'numpy', 'smtplib', 'src.pdf_report_generator',
+                 'src.bak_metadata_analyzer', 'src.zip_metadata_viewer', 'src.email_notifier')
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+_PROBE = (
+    "import sys, time, json; sys.path.insert(0, {root!r}); sys.path.append({src!r});"
+    "started = time.perf_counter(); import {module};"
+    "elapsed = time.perf_counter() - started;"
+    "print('BENCHMARK' + json.dumps({{'seconds': elapsed, 'modules': sorted(sys.modules)}}))"
+)
+
+
+def measure_import(module: str, importtime: bool = False) -> Tuple[float, List[str], List[Tuple[int, str]]]:
+    """
+    Import module di interpreter baru
+
+    Returns:
+        (detik, daftar sys.modules setelah import, [(cumulative_us, nama)] jika importtime)
+    """
+    code = _PROBE.format(root=ROOT, src=os.path.join(ROOT, 'src'), module=module)
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    proc = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, timeout=120)
+    marker = proc.stdout.rfind('BENCHMARK')
+    if proc.returncode != 0 or marker < 0:
+        raise RuntimeError(f"Import {module} gagal:\n{proc.stderr.strip()[-2000:]}")
+    payload = json.loads(proc.stdout[marker + len('BENCHMARK'):].strip().splitlines()[0])
+
+    top_level = []
+    if importtime:
+        for line in proc.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match and len(match.group(3)) <= 1:
+                top_level.append((int(match.group(2)), match.group(4)))
+        top_level.sort(reverse=True)
+    return payload['seconds'], payload['modules'], top_level
+
+
+def heavy_modules_loaded(modules: List[str]) -> List[str]:
+    loaded = set(modules)
+    return [name for name in HEAVY_MODULES if name in loaded]
+
+
+def run_benchmark(module: str = DEFAULT_MODULE, runs: int = DEFAULT_RUNS) -> Dict:
+    """Median waktu import dari beberapa run + modul berat yang ikut ter-load"""
+    timings, modules = [], []
+    for _ in range(runs):
+        seconds, modules, _ = measure_import(module)
+        timings.append(seconds)
+    _, _, slowest = measure_import(module, importtime=True)
+    return {
+        'module': module,
+        'runs': runs,
+        'median_seconds': statistics.median(timings),
+        'max_seconds': max(timings),
+        'heavy_modules': heavy_modules_loaded(modules),
+        'slowest_imports': [{'module': name, 'cumulative_ms': us / 1000} for us, name in slowest[:10]]
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark waktu startup (import) aplikasi')
+    parser.add_argument('--module', default=DEFAULT_MODULE)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help='Batas waktu import (detik)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    result = run_benchmark(args.module, args.runs)
+    print(f"Module:  {result['module']}")
+    print(f"Median:  {result['median_seconds'] * 1000:.1f} ms (max {result['max_seconds'] * 1000:.1f} ms, "
+          f"budget {args.budget * 1000:.0f} ms)")
+    print("Slowest top-level imports:")
+    for entry in result['slowest_imports']:
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+    failed = False
+    if result['heavy_modules']:
+        print(f"FAIL: heavy modules loaded at startup: {', '.join(result['heavy_modules'])}")
+        failed = True
+    if result['median_seconds'] > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+ZIP Metadata Benchmark
+Ukur waktu listing metadata banyak arsip besar seperti dialog "Show All ZIP
+Metadata": pembaca central directory (src/zip_central_directory.py)
+dibandingkan dengan zipfile.ZipFile + infolist(). Arsip dibuat sparse
+(prefix kosong beberapa GB di depan ZIP kecil), jadi ukurannya multi-GB
+tanpa memakan disk.
+
+Usage:
+    python benchmark_zip_metadata.py                       # 300 arsip @ 4 GB
+    python benchmark_zip_metadata.py --archives 500 --size-gb 8 --members 20
+"""
+
+import io
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+from typing import Dict, List
+
+from src.zip_central_directory import read_central_directory
+
+DEFAULT_ARCHIVES = 300
+DEFAULT_SIZE_GB = 4
+DEFAULT_MEMBERS = 5
+
+
+def create_sparse_archives(folder: str, count: int, size_gb: int, members: int) -> List[str]:
+    """Arsip ZIP valid berukuran size_gb dengan data sparse di depan central directory"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for index in range(members):
+            zf.writestr(f"db/BackupStaging_{index:02d}.bak", b'TAPE' + b'\0' * 4096)
+    payload = buffer.getvalue()
+
+    paths = []
+    for index in range(count):
+        path = os.path.join(folder, f"BackupStaging_{index:03d}.zip")
+        with open(path, 'wb') as f:
+            f.seek(size_gb * 1024 ** 3)
+            f.write(payload)
+        paths.append(path)
+    return paths
+
+
+def time_listing(paths: List[str], reader) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        reader(path)
+    return time.perf_counter() - started
+
+
+def _list_with_zipfile(path: str):
+    with zipfile.ZipFile(path) as zf:
+        return zf.infolist()
+
+
+def run_benchmark(archives: int = DEFAULT_ARCHIVES, size_gb: int = DEFAULT_SIZE_GB,
+                  members: int = DEFAULT_MEMBERS) -> Dict:
+    """Wall time listing metadata semua arsip: central directory reader vs zipfile"""
+    with tempfile.TemporaryDirectory(prefix='zip_metadata_benchmark_') as folder:
+        paths = create_sparse_archives(folder, archives, size_gb, members)
+        central_directory_seconds = time_listing(paths, read_central_directory)
+        zipfile_seconds = time_listing(paths, _list_with_zipfile)
+
+    return {
+        'archives': archives,
+        'size_gb': size_gb,
+        'members': members,
+        'central_directory_seconds': central_directory_seconds,
+        'zipfile_seconds': zipfile_seconds
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark listing metadata ZIP dari central directory')
+    parser.add_argument('--archives', type=int, default=DEFAULT_ARCHIVES)
+    parser.add_argument('--size-gb', type=int, default=DEFAULT_SIZE_GB, help='Ukuran (sparse) per arsip')
+    parser.add_argument('--members', type=int, default=DEFAULT_MEMBERS, help='Jumlah member per arsip')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.archives, args.size_gb, args.members)
+    print(f"Archives:          {result['archives']} x {result['size_gb']} GB ({result['members']} member)")
+    print(f"Central directory: {result['central_directory_seconds'] * 1000:.1f} ms")
+    print(f"zipfile.ZipFile:   {result['zipfile_seconds'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
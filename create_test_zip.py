@@ -5,12 +5,20 @@ Create a test ZIP file for testing the PDF report system
 
 import zipfile
 import os
+import random
 import tempfile
 from datetime import datetime
 
-def create_test_zip():
-    """Create a test ZIP file with sample content"""
-    zip_filename = "TestBackup.zip"
+def create_test_zip(zip_filename="TestBackup.zip", payload_kb=0, seed=None, verbose=True):
+    """
+    Create a test ZIP file with sample content
+
+    Args:
+        zip_filename: Path ZIP yang dibuat
+        payload_kb: Tambahan data acak (KB) di file BAK, untuk benchmark dengan ZIP I/O nyata
+        seed: Seed data acak (arsip dengan seed berbeda punya isi berbeda)
+        verbose: Cetak isi ZIP
+    """
     
     # Create temporary files to add to ZIP
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -30,6 +38,9 @@ def create_test_zip():
             # Write a simple header that looks like a BAK file
             f.write(b"TAPE\x00\x00\x00\x00")  # Simple BAK header simulation
             f.write(b"Sample database backup content for testing purposes.\n" * 100)
+            if payload_kb:
+                rng = random.Random(seed)
+                f.write(rng.getrandbits(payload_kb * 8192).to_bytes(payload_kb * 1024, 'little'))
         files_to_add.append(("database_backup.bak", bak_file))
         
         # Create another sample file
@@ -45,9 +56,12 @@ def create_test_zip():
         with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zf:
             for arc_name, file_path in files_to_add:
                 zf.write(file_path, arc_name)
-                print(f"Added {arc_name} to ZIP")
+                if verbose:
+                    print(f"Added {arc_name} to ZIP")
     
     # Verify the ZIP file
+    if os.path.exists(zip_filename) and not verbose:
+        return zip_filename
     if os.path.exists(zip_filename):
         size = os.path.getsize(zip_filename)
         print(f"\nTest ZIP file created successfully!")
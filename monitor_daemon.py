@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Headless Backup Monitor
+Entry point CLI untuk monitoring backup di server tanpa GUI
+(scan, analyze, report, serve)
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from monitoring_daemon import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache Module
+Cache hasil analisis backup yang di-address berdasarkan isi file
+(CRC32 + ukuran + versi analyzer). Entry disimpan di memori (LRU) dan di
+store SQLite, sehingga aksi Analyze / Send Report / Generate PDF memakai
+ulang satu hasil analisis tanpa mengulang proses yang memakan waktu menit.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import threading
+import configparser
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_CACHE_FILE = 'config/analysis_cache.db'
+DEFAULT_MEMORY_ENTRIES = 256
+CRC_CHUNK_SIZE = 1024 * 1024
+BUSY_TIMEOUT = 30.0  # detik menunggu lock tulis dari worker validasi lain
+
+
+def member_fingerprint(zip_ref, member: str) -> Tuple[int, int]:
+    """(CRC32, ukuran) member ZIP, diambil dari central directory tanpa membaca data"""
+    info = zip_ref.getinfo(member)
+    return info.CRC, info.file_size
+
+
+class AnalysisCache:
+    """
+    Cache hasil analisis per (analyzer, versi, CRC32, ukuran, parameter).
+    Hasil disimpan sebagai JSON agar hit dari memori maupun disk mengembalikan
+    tipe data yang sama, dan setiap get() mengembalikan salinan baru.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 enabled: bool = True):
+        if not cache_path:
+            cache_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), DEFAULT_CACHE_FILE)
+        self.cache_path = cache_path
+        self.memory_entries = memory_entries
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self._file_crcs = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka store (lazy) dan buat schema jika belum ada"""
+        if self._conn is None:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    cache_key TEXT PRIMARY KEY,
+                    analyzer TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    crc INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at TEXT
+                )
+            """)
+            # CRC file loose (.bak di disk) per (path, size, mtime, inode), lintas proses
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS file_crcs (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    crc INTEGER NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(analyzer: str, version: str, crc: int, size: int, params: str = '') -> str:
+        return f"{analyzer}:{version}:{crc & 0xFFFFFFFF:08x}:{size}:{params}"
+
+    def file_fingerprint(self, file_path: str) -> Tuple[int, int]:
+        """
+        (CRC32, ukuran) file di disk. CRC dihitung streaming sekali lalu
+        diingat (di memori dan di store) selama path, ukuran, mtime dan inode
+        tidak berubah, sehingga proses berikutnya tidak membaca ulang file.
+        """
+        stat_result = os.stat(file_path)
+        path = os.path.abspath(file_path)
+        identity = (path, stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+        with self._lock:
+            crc = self._file_crcs.get(identity)
+            if crc is None and self.enabled:
+                try:
+                    row = self._connect().execute(
+                        "SELECT crc FROM file_crcs WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                        identity
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row:
+                    crc = self._file_crcs[identity] = row[0]
+        if crc is None:
+            crc = 0
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CRC_CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+            with self._lock:
+                self._file_crcs[identity] = crc
+                if self.enabled:
+                    try:
+                        conn = self._connect()
+                        conn.execute("INSERT OR REPLACE INTO file_crcs (path, size, mtime_ns, inode, crc) "
+                                     "VALUES (?, ?, ?, ?, ?)", identity + (crc,))
+                        conn.commit()
+                    except sqlite3.Error as e:
+                        print(f"Warning: Could not persist file CRC: {e}")
+        return crc, stat_result.st_size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Ambil hasil dari memori, lalu dari disk. Returns: salinan hasil atau None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+            else:
+                try:
+                    row = self._connect().execute(
+                        "SELECT result FROM results WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row:
+                    payload = row[0]
+                    self._remember(key, payload)
+
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(payload)
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Simpan hasil analisis ke memori dan disk"""
+        if not self.enabled:
+            return
+
+        payload = json.dumps(result, default=str)
+        analyzer, version, crc, size = key.split(':', 4)[:4]
+        with self._lock:
+            self._remember(key, payload)
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (cache_key, analyzer, version, crc, size, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, analyzer, version, int(crc, 16), int(size), payload,
+                     datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not persist analysis cache entry: {e}")
+
+    def _remember(self, key: str, payload: str):
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_or_compute(self, analyzer: str, version: str, fingerprint: Tuple[int, int],
+                       compute: Callable[[], Dict[str, Any]], params: str = '') -> Dict[str, Any]:
+        """
+        Kembalikan hasil cache, atau jalankan compute() dan simpan hasilnya.
+        Hasil gagal (analysis_status 'failed', 'error', atau 'errors' tidak kosong)
+        tidak di-cache.
+        """
+        key = self.make_key(analyzer, version, fingerprint[0], fingerprint[1], params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        result = compute()
+        if (isinstance(result, dict) and result.get('analysis_status') != 'failed'
+                and not result.get('error') and not result.get('errors')):
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        """Kosongkan cache memori dan disk"""
+        with self._lock:
+            self._memory.clear()
+            self._file_crcs.clear()
+            try:
+                self._connect().execute("DELETE FROM results")
+                self._conn.execute("DELETE FROM file_crcs")
+                self._conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def close(self):
+        """Tutup koneksi store"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> AnalysisCache:
+    """Instance AnalysisCache bersama (konfigurasi dari [ANALYSIS_CACHE] di config.ini)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            enabled, memory_entries, cache_path = True, DEFAULT_MEMORY_ENTRIES, None
+            config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+            try:
+                config = configparser.ConfigParser()
+                config.read(config_path)
+                if config.has_section('ANALYSIS_CACHE'):
+                    enabled = config.getboolean('ANALYSIS_CACHE', 'enabled', fallback=True)
+                    memory_entries = config.getint('ANALYSIS_CACHE', 'memory_entries',
+                                                   fallback=DEFAULT_MEMORY_ENTRIES)
+                    cache_path = config.get('ANALYSIS_CACHE', 'cache_file', fallback='') or None
+                    if cache_path and not os.path.isabs(cache_path):
+                        cache_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), cache_path)
+            except Exception as e:
+                print(f"Warning: Could not read analysis cache config: {e}")
+            _default_cache = AnalysisCache(cache_path, memory_entries, enabled)
+        return _default_cache
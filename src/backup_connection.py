@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Backup Connection Module
+Koneksi SQLite read-only untuk analisis file backup (.bak/.db hasil ekstraksi).
+
+File dibuka lewat URI file:...?mode=ro&immutable=1: tanpa lock, tanpa
+journal/-shm di samping file backup, dan SQLite tidak perlu mengecek
+perubahan file di setiap transaksi. Pragma diatur untuk scan analitik
+(mmap_size, cache_size besar, temp_store di memori), dan koneksi dipakai
+ulang per file lintas validator lewat pool (selama size/mtime file sama).
+
+File dengan -wal yang belum di-checkpoint dibuka tanpa immutable (mode=ro
+saja) supaya isi WAL tetap terbaca.
+"""
+
+import os
+import sqlite3
+import threading
+import configparser
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.request import pathname2url
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024    # byte
+DEFAULT_CACHE_SIZE = 64 * 1024           # KiB (PRAGMA cache_size negatif)
+DEFAULT_TEMP_STORE = 'memory'
+DEFAULT_POOL_SIZE = 8                    # koneksi idle yang disimpan
+
+TEMP_STORE_MODES = ('default', 'file', 'memory')
+
+
+def backup_uri(db_path: str, immutable: bool = True) -> str:
+    """URI read-only untuk file database (immutable: file dijamin tidak berubah)"""
+    uri = 'file:' + pathname2url(os.path.abspath(db_path)) + '?mode=ro'
+    return uri + '&immutable=1' if immutable else uri
+
+
+def _has_pending_wal(db_path: str) -> bool:
+    wal_path = db_path + '-wal'
+    return os.path.exists(wal_path) and os.path.getsize(wal_path) > 0
+
+
+def connect_backup(db_path: str, mmap_size: int = DEFAULT_MMAP_SIZE, cache_size: int = DEFAULT_CACHE_SIZE,
+                   temp_store: str = DEFAULT_TEMP_STORE, immutable: bool = True) -> sqlite3.Connection:
+    """
+    Buka file backup read-only dengan pragma untuk scan analitik.
+
+    Args:
+        mmap_size: byte file yang di-memory-map (0 = tanpa mmap)
+        cache_size: page cache dalam KiB
+        temp_store: default / file / memory (sort dan index sementara)
+        immutable: buka dengan immutable=1 (diabaikan jika ada -wal yang berisi)
+
+    Raises:
+        sqlite3.Error: file tidak ada / bukan database
+    """
+    if not os.path.isfile(db_path):
+        # mode=ro tidak membuat file baru; pesan sama seperti sqlite3.connect yang gagal
+        raise sqlite3.OperationalError(f"unable to open database file: {db_path}")
+    if temp_store not in TEMP_STORE_MODES:
+        raise ValueError(f"Unknown temp_store: {temp_store}")
+    immutable = immutable and not _has_pending_wal(db_path)
+    conn = sqlite3.connect(backup_uri(db_path, immutable), uri=True, check_same_thread=False)
+    try:
+        conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-abs(int(cache_size))}")
+        conn.execute(f"PRAGMA temp_store = {temp_store.upper()}")
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+class PooledConnection:
+    """
+    Koneksi pinjaman dari BackupConnectionPool. close() mengembalikan koneksi
+    ke pool; atribut lain diteruskan ke sqlite3.Connection.
+    """
+
+    def __init__(self, pool: 'BackupConnectionPool', key: Tuple, conn: sqlite3.Connection):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return self._conn
+
+    def cursor(self) -> sqlite3.Cursor:
+        return self.connection.cursor()
+
+    def execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        return self.connection.execute(sql, parameters)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool._release(self._key, self._conn)
+            self._conn = None
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class BackupConnectionPool:
+    """
+    Pool koneksi read-only per file backup. Koneksi yang dikembalikan
+    disimpan (maksimal pool_size, LRU) dan dipinjamkan lagi untuk file yang
+    sama selama path, size dan mtime file tidak berubah. Satu koneksi hanya
+    dipinjam satu pemakai pada satu waktu.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, **connect_options):
+        self.pool_size = max(0, pool_size)
+        self.connect_options = connect_options
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()   # key -> [sqlite3.Connection]
+        self.opened = 0
+        self.reused = 0
+
+    @staticmethod
+    def _key(db_path: str) -> Tuple:
+        stat_result = os.stat(db_path)
+        return os.path.abspath(db_path), stat_result.st_size, stat_result.st_mtime_ns
+
+    def connect(self, db_path: str) -> PooledConnection:
+        """Pinjam koneksi untuk file; close() mengembalikannya ke pool"""
+        try:
+            key = self._key(db_path)
+        except OSError:
+            raise sqlite3.OperationalError(f"unable to open database file: {db_path}")
+
+        stale = []
+        conn = None
+        with self._lock:
+            # File berubah (backup ditimpa): koneksi lama tidak berlaku lagi
+            for idle_key in [k for k in self._idle if k[0] == key[0] and k != key]:
+                stale.extend(self._idle.pop(idle_key))
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                if not idle:
+                    del self._idle[key]
+                self.reused += 1
+        for old in stale:
+            old.close()
+
+        if conn is None:
+            conn = connect_backup(db_path, **self.connect_options)
+            with self._lock:
+                self.opened += 1
+        return PooledConnection(self, key, conn)
+
+    @contextmanager
+    def connection(self, db_path: str) -> Iterator[PooledConnection]:
+        conn = self.connect(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _release(self, key: Tuple, conn: sqlite3.Connection):
+        evicted = []
+        with self._lock:
+            # File sementara yang sudah dihapus tidak perlu disimpan
+            if self.pool_size and os.path.exists(key[0]):
+                self._idle.setdefault(key, []).append(conn)
+                self._idle.move_to_end(key)
+                while sum(len(conns) for conns in self._idle.values()) > self.pool_size:
+                    oldest_key = next(iter(self._idle))
+                    conns = self._idle[oldest_key]
+                    evicted.append(conns.pop(0))
+                    if not conns:
+                        del self._idle[oldest_key]
+            else:
+                evicted.append(conn)
+        for old in evicted:
+            old.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(conns) for conns in self._idle.values())
+
+    def close_file(self, db_path: str):
+        """Tutup koneksi idle untuk file (mis. sebelum file sementara dihapus)"""
+        path = os.path.abspath(db_path)
+        with self._lock:
+            closing = [conn for key in [k for k in self._idle if k[0] == path] for conn in self._idle.pop(key)]
+        for conn in closing:
+            conn.close()
+
+    def close_all(self):
+        with self._lock:
+            closing = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in closing:
+            conn.close()
+
+
+def load_backup_connection_config(config_path: Optional[str] = None) -> Dict:
+    """Opsi BackupConnectionPool dari section [BACKUP_CONNECTIONS] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    options = {}
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('BACKUP_CONNECTIONS'):
+            section = config['BACKUP_CONNECTIONS']
+            options['mmap_size'] = section.getint('mmap_size_mb', fallback=DEFAULT_MMAP_SIZE // (1024 * 1024)) \
+                * 1024 * 1024
+            options['cache_size'] = section.getint('cache_size_mb', fallback=DEFAULT_CACHE_SIZE // 1024) * 1024
+            temp_store = section.get('temp_store', DEFAULT_TEMP_STORE).strip().lower()
+            if temp_store in TEMP_STORE_MODES:
+                options['temp_store'] = temp_store
+            else:
+                print(f"Warning: Unknown temp_store '{temp_store}', using {DEFAULT_TEMP_STORE}")
+            options['immutable'] = section.getboolean('immutable', fallback=True)
+            options['pool_size'] = section.getint('pool_size', fallback=DEFAULT_POOL_SIZE)
+    except Exception as e:
+        print(f"Warning: Could not read backup connection config: {e}")
+        options = {}
+    return options
+
+
+_default_pool: Optional[BackupConnectionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> BackupConnectionPool:
+    """BackupConnectionPool bersama dengan opsi dari [BACKUP_CONNECTIONS]"""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = BackupConnectionPool(**load_backup_connection_config())
+    return _default_pool
+
+
+def open_backup(db_path: str) -> PooledConnection:
+    """Koneksi read-only (pool bersama) untuk file backup; close() mengembalikannya ke pool"""
+    return get_default_pool().connect(db_path)
@@ -1,11 +1,12 @@
 import os
 import zipfile
-import sqlite3
 import tempfile
 import shutil
 from datetime import datetime, timedelta
 import configparser
 
+from backup_connection import connect_backup
+
 class BackupMonitor:
     def __init__(self, config_file='config/config.ini'):
         self.config = configparser.ConfigParser()
@@ -63,7 +64,7 @@ class BackupMonitor:
         """
         try:
             # Try to connect to the database
-            conn = sqlite3.connect(bak_file_path)
+            conn = connect_backup(bak_file_path)
             cursor = conn.cursor()
 
             # Get table list
@@ -12,14 +12,23 @@ import shutil
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import struct
-import pandas as pd
 from pathlib import Path
 
+from zip_sqlite import DEFAULT_MEMORY_LIMIT, open_member_database, read_member_header
+from table_stats import TableStatistics, load_row_count_config
+from schema_registry import SchemaRegistry, get_default_registry
+from backup_connection import open_backup
+
 class BAKFileReader:
-    def __init__(self):
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, registry: Optional[SchemaRegistry] = None):
         self.supported_formats = ['sqlite', 'tape', 'mysql', 'postgres']
         self.temp_extract_path = None
         self.current_connection = None
+        # File .bak dalam ZIP sampai batas ini dibaca ke memory tanpa ekstraksi
+        self.memory_limit = memory_limit
+        # Mode jumlah baris ([ROW_COUNTS]): exact, atau perkiraan untuk tabel non-kunci
+        self.row_count_options = load_row_count_config()
+        self.registry = registry if registry is not None else get_default_registry()
 
     def __del__(self):
         """Cleanup temp files"""
@@ -108,6 +117,15 @@ class BAKFileReader:
                 result['zip_info']['bak_file'] = bak_file
                 result['zip_info']['total_files'] = len(zip_ref.namelist())
 
+                # Baca langsung dari ZIP ke memory jika ukurannya masih dalam batas
+                if zip_ref.getinfo(bak_file).file_size <= self.memory_limit:
+                    bak_result = self._read_bak_member(zip_ref, bak_file)
+                    result.update(bak_result)
+                    result['success'] = bak_result['success']
+                    result['extracted_path'] = None
+                    result['zip_info']['extracted_to'] = None
+                    return result
+
                 # Tentukan path ekstraksi
                 if extract_to_same_folder:
                     extract_dir = os.path.dirname(zip_path)
@@ -144,6 +162,29 @@ class BAKFileReader:
 
         return result
 
+    def _read_bak_member(self, zip_ref: zipfile.ZipFile, bak_file: str) -> Dict:
+        """Membaca file .bak di dalam ZIP tanpa ekstraksi ke disk"""
+        source_path = os.path.join(zip_ref.filename, bak_file)
+        header = read_member_header(zip_ref, bak_file, 64)
+
+        if header.startswith(b'TAPE'):
+            return self._read_tape_bak(source_path, header=header,
+                                       file_size=zip_ref.getinfo(bak_file).file_size)
+
+        try:
+            conn = open_member_database(zip_ref, bak_file, memory_limit=self.memory_limit)
+        except sqlite3.Error:
+            return {
+                'success': False,
+                'file_type': 'unknown',
+                'database_info': {},
+                'tables': {},
+                'extracted_path': None,
+                'errors': ["Unknown or unsupported database format"],
+                'warnings': []
+            }
+        return self._read_sqlite_bak(source_path, conn=conn)
+
     def _read_bak_direct(self, bak_path: str) -> Dict:
         """Membaca file .bak langsung"""
         result = {
@@ -178,8 +219,8 @@ class BAKFileReader:
             result['errors'].append(f"Error reading BAK file: {str(e)}")
             return result
 
-    def _read_sqlite_bak(self, bak_path: str) -> Dict:
-        """Membaca file .bak format SQLite"""
+    def _read_sqlite_bak(self, bak_path: str, conn: Optional[sqlite3.Connection] = None) -> Dict:
+        """Membaca file .bak format SQLite (conn: koneksi yang sudah dibuka, mis. dari ZIP)"""
         result = {
             'success': False,
             'file_type': 'sqlite',
@@ -192,25 +233,28 @@ class BAKFileReader:
 
         try:
             # Connect to database
-            conn = sqlite3.connect(bak_path)
+            if conn is None:
+                conn = open_backup(bak_path)
             self.current_connection = conn
             cursor = conn.cursor()
+            # Schema (kolom + index) dibaca sekali untuk semua tabel
+            stats = TableStatistics(cursor, **self.row_count_options)
 
-            # Get database info
-            cursor.execute("PRAGMA database_list")
-            db_info = cursor.fetchall()
-            result['database_info']['databases'] = db_info
+            # Get database info (tidak tersedia di page reader untuk database besar dalam ZIP)
+            if stats.page_reader is None:
+                cursor.execute("PRAGMA database_list")
+                db_info = cursor.fetchall()
+                result['database_info']['databases'] = db_info
 
             # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = [row[0] for row in cursor.fetchall()]
+            tables = sorted(stats.tables())
             result['database_info']['tables'] = tables
             result['database_info']['table_count'] = len(tables)
 
             # Analyze each table
             for table in tables:
                 try:
-                    table_info = self._analyze_sqlite_table(cursor, table)
+                    table_info = self._analyze_sqlite_table(stats, table)
                     result['tables'][table] = table_info
                 except Exception as e:
                     result['warnings'].append(f"Could not analyze table {table}: {e}")
@@ -229,6 +273,7 @@ class BAKFileReader:
             db_type = self._detect_sqlite_database_type(tables)
             result['database_info']['detected_type'] = db_type
 
+            stats.close()
             result['success'] = True
 
         except sqlite3.Error as e:
@@ -238,8 +283,8 @@ class BAKFileReader:
 
         return result
 
-    def _analyze_sqlite_table(self, cursor, table_name: str) -> Dict:
-        """Analisis detail tabel SQLite"""
+    def _analyze_sqlite_table(self, stats: TableStatistics, table_name: str) -> Dict:
+        """Analisis detail tabel SQLite (COUNT + MAX semua kolom tanggal dalam satu query)"""
         table_info = {
             'columns': [],
             'record_count': 0,
@@ -251,43 +296,27 @@ class BAKFileReader:
 
         try:
             # Get column info
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
+            columns = stats.columns(table_name)
             table_info['columns'] = columns
 
-            # Get record count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            table_info['record_count'] = cursor.fetchone()[0]
-
-            # Get sample data (5 records)
-            if table_info['record_count'] > 0:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 5")
-                sample_data = cursor.fetchall()
-                table_info['sample_data'] = sample_data
-
             # Find date columns
-            date_columns = []
-            for col in columns:
-                col_name = col[1].lower()
-                if any(date_kw in col_name for date_kw in ['date', 'time', 'created', 'modified', 'updated']):
-                    date_columns.append(col[1])
-
+            date_columns = stats.matching_columns(table_name, ['date', 'time', 'created', 'modified', 'updated'])
             table_info['date_columns'] = date_columns
 
-            # Get latest dates from date columns
-            for col_name in date_columns:
-                try:
-                    cursor.execute(f"SELECT MAX({col_name}) FROM {table_name} WHERE {col_name} IS NOT NULL")
-                    max_date = cursor.fetchone()[0]
-                    if max_date:
-                        table_info['latest_dates'][col_name] = max_date
-                except:
-                    pass
+            # Get record count and latest dates from date columns
+            table_stats = stats.table_stats(table_name, date_columns)
+            table_info['record_count'] = table_stats.record_count
+            if table_stats.approximate:
+                table_info['record_count_approximate'] = True
+                table_info['record_count_error'] = table_stats.count_error
+            table_info['latest_dates'] = {col: value for col, value in table_stats.latest_dates.items() if value}
+
+            # Get sample data (5 records)
+            if table_info['record_count'] > 0:
+                table_info['sample_data'] = stats.sample_rows(table_name, 5)
 
             # Get indexes
-            cursor.execute(f"PRAGMA index_list({table_name})")
-            indexes = cursor.fetchall()
-            table_info['indexes'] = indexes
+            table_info['indexes'] = stats.indexes(table_name)
 
         except Exception as e:
             table_info['error'] = str(e)
@@ -295,27 +324,11 @@ class BAKFileReader:
         return table_info
 
     def _detect_sqlite_database_type(self, tables: List[str]) -> str:
-        """Deteksi tipe database berdasarkan nama tabel"""
-        table_names_upper = [t.upper() for t in tables]
+        """Deteksi tipe database berdasarkan nama tabel (schema registry bersama)"""
+        return self.registry.detect(tables, default='generic_sqlite')
 
-        # Check for Plantware
-        plantware_tables = ['PR_TASKREG', 'PR_TASK', 'PR_PROJECT', 'PR_USER', 'PR_DEPARTMENT']
-        if any(table in table_names_upper for table in plantware_tables):
-            return 'plantware'
-
-        # Check for Venus
-        venus_tables = ['TA_MACHINE', 'TA_TRANSACTION', 'TA_LOG', 'TA_EMPLOYEE']
-        if any(table in table_names_upper for table in venus_tables):
-            return 'venus'
-
-        # Check for Staging
-        staging_tables = ['GWSCANNER', 'GW_LOG', 'SCANNER_DATA', 'GW_TRANSACTION']
-        if any(table in table_names_upper for table in staging_tables):
-            return 'staging'
-
-        return 'generic_sqlite'
-
-    def _read_tape_bak(self, bak_path: str) -> Dict:
+    def _read_tape_bak(self, bak_path: str, header: Optional[bytes] = None,
+                       file_size: Optional[int] = None) -> Dict:
         """Membaca file .bak format TAPE"""
         result = {
             'success': False,
@@ -329,11 +342,12 @@ class BAKFileReader:
 
         try:
             # Baca header tape
-            with open(bak_path, 'rb') as f:
-                header = f.read(64)
+            if header is None:
+                with open(bak_path, 'rb') as f:
+                    header = f.read(64)
 
             result['database_info']['signature'] = header[:16].hex()
-            result['database_info']['file_size'] = os.path.getsize(bak_path)
+            result['database_info']['file_size'] = file_size if file_size is not None else os.path.getsize(bak_path)
 
             if header.startswith(b'TAPE'):
                 result['database_info']['format'] = 'TAPE format'
@@ -5,14 +5,31 @@ Analyzes SQL Server backup files (.bak) without database connection
 """
 
 import os
+import re
 import struct
 import zipfile
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    from byte_scanner import ByteScanner, extract_printable_strings
+    from analysis_cache import AnalysisCache, get_default_cache, member_fingerprint
+except ImportError:
+    from src.byte_scanner import ByteScanner, extract_printable_strings
+    from src.analysis_cache import AnalysisCache, get_default_cache, member_fingerprint
+
+# Batas scan struktur default; full_scan=True untuk scan seluruh file
+STRUCTURE_SCAN_LIMIT = 4 * 1024 * 1024
+
 class BAKMetadataAnalyzer:
-    def __init__(self):
+    # Naikkan jika format hasil analisis berubah (invalidasi analysis cache)
+    CACHE_VERSION = '1'
+
+    def __init__(self, full_scan: bool = False, cache: Optional[AnalysisCache] = None):
         self.backup_file = None
+        self.full_scan = full_scan
+        self.byte_scanner = ByteScanner()
+        self.analysis_cache = cache if cache is not None else get_default_cache()
 
     def analyze_bak_file(self, bak_path: str, zip_file: Optional[zipfile.ZipFile] = None) -> Dict[str, Any]:
         """
@@ -25,6 +42,22 @@ class BAKMetadataAnalyzer:
         Returns:
             Dictionary containing BAK file metadata
         """
+        try:
+            fingerprint = (member_fingerprint(zip_file, bak_path) if zip_file
+                           else self.analysis_cache.file_fingerprint(bak_path))
+        except (OSError, KeyError):
+            return self._analyze_bak_file(bak_path, zip_file)
+
+        result = self.analysis_cache.get_or_compute(
+            'bak_metadata', self.CACHE_VERSION, fingerprint,
+            lambda: self._analyze_bak_file(bak_path, zip_file),
+            params=f"full_scan={int(self.full_scan)}"
+        )
+        result['filename'] = bak_path
+        return result
+
+    def _analyze_bak_file(self, bak_path: str, zip_file: Optional[zipfile.ZipFile] = None) -> Dict[str, Any]:
+        """Analisis tanpa cache (lihat analyze_bak_file)"""
         try:
             # Get file handle
             if zip_file:
@@ -257,22 +290,7 @@ class BAKMetadataAnalyzer:
     
     def _extract_strings(self, data: bytes, min_length: int = 4) -> List[str]:
         """Extract readable strings from binary data"""
-        strings = []
-        current_string = ""
-
-        for byte in data:
-            if 32 <= byte <= 126:  # Printable ASCII
-                current_string += chr(byte)
-            else:
-                if len(current_string) >= min_length:
-                    strings.append(current_string)
-                current_string = ""
-
-        # Add last string if any
-        if len(current_string) >= min_length:
-            strings.append(current_string)
-
-        return strings
+        return extract_printable_strings(data, min_length)
 
     def _parse_database_info(self, strings: List[str]) -> Dict[str, Any]:
         """Parse database information from extracted strings"""
@@ -394,34 +412,15 @@ class BAKMetadataAnalyzer:
         }
 
         try:
-            # Reset file position
-            file_handle.seek(0)
-
-            # Read file in chunks to analyze structure
-            chunk_size = 8192
-            chunks_analyzed = 0
-            data_blocks_found = 0
-
-            while True:
-                chunk = file_handle.read(chunk_size)
-                if not chunk:
-                    break
-
-                chunks_analyzed += 1
-
-                # Look for data block patterns
-                # SQL Server backups have specific block structures
-                if len(chunk) >= 512:  # SQL page size
-                    # Check for page headers (simplified)
-                    if chunk[0:4] == b'\x00\x01\x00\x00':  # Common page header pattern
-                        data_blocks_found += 1
-
-                # Stop after analyzing first few MB for performance
-                if chunks_analyzed * chunk_size > 4 * 1024 * 1024:  # 4MB
-                    break
-
-            structure['header_size'] = min(chunk_size * chunks_analyzed, file_size)
-            structure['data_blocks'] = data_blocks_found
+            # Scan page header (8 KB aligned) dan signature MTF per chunk besar
+            scan = self.byte_scanner.scan(
+                file_handle, max_bytes=None if self.full_scan else STRUCTURE_SCAN_LIMIT)
+
+            structure['header_size'] = min(scan['bytes_scanned'], file_size)
+            structure['data_blocks'] = scan['page_headers']
+            structure['bytes_scanned'] = scan['bytes_scanned']
+            structure['full_scan'] = scan['bytes_scanned'] >= file_size
+            structure['block_signatures'] = scan['signatures']
 
             # Estimate page count (assuming 8KB pages)
             if file_size > 0:
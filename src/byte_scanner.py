@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Byte Scanner Module
+Scanner biner berbasis regex-on-bytes dan bytes.translate untuk mencari
+string printable, signature, dan header page di seluruh buffer dalam satu
+pemanggilan (tanpa loop per byte di Python)
+"""
+
+import re
+from typing import BinaryIO, Dict, Iterable, List, Optional
+
+SCAN_CHUNK_SIZE = 8 * 1024 * 1024      # 8 MB per read
+PAGE_SIZE = 8192                       # Ukuran page SQL Server
+PAGE_HEADER_SIGNATURE = b'\x00\x01\x00\x00'
+
+# Block ID deskriptor Microsoft Tape Format yang umum di file .bak SQL Server
+MTF_SIGNATURES = (b'TAPE', b'SSET', b'VOLB', b'DIRB', b'FILE', b'CFIL',
+                  b'ESPB', b'ESET', b'EOTM', b'SFMB', b'MSCI', b'MSDA', b'MQCI', b'APAD')
+
+_printable_patterns = {}
+
+
+def _printable_pattern(min_length: int):
+    pattern = _printable_patterns.get(min_length)
+    if pattern is None:
+        pattern = re.compile(rb'[\x20-\x7e]{%d,}' % min_length)
+        _printable_patterns[min_length] = pattern
+    return pattern
+
+
+def extract_printable_strings(data: bytes, min_length: int = 4,
+                              limit: Optional[int] = None) -> List[str]:
+    """Ambil semua run ASCII printable dengan panjang >= min_length"""
+    pattern = _printable_pattern(min_length)
+    if limit is None:
+        return [match.decode('ascii') for match in pattern.findall(data)]
+
+    strings = []
+    for match in pattern.finditer(data):
+        strings.append(match.group().decode('ascii'))
+        if len(strings) >= limit:
+            break
+    return strings
+
+
+def _match_mask(column: bytes, value: int) -> int:
+    """Bitmask (big int) posisi di `column` yang bernilai `value`"""
+    table = bytearray(256)
+    table[value] = 1
+    return int.from_bytes(column.translate(table), 'big')
+
+
+def count_aligned_signature(data: bytes, signature: bytes, block_size: int = PAGE_SIZE) -> int:
+    """
+    Hitung block (offset kelipatan block_size) yang diawali signature.
+    Setiap byte signature diambil per kolom dengan slicing ber-step, diubah
+    menjadi mask 0/1 lewat translate, lalu di-AND sebagai big integer.
+    """
+    blocks = len(data) // block_size
+    if blocks == 0 or not signature:
+        return 0
+
+    mask = -1
+    for index, value in enumerate(signature):
+        column = data[index:blocks * block_size:block_size]
+        mask &= _match_mask(column, value)
+        if not mask:
+            return 0
+    return bin(mask).count('1')
+
+
+class ByteScanner:
+    """
+    Scan file/stream biner secara streaming dengan chunk besar.
+    Chunk selalu kelipatan block_size sehingga alignment page tetap benar,
+    dan sisa beberapa byte dibawa ke chunk berikutnya agar signature yang
+    terpotong batas chunk tetap terdeteksi.
+    """
+
+    def __init__(self, signatures: Iterable[bytes] = MTF_SIGNATURES,
+                 page_signature: bytes = PAGE_HEADER_SIGNATURE,
+                 block_size: int = PAGE_SIZE, chunk_size: int = SCAN_CHUNK_SIZE):
+        self.signatures = tuple(signatures)
+        self.page_signature = page_signature
+        self.block_size = block_size
+        self.chunk_size = max(block_size, chunk_size - chunk_size % block_size)
+        self._signature_pattern = re.compile(b'|'.join(re.escape(s) for s in self.signatures)) \
+            if self.signatures else None
+        self._overlap = max([len(s) for s in self.signatures] + [1]) - 1
+
+    def scan(self, file_handle: BinaryIO, max_bytes: Optional[int] = None,
+             string_limit: int = 0, min_string_length: int = 4) -> Dict:
+        """
+        Scan stream dari posisi awal
+
+        Args:
+            file_handle: File/stream biner (posisi akan di-reset ke 0 jika seekable)
+            max_bytes: Batas byte yang di-scan (None = seluruh file)
+            string_limit: Jumlah maksimum string printable yang dikumpulkan
+            min_string_length: Panjang minimum string printable
+
+        Returns:
+            Dictionary hasil scan
+        """
+        result = {
+            'bytes_scanned': 0,
+            'blocks_scanned': 0,
+            'page_headers': 0,
+            'signatures': {},
+            'strings': []
+        }
+
+        try:
+            file_handle.seek(0)
+        except Exception:
+            pass
+
+        tail = b''
+        while max_bytes is None or result['bytes_scanned'] < max_bytes:
+            size = self.chunk_size
+            if max_bytes is not None:
+                size = min(size, max_bytes - result['bytes_scanned'])
+            chunk = file_handle.read(size)
+            if not chunk:
+                break
+
+            # Chunk dibaca dari offset kelipatan block_size, jadi alignment terjaga
+            result['page_headers'] += count_aligned_signature(chunk, self.page_signature, self.block_size)
+            result['blocks_scanned'] += -(-len(chunk) // self.block_size)
+
+            if self._signature_pattern is not None:
+                offset = result['bytes_scanned']
+                # Signature yang terpotong batas chunk: mulai di tail, berakhir di chunk ini
+                boundary = tail + chunk[:self._overlap]
+                for match in self._signature_pattern.finditer(boundary):
+                    if match.start() < len(tail) < match.end():
+                        self._count_signature(result, match.group(), offset - len(tail) + match.start())
+                for match in self._signature_pattern.finditer(chunk):
+                    self._count_signature(result, match.group(), offset + match.start())
+
+            if len(result['strings']) < string_limit:
+                result['strings'].extend(extract_printable_strings(
+                    chunk, min_string_length, string_limit - len(result['strings'])))
+
+            result['bytes_scanned'] += len(chunk)
+            tail = chunk[-self._overlap:] if self._overlap else b''
+
+        return result
+
+    @staticmethod
+    def _count_signature(result: Dict, signature: bytes, offset: int):
+        entry = result['signatures'].setdefault(signature.decode('ascii'), {'count': 0, 'first_offset': offset})
+        entry['count'] += 1
@@ -7,25 +7,49 @@ containing database backups. It can analyze Plantware, Venus, and Staging databa
 """
 
 import os
-import sqlite3
 import zipfile
-import tempfile
 import shutil
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any, Optional
 
 from zip_validator import ZipValidator
+from zip_sqlite import open_member_database
+from table_stats import MODE_EXACT, TableStatistics, load_row_count_config
+from freshness import discover_date_columns
+from schema_registry import get_default_registry
+from backup_connection import open_backup
+from analysis_cache import AnalysisCache, get_default_cache, member_fingerprint
 
 class DatabaseValidator:
-    def __init__(self):
+    # Naikkan jika format hasil analisis berubah (invalidasi analysis cache)
+    CACHE_VERSION = '1'
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
         self.supported_databases = ['plantware', 'venus', 'staging']
         self.temp_connections = {}
+        self.analysis_cache = cache if cache is not None else get_default_cache()
+        # Mode jumlah baris ([ROW_COUNTS]): exact, atau perkiraan untuk tabel non-kunci
+        self.row_count_options = load_row_count_config()
     
     def validate_backup_databases(self, zip_files: List[str]) -> Dict:
         """
         Validasi database dari multiple ZIP files
         Returns: Dictionary dengan hasil validasi lengkap
         """
+        zip_results = []
+        for zip_file in zip_files:
+            try:
+                zip_results.append(self._validate_single_zip(zip_file))
+            except Exception as e:
+                zip_results.append({'errors': [f"Error processing {zip_file}: {str(e)}"]})
+        
+        return self.merge_zip_results(zip_files, zip_results)
+    
+    def merge_zip_results(self, zip_files: List[str], zip_results: List[Dict]) -> Dict:
+        """
+        Gabungkan hasil _validate_single_zip per arsip (urutan sama dengan zip_files)
+        Returns: Dictionary dengan hasil validasi lengkap
+        """
         results = {
             'validation_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'total_zip_files': len(zip_files),
@@ -36,10 +60,8 @@ class DatabaseValidator:
             'warnings': []
         }
         
-        for zip_file in zip_files:
+        for zip_file, zip_result in zip(zip_files, zip_results):
             try:
-                zip_result = self._validate_single_zip(zip_file)
-                
                 # Merge results
                 for db_type, db_info in zip_result.get('databases', {}).items():
                     if db_type not in results['databases_found']:
@@ -86,39 +108,56 @@ class DatabaseValidator:
                     result['warnings'].append(f"No .bak files found in {zip_path}")
                     return result
                 
-                # Analyze each .bak file
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    for bak_file in bak_files:
-                        try:
-                            # Extract .bak file
-                            zip_ref.extract(bak_file, temp_dir)
-                            bak_path = os.path.join(temp_dir, bak_file)
-                            
-                            # Analyze database
-                            db_analysis = self._analyze_database(bak_path)
+                # Analyze each .bak file langsung dari ZIP (tanpa ekstraksi ke disk)
+                for bak_file in bak_files:
+                    try:
+                        db_analysis = self._analyze_database_member(zip_ref, bak_file)
+                        
+                        if db_analysis['database_type'] != 'unknown':
+                            result['databases'][db_analysis['database_type']] = db_analysis
                             
-                            if db_analysis['database_type'] != 'unknown':
-                                result['databases'][db_analysis['database_type']] = db_analysis
-                                
-                                # Track latest date for this database type
-                                latest_date = self._get_database_latest_date(db_analysis)
-                                if latest_date:
-                                    result['latest_dates'][db_analysis['database_type']] = latest_date
-                            
-                        except Exception as e:
-                            result['errors'].append(f"Error analyzing {bak_file}: {str(e)}")
+                            # Track latest date for this database type
+                            latest_date = self._get_database_latest_date(db_analysis)
+                            if latest_date:
+                                result['latest_dates'][db_analysis['database_type']] = latest_date
+                        
+                    except Exception as e:
+                        result['errors'].append(f"Error analyzing {bak_file}: {str(e)}")
         
         except Exception as e:
             result['errors'].append(f"Error processing ZIP {zip_path}: {str(e)}")
         
         return result
     
-    def _analyze_database(self, bak_path: str) -> Dict:
+    def _analyze_database_member(self, zip_ref: zipfile.ZipFile, bak_file: str) -> Dict:
+        """Analyze database di dalam ZIP tanpa ekstraksi"""
+        bak_path = os.path.join(zip_ref.filename, bak_file)
+        file_size = zip_ref.getinfo(bak_file).file_size
+        # Jumlah record terbaru dihitung relatif ke hari ini, jadi tanggal ikut jadi key
+        analysis = self.analysis_cache.get_or_compute(
+            'database_validator', self.CACHE_VERSION, member_fingerprint(zip_ref, bak_file),
+            lambda: self._analyze_database(bak_path, file_size,
+                                           connect=lambda: open_member_database(zip_ref, bak_file)),
+            params=datetime.now().strftime('%Y-%m-%d') + self._row_count_params()
+                   + get_default_registry().cache_params()
+        )
+        analysis['file_path'] = bak_path
+        return analysis
+    
+    def _row_count_params(self) -> str:
+        """Bagian key cache untuk mode jumlah baris selain default (hasil bisa berupa perkiraan)"""
+        mode = self.row_count_options.get('mode', MODE_EXACT)
+        budget = self.row_count_options.get('time_budget')
+        if mode == MODE_EXACT and not budget:
+            return ''
+        return f":{mode}:{budget or 0}"
+    
+    def _analyze_database(self, bak_path: str, file_size: Optional[int] = None, connect=None) -> Dict:
         """Analyze database file"""
         analysis = {
             'database_type': 'unknown',
             'file_path': bak_path,
-            'file_size_mb': round(os.path.getsize(bak_path) / (1024 * 1024), 2),
+            'file_size_mb': 0,
             'tables': [],
             'key_tables_info': {},
             'latest_dates': {},
@@ -127,12 +166,17 @@ class DatabaseValidator:
         }
         
         try:
-            conn = sqlite3.connect(bak_path)
+            if file_size is None:
+                file_size = os.path.getsize(bak_path)
+            analysis['file_size_mb'] = round(file_size / (1024 * 1024), 2)
+            
+            conn = connect() if connect else open_backup(bak_path)
             cursor = conn.cursor()
+            # Schema dibaca sekali; setiap tabel kunci cukup satu query agregat
+            stats = TableStatistics(cursor, **self.row_count_options)
             
             # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
+            tables = stats.tables()
             analysis['tables'] = tables
             
             # Detect database type
@@ -140,12 +184,13 @@ class DatabaseValidator:
             
             # Analyze based on database type
             if analysis['database_type'] == 'plantware':
-                analysis['key_tables_info'] = self._analyze_plantware_database(cursor)
+                analysis['key_tables_info'] = self._analyze_plantware_database(stats)
             elif analysis['database_type'] == 'venus':
-                analysis['key_tables_info'] = self._analyze_venus_database(cursor)
+                analysis['key_tables_info'] = self._analyze_venus_database(stats)
             elif analysis['database_type'] == 'staging':
-                analysis['key_tables_info'] = self._analyze_staging_database(cursor)
+                analysis['key_tables_info'] = self._analyze_staging_database(stats)
             
+            stats.close()
             conn.close()
             
         except Exception as e:
@@ -154,204 +199,95 @@ class DatabaseValidator:
         return analysis
     
     def _detect_database_type(self, tables: List[str]) -> str:
-        """Detect database type based on table names"""
-        table_names_upper = [t.upper() for t in tables]
-        
-        # Check for Plantware specific tables
-        plantware_indicators = ['PR_TASKREG', 'PR_TASK', 'PR_PROJECT']
-        if any(indicator in table_names_upper for indicator in plantware_indicators):
-            return 'plantware'
-        
-        # Check for Venus specific tables
-        venus_indicators = ['TA_MACHINE', 'TA_TRANSACTION', 'TA_LOG']
-        if any(indicator in table_names_upper for indicator in venus_indicators):
-            return 'venus'
-        
-        # Check for Staging specific tables
-        staging_indicators = ['GWSCANNER', 'GW_LOG', 'SCANNER_DATA']
-        if any(indicator in table_names_upper for indicator in staging_indicators):
-            return 'staging'
-        
-        return 'unknown'
+        """Detect database type based on table names (schema registry bersama)"""
+        return get_default_registry().detect(tables)
     
-    def _analyze_plantware_database(self, cursor) -> Dict:
+    def _analyze_plantware_database(self, stats: TableStatistics) -> Dict:
         """Analyze Plantware database specifically"""
         info = {}
         
         # Analyze PR_TASKREG table
-        try:
-            # Check if table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='PR_TASKREG'")
-            if cursor.fetchone():
-                # Get record count
-                cursor.execute("SELECT COUNT(*) FROM PR_TASKREG")
-                count = cursor.fetchone()[0]
-                
-                # Get latest dates from various columns
-                date_info = self._get_table_date_info(cursor, 'PR_TASKREG', 
-                    ['TASK_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'START_DATE', 'END_DATE'])
-                
-                # Get recent records (last 7 days)
-                recent_count = self._get_recent_records_count(cursor, 'PR_TASKREG', 
-                    ['TASK_DATE', 'CREATED_DATE'], days=7)
-                
-                info['PR_TASKREG'] = {
-                    'total_records': count,
-                    'latest_dates': date_info,
-                    'recent_records_7days': recent_count,
-                    'status': 'active' if recent_count > 0 else 'inactive'
-                }
-            else:
-                info['PR_TASKREG'] = {'error': 'Table not found'}
-        
-        except Exception as e:
-            info['PR_TASKREG'] = {'error': str(e)}
+        info['PR_TASKREG'] = self._analyze_key_table(stats, 'PR_TASKREG',
+            ['TASK_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'START_DATE', 'END_DATE'],
+            ['TASK_DATE', 'CREATED_DATE'])
         
         # Analyze other Plantware tables if they exist
-        other_tables = ['PR_PROJECT', 'PR_TASK', 'PR_USER']
-        for table in other_tables:
-            try:
-                cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
-                if cursor.fetchone():
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
-                    info[table] = {'total_records': count}
-            except:
-                pass
+        info.update(self._count_tables(stats, ['PR_PROJECT', 'PR_TASK', 'PR_USER']))
         
         return info
     
-    def _analyze_venus_database(self, cursor) -> Dict:
+    def _analyze_venus_database(self, stats: TableStatistics) -> Dict:
         """Analyze Venus database specifically"""
         info = {}
         
         # Analyze TA_MACHINE table
-        try:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TA_MACHINE'")
-            if cursor.fetchone():
-                # Get record count
-                cursor.execute("SELECT COUNT(*) FROM TA_MACHINE")
-                count = cursor.fetchone()[0]
-                
-                # Get latest dates
-                date_info = self._get_table_date_info(cursor, 'TA_MACHINE', 
-                    ['MACHINE_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'LAST_UPDATE', 'TIMESTAMP'])
-                
-                # Get recent records
-                recent_count = self._get_recent_records_count(cursor, 'TA_MACHINE', 
-                    ['MACHINE_DATE', 'TIMESTAMP'], days=7)
-                
-                info['TA_MACHINE'] = {
-                    'total_records': count,
-                    'latest_dates': date_info,
-                    'recent_records_7days': recent_count,
-                    'status': 'active' if recent_count > 0 else 'inactive'
-                }
-            else:
-                info['TA_MACHINE'] = {'error': 'Table not found'}
-        
-        except Exception as e:
-            info['TA_MACHINE'] = {'error': str(e)}
+        info['TA_MACHINE'] = self._analyze_key_table(stats, 'TA_MACHINE',
+            ['MACHINE_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'LAST_UPDATE', 'TIMESTAMP'],
+            ['MACHINE_DATE', 'TIMESTAMP'])
         
         # Analyze other Venus tables
-        other_tables = ['TA_TRANSACTION', 'TA_LOG', 'TA_USER']
-        for table in other_tables:
-            try:
-                cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
-                if cursor.fetchone():
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
-                    info[table] = {'total_records': count}
-            except:
-                pass
+        info.update(self._count_tables(stats, ['TA_TRANSACTION', 'TA_LOG', 'TA_USER']))
         
         return info
     
-    def _analyze_staging_database(self, cursor) -> Dict:
+    def _analyze_staging_database(self, stats: TableStatistics) -> Dict:
         """Analyze Staging database specifically"""
         info = {}
         
         # Analyze GWSCANNER table
-        try:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='GWSCANNER'")
-            if cursor.fetchone():
-                # Get record count
-                cursor.execute("SELECT COUNT(*) FROM GWSCANNER")
-                count = cursor.fetchone()[0]
-                
-                # Get latest dates
-                date_info = self._get_table_date_info(cursor, 'GWSCANNER', 
-                    ['SCAN_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'TIMESTAMP', 'LOG_DATE'])
-                
-                # Get recent records
-                recent_count = self._get_recent_records_count(cursor, 'GWSCANNER', 
-                    ['SCAN_DATE', 'TIMESTAMP'], days=7)
-                
-                info['GWSCANNER'] = {
-                    'total_records': count,
-                    'latest_dates': date_info,
-                    'recent_records_7days': recent_count,
-                    'status': 'active' if recent_count > 0 else 'inactive'
-                }
-            else:
-                info['GWSCANNER'] = {'error': 'Table not found'}
-        
-        except Exception as e:
-            info['GWSCANNER'] = {'error': str(e)}
+        info['GWSCANNER'] = self._analyze_key_table(stats, 'GWSCANNER',
+            ['SCAN_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'TIMESTAMP', 'LOG_DATE'],
+            ['SCAN_DATE', 'TIMESTAMP'])
         
         # Analyze other Staging tables
-        other_tables = ['GW_LOG', 'SCANNER_DATA', 'GW_CONFIG']
-        for table in other_tables:
-            try:
-                cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
-                if cursor.fetchone():
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
-                    info[table] = {'total_records': count}
-            except:
-                pass
+        info.update(self._count_tables(stats, ['GW_LOG', 'SCANNER_DATA', 'GW_CONFIG']))
         
         return info
     
-    def _get_table_date_info(self, cursor, table: str, date_columns: List[str]) -> Dict:
-        """Get date information from table"""
-        date_info = {}
-        
-        for col in date_columns:
-            try:
-                # Check if column exists
-                cursor.execute(f"PRAGMA table_info({table})")
-                columns = [row[1] for row in cursor.fetchall()]
-                
-                if col in columns:
-                    cursor.execute(f"SELECT MAX({col}) FROM {table}")
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        date_info[col] = str(result[0])
-            except:
-                continue
+    def _analyze_key_table(self, stats: TableStatistics, table: str, date_columns: List[str],
+                           recent_columns: List[str], days: int = 7) -> Dict:
+        """
+        Jumlah record, tanggal terbaru per kolom dan record terbaru (N hari)
+        dalam satu query agregat
+        """
+        if not stats.has_table(table):
+            return {'error': 'Table not found'}
         
-        return date_info
+        try:
+            cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            # Kandidat tetap + kolom tanggal yang ditemukan dari schema
+            date_columns = list(dict.fromkeys(date_columns + discover_date_columns(stats, table)))
+            table_stats = stats.table_stats(table, date_columns + recent_columns, recent_since=cutoff_date)
+            
+            date_info = {col: str(table_stats.latest_dates[col])
+                         for col in date_columns if table_stats.latest_dates.get(col)}
+            # Record terbaru dihitung dari kolom recent pertama yang ada di tabel
+            recent_count = next((table_stats.recent_counts[col] for col in recent_columns
+                                 if col in table_stats.recent_counts), 0)
+            
+            return {
+                'total_records': table_stats.record_count,
+                'latest_dates': date_info,
+                'recent_records_7days': recent_count,
+                'status': 'active' if recent_count > 0 else 'inactive'
+            }
+        except Exception as e:
+            return {'error': str(e)}
     
-    def _get_recent_records_count(self, cursor, table: str, date_columns: List[str], days: int = 7) -> int:
-        """Get count of recent records within specified days"""
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        
-        for col in date_columns:
+    def _count_tables(self, stats: TableStatistics, tables: List[str]) -> Dict:
+        """Jumlah record tabel pendukung yang ada"""
+        info = {}
+        for table in tables:
             try:
-                # Check if column exists
-                cursor.execute(f"PRAGMA table_info({table})")
-                columns = [row[1] for row in cursor.fetchall()]
-                
-                if col in columns:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {col} >= ?", (cutoff_date,))
-                    result = cursor.fetchone()
-                    if result:
-                        return result[0]
+                if stats.has_table(table):
+                    table_stats = stats.table_stats(table)
+                    info[table] = {'total_records': table_stats.record_count}
+                    if table_stats.approximate:
+                        info[table]['approximate'] = True
+                        info[table]['count_error'] = table_stats.count_error
             except:
-                continue
-        
-        return 0
+                pass
+        return info
     
     def _get_database_latest_date(self, db_analysis: Dict) -> Optional[str]:
         """Get the latest date from database analysis"""
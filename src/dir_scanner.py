@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Directory Scanner Module
+Scan folder backup dengan satu kali os.scandir. Metadata dari DirEntry
+(ukuran, mtime) dan tanggal dari nama file disimpan dalam record ringkas
+yang dipakai bersama oleh semua pemanggil, sehingga setiap file hanya
+di-stat satu kali per scan (penting untuk share SMB, di mana setiap stat
+adalah satu round trip jaringan).
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# Pola tanggal di nama file backup, dicoba berurutan
+FILENAME_DATE_PATTERNS = [
+    (re.compile(r'(\d{4})[-_](\d{2})[-_](\d{2})'), 'ymd'),   # YYYY-MM-DD / YYYY_MM_DD
+    (re.compile(r'(\d{4})(\d{2})(\d{2})'), 'ymd'),           # YYYYMMDD
+    (re.compile(r'(\d{2})[-_](\d{2})[-_](\d{4})'), 'dmy'),   # DD-MM-YYYY / DD_MM_YYYY
+    (re.compile(r'(\d{2})(\d{2})(\d{4})'), 'dmy'),           # DDMMYYYY
+    (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'), 'ymd'),     # YYYY-M-D
+]
+
+
+def parse_filename_date(filename: str) -> Optional[datetime]:
+    """Tanggal backup dari nama file, atau None jika tidak ada tanggal valid"""
+    for pattern, order in FILENAME_DATE_PATTERNS:
+        for match in pattern.finditer(filename):
+            first, second, third = (int(group) for group in match.groups())
+            try:
+                if order == 'ymd':
+                    return datetime(first, second, third)
+                return datetime(third, second, first)
+            except ValueError:
+                continue
+    return None
+
+
+class FileRecord(NamedTuple):
+    """Metadata satu file hasil scan"""
+    path: str
+    name: str
+    size: int
+    mtime: float
+    filename_date: Optional[datetime]
+    stat: os.stat_result
+
+    @property
+    def modified_date(self) -> str:
+        """Tanggal modifikasi (YYYY-MM-DD)"""
+        return datetime.fromtimestamp(self.mtime).strftime('%Y-%m-%d')
+
+    @property
+    def file_date(self) -> str:
+        """Tanggal dari nama file, fallback ke tanggal modifikasi (YYYY-MM-DD)"""
+        if self.filename_date is not None:
+            return self.filename_date.strftime('%Y-%m-%d')
+        return self.modified_date
+
+    @property
+    def effective_datetime(self) -> datetime:
+        """Yang lebih baru antara modification time dan tanggal di nama file"""
+        modified = datetime.fromtimestamp(self.mtime)
+        if self.filename_date is None:
+            return modified
+        return max(modified, self.filename_date)
+
+    def to_dict(self) -> dict:
+        """Format file info yang dipakai tabel GUI (name, path, size, modified)"""
+        return {'name': self.name, 'path': self.path, 'size': self.size, 'modified': self.mtime}
+
+
+def scan_directory(folder: str, extensions: Iterable[str] = ('.zip',),
+                   recursive: bool = False) -> List[FileRecord]:
+    """
+    Scan folder sekali dengan os.scandir
+
+    Args:
+        folder: Folder yang di-scan
+        extensions: Ekstensi file yang diambil (case-insensitive)
+        recursive: Ikut scan subfolder
+
+    Returns:
+        List FileRecord, terbaru (mtime) lebih dulu
+    """
+    suffixes = tuple(ext.lower() for ext in extensions)
+    records = []
+    stack = [folder]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                            continue
+                        if not entry.name.lower().endswith(suffixes):
+                            continue
+                        # Di Windows stat() DirEntry diambil dari hasil listing, tanpa round trip tambahan
+                        stat_result = entry.stat()
+                    except OSError:
+                        continue
+                    records.append(FileRecord(entry.path, entry.name, stat_result.st_size,
+                                              stat_result.st_mtime, parse_filename_date(entry.name),
+                                              stat_result))
+        except OSError:
+            continue
+
+    records.sort(key=lambda record: record.mtime, reverse=True)
+    return records
+
+
+def filter_latest_date(records: List[FileRecord]) -> Tuple[List[FileRecord], str]:
+    """
+    Ambil record dengan tanggal modifikasi terbaru
+
+    Returns:
+        (records_tanggal_terbaru, tanggal 'YYYY-MM-DD'), atau ([], '') jika kosong
+    """
+    if not records:
+        return [], ''
+    latest_date = max(records, key=lambda record: record.mtime).modified_date
+    return [record for record in records if record.modified_date == latest_date], latest_date
@@ -1,10 +1,34 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.mime.base import MIMEBase
+from email import encoders
 import configparser
 import os
 from datetime import datetime
 
+try:
+    from mail_transport import get_transport, get_digest_queue, transport_options
+except ImportError:
+    from src.mail_transport import get_transport, get_digest_queue, transport_options
+
+
+def render_notification_html(subject, message):
+    """Template HTML standar email notifikasi"""
+    return f"""
+            <html>
+            <body>
+                <h2>Database Backup Monitoring Report</h2>
+                <p><strong>Waktu:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                <hr>
+                {message}
+                <hr>
+                <p><em>Email ini dikirim secara otomatis oleh sistem monitoring database backup</em></p>
+            </body>
+            </html>
+            """
+
+
 class EmailNotifier:
     def __init__(self, config_file='config/config.ini'):
         self.config = configparser.ConfigParser()
@@ -17,6 +41,9 @@ class EmailNotifier:
         self.smtp_server = 'smtp.gmail.com'
         self.smtp_port = 587
         self.default_subject = 'Laporan Monitoring Backup Database'
+        # Alert yang masuk dalam window ini digabung jadi satu email (0 = kirim langsung)
+        self.digest_window_seconds = 0
+        self.transport_options = {}
 
         # Load from config if exists
         try:
@@ -27,11 +54,18 @@ class EmailNotifier:
                 self.receiver_email = self.config['EMAIL'].get('receiver_email', self.receiver_email)
                 self.smtp_server = self.config['EMAIL'].get('smtp_server', self.smtp_server)
                 self.smtp_port = int(self.config['EMAIL'].get('smtp_port', self.smtp_port))
+                self.digest_window_seconds = float(self.config['EMAIL'].get('digest_window_seconds', 0) or 0)
+                self.transport_options = transport_options(self.config['EMAIL'])
             if 'NOTIFICATION' in self.config:
                 self.default_subject = self.config['NOTIFICATION'].get('subject', self.default_subject)
         except Exception as e:
             print(f"Warning: Could not load email config: {e}")
 
+    def _transport(self):
+        """Koneksi SMTP bersama untuk akun pengirim saat ini"""
+        return get_transport(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password,
+                             **self.transport_options)
+
     def send_notification(self, subject=None, message="", attachment_path=None):
         """
         Kirim email notifikasi
@@ -48,39 +82,28 @@ class EmailNotifier:
             msg['Subject'] = subject or self.default_subject
 
             # Add body
-            body = f"""
-            <html>
-            <body>
-                <h2>Database Backup Monitoring Report</h2>
-                <p><strong>Waktu:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                <hr>
-                {message}
-                <hr>
-                <p><em>Email ini dikirim secara otomatis oleh sistem monitoring database backup</em></p>
-            </body>
-            </html>
-            """
+            body = render_notification_html(msg['Subject'], message)
 
             msg.attach(MIMEText(body, 'html'))
 
-            # Connect to SMTP server and send
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.ehlo()  # Extended Hello
-
-            # Login with error handling
-            try:
-                server.login(self.sender_email, self.sender_password)
-            except smtplib.SMTPAuthenticationError as auth_error:
-                server.quit()
-                return False, f"Autentikasi gagal: {str(auth_error)}. Silakan periksa email dan app password Anda."
+            # Attach file (mis. PDF report) jika ada
+            if attachment_path and os.path.exists(attachment_path):
+                with open(attachment_path, 'rb') as attachment:
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(attachment.read())
+                encoders.encode_base64(part)
+                part.add_header('Content-Disposition',
+                                f'attachment; filename= {os.path.basename(attachment_path)}')
+                msg.attach(part)
 
+            # Kirim lewat koneksi SMTP bersama (reconnect + retry di MailTransport)
             text = msg.as_string()
-            server.sendmail(self.sender_email, self.receiver_email, text)
-            server.quit()
+            self._transport().sendmail(self.sender_email, self.receiver_email, text)
 
             return True, "Email berhasil dikirim"
 
+        except smtplib.SMTPAuthenticationError as auth_error:
+            return False, f"Autentikasi gagal: {str(auth_error)}. Silakan periksa email dan app password Anda."
         except smtplib.SMTPException as smtp_error:
             return False, f"Error SMTP: {str(smtp_error)}"
         except Exception as e:
@@ -153,6 +176,14 @@ class EmailNotifier:
         </div>
         """
 
+        if self.digest_window_seconds > 0:
+            if not self.sender_email or not self.sender_password or not self.receiver_email:
+                return False, "Konfigurasi email tidak lengkap. Silakan periksa email pengirim, password, dan email penerima."
+            queue = get_digest_queue(self._transport(), self.receiver_email, self.digest_window_seconds,
+                                     render_notification_html)
+            queue.submit(subject, alert_message)
+            return True, f"Alert masuk antrian digest ({self.digest_window_seconds:g} detik)"
+
         return self.send_notification(subject, alert_message)
 
     def send_monitoring_report(self, monitoring_data):
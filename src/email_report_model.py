@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Email Report Model
+Model ringkasan bertipe untuk template email HTML (src/templates). Dict hasil
+analisis (EnhancedZipAnalyzer / EnhancedBackupMonitor) dinormalisasi sekali
+di sini, sehingga template hanya membaca atribut dan tidak lagi berisi
+rantai .get(..., {}) bersarang.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+INTEGRITY_STATUS_CLASS = {
+    'Good': 'status-good',
+    'Warnings': 'status-warning',
+    'Corrupted': 'status-danger',
+    'Invalid': 'status-danger',
+    'Error': 'status-danger'
+}
+
+
+class BakFileSummary(NamedTuple):
+    """Ringkasan satu file BAK di dalam arsip"""
+    filename: str
+    database_name: str
+    size_mb: float
+    backup_type: str
+    backup_date: str
+    sql_version: str
+    estimated_tables: int
+    estimated_records: int
+    is_valid: bool
+    can_be_restored: bool
+
+    @classmethod
+    def from_analysis(cls, bak_result: Dict[str, Any]) -> 'BakFileSummary':
+        db_info = bak_result.get('database_info', {})
+        validation = bak_result.get('validation', {})
+        return cls(
+            filename=bak_result.get('original_filename', bak_result.get('filename', 'Unknown')),
+            database_name=db_info.get('database_name', 'Unknown'),
+            size_mb=bak_result.get('file_size_mb', 0),
+            backup_type=db_info.get('backup_type', 'Unknown'),
+            backup_date=db_info.get('backup_date', 'Unknown'),
+            sql_version=db_info.get('sql_version', 'Unknown'),
+            estimated_tables=db_info.get('estimated_tables', 0),
+            estimated_records=bak_result.get('table_info', {}).get('total_records',
+                                                                    db_info.get('estimated_records', 0)),
+            is_valid=bool(validation.get('is_valid_bak', False)),
+            can_be_restored=bool(validation.get('can_be_restored', False))
+        )
+
+
+class ContainedFile(NamedTuple):
+    """Satu entri daftar file terbesar di dalam arsip"""
+    filename: str
+    size_mb: float
+    file_type: str
+
+
+class ArchiveSummary(NamedTuple):
+    """Ringkasan satu arsip ZIP hasil analisis komprehensif"""
+    filename: str
+    size_mb: float
+    created_time: str
+    modified_time: str
+    backup_date: str
+    database_type: str
+    total_files: int
+    compression_ratio: float
+    integrity: str
+    is_valid_zip: bool
+    can_be_extracted: bool
+    corruption_detected: bool
+    warnings: Tuple[str, ...]
+    total_bak_files: int
+    bak_total_size_mb: float
+    valid_bak_files: int
+    corrupted_bak_files: int
+    databases: Tuple[str, ...]
+    bak_files: Tuple[BakFileSummary, ...]
+    has_file_analysis: bool
+    content_total_files: int
+    content_bak_files: int
+    content_database_files: int
+    content_log_files: int
+    largest_files: Tuple[ContainedFile, ...]
+    recommendations: Tuple[str, ...]
+    analysis_time: str
+    analysis_failed: bool
+
+    @classmethod
+    def from_analysis(cls, data: Dict[str, Any]) -> 'ArchiveSummary':
+        zip_info = data.get('zip_info', {})
+        validation = data.get('validation', {})
+        bak_analysis = data.get('bak_analysis', {})
+        bak_summary = bak_analysis.get('summary', {})
+        file_analysis = data.get('file_analysis', {}) or {}
+        return cls(
+            filename=zip_info.get('filename', 'Unknown'),
+            size_mb=zip_info.get('file_size_mb', 0),
+            created_time=zip_info.get('created_time', 'Unknown'),
+            modified_time=zip_info.get('modified_time', 'Unknown'),
+            backup_date=zip_info.get('backup_date_from_filename', 'Unknown'),
+            database_type=zip_info.get('database_type_from_filename', 'Unknown'),
+            total_files=zip_info.get('total_files', 0),
+            compression_ratio=zip_info.get('compression_ratio', 0),
+            integrity=validation.get('file_integrity', 'Unknown'),
+            is_valid_zip=bool(validation.get('is_valid_zip', False)),
+            can_be_extracted=bool(validation.get('can_be_extracted', False)),
+            corruption_detected=bool(validation.get('corruption_detected', False)),
+            warnings=tuple(validation.get('warnings', []) or ()),
+            total_bak_files=bak_analysis.get('total_bak_files', 0),
+            bak_total_size_mb=bak_summary.get('total_size_mb', 0),
+            valid_bak_files=bak_summary.get('valid_bak_files', 0),
+            corrupted_bak_files=bak_summary.get('corrupted_bak_files', 0),
+            databases=tuple(bak_summary.get('databases_found', []) or ()),
+            bak_files=tuple(BakFileSummary.from_analysis(b) for b in bak_analysis.get('bak_analyses', [])),
+            has_file_analysis=bool(file_analysis),
+            content_total_files=file_analysis.get('total_files', 0),
+            content_bak_files=len(file_analysis.get('bak_files', [])),
+            content_database_files=len(file_analysis.get('database_files', [])),
+            content_log_files=len(file_analysis.get('log_files', [])),
+            largest_files=tuple(ContainedFile(f.get('filename', 'Unknown'), f.get('size_mb', 0),
+                                              f.get('file_type', 'Unknown'))
+                                for f in file_analysis.get('largest_files', [])[:5]),
+            recommendations=tuple(data.get('recommendations', []) or ()),
+            analysis_time=data.get('analysis_time', 'Unknown'),
+            analysis_failed=str(data.get('analysis_status', '')).lower() == 'failed'
+        )
+
+    @property
+    def integrity_class(self) -> str:
+        """Kelas CSS untuk status integritas ZIP"""
+        return INTEGRITY_STATUS_CLASS.get(self.integrity, 'status-warning')
+
+    @property
+    def section_class(self) -> str:
+        """Kelas CSS kartu arsip di digest (danger/warning/normal)"""
+        if self.corruption_detected:
+            return 'file-section status-danger'
+        if self.warnings:
+            return 'file-section status-warning'
+        return 'file-section'
+
+
+class DigestSummary(NamedTuple):
+    """Ringkasan banyak arsip untuk email digest auto analysis"""
+    archives: Tuple[ArchiveSummary, ...]
+    generated_at: str
+
+    @classmethod
+    def from_results(cls, analysis_results: Iterable[Dict[str, Any]],
+                     generated_at: Optional[datetime] = None) -> 'DigestSummary':
+        generated_at = generated_at or datetime.now()
+        return cls(archives=tuple(ArchiveSummary.from_analysis(r) for r in analysis_results),
+                   generated_at=generated_at.strftime('%Y-%m-%d %H:%M:%S'))
+
+    @property
+    def total_files(self) -> int:
+        return len(self.archives)
+
+    @property
+    def successful_analyses(self) -> int:
+        return sum(1 for a in self.archives if not a.analysis_failed)
+
+    @property
+    def failed_analyses(self) -> int:
+        return self.total_files - self.successful_analyses
+
+    @property
+    def total_size_mb(self) -> float:
+        return sum(a.size_mb for a in self.archives)
+
+    @property
+    def valid_zips(self) -> int:
+        return sum(1 for a in self.archives if a.is_valid_zip)
+
+    @property
+    def corrupted_files(self) -> int:
+        return sum(1 for a in self.archives if a.corruption_detected)
+
+
+class DeepZipRow(NamedTuple):
+    """Satu baris arsip ZIP di email deep analysis (ZipBackupMonitorEnhanced)"""
+    filename: str
+    backup_type: str
+    size: str
+    status: str
+    status_class: str
+    modified: str
+    days_old: int
+    age_status: str
+    age_class: str
+
+
+class DeepBakRow(NamedTuple):
+    """Satu baris file BAK di email deep analysis (ZipBackupMonitorEnhanced)"""
+    filename: str
+    backup_type: str
+    size: str
+    size_below_minimum: bool
+    is_outdated: bool
+    days_since_backup: int
+    can_be_extracted: bool
+    dbatools_readable: bool
+    one_day_different: bool
+
+    @classmethod
+    def from_extracted(cls, bak_file: Dict[str, Any], format_size) -> 'DeepBakRow':
+        return cls(
+            filename=bak_file.get('filename', 'Unknown'),
+            backup_type=bak_file.get('backup_type', 'Unknown'),
+            size=format_size(bak_file.get('size', 0)),
+            size_below_minimum=bool(bak_file.get('size_warning', False)),
+            is_outdated=bool(bak_file.get('is_outdated', False)),
+            days_since_backup=bak_file.get('days_since_backup', 0),
+            can_be_extracted=not bak_file.get('extraction_failed', True),
+            dbatools_readable=bak_file.get('dbatools_analysis', {}).get('status') == 'Analyzed',
+            one_day_different=bool(bak_file.get('file_date_one_day_different', False))
+        )
+
+
+OLD_BACKUP_DAYS = 30
+_BACKUP_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+
+
+def is_old_backup(backup_date: Any, max_age_days: int = OLD_BACKUP_DAYS,
+                  now: Optional[datetime] = None) -> bool:
+    """True jika tanggal backup (string) lebih tua dari max_age_days"""
+    if not isinstance(backup_date, str) or backup_date == 'Unknown':
+        return False
+    for fmt in _BACKUP_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(backup_date, fmt)
+        except ValueError:
+            continue
+        return ((now or datetime.now()) - parsed).days > max_age_days
+    return False
+
+
+class SummaryZipRow(NamedTuple):
+    """Satu arsip ZIP di email summary analisis (BackupMonitorWindow)"""
+    filename: str
+    size_mb: float
+    bak_count: int
+    is_valid: bool
+    modified: str
+
+    @classmethod
+    def from_result(cls, zip_result: Dict[str, Any], modified_date) -> 'SummaryZipRow':
+        zip_path = zip_result.get('zip_file', 'Unknown')
+        return cls(
+            filename=os.path.basename(zip_path),
+            size_mb=zip_result.get('file_size_mb', 0),
+            bak_count=len(zip_result.get('bak_analyses', [])),
+            is_valid=bool(zip_result.get('integrity_check', {}).get('is_valid', False)),
+            modified=modified_date(zip_path)
+        )
+
+
+class SummaryBakRow(NamedTuple):
+    """Satu file BAK di email summary analisis (BackupMonitorWindow)"""
+    filename: str
+    backup_type: str
+    database_name: str
+    backup_date: str
+    record_count: Any
+    status: str
+
+    @classmethod
+    def from_result(cls, bak_result: Dict[str, Any]) -> 'SummaryBakRow':
+        analysis = bak_result.get('analysis') or {}
+        if not analysis:
+            db_info = bak_result.get('database_info', {})
+            analysis = {
+                'backup_type': db_info.get('backup_type', 'Unknown'),
+                'database_name': db_info.get('database_name', 'Unknown'),
+                'backup_date': (db_info.get('backup_date')
+                                or bak_result.get('backup_header', {}).get('backup_finish_date') or 'Unknown'),
+                'database_info': db_info
+            }
+
+        backup_date = analysis.get('backup_date', 'Unknown')
+        record_count = analysis.get('database_info', {}).get('record_count')
+        if record_count is None:
+            record_count = analysis.get('database_info', {}).get('estimated_rows', 'N/A')
+
+        if bak_result.get('error') or bak_result.get('analysis_status') == 'failed':
+            status = 'Error'
+        elif backup_date == 'Unknown':
+            status = 'Warning'
+        else:
+            status = 'Valid'
+
+        return cls(
+            filename=bak_result.get('file_name') or bak_result.get('filename') or 'Unknown',
+            backup_type=analysis.get('backup_type', 'Unknown'),
+            database_name=analysis.get('database_name', 'Unknown'),
+            backup_date=backup_date,
+            record_count=record_count,
+            status=status
+        )
+
+    @property
+    def status_color(self) -> str:
+        return {'Error': 'red', 'Warning': 'orange'}.get(self.status, 'green')
+
+
+def _bak_size_mb(bak_result: Dict[str, Any]) -> float:
+    if 'file_size_mb' in bak_result:
+        return bak_result.get('file_size_mb', 0) or 0
+    try:
+        return (bak_result.get('file_size', 0) or 0) / (1024 * 1024)
+    except TypeError:
+        return 0
+
+
+def _is_bak_valid(bak_result: Dict[str, Any]) -> bool:
+    if bak_result.get('analysis_status') == 'success':
+        validation = bak_result.get('validation', {})
+        return bool(validation.get('is_valid_bak', True))
+    analysis = bak_result.get('analysis', {})
+    if analysis.get('error'):
+        return False
+    return analysis.get('backup_date', 'Unknown') != 'Unknown'
+
+
+class BackupSummary(NamedTuple):
+    """Ringkasan analisis ZIP/BAK untuk email summary (BackupMonitorWindow)"""
+    has_data: bool
+    has_zip_results: bool
+    has_bak_results: bool
+    total_zip_size_mb: float
+    total_bak_files: int
+    total_bak_size_mb: float
+    valid_zips: int
+    valid_baks: int
+    zip_rows: Tuple[SummaryZipRow, ...]
+    bak_rows: Tuple[SummaryBakRow, ...]
+    recommendations: Tuple[str, ...]
+    generated_at: str
+
+    @classmethod
+    def from_results(cls, zip_results: Optional[List[Dict[str, Any]]] = None,
+                     bak_results: Optional[List[Dict[str, Any]]] = None, modified_date=None,
+                     generated_at: Optional[datetime] = None) -> 'BackupSummary':
+        zip_results = zip_results or []
+        bak_results = bak_results or []
+        modified_date = modified_date or (lambda path: 'Unknown')
+        generated_at = generated_at or datetime.now()
+
+        zip_entries = [r for r in zip_results if str(r.get('zip_file', '')).lower().endswith('.zip')]
+        if zip_results:
+            all_baks = [b for r in zip_results for b in r.get('bak_analyses', [])]
+        else:
+            # Analisis BAK saja: tanpa konteks ZIP
+            all_baks = list(bak_results)
+
+        return cls(
+            has_data=bool(zip_results or bak_results),
+            has_zip_results=bool(zip_results),
+            has_bak_results=bool(bak_results),
+            total_zip_size_mb=sum(r.get('file_size_mb', 0) for r in zip_entries),
+            total_bak_files=len(all_baks),
+            total_bak_size_mb=sum(_bak_size_mb(b) for b in all_baks),
+            valid_zips=sum(1 for r in zip_entries if r.get('integrity_check', {}).get('is_valid', False)),
+            valid_baks=sum(1 for b in all_baks if _is_bak_valid(b)),
+            zip_rows=tuple(SummaryZipRow.from_result(r, modified_date) for r in zip_entries),
+            bak_rows=tuple(SummaryBakRow.from_result(b) for b in bak_results),
+            recommendations=tuple(backup_recommendations(zip_results, bak_results)),
+            generated_at=generated_at.strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+    @property
+    def total_zip_files(self) -> int:
+        return len(self.zip_rows)
+
+
+def backup_recommendations(zip_results: List[Dict[str, Any]], bak_results: List[Dict[str, Any]]) -> List[str]:
+    """Rekomendasi email summary dari hasil analisis ZIP dan BAK"""
+    recommendations = []
+
+    invalid_zips = [r for r in zip_results if not r.get('integrity_check', {}).get('is_valid', False)]
+    if invalid_zips:
+        recommendations.append(f"🔍 Terdapat {len(invalid_zips)} file ZIP dengan integrity yang tidak valid. "
+                               "Disarankan untuk memeriksa ulang file backup tersebut.")
+
+    problematic_baks = [r for r in bak_results if 'error' in r.get('analysis', {})]
+    if problematic_baks:
+        recommendations.append(f"⚠️ Terdapat {len(problematic_baks)} file BAK yang mengalami error saat analisis. "
+                               "Disarankan untuk memeriksa struktur file backup.")
+
+    old_backups = [r for r in bak_results if is_old_backup(r.get('analysis', {}).get('backup_date', ''))]
+    if old_backups:
+        recommendations.append(f"📅 Terdapat {len(old_backups)} file backup yang sudah cukup lama. "
+                               "Disarankan untuk membuat backup baru.")
+
+    if not recommendations:
+        recommendations.append("✅ Semua file backup dalam kondisi baik dan layak digunakan.")
+    return recommendations
+
+
+def top_failures(common_failures: Dict[str, int], limit: int = 5) -> List[Tuple[str, int]]:
+    """Kegagalan checklist terbanyak, urut menurun"""
+    return sorted(common_failures.items(), key=lambda item: item[1], reverse=True)[:limit]
@@ -14,9 +14,16 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import sqlite3
 
+from mtf_parser import parse_mtf
+from analysis_cache import AnalysisCache, get_default_cache, member_fingerprint
+
 class EnhancedBAKAnalyzer:
-    def __init__(self):
+    # Naikkan jika format hasil analisis berubah (invalidasi analysis cache)
+    CACHE_VERSION = '1'
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
         self.sql_server_available = self._check_sql_server()
+        self.analysis_cache = cache if cache is not None else get_default_cache()
 
     def _check_sql_server(self) -> bool:
         """Check if SQL Server is available"""
@@ -31,6 +38,23 @@ class EnhancedBAKAnalyzer:
         """
         Analisis komprehensif BAK file dengan deteksi database yang lebih baik
         """
+        try:
+            fingerprint = (member_fingerprint(zip_file, bak_path) if zip_file
+                           else self.analysis_cache.file_fingerprint(bak_path))
+        except (OSError, KeyError):
+            return self._analyze_bak_file_comprehensive(bak_path, zip_file)
+
+        # Hasil restore bergantung pada ketersediaan SQL Server
+        result = self.analysis_cache.get_or_compute(
+            'enhanced_bak', self.CACHE_VERSION, fingerprint,
+            lambda: self._analyze_bak_file_comprehensive(bak_path, zip_file),
+            params=f"sql_server={int(self.sql_server_available)}"
+        )
+        result['filename'] = os.path.basename(bak_path)
+        return result
+
+    def _analyze_bak_file_comprehensive(self, bak_path: str, zip_file: Optional[zipfile.ZipFile] = None) -> Dict[str, Any]:
+        """Analisis tanpa cache (lihat analyze_bak_file_comprehensive)"""
         try:
             # Extract file if needed
             if zip_file:
@@ -140,6 +164,14 @@ class EnhancedBAKAnalyzer:
                         basic_info['is_sql_backup'] = True
                         break
 
+                # Header MTF native (setara RESTORE HEADERONLY)
+                mtf_header = self._read_mtf_header(bak_path)
+                if mtf_header:
+                    basic_info.update(self._mtf_header_to_info(mtf_header))
+                    basic_info['is_sql_backup'] = True
+                    basic_info['backup_date_source'] = 'mtf_header'
+                    return basic_info
+
                 # Extract text information
                 try:
                     header_text = header.decode('utf-8', errors='ignore')
@@ -175,6 +207,38 @@ class EnhancedBAKAnalyzer:
         except Exception as e:
             return {'error': str(e)}
 
+    def _read_mtf_header(self, bak_path: str) -> Optional[Dict[str, Any]]:
+        """Baca header backup set pertama dari descriptor block MTF"""
+        try:
+            parsed = parse_mtf(bak_path)
+            if parsed['backup_sets']:
+                backup_set = parsed['backup_sets'][0]
+                return dict(backup_set['header'], files=backup_set['files'])
+        except Exception:
+            pass
+        return None
+
+    def _mtf_header_to_info(self, mtf_header: Dict[str, Any]) -> Dict[str, Any]:
+        """Mapping field HEADERONLY ke format database_info analyzer ini"""
+        info = {
+            'database_name': mtf_header.get('DatabaseName'),
+            'backup_type': {1: 'FULL', 2: 'TRANSACTION LOG', 5: 'DIFFERENTIAL'}.get(
+                mtf_header.get('BackupType')),
+            'backup_name': mtf_header.get('BackupName'),
+            'server_name': mtf_header.get('ServerName'),
+            'user_name': mtf_header.get('UserName'),
+            'collation': mtf_header.get('Collation'),
+            'logical_files': [f['LogicalName'] for f in mtf_header.get('files', []) if f.get('LogicalName')]
+        }
+        if mtf_header.get('BackupStartDate'):
+            info['backup_date'] = mtf_header['BackupStartDate'].strftime('%Y-%m-%d %H:%M:%S')
+        if mtf_header.get('BackupFinishDate'):
+            info['backup_finish_date'] = mtf_header['BackupFinishDate'].strftime('%Y-%m-%d %H:%M:%S')
+        if mtf_header.get('SoftwareVersionMajor'):
+            info['sql_version'] = f"{mtf_header['SoftwareVersionMajor']}.{mtf_header.get('SoftwareVersionMinor') or 0}"
+        # Field yang tidak ada di header tidak menimpa nilai fallback
+        return {key: value for key, value in info.items() if value}
+
     def _extract_db_name_from_filename(self, filepath: str) -> str:
         """Extract database name from filename"""
         filename = os.path.basename(filepath).lower()
@@ -209,9 +273,18 @@ class EnhancedBAKAnalyzer:
         try:
             # Generate unique database name
             db_name = f"temp_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            data_dir = 'C:\\Program Files\\Microsoft SQL Server\\MSSQL15.MSSQLSERVER\\MSSQL\\DATA'
+
+            # Nama file logical diambil dari header MTF (setara RESTORE FILELISTONLY)
+            mtf_header = self._read_mtf_header(bak_path)
+            files = (mtf_header or {}).get('files') or []
+            if mtf_header:
+                result['backup_header'] = self._mtf_header_to_info(mtf_header)
+            data_file = next((f['LogicalName'] for f in files if f['Type'] == 'D' and f['LogicalName']), db_name)
+            log_file = next((f['LogicalName'] for f in files if f['Type'] == 'L' and f['LogicalName']), f'{db_name}_log')
 
             # Restore command
-            restore_cmd = f'sqlcmd -S localhost -U sa -P windows0819 -Q "RESTORE DATABASE [{db_name}] FROM DISK = \'{bak_path}\' WITH REPLACE, MOVE \'{db_name}\' TO \'C:\\Program Files\\Microsoft SQL Server\\MSSQL15.MSSQLSERVER\\MSSQL\\DATA\\{db_name}.mdf\', MOVE \'{db_name}_log\' TO \'C:\\Program Files\\Microsoft SQL Server\\MSSQL15.MSSQLSERVER\\MSSQL\\DATA\\{db_name}_log.ldf\'" -h -1'
+            restore_cmd = f'sqlcmd -S localhost -U sa -P windows0819 -Q "RESTORE DATABASE [{db_name}] FROM DISK = \'{bak_path}\' WITH REPLACE, MOVE \'{data_file}\' TO \'{data_dir}\\{db_name}.mdf\', MOVE \'{log_file}\' TO \'{data_dir}\\{db_name}_log.ldf\'" -h -1'
 
             # Execute restore
             restore_result = subprocess.run(restore_cmd, shell=True, capture_output=True, text=True, timeout=300)
@@ -374,6 +447,14 @@ class EnhancedBAKAnalyzer:
                     'compatibility_level': 'Unknown'
                 }
 
+                # Header MTF native, regex hanya sebagai fallback
+                mtf_header = self._read_mtf_header(bak_path)
+                if mtf_header:
+                    db_info.update(self._mtf_header_to_info(mtf_header))
+                    db_info['header_source'] = 'mtf'
+                    db_info.update(self._estimate_database_stats(db_info['database_name'], db_info['size_mb']))
+                    return db_info
+
                 # Enhanced header analysis
                 try:
                     header_text = header.decode('utf-8', errors='ignore')
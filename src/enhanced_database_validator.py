@@ -17,6 +17,11 @@ import struct
 
 # Import tape analyzer
 from tape_file_analyzer import TapeFileAnalyzer
+from zip_verifier import get_default_verifier
+from table_stats import TableStatistics, load_row_count_config
+from freshness import discover_date_columns
+from schema_registry import get_default_registry
+from backup_connection import connect_backup
 
 class EnhancedDatabaseValidator:
     def __init__(self):
@@ -30,6 +35,9 @@ class EnhancedDatabaseValidator:
             b'TAPE': 'tape_format',
         }
         self.tape_analyzer = TapeFileAnalyzer()
+        self.zip_verifier = get_default_verifier()
+        # Mode jumlah baris ([ROW_COUNTS]): exact, atau perkiraan untuk tabel non-kunci
+        self.row_count_options = load_row_count_config()
 
     def validate_backup_databases(self, zip_files: List[str]) -> Dict:
         """
@@ -99,7 +107,7 @@ class EnhancedDatabaseValidator:
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 # Test ZIP integrity
-                test_result = zip_ref.testzip()
+                test_result = self.zip_verifier.verify(zip_path, zip_ref=zip_ref)['bad_file']
                 if test_result is not None:
                     result['is_valid'] = False
                     result['error'] = f"Corrupted file: {test_result}"
@@ -269,51 +277,52 @@ class EnhancedDatabaseValidator:
 
             # Jika bukan TAPE, coba sebagai SQLite
             try:
-                conn = sqlite3.connect(db_path)
+                conn = connect_backup(db_path)
                 cursor = conn.cursor()
+                # Schema dibaca sekali; setiap tabel cukup satu query agregat
+                stats = TableStatistics(cursor, **self.row_count_options)
 
                 # Get database info
                 cursor.execute("PRAGMA database_list")
                 db_info = cursor.fetchall()
 
                 # Get all tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [row[0] for row in cursor.fetchall()]
+                tables = stats.tables()
                 analysis['tables'] = tables
 
                 # Detect database type
                 analysis['database_type'] = self._detect_database_type(tables)
 
+                # Analyze based on database type (tabel kunci di-scan sekali beserta kolom
+                # tanggalnya, detail tabel di bawah memakai ulang jumlah record-nya)
+                if analysis['database_type'] == 'plantware':
+                    analysis['key_tables_info'] = self._analyze_plantware_database(stats)
+                elif analysis['database_type'] == 'venus':
+                    analysis['key_tables_info'] = self._analyze_venus_database(stats)
+                elif analysis['database_type'] == 'staging':
+                    analysis['key_tables_info'] = self._analyze_staging_database(stats)
+
                 # Get table details
                 for table in tables:
                     try:
-                        cursor.execute(f"PRAGMA table_info({table})")
-                        columns = cursor.fetchall()
-
-                        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = cursor.fetchone()[0]
-
+                        table_stats = stats.table_stats(table)
                         analysis['table_details'][table] = {
-                            'columns': columns,
-                            'record_count': count
+                            'columns': stats.columns(table),
+                            'record_count': table_stats.record_count
                         }
+                        if table_stats.approximate:
+                            analysis['table_details'][table]['record_count_approximate'] = True
+                            analysis['table_details'][table]['record_count_error'] = table_stats.count_error
                     except Exception as e:
                         analysis['warnings'].append(f"Could not analyze table {table}: {e}")
 
-                # Analyze based on database type
-                if analysis['database_type'] == 'plantware':
-                    analysis['key_tables_info'] = self._analyze_plantware_database(cursor)
-                elif analysis['database_type'] == 'venus':
-                    analysis['key_tables_info'] = self._analyze_venus_database(cursor)
-                elif analysis['database_type'] == 'staging':
-                    analysis['key_tables_info'] = self._analyze_staging_database(cursor)
-
                 # Get total records
                 analysis['total_records'] = sum(
                     table_info.get('record_count', 0)
                     for table_info in analysis['table_details'].values()
                 )
 
+                stats.close()
                 conn.close()
 
             except sqlite3.Error as e:
@@ -388,108 +397,79 @@ class EnhancedDatabaseValidator:
         return analysis
 
     def _detect_database_type(self, tables: List[str]) -> str:
-        """Detect database type based on table names"""
-        # Jika tables kosong (biasanya untuk tape format), cek berdasarkan format info
-        if not tables:
-            return 'plantware'  # Asumsi Plantware untuk tape format
-
-        table_names_upper = [t.upper() for t in tables]
+        """Detect database type based on table names (schema registry bersama)"""
+        # Tabel kosong / tidak dikenal (biasanya tape format): asumsi Plantware
+        return get_default_registry().detect(tables, default='plantware')
 
-        # Check for Plantware specific tables
-        plantware_indicators = ['PR_TASKREG', 'PR_TASK', 'PR_PROJECT', 'PR_USER', 'PR_DEPARTMENT']
-        if any(indicator in table_names_upper for indicator in plantware_indicators):
-            return 'plantware'
-
-        # Check for Venus specific tables
-        venus_indicators = ['TA_MACHINE', 'TA_TRANSACTION', 'TA_LOG', 'TA_EMPLOYEE']
-        if any(indicator in table_names_upper for indicator in venus_indicators):
-            return 'venus'
-
-        # Check for Staging specific tables
-        staging_indicators = ['GWSCANNER', 'GW_LOG', 'SCANNER_DATA', 'GW_TRANSACTION']
-        if any(indicator in table_names_upper for indicator in staging_indicators):
-            return 'staging'
-
-        # Jika tidak ada tables yang terdeteksi, tapi file besar, kemungkinan Plantware tape format
-        return 'plantware'
-
-    def _analyze_plantware_database(self, cursor) -> Dict:
+    def _analyze_plantware_database(self, stats: TableStatistics) -> Dict:
         """Analyze Plantware database specifically"""
         info = {}
 
         # Analyze PR_TASKREG table
-        if self._table_exists(cursor, 'PR_TASKREG'):
+        if stats.has_table('PR_TASKREG'):
             info['PR_TASKREG'] = self._analyze_table_with_dates(
-                cursor, 'PR_TASKREG',
+                stats, 'PR_TASKREG',
                 ['TASK_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'START_DATE', 'END_DATE']
             )
 
         # Analyze PR_TASK table
-        if self._table_exists(cursor, 'PR_TASK'):
+        if stats.has_table('PR_TASK'):
             info['PR_TASK'] = self._analyze_table_with_dates(
-                cursor, 'PR_TASK',
+                stats, 'PR_TASK',
                 ['TASK_DATE', 'CREATED_DATE', 'MODIFIED_DATE']
             )
 
         # Analyze PR_PROJECT table
-        if self._table_exists(cursor, 'PR_PROJECT'):
+        if stats.has_table('PR_PROJECT'):
             info['PR_PROJECT'] = self._analyze_table_with_dates(
-                cursor, 'PR_PROJECT',
+                stats, 'PR_PROJECT',
                 ['PROJECT_DATE', 'CREATED_DATE', 'MODIFIED_DATE']
             )
 
         return info
 
-    def _analyze_venus_database(self, cursor) -> Dict:
+    def _analyze_venus_database(self, stats: TableStatistics) -> Dict:
         """Analyze Venus database specifically"""
         info = {}
 
         # Analyze TA_TRANSACTION table
-        if self._table_exists(cursor, 'TA_TRANSACTION'):
+        if stats.has_table('TA_TRANSACTION'):
             info['TA_TRANSACTION'] = self._analyze_table_with_dates(
-                cursor, 'TA_TRANSACTION',
+                stats, 'TA_TRANSACTION',
                 ['TRANSACTION_DATE', 'CREATE_DATE', 'LOG_DATE']
             )
 
         # Analyze TA_MACHINE table
-        if self._table_exists(cursor, 'TA_MACHINE'):
+        if stats.has_table('TA_MACHINE'):
             info['TA_MACHINE'] = self._analyze_table_with_dates(
-                cursor, 'TA_MACHINE',
+                stats, 'TA_MACHINE',
                 ['INSTALL_DATE', 'LAST_SERVICE_DATE']
             )
 
         return info
 
-    def _analyze_staging_database(self, cursor) -> Dict:
+    def _analyze_staging_database(self, stats: TableStatistics) -> Dict:
         """Analyze Staging database specifically"""
         info = {}
 
         # Analyze GWSCANNER table
-        if self._table_exists(cursor, 'GWSCANNER'):
+        if stats.has_table('GWSCANNER'):
             info['GWSCANNER'] = self._analyze_table_with_dates(
-                cursor, 'GWSCANNER',
+                stats, 'GWSCANNER',
                 ['SCAN_DATE', 'CREATE_DATE', 'UPDATE_DATE']
             )
 
         # Analyze GW_TRANSACTION table
-        if self._table_exists(cursor, 'GW_TRANSACTION'):
+        if stats.has_table('GW_TRANSACTION'):
             info['GW_TRANSACTION'] = self._analyze_table_with_dates(
-                cursor, 'GW_TRANSACTION',
+                stats, 'GW_TRANSACTION',
                 ['TRANSACTION_DATE', 'CREATE_DATE']
             )
 
         return info
 
-    def _table_exists(self, cursor, table_name: str) -> bool:
-        """Check if table exists"""
-        try:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-            return cursor.fetchone() is not None
-        except:
-            return False
-
-    def _analyze_table_with_dates(self, cursor, table_name: str, date_columns: List[str]) -> Dict:
-        """Analyze table with date columns"""
+    def _analyze_table_with_dates(self, stats: TableStatistics, table_name: str, date_columns: List[str]) -> Dict:
+        """Analyze table with date columns (jumlah, tanggal terbaru dan record 30 hari dalam satu query)"""
         info = {
             'record_count': 0,
             'date_columns_found': [],
@@ -498,36 +478,16 @@ class EnhancedDatabaseValidator:
         }
 
         try:
-            # Get record count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            info['record_count'] = cursor.fetchone()[0]
-
-            # Check which date columns exist
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [row[1] for row in cursor.fetchall()]
-
-            for date_col in date_columns:
-                if date_col in columns:
-                    info['date_columns_found'].append(date_col)
-
-                    # Get latest date
-                    try:
-                        cursor.execute(f"SELECT MAX({date_col}) FROM {table_name} WHERE {date_col} IS NOT NULL")
-                        latest_date = cursor.fetchone()[0]
-                        if latest_date:
-                            info['latest_dates'][date_col] = latest_date
-                    except:
-                        pass
-
-                    # Get recent records count (last 30 days)
-                    try:
-                        thirty_days_ago = datetime.now() - timedelta(days=30)
-                        cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {date_col} >= ?",
-                                     (thirty_days_ago.strftime('%Y-%m-%d'),))
-                        recent_count = cursor.fetchone()[0]
-                        info['recent_records'][date_col] = recent_count
-                    except:
-                        pass
+            thirty_days_ago = datetime.now() - timedelta(days=30)
+            # Kandidat tetap + kolom tanggal yang ditemukan dari schema
+            date_columns = list(dict.fromkeys(list(date_columns) + discover_date_columns(stats, table_name)))
+            table_stats = stats.table_stats(table_name, date_columns,
+                                            recent_since=thirty_days_ago.strftime('%Y-%m-%d'))
+
+            info['record_count'] = table_stats.record_count
+            info['date_columns_found'] = stats.existing_columns(table_name, date_columns)
+            info['latest_dates'] = {col: value for col, value in table_stats.latest_dates.items() if value}
+            info['recent_records'] = dict(table_stats.recent_counts)
 
         except Exception as e:
             info['error'] = str(e)
@@ -10,14 +10,17 @@ import tempfile
 import shutil
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-import hashlib
 import json
 
 from enhanced_bak_analyzer import EnhancedBAKAnalyzer
+from zip_verifier import get_default_verifier
+from zip_central_directory import read_central_directory
+from file_hasher import get_default_hasher
 
 class EnhancedZIPAnalyzer:
     def __init__(self):
         self.bak_analyzer = EnhancedBAKAnalyzer()
+        self.zip_verifier = get_default_verifier()
 
     def analyze_zip_comprehensive(self, zip_path: str) -> Dict[str, Any]:
         """
@@ -62,8 +65,11 @@ class EnhancedZIPAnalyzer:
                 'recommendations': [f'Analisis gagal: {str(e)}']
             }
 
-    def _analyze_zip_metadata(self, zip_path: str) -> Dict[str, Any]:
-        """Analisis metadata file ZIP"""
+    def _analyze_zip_metadata(self, zip_path: str, metadata_only: bool = False) -> Dict[str, Any]:
+        """
+        Analisis metadata file ZIP dari central directory (data member tidak dibaca).
+        metadata_only=True juga melewati hash MD5 seluruh arsip.
+        """
         try:
             stat = os.stat(zip_path)
             filename = os.path.basename(zip_path)
@@ -75,23 +81,23 @@ class EnhancedZIPAnalyzer:
                 'file_size_mb': round(stat.st_size / (1024 * 1024), 2),
                 'created_time': datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
                 'modified_time': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
-                'file_hash': self._calculate_file_hash(zip_path),
+                'file_hash': None if metadata_only else self._calculate_file_hash(zip_path),
                 'backup_date_from_filename': self._extract_date_from_filename(filename),
                 'database_type_from_filename': self._extract_database_type_from_filename(filename)
             }
 
             # Analyze ZIP structure
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_file_list = zip_ref.namelist()
-
-                zip_info.update({
-                    'total_files': len(zip_file_list),
-                    'total_compressed_size': sum(zinfo.compress_size for zinfo in zip_ref.infolist()),
-                    'total_uncompressed_size': sum(zinfo.file_size for zinfo in zip_ref.infolist()),
-                    'compression_ratio': self._calculate_compression_ratio(zip_ref),
-                    'file_types': self._analyze_file_types(zip_file_list),
-                    'directory_structure': self._analyze_directory_structure(zip_file_list)
-                })
+            central_directory = read_central_directory(zip_path)
+            zip_file_list = central_directory.names()
+
+            zip_info.update({
+                'total_files': len(zip_file_list),
+                'total_compressed_size': central_directory.total_compressed,
+                'total_uncompressed_size': central_directory.total_uncompressed,
+                'compression_ratio': central_directory.compression_ratio,
+                'file_types': self._analyze_file_types(zip_file_list),
+                'directory_structure': self._analyze_directory_structure(zip_file_list)
+            })
 
             return zip_info
 
@@ -99,14 +105,10 @@ class EnhancedZIPAnalyzer:
             return {'error': str(e)}
 
     def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate MD5 hash of file"""
+        """SHA-256 file dari hashing service (di-hash sekali per modifikasi arsip)"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except:
+            return get_default_hasher().hash_file(file_path).digests['sha256']
+        except Exception:
             return "Hash calculation failed"
 
     def _extract_date_from_filename(self, filename: str) -> str:
@@ -148,18 +150,6 @@ class EnhancedZIPAnalyzer:
         else:
             return 'Unknown'
 
-    def _calculate_compression_ratio(self, zip_ref: zipfile.ZipFile) -> float:
-        """Calculate ZIP compression ratio"""
-        try:
-            total_compressed = sum(zinfo.compress_size for zinfo in zip_ref.infolist())
-            total_uncompressed = sum(zinfo.file_size for zinfo in zip_ref.infolist())
-
-            if total_uncompressed > 0:
-                return round((1 - total_compressed / total_uncompressed) * 100, 2)
-            return 0.0
-        except:
-            return 0.0
-
     def _analyze_file_types(self, file_list: List[str]) -> Dict[str, int]:
         """Analyze file types in ZIP"""
         file_types = {}
@@ -207,28 +197,22 @@ class EnhancedZIPAnalyzer:
 
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Test ZIP integrity
-                try:
-                    test_result = zip_ref.testzip()
-                    if test_result is not None:
-                        validation['corruption_detected'] = True
-                        validation['warnings'].append(f"Corrupted file: {test_result}")
-                        validation['can_be_extracted'] = False
-                    else:
-                        validation['is_valid_zip'] = True
-                except Exception as e:
+                # Test ZIP integrity; satu pass verifier sekaligus memastikan
+                # setiap member bisa dibaca sampai habis
+                record = self.zip_verifier.verify(zip_path, zip_ref=zip_ref)
+                if record['error']:
                     validation['corruption_detected'] = True
-                    validation['warnings'].append(f"ZIP test failed: {str(e)}")
+                    validation['warnings'].append(f"ZIP test failed: {record['error']}")
                     validation['can_be_extracted'] = False
-
-                # Check all files can be read
-                try:
-                    for zinfo in zip_ref.infolist():
-                        with zip_ref.open(zinfo.filename) as f:
-                            f.read(1024)  # Try to read first 1KB
-                except Exception as e:
-                    validation['warnings'].append(f"Cannot read some files: {str(e)}")
+                elif record['bad_file'] is not None:
+                    validation['corruption_detected'] = True
+                    validation['warnings'].append(f"Corrupted file: {record['bad_file']}")
                     validation['can_be_extracted'] = False
+                    unreadable = [m for m in record['members'] if m['error']]
+                    if unreadable:
+                        validation['warnings'].append(f"Cannot read some files: {unreadable[0]['error']}")
+                else:
+                    validation['is_valid_zip'] = True
 
             # Determine overall integrity
             if validation['corruption_detected']:
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+File Hasher Module
+Fingerprint arsip backup: beberapa digest (SHA-256, BLAKE2b, CRC32, ...)
+dihitung dalam satu kali baca dengan buffer besar (readinto ke buffer yang
+dipakai ulang, atau mmap), beberapa file di-hash paralel di thread pool
+(hashlib dan zlib melepas GIL untuk buffer besar), dan hasilnya disimpan di
+store SQLite per (path, size, mtime, inode) sehingga setiap arsip hanya
+di-hash sekali per modifikasi.
+
+Digest yang tersimpan juga dipakai untuk mendeteksi arsip duplikat dan
+bit-rot (isi berubah padahal ukuran/mtime tetap).
+"""
+
+import os
+import mmap
+import json
+import zlib
+import hashlib
+import sqlite3
+import threading
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+DEFAULT_STORE_FILE = 'config/file_hashes.db'
+DEFAULT_ALGORITHMS = ('sha256', 'blake2b', 'crc32')
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024      # 8 MB per read
+DEFAULT_WORKERS = 4
+BUSY_TIMEOUT = 30.0                       # detik menunggu lock tulis store dari proses lain
+
+STATUS_NEW = 'new'            # belum pernah di-hash
+STATUS_OK = 'ok'              # digest sama dengan yang tersimpan
+STATUS_MODIFIED = 'modified'  # ukuran/mtime berubah sejak hash terakhir
+STATUS_CORRUPTED = 'corrupted'  # isi berubah padahal ukuran/mtime sama (bit-rot)
+
+
+class _CRC32:
+    """CRC32 dengan antarmuka hashlib (update/hexdigest)"""
+
+    def __init__(self):
+        self.value = 0
+
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+
+    def hexdigest(self) -> str:
+        return f"{self.value & 0xFFFFFFFF:08x}"
+
+
+def new_digest(algorithm: str):
+    """Objek digest untuk nama algoritma hashlib, atau 'crc32'"""
+    if algorithm == 'crc32':
+        return _CRC32()
+    return hashlib.new(algorithm)
+
+
+def compute_digests(file_path: str, algorithms: Sequence[str] = DEFAULT_ALGORITHMS,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = False) -> Dict[str, str]:
+    """Hitung semua digest file dalam satu kali baca"""
+    digests = [(algorithm, new_digest(algorithm)) for algorithm in algorithms]
+
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, size, chunk_size):
+                        chunk = view[start:start + chunk_size]
+                        for _, digest in digests:
+                            digest.update(chunk)
+                        chunk.release()
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                chunk = view[:read]
+                for _, digest in digests:
+                    digest.update(chunk)
+
+    return {algorithm: digest.hexdigest() for algorithm, digest in digests}
+
+
+class FileDigests(NamedTuple):
+    """Digest satu file beserta identitas file saat di-hash"""
+    path: str
+    size: int
+    mtime_ns: int
+    digests: Dict[str, str]
+    hashed_at: str
+    cached: bool
+    status: str = STATUS_NEW
+
+
+class HashStore:
+    """
+    Store SQLite digest per file. Entry berlaku selama path, size, mtime dan
+    inode tidak berubah (sama seperti ScanIndex).
+    """
+
+    def __init__(self, store_path: Optional[str] = None):
+        if not store_path:
+            store_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), DEFAULT_STORE_FILE)
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka store (lazy) dan buat schema jika belum ada"""
+        if self._conn is None:
+            store_dir = os.path.dirname(self.store_path)
+            if store_dir:
+                os.makedirs(store_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.store_path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    digests TEXT NOT NULL,
+                    sha256 TEXT,
+                    hashed_at TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_file_hashes_sha256 ON file_hashes (sha256)")
+            self._conn.commit()
+        return self._conn
+
+    def lookup(self, path: str) -> Optional[Dict]:
+        """Entry tersimpan untuk path (tanpa cek identitas), atau None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT size, mtime_ns, inode, digests, hashed_at FROM file_hashes WHERE path = ?",
+                (os.path.abspath(path),)
+            ).fetchone()
+        if not row:
+            return None
+        size, mtime_ns, inode, digests, hashed_at = row
+        return {'size': size, 'mtime_ns': mtime_ns, 'inode': inode, 'digests': json.loads(digests),
+                'hashed_at': hashed_at}
+
+    def store(self, path: str, stat_result: os.stat_result, digests: Dict[str, str], hashed_at: str):
+        """Simpan (atau timpa) digest satu file"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, digests, sha256, hashed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(path), stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino,
+                 json.dumps(digests, sort_keys=True), digests.get('sha256'), hashed_at)
+            )
+            conn.commit()
+
+    def duplicates(self) -> List[List[str]]:
+        """Grup path dengan SHA-256 dan ukuran sama (minimal dua file per grup)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT sha256, size, path FROM file_hashes WHERE sha256 IN ("
+                "  SELECT sha256 FROM file_hashes WHERE sha256 IS NOT NULL "
+                "  GROUP BY sha256, size HAVING COUNT(*) > 1"
+                ") ORDER BY sha256, path"
+            ).fetchall()
+        groups: Dict[tuple, List[str]] = {}
+        for sha256, size, path in rows:
+            groups.setdefault((sha256, size), []).append(path)
+        return [paths for paths in groups.values() if len(paths) > 1]
+
+    def prune(self, existing_paths: Iterable[str]) -> int:
+        """Hapus entry untuk file yang sudah tidak ada. Returns: jumlah entry dihapus"""
+        keep = {os.path.abspath(p) for p in existing_paths}
+        with self._lock:
+            conn = self._connect()
+            stored = [row[0] for row in conn.execute("SELECT path FROM file_hashes")]
+            stale = [(p,) for p in stored if p not in keep and not os.path.exists(p)]
+            if stale:
+                conn.executemany("DELETE FROM file_hashes WHERE path = ?", stale)
+                conn.commit()
+        return len(stale)
+
+    def close(self):
+        """Tutup koneksi store"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class FileHasher:
+    """
+    Service hashing arsip: digest multi-algoritma satu pass, paralel antar
+    file, dan hasil tersimpan per modifikasi file.
+    """
+
+    def __init__(self, algorithms: Sequence[str] = DEFAULT_ALGORITHMS, store_path: Optional[str] = None,
+                 workers: int = DEFAULT_WORKERS, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 use_mmap: bool = False, store: Optional[HashStore] = None):
+        # SHA-256 selalu dihitung: dipakai sebagai file_hash analyzer dan kunci deteksi duplikat
+        algorithms = tuple(dict.fromkeys(('sha256',) + tuple(algorithms)))
+        for algorithm in algorithms:
+            new_digest(algorithm)   # ValueError untuk nama algoritma yang tidak dikenal
+        self.algorithms = algorithms
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self.store = store or HashStore(store_path)
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self._counter_lock = threading.Lock()
+
+    def _hash(self, file_path: str) -> Dict[str, str]:
+        digests = compute_digests(file_path, self.algorithms, self.chunk_size, self.use_mmap)
+        with self._counter_lock:
+            self.files_hashed += 1
+            self.bytes_hashed += os.path.getsize(file_path)
+        return digests
+
+    def hash_file(self, file_path: str, verify: bool = False) -> FileDigests:
+        """
+        Digest file; dipakai dari store jika file belum berubah sejak hash terakhir.
+
+        Args:
+            verify: hash ulang walaupun ada di store dan bandingkan hasilnya
+                    (status STATUS_CORRUPTED jika isi berbeda tanpa perubahan ukuran/mtime)
+        """
+        stat_result = os.stat(file_path)
+        stored = self.store.lookup(file_path)
+        unchanged = stored is not None and \
+            (stored['size'], stored['mtime_ns'], stored['inode']) == \
+            (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+
+        if unchanged and not verify and all(a in stored['digests'] for a in self.algorithms):
+            return FileDigests(os.path.abspath(file_path), stat_result.st_size, stat_result.st_mtime_ns,
+                               {a: stored['digests'][a] for a in self.algorithms}, stored['hashed_at'],
+                               cached=True, status=STATUS_OK)
+
+        digests = self._hash(file_path)
+        hashed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        if stored is None:
+            status = STATUS_NEW
+        elif not unchanged:
+            status = STATUS_MODIFIED
+        elif any(stored['digests'].get(a, digests[a]) != digests[a] for a in self.algorithms):
+            status = STATUS_CORRUPTED
+        else:
+            status = STATUS_OK
+
+        # Digest lama dipertahankan sebagai bukti jika isi berubah diam-diam
+        if status != STATUS_CORRUPTED:
+            self.store.store(file_path, stat_result, digests, hashed_at)
+        return FileDigests(os.path.abspath(file_path), stat_result.st_size, stat_result.st_mtime_ns,
+                           digests, hashed_at, cached=False, status=status)
+
+    def hash_files(self, file_paths: Sequence[str], verify: bool = False) -> List[FileDigests]:
+        """Hash banyak file paralel; hasil urut sesuai input"""
+        if self.workers == 1 or len(file_paths) <= 1:
+            return [self.hash_file(path, verify) for path in file_paths]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(file_paths)),
+                                thread_name_prefix='file-hasher') as executor:
+            return list(executor.map(lambda path: self.hash_file(path, verify), file_paths))
+
+    def duplicates(self) -> List[List[str]]:
+        """Grup arsip dengan isi identik (SHA-256 + ukuran)"""
+        return self.store.duplicates()
+
+    def close(self):
+        self.store.close()
+
+
+def load_hashing_config(config_path: Optional[str] = None) -> Dict:
+    """Opsi FileHasher dari section [HASHING] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    options = {}
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('HASHING'):
+            section = config['HASHING']
+            store_path = section.get('store_file', '') or None
+            if store_path and not os.path.isabs(store_path):
+                store_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), store_path)
+            options['store_path'] = store_path
+            algorithms = [a.strip().lower() for a in section.get('algorithms', '').split(',') if a.strip()]
+            if algorithms:
+                options['algorithms'] = algorithms
+            options['workers'] = section.getint('workers', fallback=DEFAULT_WORKERS)
+            options['chunk_size'] = section.getint('chunk_size_mb', fallback=DEFAULT_CHUNK_SIZE // (1024 * 1024)) \
+                * 1024 * 1024
+            options['use_mmap'] = section.getboolean('use_mmap', fallback=False)
+    except Exception as e:
+        print(f"Warning: Could not read hashing config: {e}")
+        options = {}
+    return options
+
+
+_default_hasher: Optional[FileHasher] = None
+_default_hasher_lock = threading.Lock()
+
+
+def get_default_hasher() -> FileHasher:
+    """FileHasher bersama dengan opsi dari [HASHING] (store di config/file_hashes.db)"""
+    global _default_hasher
+    if _default_hasher is None:
+        with _default_hasher_lock:
+            if _default_hasher is None:
+                options = load_hashing_config()
+                try:
+                    _default_hasher = FileHasher(**options)
+                except ValueError as e:
+                    print(f"Warning: Invalid hashing config ({e}), using defaults")
+                    _default_hasher = FileHasher(store_path=options.get('store_path'))
+    return _default_hasher
@@ -4,13 +4,34 @@ import tempfile
 import shutil
 import re
 from datetime import datetime, timedelta
-import sqlite3
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+from scan_index import ScanIndex
+from zip_verifier import ZipVerifier, get_default_verifier, summarize_members
+from dir_scanner import FileRecord, scan_directory
+from stability_gate import StabilityGate, STATE_PENDING
+from table_stats import TableStatistics
+from freshness import FreshnessStore, create_probe
+from schema_registry import SchemaRegistry, get_default_registry
+from backup_connection import connect_backup
 
 class FolderMonitor:
-    def __init__(self):
+    def __init__(self, scan_index: Optional[ScanIndex] = None,
+                 zip_verifier: Optional[ZipVerifier] = None,
+                 stability_gate: Optional[StabilityGate] = None,
+                 freshness_store: Optional[FreshnessStore] = None,
+                 registry: Optional[SchemaRegistry] = None):
         self.monitoring_path = ""
         self.temp_dir = None
+        # Index persisten agar ZIP yang tidak berubah tidak diverifikasi ulang
+        self.scan_index = scan_index if scan_index is not None else ScanIndex()
+        self.zip_verifier = zip_verifier if zip_verifier is not None else get_default_verifier()
+        # Arsip yang masih ditulis job backup ditunda, bukan dilaporkan rusak
+        self.stability_gate = stability_gate if stability_gate is not None else StabilityGate()
+        # None: store [FRESHNESS] bersama (config/freshness_columns.db)
+        self.freshness_store = freshness_store
+        self.registry = registry if registry is not None else get_default_registry()
+        self.pending_files = []
 
     def set_monitoring_path(self, path: str):
         """Set path folder yang akan dimonitoring"""
@@ -24,54 +45,48 @@ class FolderMonitor:
         if not self.monitoring_path or not os.path.exists(self.monitoring_path):
             return [], ""
 
-        # Pattern untuk mencari tanggal dalam format yang umum
-        date_patterns = [
-            r'(\d{4}-\d{2}-\d{2})',  # YYYY-MM-DD
-            r'(\d{2}-\d{2}-\d{4})',  # DD-MM-YYYY
-            r'(\d{4}_\d{2}_\d{2})',  # YYYY_MM_DD
-            r'(\d{2}_\d{2}_\d{4})',  # DD_MM_YYYY
-            r'(\d{8})',              # YYYYMMDD
-            r'(\d{6})',              # YYMMDD
-        ]
-
         zip_files = []
         date_groups = {}
         invalid_zips = []
+        self.pending_files = []
 
-        # Scan semua file zip
-        for file in os.listdir(self.monitoring_path):
-            if file.lower().endswith('.zip'):
-                file_path = os.path.join(self.monitoring_path, file)
+        # Scan semua file zip (satu scandir, metadata dipakai ulang untuk index & gate)
+        for record in scan_directory(self.monitoring_path):
+            file_path = record.path
+            stat_result = record.stat
 
+            state, reason = self.stability_gate.check(file_path, stat_result)
+            if state == STATE_PENDING:
+                self.pending_files.append(self.stability_gate.pending_entry(file_path, reason))
+                continue
+
+            # Gunakan hasil index jika arsip belum berubah sejak scan terakhir
+            cached = self.scan_index.lookup(file_path, stat_result)
+            if cached is not None:
+                is_valid = cached['is_valid']
+                file_date = cached['file_date']
+            else:
                 # Validasi ZIP file
-                if not self._validate_zip_file(file_path):
-                    invalid_zips.append(file)
-                    continue
-
-                zip_files.append(file_path)
-
-                # Ekstrak tanggal dari filename
-                file_date = None
-                for pattern in date_patterns:
-                    match = re.search(pattern, file)
-                    if match:
-                        date_str = match.group(1)
-                        # Konversi ke format YYYY-MM-DD
-                        file_date = self._normalize_date(date_str)
-                        break
-
-                if not file_date:
-                    # Jika tidak ada tanggal di filename, gunakan modification time
-                    mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    file_date = mod_time.strftime('%Y-%m-%d')
-
-                if file_date not in date_groups:
-                    date_groups[file_date] = []
-                date_groups[file_date].append(file_path)
+                is_valid, members, error = self._inspect_zip_file(file_path)
+                file_date = self._extract_file_date(record) if is_valid else None
+                self.scan_index.store(file_path, is_valid, file_date, members, error, stat_result)
+
+            if not is_valid:
+                invalid_zips.append(record.name)
+                continue
+
+            zip_files.append(file_path)
+
+            if file_date not in date_groups:
+                date_groups[file_date] = []
+            date_groups[file_date].append(file_path)
 
         # Log invalid ZIP files
         if invalid_zips:
             print(f"Warning: {len(invalid_zips)} invalid ZIP files found: {invalid_zips}")
+        if self.pending_files:
+            print(f"Pending: {len(self.pending_files)} ZIP files still being written: "
+                  f"{[entry['filename'] for entry in self.pending_files]}")
 
         if not date_groups:
             return [], ""
@@ -82,6 +97,19 @@ class FolderMonitor:
 
         return date_groups[latest_date], latest_date
 
+    def _extract_file_date(self, record: FileRecord) -> str:
+        """Tanggal arsip dari filename, fallback ke modification time"""
+        if record.filename_date is not None:
+            return record.filename_date.strftime('%Y-%m-%d')
+
+        # Format pendek YYMMDD (mis. Backup_251004.zip)
+        match = re.search(r'(\d{6})', record.name)
+        if match:
+            return self._normalize_date(match.group(1))
+
+        # Jika tidak ada tanggal di filename, gunakan modification time
+        return record.modified_date
+
     def _normalize_date(self, date_str: str) -> str:
         """Normalisasi format tanggal ke YYYY-MM-DD"""
         # Ganti underscore dengan dash
@@ -114,17 +142,26 @@ class FolderMonitor:
 
     def _validate_zip_file(self, zip_path: str) -> bool:
         """Validasi integrity file ZIP"""
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Test ZIP integrity
-                zip_ref.testzip()
-                # Check if ZIP is not empty
-                if len(zip_ref.namelist()) == 0:
-                    return False
-                return True
-        except Exception as e:
-            print(f"Invalid ZIP file {zip_path}: {str(e)}")
-            return False
+        is_valid, _, _ = self._inspect_zip_file(zip_path)
+        return is_valid
+
+    def _inspect_zip_file(self, zip_path: str) -> Tuple[bool, List[Dict], Optional[str]]:
+        """
+        Validasi integrity file ZIP sekaligus ambil daftar member
+        Returns: (is_valid, members, error)
+        """
+        record = self.zip_verifier.verify(zip_path)
+        if record['error']:
+            print(f"Invalid ZIP file {zip_path}: {record['error']}")
+            return False, [], record['error']
+
+        members = summarize_members(record)
+        if record['bad_file'] is not None:
+            return False, members, f"Corrupted file: {record['bad_file']}"
+        # Check if ZIP is not empty
+        if len(members) == 0:
+            return False, members, "ZIP file is empty"
+        return True, members, None
 
     def extract_zip_files(self, zip_files: List[str], extract_to: str = None) -> Dict[str, List[str]]:
         """
@@ -206,17 +243,18 @@ class FolderMonitor:
         result = {
             'tables': {},
             'errors': [],
-            'database_type': self._detect_database_type(bak_file_path)
+            'database_type': 'Unknown'
         }
 
         try:
             # Koneksi ke database SQLite
-            conn = sqlite3.connect(bak_file_path)
+            conn = connect_backup(bak_file_path)
             cursor = conn.cursor()
 
-            # Get table list
+            # Get table list (sekaligus untuk deteksi tipe, tanpa koneksi kedua)
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [table[0] for table in cursor.fetchall()]
+            result['database_type'] = self._detect_database_type(bak_file_path, tables)
 
             # Query berdasarkan database type
             if result['database_type'] == 'Plantware':
@@ -233,10 +271,12 @@ class FolderMonitor:
 
         except Exception as e:
             result['errors'].append(f"Database connection error: {str(e)}")
+            if result['database_type'] == 'Unknown':
+                result['database_type'] = self._detect_database_type(bak_file_path)
 
         return result
 
-    def _detect_database_type(self, bak_file_path: str) -> str:
+    def _detect_database_type(self, bak_file_path: str, tables: Optional[List[str]] = None) -> str:
         """Deteksi tipe database berdasarkan filename atau tabel yang ada"""
         filename = os.path.basename(bak_file_path).lower()
 
@@ -246,132 +286,48 @@ class FolderMonitor:
             return 'Venus'
         elif 'staging' in filename:
             return 'Staging'
-        else:
-            # Deteksi berdasarkan tabel yang ada
-            try:
-                conn = sqlite3.connect(bak_file_path)
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                tables = [table[0].upper() for table in cursor.fetchall()]
-
-                if 'PR_TASKREG' in tables:
-                    return 'Plantware'
-                elif 'TA_MACHINE' in tables:
-                    return 'Venus'
-                elif 'GWSCANNER' in tables:
-                    return 'Staging'
-
-                conn.close()
-            except:
-                pass
 
-            return 'Unknown'
+        # Deteksi berdasarkan tabel yang ada (schema registry bersama, hasil disimpan per file)
+        return self.registry.detect_file(bak_file_path, tables).capitalize()
 
     def _query_plantware(self, cursor, tables: List[str]) -> Dict:
         """Query khusus untuk database Plantware"""
-        result = {'tables': {}, 'errors': []}
-
-        # Query tabel PR_TASKREG
-        if 'PR_TASKREG' in [t.upper() for t in tables]:
-            try:
-                # Get total records
-                cursor.execute("SELECT COUNT(*) FROM PR_TASKREG")
-                total_count = cursor.fetchone()[0]
-
-                # Get latest record date - coba beberapa kolom tanggal
-                date_columns = ['TASK_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'START_DATE', 'END_DATE']
-                latest_date = None
-
-                for col in date_columns:
-                    try:
-                        cursor.execute(f"SELECT MAX({col}) FROM PR_TASKREG")
-                        result_max = cursor.fetchone()
-                        if result_max and result_max[0]:
-                            latest_date = result_max[0]
-                            break
-                    except:
-                        continue
-
-                if latest_date:
-                    result['tables']['PR_TASKREG'] = f"{total_count} records (latest: {latest_date})"
-                else:
-                    result['tables']['PR_TASKREG'] = f"{total_count} records"
-
-            except Exception as e:
-                result['tables']['PR_TASKREG'] = f"Error: {str(e)}"
-                result['errors'].append(f"Error querying PR_TASKREG: {str(e)}")
-
-        return result
+        return self._query_key_table(cursor, tables, 'PR_TASKREG', 'Plantware',
+                                     ['TASK_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'START_DATE', 'END_DATE'])
 
     def _query_venus(self, cursor, tables: List[str]) -> Dict:
         """Query khusus untuk database Venus"""
-        result = {'tables': {}, 'errors': []}
-
-        # Query tabel TA_MACHINE
-        if 'TA_MACHINE' in [t.upper() for t in tables]:
-            try:
-                # Get total records
-                cursor.execute("SELECT COUNT(*) FROM TA_MACHINE")
-                total_count = cursor.fetchone()[0]
-
-                # Get latest record date
-                date_columns = ['MACHINE_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'LAST_UPDATE', 'TIMESTAMP']
-                latest_date = None
-
-                for col in date_columns:
-                    try:
-                        cursor.execute(f"SELECT MAX({col}) FROM TA_MACHINE")
-                        result_max = cursor.fetchone()
-                        if result_max and result_max[0]:
-                            latest_date = result_max[0]
-                            break
-                    except:
-                        continue
-
-                if latest_date:
-                    result['tables']['TA_MACHINE'] = f"{total_count} records (latest: {latest_date})"
-                else:
-                    result['tables']['TA_MACHINE'] = f"{total_count} records"
-
-            except Exception as e:
-                result['tables']['TA_MACHINE'] = f"Error: {str(e)}"
-                result['errors'].append(f"Error querying TA_MACHINE: {str(e)}")
-
-        return result
+        return self._query_key_table(cursor, tables, 'TA_MACHINE', 'Venus',
+                                     ['MACHINE_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'LAST_UPDATE', 'TIMESTAMP'])
 
     def _query_staging(self, cursor, tables: List[str]) -> Dict:
         """Query khusus untuk database Staging"""
+        return self._query_key_table(cursor, tables, 'GWSCANNER', 'Staging',
+                                     ['SCAN_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'TIMESTAMP', 'LOG_DATE'])
+
+    def _query_key_table(self, cursor, tables: List[str], table: str, database_type: str,
+                         date_columns: List[str]) -> Dict:
+        """Jumlah record dan tanggal terbaru tabel kunci"""
         result = {'tables': {}, 'errors': []}
 
-        # Query tabel GWSCANNER
-        if 'GWSCANNER' in [t.upper() for t in tables]:
+        table_name = next((t for t in tables if t.upper() == table), None)
+        if table_name:
             try:
-                # Get total records
-                cursor.execute("SELECT COUNT(*) FROM GWSCANNER")
-                total_count = cursor.fetchone()[0]
-
-                # Get latest record date
-                date_columns = ['SCAN_DATE', 'CREATED_DATE', 'MODIFIED_DATE', 'TIMESTAMP', 'LOG_DATE']
-                latest_date = None
-
-                for col in date_columns:
-                    try:
-                        cursor.execute(f"SELECT MAX({col}) FROM GWSCANNER")
-                        result_max = cursor.fetchone()
-                        if result_max and result_max[0]:
-                            latest_date = result_max[0]
-                            break
-                    except:
-                        continue
+                stats = TableStatistics(cursor)
+                total_count = stats.table_stats(table_name).record_count
+
+                # Tanggal terbaru: kolom yang diingat untuk tipe ini, kandidat, lalu kolom
+                # tanggal dari schema; lewat index atau scan mundur (bukan MAX per kolom)
+                latest_date = create_probe(stats, database_type, self.freshness_store).latest(table_name, date_columns).latest
 
                 if latest_date:
-                    result['tables']['GWSCANNER'] = f"{total_count} records (latest: {latest_date})"
+                    result['tables'][table] = f"{total_count} records (latest: {latest_date})"
                 else:
-                    result['tables']['GWSCANNER'] = f"{total_count} records"
+                    result['tables'][table] = f"{total_count} records"
 
             except Exception as e:
-                result['tables']['GWSCANNER'] = f"Error: {str(e)}"
-                result['errors'].append(f"Error querying GWSCANNER: {str(e)}")
+                result['tables'][table] = f"Error: {str(e)}"
+                result['errors'].append(f"Error querying {table}: {str(e)}")
 
         return result
 
@@ -429,6 +385,7 @@ class FolderMonitor:
             'extracted_data': {},
             'bak_files': {},
             'analysis_results': {},
+            'pending_files': [],
             'status': 'Ready',
             'errors': []
         }
@@ -438,6 +395,11 @@ class FolderMonitor:
             zip_files, latest_date = self.get_latest_zip_files_by_date()
             summary['latest_date'] = latest_date
             summary['zip_files'] = [os.path.basename(f) for f in zip_files]
+            summary['pending_files'] = list(self.pending_files)
+
+            if not zip_files and self.pending_files:
+                summary['status'] = 'Pending'
+                return summary
 
             if not zip_files:
                 summary['status'] = 'No files found'
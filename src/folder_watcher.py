@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Folder Watcher Module
+Watcher event-driven untuk folder backup: inotify di Linux, dengan fallback
+polling yang membandingkan snapshot direktori yang di-cache. Hanya arsip
+baru/berubah yang diantrikan, dan file yang masih ditulis ditahan (debounce)
+sampai ukuran dan mtime-nya stabil.
+"""
+
+import os
+import sys
+import time
+import queue
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DEBOUNCE_SECONDS = 5.0
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_FULL_RESCAN_INTERVAL = 300.0
+WATCH_BACKENDS = ('auto', 'inotify', 'polling')
+
+# Konstanta inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """Fungsi inotify dari libc, atau None jika tidak tersedia"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FolderWatcher:
+    """
+    Pantau folder dan antrikan path arsip yang baru dibuat atau berubah.
+
+    Event mentah (inotify atau diff snapshot) hanya menandai file sebagai
+    pending; file baru dikirim ke antrian setelah ukuran dan mtime tidak
+    berubah selama debounce_seconds.
+    """
+
+    def __init__(self, path: str, extensions: Iterable[str] = ('.zip',), recursive: bool = True,
+                 debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 full_rescan_interval: float = DEFAULT_FULL_RESCAN_INTERVAL,
+                 backend: str = 'auto', on_ready: Optional[Callable[[str], None]] = None):
+        if backend not in WATCH_BACKENDS:
+            raise ValueError(f"Unknown watch backend: {backend} (expected one of {WATCH_BACKENDS})")
+
+        self.path = os.path.abspath(path)
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.recursive = recursive
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.full_rescan_interval = full_rescan_interval
+        self.on_ready = on_ready
+        self.ready = queue.Queue()
+
+        self._libc = _load_inotify() if backend in ('auto', 'inotify') else None
+        if backend == 'inotify' and self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self.backend = 'inotify' if self._libc is not None else 'polling'
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._pending = {}       # path -> (size, mtime_ns, waktu perubahan terakhir)
+        self._snapshot = {}      # path -> (size, mtime_ns) file yang sudah stabil
+        self._dir_mtimes = {}    # dir -> mtime_ns (polling: hanya scan ulang dir yang berubah)
+        self._last_full_scan = 0.0
+
+    # ------------------------------------------------------------------ public
+
+    def start(self):
+        """Ambil snapshot awal lalu jalankan watcher di background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._full_scan(initial=True)
+        target = self._run_inotify if self.backend == 'inotify' else self._run_polling
+        self._thread = threading.Thread(target=target, name='FolderWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Hentikan watcher"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Tunggu sampai ada arsip yang siap dianalisis
+
+        Returns:
+            List path (tanpa duplikat) yang siap, kosong jika timeout
+        """
+        try:
+            first = self.ready.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        paths = [first]
+        while True:
+            try:
+                path = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            if path not in paths:
+                paths.append(path)
+        return paths
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # ---------------------------------------------------------------- internal
+
+    def _matches(self, path: str) -> bool:
+        return path.lower().endswith(self.extensions)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _scan_dir(self, directory: str, files: Dict[str, Tuple[int, int]], dirs: List[str]):
+        """Satu level scandir: isi files (path -> (size, mtime_ns)) dan daftar subdir"""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive:
+                                dirs.append(entry.path)
+                        elif self._matches(entry.name):
+                            st = entry.stat()
+                            files[entry.path] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+    def _full_scan(self, initial: bool = False):
+        """Scan seluruh tree; snapshot awal tidak memicu event"""
+        files, dir_mtimes = {}, {}
+        stack = [self.path]
+        while stack:
+            directory = stack.pop()
+            try:
+                dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            subdirs = []
+            self._scan_dir(directory, files, subdirs)
+            stack.extend(subdirs)
+
+        self._dir_mtimes = dir_mtimes
+        self._last_full_scan = time.monotonic()
+        if initial:
+            self._snapshot = files
+        else:
+            self._diff(files, set(dir_mtimes))
+
+    def _incremental_scan(self):
+        """Scan ulang hanya direktori yang mtime-nya berubah (file baru/rename/hapus)"""
+        changed_dirs = []
+        for directory, mtime_ns in list(self._dir_mtimes.items()):
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                # Direktori hilang: buang file di dalamnya dari snapshot
+                self._dir_mtimes.pop(directory, None)
+                prefix = directory + os.sep
+                for path in [p for p in self._snapshot if p.startswith(prefix)]:
+                    self._snapshot.pop(path, None)
+                continue
+            if current != mtime_ns:
+                changed_dirs.append(directory)
+                self._dir_mtimes[directory] = current
+
+        for directory in changed_dirs:
+            files, subdirs = {}, []
+            self._scan_dir(directory, files, subdirs)
+            self._diff(files, {directory})
+            for subdir in subdirs:
+                if subdir not in self._dir_mtimes:
+                    # Direktori baru: scan seluruh isinya
+                    stack = [subdir]
+                    while stack:
+                        current_dir = stack.pop()
+                        try:
+                            self._dir_mtimes[current_dir] = os.stat(current_dir).st_mtime_ns
+                        except OSError:
+                            continue
+                        new_files, new_dirs = {}, []
+                        self._scan_dir(current_dir, new_files, new_dirs)
+                        self._diff(new_files, {current_dir})
+                        stack.extend(new_dirs)
+
+    def _diff(self, files: Dict[str, Tuple[int, int]], scanned_dirs):
+        """Bandingkan hasil scan dengan snapshot; file baru/berubah jadi pending"""
+        for path, signature in files.items():
+            if self._snapshot.get(path) != signature:
+                self._mark_pending(path, signature)
+        for path in list(self._snapshot):
+            if os.path.dirname(path) in scanned_dirs and path not in files:
+                self._snapshot.pop(path, None)
+                self._pending.pop(path, None)
+
+    def _mark_pending(self, path: str, signature: Optional[Tuple[int, int]] = None):
+        if signature is None:
+            signature = self._stat(path)
+            if signature is None:
+                return
+        previous = self._pending.get(path)
+        if previous is None or previous[:2] != signature:
+            self._pending[path] = (signature[0], signature[1], time.monotonic())
+
+    def _flush_pending(self):
+        """Kirim file pending yang sudah stabil selama debounce_seconds"""
+        now = time.monotonic()
+        for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+            signature = self._stat(path)
+            if signature is None:
+                self._pending.pop(path, None)
+                continue
+            if signature != (size, mtime_ns):
+                self._pending[path] = (signature[0], signature[1], now)
+                continue
+            if now - changed_at >= self.debounce_seconds:
+                self._pending.pop(path, None)
+                self._snapshot[path] = signature
+                self.ready.put(path)
+                if self.on_ready is not None:
+                    try:
+                        self.on_ready(path)
+                    except Exception as e:
+                        print(f"Warning: watcher callback failed for {path}: {e}")
+
+    def _tick_interval(self) -> float:
+        # Saat ada file pending, cek lebih sering agar debounce tepat waktu
+        if self._pending:
+            return min(self.poll_interval, max(0.1, self.debounce_seconds / 4))
+        return self.poll_interval
+
+    def _run_polling(self):
+        while not self._stop.wait(self._tick_interval()):
+            try:
+                if time.monotonic() - self._last_full_scan >= self.full_rescan_interval:
+                    self._full_scan()
+                else:
+                    self._incremental_scan()
+                self._flush_pending()
+            except Exception as e:
+                print(f"Warning: folder watcher polling error: {e}")
+
+    def _run_inotify(self):
+        libc = self._libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            print(f"Warning: inotify_init1 failed (errno {ctypes.get_errno()}), falling back to polling")
+            self.backend = 'polling'
+            self._run_polling()
+            return
+
+        watches = {}
+        try:
+            for directory in list(self._dir_mtimes):
+                self._add_watch(fd, directory, watches)
+
+            while not self._stop.is_set():
+                readable, _, _ = select.select([fd], [], [], self._tick_interval())
+                if readable:
+                    self._read_inotify_events(fd, watches)
+                self._flush_pending()
+        finally:
+            os.close(fd)
+
+    def _add_watch(self, fd: int, directory: str, watches: Dict[int, str]):
+        wd = self._libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            watches[wd] = directory
+            self._dir_mtimes.setdefault(directory, 0)
+
+    def _read_inotify_events(self, fd: int, watches: Dict[int, str]):
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+            raw_name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + name_length]
+            offset += INOTIFY_EVENT.size + name_length
+            name = os.fsdecode(raw_name.rstrip(b'\x00'))
+
+            if mask & IN_Q_OVERFLOW:
+                # Event hilang: sinkronkan ulang dengan snapshot penuh
+                self._full_scan()
+                for directory in self._dir_mtimes:
+                    if directory not in watches.values():
+                        self._add_watch(fd, directory, watches)
+                continue
+
+            directory = watches.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF):
+                watches.pop(wd, None)
+                self._dir_mtimes.pop(directory, None)
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_watch(fd, path, watches)
+                    # File yang sudah ada sebelum watch terpasang
+                    files, subdirs = {}, []
+                    self._scan_dir(path, files, subdirs)
+                    for file_path, signature in files.items():
+                        self._mark_pending(file_path, signature)
+                    for subdir in subdirs:
+                        self._add_watch(fd, subdir, watches)
+                continue
+
+            if not self._matches(name):
+                continue
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._pending.pop(path, None)
+                self._snapshot.pop(path, None)
+            else:
+                self._mark_pending(path)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Freshness Module
+Probe "tanggal record terbaru" database backup tanpa MAX() di seluruh tabel.
+
+Kolom tanggal ditemukan dari schema (tipe DATE/TIME/TIMESTAMP atau nama
+kolom), lalu per kolom:
+  - ada index dengan kolom tersebut di depan: satu lookup ORDER BY ... DESC LIMIT 1
+  - tanpa index: scan mundur urutan rowid per blok dan berhenti begitu satu
+    blok tidak lagi berisi tanggal yang lebih baru (record backup ditambahkan
+    kronologis, jadi tanggal terbaru ada di ujung tabel)
+
+Kolom yang berhasil per (tipe database, tabel) disimpan di store SQLite
+sehingga run berikutnya langsung mencoba kolom itu lebih dulu.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import configparser
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from table_stats import TableStatistics, quote_identifier
+
+DEFAULT_STORE_FILE = 'config/freshness_columns.db'
+DEFAULT_TAIL_ROWS = 1000        # baris per blok scan mundur
+DEFAULT_MAX_TAIL_ROWS = 200000  # batas scan mundur sebelum menyerah
+BUSY_TIMEOUT = 30.0             # detik menunggu lock tulis store dari proses lain
+
+METHOD_INDEX = 'index'          # lookup lewat index kolom
+METHOD_TAIL_SCAN = 'tail_scan'  # scan mundur urutan rowid dengan early exit
+METHOD_FULL_SCAN = 'full_scan'  # MAX() biasa (tabel WITHOUT ROWID)
+
+# Tipe kolom (declared type) dan potongan nama kolom yang menandakan kolom tanggal
+DATE_TYPE_KEYWORDS = ('DATE', 'TIME')
+DATE_NAME_KEYWORDS = ('DATE', 'TIME', 'TGL', 'TANGGAL', 'CREATED', 'MODIFIED', 'UPDATE')
+
+# Nilai tanggal yang bisa dibandingkan sebagai teks: YYYY-MM-DD / YYYY/MM/DD (+ jam)
+_DATE_VALUE = re.compile(r'^\d{4}[-/.]\d{2}[-/.]\d{2}')
+
+
+def looks_like_date(value: Any) -> bool:
+    """True jika nilai berupa tanggal teks berurutan (ISO) atau objek datetime"""
+    if isinstance(value, datetime):
+        return True
+    return isinstance(value, str) and bool(_DATE_VALUE.match(value))
+
+
+def discover_date_columns(stats: TableStatistics, table: str) -> List[str]:
+    """Kolom tanggal dari schema: tipe DATE/TIME dulu, lalu kolom yang namanya mirip tanggal"""
+    typed, named = [], []
+    for column in stats.columns(table):
+        name, declared = column[1], (column[2] or '').upper()
+        if any(keyword in declared for keyword in DATE_TYPE_KEYWORDS):
+            typed.append(name)
+        elif any(keyword in name.upper() for keyword in DATE_NAME_KEYWORDS):
+            named.append(name)
+    return typed + named
+
+
+class FreshnessResult(NamedTuple):
+    """Tanggal terbaru satu tabel beserta kolom dan cara membacanya"""
+    table: str
+    column: Optional[str]
+    latest: Any
+    method: Optional[str]
+    rows_read: int = 0
+
+
+class FreshnessStore:
+    """
+    Store SQLite kolom tanggal yang terakhir berhasil per (tipe database, tabel).
+    Pola penyimpanan sama dengan ScanIndex.
+    """
+
+    def __init__(self, store_path: Optional[str] = None):
+        if not store_path:
+            store_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), DEFAULT_STORE_FILE)
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka store (lazy) dan buat schema jika belum ada"""
+        if self._conn is None:
+            store_dir = os.path.dirname(self.store_path)
+            if store_dir:
+                os.makedirs(store_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.store_path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS freshness_columns (
+                    database_type TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    column_name TEXT NOT NULL,
+                    method TEXT,
+                    updated_at TEXT,
+                    PRIMARY KEY (database_type, table_name)
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def lookup(self, database_type: str, table: str) -> Optional[str]:
+        """Kolom tanggal yang terakhir berhasil, atau None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT column_name FROM freshness_columns WHERE database_type = ? AND table_name = ?",
+                (database_type.lower(), table.upper())
+            ).fetchone()
+        return row[0] if row else None
+
+    def remember(self, database_type: str, table: str, column: str, method: Optional[str] = None):
+        """Simpan kolom yang berhasil dipakai untuk tabel ini"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO freshness_columns "
+                "(database_type, table_name, column_name, method, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (database_type.lower(), table.upper(), column, method, datetime.now().isoformat())
+            )
+            conn.commit()
+
+    def forget(self, database_type: str, table: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM freshness_columns WHERE database_type = ? AND table_name = ?",
+                         (database_type.lower(), table.upper()))
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class FreshnessProbe:
+    """
+    Tanggal terbaru per tabel untuk satu database (cursor sqlite3 atau
+    PageReaderCursor, lewat TableStatistics yang sama dengan validator).
+
+    Args:
+        stats: TableStatistics database yang sedang dianalisis
+        database_type: tipe database (kunci store kolom yang berhasil)
+        store: FreshnessStore; None = tanpa memori antar run
+        tail_rows: baris per blok scan mundur
+        max_tail_rows: batas baris scan mundur per kolom
+    """
+
+    def __init__(self, stats: TableStatistics, database_type: str = 'unknown',
+                 store: Optional[FreshnessStore] = None, tail_rows: int = DEFAULT_TAIL_ROWS,
+                 max_tail_rows: int = DEFAULT_MAX_TAIL_ROWS):
+        self.stats = stats
+        self.database_type = database_type or 'unknown'
+        self.store = store
+        self.tail_rows = max(1, tail_rows)
+        self.max_tail_rows = max(self.tail_rows, max_tail_rows)
+        self.queries = 0
+
+    def date_columns(self, table: str) -> List[str]:
+        return discover_date_columns(self.stats, table)
+
+    def _execute(self, sql: str, parameters: Sequence = ()) -> List:
+        self.queries += 1
+        return self.stats.cursor.execute(sql, tuple(parameters)).fetchall()
+
+    def _reverse_values(self, table: str, column: str) -> Iterator[Any]:
+        """Nilai kolom dalam urutan rowid menurun, dibaca per blok tail_rows"""
+        page_reader = self.stats.page_reader
+        if page_reader is not None:
+            yield from page_reader.iter_column(table, column, reverse=True)
+            return
+        quoted_table, quoted_column = quote_identifier(table), quote_identifier(column)
+        rows = self._execute(f"SELECT rowid, {quoted_column} FROM {quoted_table} ORDER BY rowid DESC LIMIT ?",
+                             (self.tail_rows,))
+        while rows:
+            for row in rows:
+                yield row[1]
+            if len(rows) < self.tail_rows:
+                return
+            rows = self._execute(f"SELECT rowid, {quoted_column} FROM {quoted_table} WHERE rowid < ? "
+                                 f"ORDER BY rowid DESC LIMIT ?", (rows[-1][0], self.tail_rows))
+
+    def _tail_scan(self, table: str, column: str):
+        """
+        Scan mundur dengan early exit: berhenti setelah satu blok penuh tanpa
+        tanggal yang lebih baru dari tanggal terbaru sejauh ini.
+        """
+        latest = None
+        rows_read = 0
+        block_newer = False
+        for value in self._reverse_values(table, column):
+            rows_read += 1
+            if looks_like_date(value) and (latest is None or str(value) > str(latest)):
+                latest = value
+                block_newer = True
+            if rows_read % self.tail_rows == 0:
+                if latest is not None and not block_newer:
+                    break
+                if rows_read >= self.max_tail_rows:
+                    break
+                block_newer = False
+        return latest, rows_read
+
+    def column_latest(self, table: str, column: str):
+        """(tanggal terbaru, method, baris dibaca) satu kolom"""
+        quoted_table, quoted_column = quote_identifier(table), quote_identifier(column)
+        if column in self.stats.indexed_columns(table):
+            rows = self._execute(f"SELECT {quoted_column} FROM {quoted_table} WHERE {quoted_column} IS NOT NULL "
+                                 f"ORDER BY {quoted_column} DESC LIMIT 1")
+            return (rows[0][0] if rows else None), METHOD_INDEX, len(rows)
+        try:
+            latest, rows_read = self._tail_scan(table, column)
+            return latest, METHOD_TAIL_SCAN, rows_read
+        except sqlite3.OperationalError:
+            # Tabel WITHOUT ROWID: tidak ada urutan rowid untuk di-scan mundur
+            rows = self._execute(f"SELECT MAX({quoted_column}) FROM {quoted_table}")
+            return rows[0][0], METHOD_FULL_SCAN, 0
+
+    def latest(self, table: str, candidates: Optional[Sequence[str]] = None) -> FreshnessResult:
+        """
+        Tanggal terbaru tabel dari kolom pertama yang berisi tanggal.
+
+        Urutan kolom: kolom yang tersimpan di store untuk tipe database ini,
+        lalu kandidat pemanggil (yang ada di tabel), lalu kolom hasil
+        discovery schema.
+        """
+        columns = []
+        remembered = self.store.lookup(self.database_type, table) if self.store else None
+        if remembered:
+            columns.append(remembered)
+        columns.extend(self.stats.existing_columns(table, candidates or ()))
+        columns.extend(self.date_columns(table))
+        columns = self.stats.existing_columns(table, dict.fromkeys(columns))
+
+        for column in columns:
+            try:
+                value, method, rows_read = self.column_latest(table, column)
+            except sqlite3.Error:
+                continue
+            if value is not None and looks_like_date(value):
+                if self.store and column != remembered:
+                    self.store.remember(self.database_type, table, column, method)
+                return FreshnessResult(table, column, value, method, rows_read)
+
+        if remembered and self.store:
+            # Kolom tersimpan tidak lagi berisi tanggal (schema berubah)
+            self.store.forget(self.database_type, table)
+        return FreshnessResult(table, None, None, None)
+
+    def latest_overall(self, tables: Optional[Sequence[str]] = None) -> Optional[Any]:
+        """Tanggal terbaru dari semua tabel (atau tabel yang diberikan)"""
+        latest = None
+        for table in (self.stats.tables() if tables is None else tables):
+            result = self.latest(table)
+            if result.latest is not None and (latest is None or str(result.latest) > str(latest)):
+                latest = result.latest
+        return latest
+
+
+def load_freshness_config(config_path: Optional[str] = None) -> Dict:
+    """Opsi FreshnessProbe/FreshnessStore dari section [FRESHNESS] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    options = {}
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('FRESHNESS'):
+            section = config['FRESHNESS']
+            store_path = section.get('store_file', '') or None
+            if store_path and not os.path.isabs(store_path):
+                store_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), store_path)
+            options['store_path'] = store_path
+            options['tail_rows'] = section.getint('tail_rows', fallback=DEFAULT_TAIL_ROWS)
+            options['max_tail_rows'] = section.getint('max_tail_rows', fallback=DEFAULT_MAX_TAIL_ROWS)
+    except Exception as e:
+        print(f"Warning: Could not read freshness config: {e}")
+        options = {}
+    return options
+
+
+_default_store: Optional[FreshnessStore] = None
+_default_options: Optional[Dict] = None
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> FreshnessStore:
+    """FreshnessStore bersama (store di config/freshness_columns.db, atau [FRESHNESS] store_file)"""
+    global _default_store, _default_options
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_options = load_freshness_config()
+                _default_store = FreshnessStore(_default_options.get('store_path'))
+    return _default_store
+
+
+def create_probe(stats: TableStatistics, database_type: str = 'unknown',
+                 store: Optional[FreshnessStore] = None) -> FreshnessProbe:
+    """FreshnessProbe dengan opsi [FRESHNESS] dan store bersama"""
+    if store is None:
+        store = get_default_store()
+    options = {key: value for key, value in (_default_options or {}).items() if key != 'store_path'}
+    return FreshnessProbe(stats, database_type, store, **options)
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
+import hashlib
 import os
 from datetime import datetime
 from email_notifier import EmailNotifier
@@ -8,6 +9,8 @@ from folder_monitor import FolderMonitor
 from zip_validator import ZipValidator
 from database_validator import DatabaseValidator
 from monitoring_controller import MonitoringController
+from folder_watcher import FolderWatcher
+from notification_outbox import NotificationOutbox, load_outbox_config
 
 class DatabaseBackupMonitorGUI:
     def __init__(self, root):
@@ -21,6 +24,13 @@ class DatabaseBackupMonitorGUI:
         self.zip_validator = ZipValidator()
         self.database_validator = DatabaseValidator()
         self.monitoring_controller = MonitoringController()
+        self.notifier = self.email_notifier
+
+        # Report/alert email ditulis ke outbox persisten dan dikirim di background,
+        # sehingga worker monitoring tidak menunggu SMTP dan email tidak hilang saat SMTP mati
+        self.outbox = NotificationOutbox(self._deliver_email, on_result=self._on_outbox_result,
+                                         **load_outbox_config())
+        self.outbox.start()
         
         # Variables
         self.smtp_server = tk.StringVar()
@@ -240,6 +250,19 @@ class DatabaseBackupMonitorGUI:
         thread.daemon = True
         thread.start()
 
+    def _deliver_email(self, subject, message, attachment_path=None):
+        """Sender untuk outbox (dipanggil dari thread sender)"""
+        return self.notifier.send_notification(subject=subject, message=message,
+                                               attachment_path=attachment_path)
+
+    def _on_outbox_result(self, notification, success, message):
+        if success:
+            self.log_message(f"Email sent: {notification['subject']}")
+        elif notification['status'] == 'failed':
+            self.log_message(f"Email failed permanently after {notification['attempts']} attempts: {message}")
+        else:
+            self.log_message(f"Email failed (attempt {notification['attempts']}), will retry: {message}")
+
     def send_test_notification(self):
         def send_notification():
             try:
@@ -492,18 +515,14 @@ class DatabaseBackupMonitorGUI:
                         message += f"<li>{error}</li>"
                     message += "</ul>"
 
-                # Send email
-                success, email_message = self.notifier.send_notification(
+                # Queue email (dikirim oleh sender outbox di background)
+                self.outbox.enqueue(
                     subject=f"Folder Monitoring Report - {summary['latest_date']}",
                     message=message
                 )
 
-                if success:
-                    self.update_status("Folder report sent successfully")
-                    messagebox.showinfo("Success", "Folder monitoring report sent successfully!")
-                else:
-                    self.update_status("Failed to send folder report")
-                    messagebox.showerror("Error", f"Failed to send report: {email_message}")
+                self.update_status("Folder report queued for sending")
+                messagebox.showinfo("Success", "Folder monitoring report queued and will be sent in the background.")
 
             except Exception as e:
                 self.update_status("Failed to send folder report")
@@ -555,7 +574,17 @@ class DatabaseBackupMonitorGUI:
         import time
 
         self.log_message("Auto monitoring loop started")
-        check_interval = 3600  # 1 hour
+        check_interval = 3600  # 1 hour, pengecekan terjadwal tetap berjalan
+
+        # Arsip baru memicu pengecekan lebih awal tanpa menunggu jadwal berikutnya
+        watcher = None
+        try:
+            watcher = FolderWatcher(self.monitoring_path.get())
+            watcher.start()
+            self.log_message(f"Folder watcher active ({watcher.backend})")
+        except Exception as e:
+            self.log_message(f"Folder watcher unavailable, using scheduled checks only: {str(e)}")
+            watcher = None
 
         while self.auto_monitoring_active:
             try:
@@ -570,7 +599,7 @@ class DatabaseBackupMonitorGUI:
 
                 # Check for issues
                 has_issues = (
-                    summary['status'] not in ['Success', 'Ready'] or
+                    summary['status'] not in ['Success', 'Ready', 'Pending'] or
                     summary['errors'] or
                     any('errors' in result and result['errors']
                         for result in summary['analysis_results'].values())
@@ -581,15 +610,23 @@ class DatabaseBackupMonitorGUI:
                     # Send alert email
                     self._send_auto_alert(summary)
 
-                # Wait for next check
-                for _ in range(check_interval):
-                    if not self.auto_monitoring_active:
+                # Wait for next check, or until the watcher reports a new/changed archive
+                next_check = time.monotonic() + check_interval
+                while self.auto_monitoring_active and time.monotonic() < next_check:
+                    if watcher is None:
+                        time.sleep(1)
+                        continue
+                    changed_files = watcher.wait_for_changes(timeout=1.0)
+                    if changed_files:
+                        names = ', '.join(os.path.basename(f) for f in changed_files)
+                        self.log_message(f"New or changed backup detected: {names}")
                         break
-                    time.sleep(1)
 
             except Exception as e:
                 self.log_message(f"Auto monitoring error: {str(e)}")
 
+        if watcher is not None:
+            watcher.stop()
         self.log_message("Auto monitoring loop stopped")
 
     def _send_auto_alert(self, summary):
@@ -624,7 +661,7 @@ class DatabaseBackupMonitorGUI:
             """
 
             # Add status issues
-            if summary['status'] not in ['Success', 'Ready']:
+            if summary['status'] not in ['Success', 'Ready', 'Pending']:
                 message += f"<li>Overall status: {summary['status']}</li>"
 
             # Add errors
@@ -641,15 +678,20 @@ class DatabaseBackupMonitorGUI:
             <p><em>This alert was generated automatically by the monitoring system.</em></p>
             """
 
-            success, email_message = self.notifier.send_notification(
+            # Alert yang sama (folder, tanggal, isi masalah) hanya dikirim sekali
+            dedup_key = "auto-alert:{}:{}:{}".format(
+                summary['monitoring_path'], summary['latest_date'],
+                hashlib.sha1(message.encode('utf-8')).hexdigest())
+            notification_id = self.outbox.enqueue(
                 subject=f"🚨 Auto Monitoring Alert - {summary['latest_date']}",
-                message=message
+                message=message,
+                dedup_key=dedup_key
             )
 
-            if success:
-                self.log_message("Alert email sent successfully")
+            if notification_id is None:
+                self.log_message("Same alert already sent or queued - skipping")
             else:
-                self.log_message(f"Failed to send alert: {email_message}")
+                self.log_message("Alert email queued")
 
         except Exception as e:
             self.log_message(f"Error sending auto alert: {str(e)}")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+HTML Template Engine
+Template HTML email (src/templates/*.html) dikompilasi satu kali menjadi
+code object Python dan di-cache per nama, sehingga render berikutnya hanya
+mengeksekusi kode yang sudah jadi, tanpa parsing ulang dan tanpa
+konkatenasi f-string panjang di setiap pengiriman.
+
+Sintaks mirip Jinja2, dengan ekspresi Python biasa:
+    {{ expr }}          hasil ekspresi, di-escape HTML
+    {{ expr|safe }}     tanpa escape (untuk HTML yang sudah dirender)
+    {% if expr %} / {% elif expr %} / {% else %} / {% endif %}
+    {% for target in expr %} / {% endfor %}
+    {# komentar #}
+"""
+
+import os
+import re
+import threading
+from html import escape
+from typing import Any, Dict, List, Optional
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+_TOKEN_RE = re.compile(r'({{.*?}}|{%.*?%}|{#.*?#})', re.DOTALL)
+_SAFE_SUFFIX = re.compile(r'\|\s*safe\s*$')
+
+
+class TemplateError(Exception):
+    """Template tidak valid (tag tidak seimbang atau ekspresi salah)"""
+
+
+def _escape(value: Any) -> str:
+    return escape(str(value), quote=True)
+
+
+def compile_template(source: str, name: str = '<string>'):
+    """Kompilasi source template menjadi code object Python"""
+    lines = []
+    stack = []
+    indent = 0
+    line_no = 1
+
+    def emit(code):
+        lines.append('    ' * indent + code)
+
+    for token in _TOKEN_RE.split(source):
+        token_line = line_no
+        line_no += token.count('\n')
+        if not token:
+            continue
+
+        if token.startswith('{#'):
+            continue
+
+        if token.startswith('{{'):
+            expr = token[2:-2].strip()
+            if _SAFE_SUFFIX.search(expr):
+                emit(f"_append(str({_SAFE_SUFFIX.sub('', expr)}))")
+            else:
+                emit(f"_append(_escape({expr}))")
+            continue
+
+        if not token.startswith('{%'):
+            emit(f"_append({token!r})")
+            continue
+
+        statement = token[2:-2].strip()
+        keyword = statement.split(None, 1)[0] if statement else ''
+        if keyword in ('if', 'for'):
+            emit(f"{statement}:")
+            stack.append((keyword, token_line))
+            indent += 1
+            emit('pass')
+        elif keyword in ('elif', 'else'):
+            if not stack or stack[-1][0] != 'if':
+                raise TemplateError(f"{name}:{token_line}: '{keyword}' tanpa 'if'")
+            indent -= 1
+            emit(f"{statement}:")
+            indent += 1
+            emit('pass')
+        elif keyword in ('endif', 'endfor'):
+            if not stack or stack[-1][0] != keyword[3:]:
+                raise TemplateError(f"{name}:{token_line}: '{keyword}' tidak punya pasangan")
+            stack.pop()
+            indent -= 1
+        else:
+            raise TemplateError(f"{name}:{token_line}: tag tidak dikenal '{statement}'")
+
+    if stack:
+        keyword, opened_at = stack[-1]
+        raise TemplateError(f"{name}:{opened_at}: '{keyword}' tidak ditutup")
+
+    try:
+        return compile('\n'.join(lines) or 'pass', f"<template {name}>", 'exec')
+    except SyntaxError as e:
+        raise TemplateError(f"{name}: ekspresi tidak valid: {e.msg} ({e.text.strip() if e.text else ''})") from e
+
+
+class Template:
+    """Template yang sudah dikompilasi; render() aman dipanggil dari banyak thread"""
+
+    def __init__(self, source: str, name: str = '<string>', globals: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.code = compile_template(source, name)
+        self.globals = {'_escape': _escape, '__builtins__': __builtins__}
+        if globals:
+            self.globals.update(globals)
+
+    def render(self, context: Optional[Dict[str, Any]] = None, /, **kwargs) -> str:
+        output: List[str] = []
+        namespace = dict(self.globals)
+        if context:
+            namespace.update(context)
+        namespace.update(kwargs)
+        namespace['_append'] = output.append
+        exec(self.code, namespace)
+        return ''.join(output)
+
+
+class TemplateLoader:
+    """Muat template dari folder dan cache hasil kompilasinya per nama"""
+
+    def __init__(self, directory: str = TEMPLATE_DIR, globals: Optional[Dict[str, Any]] = None):
+        self.directory = directory
+        self.globals = globals or {}
+        self._cache: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+        self.compile_count = 0
+
+    def get_template(self, name: str) -> Template:
+        template = self._cache.get(name)
+        if template is not None:
+            return template
+
+        with self._lock:
+            template = self._cache.get(name)
+            if template is None:
+                path = os.path.join(self.directory, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        source = f.read()
+                except OSError as e:
+                    raise TemplateError(f"Template {name} tidak ditemukan: {e}") from e
+                template = Template(source, name, self.globals)
+                self._cache[name] = template
+                self.compile_count += 1
+        return template
+
+    def render(self, name: str, context: Optional[Dict[str, Any]] = None, /, **kwargs) -> str:
+        return self.get_template(name).render(context, **kwargs)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_default_loader: Optional[TemplateLoader] = None
+_default_loader_lock = threading.Lock()
+
+
+def get_default_loader() -> TemplateLoader:
+    """Loader bersama untuk src/templates (cache template satu per proses)"""
+    global _default_loader
+    if _default_loader is None:
+        with _default_loader_lock:
+            if _default_loader is None:
+                _default_loader = TemplateLoader()
+    return _default_loader
+
+
+def render_template(name: str, context: Optional[Dict[str, Any]] = None, /, **kwargs) -> str:
+    """Render template dari src/templates dengan loader bersama"""
+    return get_default_loader().render(name, context, **kwargs)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Lazy Import Module
+Tunda import subsystem berat (ReportLab, stack email, analyzer BAK) sampai
+pertama kali dipakai, supaya window GUI bisa tampil tanpa menunggu semua
+modul ter-load.
+"""
+
+import importlib
+import threading
+from typing import Any
+
+
+class LazyAttribute:
+    """
+    Placeholder untuk class/fungsi dari modul lain yang baru di-import saat
+    pertama kali dipanggil atau diakses atributnya.
+
+    Contoh:
+        PDFReportGenerator = LazyAttribute('src.pdf_report_generator', 'PDFReportGenerator')
+        generator = PDFReportGenerator()   # import terjadi di sini
+    """
+
+    def __init__(self, module_name: str, attribute: str):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        """Import modul (sekali) dan kembalikan atribut aslinya"""
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    self._target = getattr(module, self._attribute)
+        return self._target
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._target is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<LazyAttribute {self._module_name}.{self._attribute} ({state})>"
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Mail Transport Module
+Koneksi SMTP bersama untuk semua notifier email. Koneksi (STARTTLS + login)
+dibuka sekali lalu dipakai ulang, dicek dengan NOOP sebelum dipakai setelah
+idle, dan dibuka ulang dengan backoff eksponensial jika server memutus
+koneksi. Alert yang datang beruntun dalam satu window bisa digabung menjadi
+satu email digest lewat DigestQueue.
+"""
+
+import time
+import atexit
+import smtplib
+import threading
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Dict, List, Tuple, Union
+
+DEFAULT_TIMEOUT = 30            # detik per operasi socket
+DEFAULT_IDLE_TIMEOUT = 240      # koneksi idle lebih lama dari ini ditutup (server biasanya memutus ~5 menit)
+DEFAULT_HEALTH_CHECK_AFTER = 15  # koneksi idle lebih lama dari ini dicek dengan NOOP
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 60.0
+DEFAULT_DIGEST_RETRY_BASE = 30.0    # detik, digandakan setiap digest yang gagal dikirim
+DEFAULT_DIGEST_RETRY_MAX = 3600.0
+
+
+class MailTransport:
+    """
+    Satu koneksi SMTP persisten untuk satu (server, port, akun pengirim).
+    Thread-safe: pengiriman diserialisasi dengan lock karena objek smtplib.SMTP
+    tidak boleh dipakai dari beberapa thread sekaligus.
+    """
+
+    def __init__(self, smtp_server: str, smtp_port: int, sender_email: str, sender_password: str,
+                 timeout: float = DEFAULT_TIMEOUT, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 health_check_after: float = DEFAULT_HEALTH_CHECK_AFTER,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX, smtp_class=smtplib.SMTP,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.smtp_server = smtp_server
+        self.smtp_port = int(smtp_port)
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._smtp_class = smtp_class
+        self._sleep = sleep
+        self._server = None
+        self._last_used = 0.0
+        self._failures = 0
+        self._last_failure = 0.0
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.messages_sent = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._server is not None
+
+    def backoff_delay(self) -> float:
+        """Jeda sebelum koneksi berikutnya berdasarkan jumlah kegagalan beruntun"""
+        if self._failures == 0:
+            return 0.0
+        return min(self.backoff_max, self.backoff_base * (2 ** (self._failures - 1)))
+
+    def _open(self):
+        """
+        Buka koneksi baru: EHLO, STARTTLS, login. Jika ada password, STARTTLS
+        wajib: server yang tidak menawarkan STARTTLS ditolak dengan
+        SMTPNotSupportedError sebelum password dikirim.
+        """
+        wait = self._last_failure + self.backoff_delay() - time.monotonic()
+        if wait > 0:
+            self._sleep(wait)
+
+        server = self._smtp_class(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.sender_password or server.has_extn('starttls'):
+                # starttls() raise SMTPNotSupportedError jika tidak ditawarkan server
+                server.starttls()
+                server.ehlo()
+            if self.sender_password:
+                server.login(self.sender_email, self.sender_password)
+        except Exception:
+            self._discard(server)
+            raise
+        self.connects += 1
+        return server
+
+    @staticmethod
+    def _discard(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _drop(self):
+        if self._server is not None:
+            self._discard(self._server)
+            self._server = None
+
+    def _is_healthy(self) -> bool:
+        """NOOP ke server; koneksi yang sudah diputus server gagal di sini"""
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _connection(self):
+        """Koneksi yang siap dipakai (reuse jika masih sehat)"""
+        if self._server is not None:
+            idle = time.monotonic() - self._last_used
+            if idle > self.idle_timeout or (idle > self.health_check_after and not self._is_healthy()):
+                self._drop()
+        if self._server is None:
+            self._server = self._open()
+        return self._server
+
+    def sendmail(self, from_addr: str, to_addrs: Union[str, List[str]], msg: str) -> None:
+        """
+        Kirim satu pesan lewat koneksi bersama (signature sama dengan smtplib.SMTP.sendmail)
+
+        Koneksi putus / error sementara dicoba ulang sampai max_attempts kali
+        dengan backoff. Error autentikasi dan penolakan permanen (5xx) langsung
+        di-raise; error terakhir di-raise jika semua percobaan gagal.
+        """
+        with self._lock:
+            last_error = None
+            for _ in range(self.max_attempts):
+                try:
+                    self._connection().sendmail(from_addr, to_addrs, msg)
+                except smtplib.SMTPAuthenticationError:
+                    self._drop()
+                    self._failures += 1
+                    self._last_failure = time.monotonic()
+                    raise
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPNotSupportedError):
+                    raise
+                except smtplib.SMTPResponseException as e:
+                    if e.smtp_code >= 500:
+                        raise
+                    last_error = e
+                except (smtplib.SMTPException, OSError) as e:
+                    last_error = e
+                else:
+                    self._failures = 0
+                    self._last_used = time.monotonic()
+                    self.messages_sent += 1
+                    return
+                self._drop()
+                self._failures += 1
+                self._last_failure = time.monotonic()
+            raise last_error
+
+    def close(self):
+        with self._lock:
+            self._drop()
+
+
+def transport_options(section) -> Dict:
+    """Opsi MailTransport dari section [EMAIL] config (key yang tidak ada pakai default)"""
+    if section is None:
+        return {}
+    options = {}
+    for key, option, cast in (('smtp_timeout', 'timeout', float),
+                              ('smtp_idle_timeout', 'idle_timeout', float),
+                              ('smtp_max_attempts', 'max_attempts', int),
+                              ('smtp_backoff_max', 'backoff_max', float)):
+        try:
+            value = section.get(key, None)
+            if value not in (None, ''):
+                options[option] = cast(value)
+        except (TypeError, ValueError):
+            continue
+    return options
+
+
+_transports: Dict[Tuple, MailTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(smtp_server: str, smtp_port: int, sender_email: str, sender_password: str,
+                  **options) -> MailTransport:
+    """
+    MailTransport bersama untuk akun pengirim ini. Options hanya dipakai saat
+    transport pertama kali dibuat. Jika password akun berubah, transport lama
+    ditutup dan diganti.
+    """
+    account = (smtp_server, int(smtp_port), sender_email)
+    with _transports_lock:
+        transport = _transports.get(account)
+        if transport is not None and transport.sender_password != sender_password:
+            transport.close()
+            transport = None
+        if transport is None:
+            transport = MailTransport(smtp_server, smtp_port, sender_email, sender_password, **options)
+            _transports[account] = transport
+        return transport
+
+
+def close_all_transports():
+    """Flush digest yang tertunda lalu tutup semua koneksi bersama"""
+    with _digest_lock:
+        queues = list(_digest_queues.values())
+    for queue in queues:
+        queue.close()
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.close()
+
+
+def _default_render(subject: str, html_fragment: str) -> str:
+    return f"<html><body>{html_fragment}</body></html>"
+
+
+class DigestQueue:
+    """
+    Antrian email untuk satu penerima. Pesan pertama memulai window; semua
+    pesan yang masuk sebelum window habis dikirim sebagai satu email (digest).
+    Window 0 berarti setiap pesan langsung dikirim sendiri.
+
+    Digest yang gagal dikirim dari timer dikembalikan ke antrian dan dicoba
+    lagi dengan backoff eksponensial (retry_base, digandakan sampai
+    retry_max); pesan baru yang masuk selama itu ikut digabung.
+    """
+
+    def __init__(self, transport: MailTransport, recipient: str, window_seconds: float,
+                 render: Callable[[str, str], str] = _default_render, subject_prefix: str = 'Digest',
+                 retry_base: float = DEFAULT_DIGEST_RETRY_BASE, retry_max: float = DEFAULT_DIGEST_RETRY_MAX):
+        self.transport = transport
+        self.recipient = recipient
+        self.window_seconds = window_seconds
+        self.render = render
+        self.subject_prefix = subject_prefix
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._pending: List[Tuple[str, str, datetime]] = []
+        self._timer = None
+        self._lock = threading.Lock()
+        self.digests_sent = 0
+        self.failures = 0
+
+    def submit(self, subject: str, html_fragment: str):
+        """Masukkan pesan ke antrian (dikirim saat window habis)"""
+        with self._lock:
+            self._pending.append((subject, html_fragment, datetime.now()))
+            immediate = self.window_seconds <= 0
+            if not immediate and self._timer is None:
+                self._timer = threading.Timer(self.window_seconds, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if immediate:
+            self.flush()
+
+    def _flush_from_timer(self):
+        items = self.take_pending()
+        if not items:
+            return
+        try:
+            self.send_items(items)
+        except Exception as e:
+            self.requeue(items, e)
+
+    def retry_delay(self) -> float:
+        """Jeda sebelum digest dicoba lagi berdasarkan jumlah kegagalan beruntun"""
+        return min(self.retry_max, self.retry_base * (2 ** max(0, self.failures - 1)))
+
+    def requeue(self, items: List[Tuple[str, str, datetime]], error: Exception):
+        """Kembalikan pesan yang gagal dikirim ke depan antrian dan jadwalkan percobaan berikutnya"""
+        with self._lock:
+            self._pending[:0] = items
+            self.failures += 1
+            delay = self.retry_delay()
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+        print(f"Warning: Digest email gagal dikirim ({len(items)} pesan, dicoba lagi dalam {delay:g} detik): {error}")
+
+    def compose(self, items: List[Tuple[str, str, datetime]]) -> MIMEMultipart:
+        """Gabungkan pesan tertunda menjadi satu email"""
+        if len(items) == 1:
+            subject, fragment, _ = items[0]
+        else:
+            subject = f"{self.subject_prefix}: {len(items)} notifikasi - {items[0][0]}"
+            fragment = '<hr>'.join(
+                f"<h3>{item_subject}</h3><p><em>{queued_at.strftime('%Y-%m-%d %H:%M:%S')}</em></p>{item_fragment}"
+                for item_subject, item_fragment, queued_at in items)
+
+        msg = MIMEMultipart()
+        msg['From'] = self.transport.sender_email
+        msg['To'] = self.recipient
+        msg['Subject'] = subject
+        msg.attach(MIMEText(self.render(subject, fragment), 'html'))
+        return msg
+
+    def flush(self) -> int:
+        """
+        Kirim semua pesan tertunda sekarang sebagai satu email
+
+        Returns:
+            Jumlah pesan yang digabung (0 jika antrian kosong)
+        """
+        items = self.take_pending()
+        if not items:
+            return 0
+        return self.send_items(items)
+
+    def take_pending(self) -> List[Tuple[str, str, datetime]]:
+        """Ambil semua pesan tertunda (dan batalkan timer window)"""
+        with self._lock:
+            items, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return items
+
+    def send_items(self, items: List[Tuple[str, str, datetime]]) -> int:
+        """Kirim pesan sebagai satu email lewat transport antrian ini"""
+        msg = self.compose(items)
+        self.transport.sendmail(self.transport.sender_email, self.recipient, msg.as_string())
+        self.digests_sent += 1
+        self.failures = 0
+        return len(items)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def close(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Warning: Digest email gagal dikirim: {e}")
+
+
+_digest_queues: Dict[Tuple, DigestQueue] = {}
+_digest_lock = threading.Lock()
+
+
+def get_digest_queue(transport: MailTransport, recipient: str, window_seconds: float,
+                     render: Callable[[str, str], str] = _default_render) -> DigestQueue:
+    """
+    DigestQueue bersama per (akun pengirim, penerima), supaya alert dari
+    beberapa notifier ikut digabung. Jika transport akun diganti (mis. password
+    berubah), pesan yang masih tertunda di antrian lama langsung dikirim lewat
+    transport baru (atau masuk antrian retry jika gagal), bukan dibuang.
+    """
+    key = (transport.smtp_server, transport.smtp_port, transport.sender_email, recipient)
+    stale = []
+    with _digest_lock:
+        queue = _digest_queues.get(key)
+        if queue is None or queue.transport is not transport:
+            if queue is not None:
+                stale = queue.take_pending()
+            queue = DigestQueue(transport, recipient, window_seconds, render)
+            _digest_queues[key] = queue
+        queue.window_seconds = window_seconds
+    if stale:
+        try:
+            queue.send_items(stale)
+        except Exception as e:
+            queue.requeue(stale, e)
+    return queue
+
+
+atexit.register(close_all_transports)
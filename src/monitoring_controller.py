@@ -5,20 +5,157 @@ Modul pengontrol untuk koordinasi monitoring backup dan validasi database
 """
 
 import os
-import glob
+import time
+import threading
+import configparser
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait as wait_connections
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-import re
 from pathlib import Path
 
 from zip_validator import ZipValidator
 from database_validator import DatabaseValidator
+from analysis_cache import AnalysisCache
+from dir_scanner import scan_directory, parse_filename_date
+from stability_gate import StabilityGate, STATE_PENDING, DEFAULT_STABILITY_WINDOW, DEFAULT_MAX_PENDING
+from zip_sqlite import DEFAULT_MEMORY_LIMIT
+
+EXECUTOR_MODES = ('serial', 'thread', 'process')
+DEFAULT_EXECUTOR_MODE = 'process'
+DEFAULT_ARCHIVE_TIMEOUT = 900  # detik per arsip
+DEFAULT_VALIDATION_MEMORY_MB = 2048  # budget memori semua worker validasi (0 = tanpa batas)
+# Perkiraan puncak memori satu worker: member database di memori + salinan milik SQLite
+WORKER_MEMORY_ESTIMATE = 2 * DEFAULT_MEMORY_LIMIT
+
+
+def _validate_archive(zip_path: str,
+                      validators: Optional[Tuple[ZipValidator, DatabaseValidator]] = None) -> Tuple[Dict, Dict]:
+    """
+    Validasi ZIP + database untuk satu arsip
+    validators: (ZipValidator, DatabaseValidator) yang dipakai ulang antar arsip
+    """
+    zip_validator, database_validator = validators or (ZipValidator(), DatabaseValidator())
+    zip_result = zip_validator.validate_zip_file(zip_path)
+    db_result = database_validator._validate_single_zip(zip_path)
+    return zip_result, db_result
+
+
+def _cache_options(cache: AnalysisCache) -> Dict:
+    """Opsi untuk membuka store analysis cache yang sama di proses worker"""
+    return {'cache_path': cache.cache_path, 'memory_entries': cache.memory_entries, 'enabled': cache.enabled}
+
+
+def _archive_worker(conn, cache_options: Optional[Dict] = None,
+                    validators: Optional[Tuple[ZipValidator, DatabaseValidator]] = None) -> None:
+    """
+    Target worker (process / thread): terima path arsip lewat pipe dan kirim
+    hasil validasinya kembali, sampai menerima None atau pipe ditutup.
+
+    Validator dibuat sekali per worker. Worker process membuka koneksi store
+    analysis cache sendiri dari cache_options (koneksi SQLite milik proses
+    induk tidak boleh dipakai setelah fork).
+    """
+    cache = None
+    if validators is None:
+        cache = AnalysisCache(**cache_options) if cache_options is not None else None
+        validators = (ZipValidator(cache=cache), DatabaseValidator(cache=cache))
+    try:
+        while True:
+            try:
+                zip_path = conn.recv()
+            except (EOFError, OSError):
+                break
+            if zip_path is None:
+                break
+            try:
+                outcome = ('ok', _validate_archive(zip_path, validators))
+            except Exception as e:
+                outcome = ('error', f"Error processing {zip_path}: {str(e)}")
+            try:
+                conn.send(outcome)
+            except OSError:
+                break  # Arsip sudah dilaporkan timeout dan pipe ditutup
+    finally:
+        conn.close()
+        if cache is not None:
+            cache.close()
+
+
+def memory_capped_workers(workers: int, memory_budget_mb: float) -> int:
+    """Batasi jumlah worker supaya perkiraan memori semua worker muat di budget"""
+    if memory_budget_mb <= 0:
+        return workers
+    return max(1, min(workers, int(memory_budget_mb * 1024 * 1024 // WORKER_MEMORY_ESTIMATE)))
+
+
+def _failed_archive_results(zip_path: str, message: str) -> Tuple[Dict, Dict]:
+    """Hasil pengganti untuk arsip yang gagal / timeout di worker"""
+    zip_result = {
+        'filename': os.path.basename(zip_path),
+        'filepath': zip_path,
+        'is_valid': False,
+        'is_readable': False,
+        'has_bak_files': False,
+        'file_size_mb': 0,
+        'extracted_date': None,
+        'bak_files': [],
+        'database_info': {},
+        'errors': [message],
+        'warnings': []
+    }
+    db_result = {
+        'zip_file': os.path.basename(zip_path),
+        'databases': {},
+        'latest_dates': {},
+        'errors': [message],
+        'warnings': []
+    }
+    return zip_result, db_result
+
 
 class MonitoringController:
-    def __init__(self):
-        self.zip_validator = ZipValidator()
-        self.database_validator = DatabaseValidator()
+    def __init__(self, config_file='config/config.ini', cache: Optional[AnalysisCache] = None):
+        self.zip_validator = ZipValidator(cache=cache)
+        self.database_validator = DatabaseValidator(cache=cache)
+        self.analysis_cache = self.zip_validator.analysis_cache
         self.monitoring_results = {}
+
+        # Eksekusi paralel per arsip (lihat [MONITORING] di config.ini)
+        self.executor_mode = DEFAULT_EXECUTOR_MODE
+        self.max_workers = os.cpu_count() or 1
+        self.archive_timeout = DEFAULT_ARCHIVE_TIMEOUT
+        memory_budget_mb = DEFAULT_VALIDATION_MEMORY_MB
+        stability_window = DEFAULT_STABILITY_WINDOW
+        max_pending = DEFAULT_MAX_PENDING
+
+        config = configparser.ConfigParser()
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), config_file)
+        try:
+            config.read(config_path)
+            if 'MONITORING' in config:
+                section = config['MONITORING']
+                self.executor_mode = section.get('validation_executor', self.executor_mode).strip().lower()
+                workers = section.getint('validation_workers', 0)
+                if workers > 0:
+                    self.max_workers = workers
+                self.archive_timeout = section.getfloat('archive_timeout', self.archive_timeout)
+                memory_budget_mb = section.getfloat('validation_memory_mb', memory_budget_mb)
+                stability_window = section.getfloat('stability_window_seconds', stability_window)
+                max_pending = section.getfloat('max_pending_seconds', max_pending)
+        except Exception as e:
+            print(f"Warning: Could not load monitoring config: {e}")
+
+        # Setiap worker bisa memuat satu member database ke memori
+        self.max_workers = memory_capped_workers(self.max_workers, memory_budget_mb)
+
+        # Arsip yang masih ditulis job backup ditunda ke siklus berikutnya
+        self.stability_gate = StabilityGate(stability_window, max_pending)
+
+        if self.executor_mode not in EXECUTOR_MODES:
+            print(f"Warning: Unknown validation_executor '{self.executor_mode}', using {DEFAULT_EXECUTOR_MODE}")
+            self.executor_mode = DEFAULT_EXECUTOR_MODE
     
     def monitor_backup_folder(self, folder_path: str, days_to_check: int = 7) -> Dict:
         """
@@ -36,6 +173,7 @@ class MonitoringController:
             'folder_path': folder_path,
             'days_checked': days_to_check,
             'zip_files_found': [],
+            'pending_files': [],
             'zip_validation_results': {},
             'database_validation_results': {},
             'date_comparison_results': {},
@@ -46,19 +184,24 @@ class MonitoringController:
         
         try:
             # Step 1: Find recent ZIP files
-            recent_zip_files = self._find_recent_zip_files(folder_path, days_to_check)
+            recent_zip_files = self._find_recent_zip_files(folder_path, days_to_check,
+                                                           monitoring_result['pending_files'])
             monitoring_result['zip_files_found'] = recent_zip_files
+            if monitoring_result['pending_files']:
+                names = ', '.join(entry['filename'] for entry in monitoring_result['pending_files'])
+                monitoring_result['warnings'].append(
+                    f"{len(monitoring_result['pending_files'])} ZIP file masih ditulis, dianalisis pada siklus berikutnya: {names}")
             
             if not recent_zip_files:
                 monitoring_result['warnings'].append(f"Tidak ditemukan ZIP files dalam {days_to_check} hari terakhir di folder {folder_path}")
                 return monitoring_result
             
-            # Step 2: Validate ZIP files
-            zip_validation = self.zip_validator.validate_multiple_zip_files(recent_zip_files)
+            # Step 2 & 3: Validate ZIP files dan database di dalamnya (paralel per arsip)
+            zip_results, db_results = self._validate_archives(recent_zip_files)
+            zip_validation = self.zip_validator.summarize_validations(zip_results)
             monitoring_result['zip_validation_results'] = zip_validation
             
-            # Step 3: Validate databases within ZIP files
-            database_validation = self.database_validator.validate_backup_databases(recent_zip_files)
+            database_validation = self.database_validator.merge_zip_results(recent_zip_files, db_results)
             monitoring_result['database_validation_results'] = database_validation
             
             # Step 4: Compare dates between ZIP files and database records
@@ -87,68 +230,149 @@ class MonitoringController:
         
         return monitoring_result
     
-    def _find_recent_zip_files(self, folder_path: str, days: int) -> List[str]:
-        """Find ZIP files from recent days"""
+    def _start_worker(self, context) -> Tuple:
+        """Worker validasi baru: (ujung pipe milik controller, process / thread)"""
+        conn, child = context.Pipe()
+        if self.executor_mode == 'process':
+            worker = context.Process(target=_archive_worker, args=(child, _cache_options(self.analysis_cache)),
+                                     daemon=True)
+            worker.start()
+            child.close()
+        else:
+            worker = threading.Thread(target=_archive_worker,
+                                      args=(child, None, (self.zip_validator, self.database_validator)),
+                                      daemon=True)
+            worker.start()
+        return conn, worker
+
+    def _validate_archives(self, zip_files: List[str]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Jalankan validasi setiap arsip dengan paling banyak max_workers worker
+        Returns: (zip_results, db_results) dengan urutan sama seperti zip_files
+
+        Worker dipakai ulang untuk arsip berikutnya, jadi validator dan koneksi
+        store cache hanya dibuat sekali per worker (bukan per arsip).
+
+        Mode process: arsip yang melewati archive_timeout dihentikan (proses
+        worker di-terminate, diganti worker baru) dan slotnya dipakai arsip
+        berikutnya. Mode thread tidak bisa menghentikan thread; slot tetap
+        dilepas supaya antrian berjalan, tetapi thread yang timeout baru
+        selesai sendiri.
+        """
+        if self.executor_mode == 'serial':
+            validators = (self.zip_validator, self.database_validator)
+            results = []
+            for zip_path in zip_files:
+                try:
+                    results.append(_validate_archive(zip_path, validators))
+                except Exception as e:
+                    results.append(_failed_archive_results(zip_path, f"Error processing {zip_path}: {str(e)}"))
+            return [r[0] for r in results], [r[1] for r in results]
+
+        workers = max(1, min(self.max_workers, len(zip_files)))
+        context = multiprocessing.get_context()
+        results = [None] * len(zip_files)
+        queue = deque(range(len(zip_files)))
+        idle = []     # (pipe, worker) yang siap menerima arsip berikutnya
+        running = {}  # pipe -> (index, worker, waktu mulai)
+
+        def stop(conn, worker, terminate=False):
+            if not terminate:
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+            conn.close()
+            if isinstance(worker, threading.Thread):
+                return  # Thread tidak bisa dihentikan dari luar
+            if terminate:
+                worker.terminate()
+            worker.join(5)
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+
+        try:
+            while queue or running:
+                while queue and len(running) < workers:
+                    conn, worker = idle.pop() if idle else self._start_worker(context)
+                    index = queue.popleft()
+                    try:
+                        conn.send(zip_files[index])
+                    except OSError:
+                        # Worker idle sudah berhenti: arsip dikerjakan worker lain
+                        stop(conn, worker, terminate=True)
+                        queue.appendleft(index)
+                        continue
+                    running[conn] = (index, worker, time.monotonic())
+
+                timeout = None
+                if self.archive_timeout > 0:
+                    deadline = min(started for _, _, started in running.values()) + self.archive_timeout
+                    timeout = max(0.0, deadline - time.monotonic())
+
+                for conn in wait_connections(list(running), timeout=timeout):
+                    index, worker, _ = running.pop(conn)
+                    try:
+                        status, payload = conn.recv()
+                    except (EOFError, OSError):
+                        status, payload = 'error', f"Worker validasi {os.path.basename(zip_files[index])} berhenti tanpa hasil"
+                        stop(conn, worker, terminate=True)
+                    else:
+                        idle.append((conn, worker))
+                    if status == 'ok':
+                        results[index] = payload
+                    else:
+                        results[index] = _failed_archive_results(zip_files[index], payload)
+
+                if self.archive_timeout <= 0:
+                    continue
+
+                now = time.monotonic()
+                for conn, (index, worker, started) in list(running.items()):
+                    if now - started >= self.archive_timeout:
+                        del running[conn]
+                        stop(conn, worker, terminate=True)
+                        results[index] = _failed_archive_results(
+                            zip_files[index],
+                            f"Timeout validasi {os.path.basename(zip_files[index])} setelah {self.archive_timeout:g} detik")
+        finally:
+            for conn, (_, worker, _) in running.items():
+                stop(conn, worker, terminate=True)
+            for conn, worker in idle:
+                stop(conn, worker)
+
+        return [r[0] for r in results], [r[1] for r in results]
+    
+    def _find_recent_zip_files(self, folder_path: str, days: int,
+                               pending: Optional[List[Dict]] = None) -> List[str]:
+        """
+        Find ZIP files from recent days
+        Arsip yang belum lolos stability gate dimasukkan ke pending (jika diberikan)
+        """
         if not os.path.exists(folder_path):
             return []
         
         zip_files = []
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        # Find all ZIP files in folder
-        zip_pattern = os.path.join(folder_path, "*.zip")
-        all_zip_files = glob.glob(zip_pattern)
-        
-        for zip_file in all_zip_files:
-            try:
-                # Check modification time
-                mod_time = datetime.fromtimestamp(os.path.getmtime(zip_file))
-                
-                # Also try to extract date from filename
-                filename_date = self._extract_date_from_filename(os.path.basename(zip_file))
-                
-                # Use the more recent date
-                file_date = max(mod_time, filename_date) if filename_date else mod_time
-                
-                if file_date >= cutoff_date:
-                    zip_files.append(zip_file)
-            
-            except Exception as e:
-                continue
-        
-        # Sort by date (newest first)
-        zip_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+        # Satu scandir untuk semua metadata (mtime + tanggal di nama file)
+        for record in scan_directory(folder_path):
+            # Use the more recent date
+            if record.effective_datetime >= cutoff_date:
+                state, reason = self.stability_gate.check(record.path, record.stat)
+                if state == STATE_PENDING:
+                    if pending is not None:
+                        pending.append(self.stability_gate.pending_entry(record.path, reason))
+                    continue
+                # scan_directory sudah terurut dari yang terbaru
+                zip_files.append(record.path)
         
         return zip_files
     
     def _extract_date_from_filename(self, filename: str) -> Optional[datetime]:
         """Extract date from filename using various patterns"""
-        # Common date patterns in filenames
-        patterns = [
-            r'(\d{4})-(\d{2})-(\d{2})',  # YYYY-MM-DD
-            r'(\d{4})(\d{2})(\d{2})',    # YYYYMMDD
-            r'(\d{2})-(\d{2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{2})(\d{2})(\d{4})',    # DDMMYYYY
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-M-D
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, filename)
-            if match:
-                try:
-                    groups = match.groups()
-                    if len(groups) == 3:
-                        # Determine if it's YYYY-MM-DD or DD-MM-YYYY format
-                        if len(groups[0]) == 4:  # YYYY-MM-DD
-                            year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                        else:  # DD-MM-YYYY
-                            day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
-                        
-                        return datetime(year, month, day)
-                except ValueError:
-                    continue
-        
-        return None
+        return parse_filename_date(filename)
     
     def _compare_zip_and_database_dates(self, zip_validation: Dict, database_validation: Dict) -> Dict:
         """Compare dates between ZIP files and database records"""
@@ -165,9 +389,9 @@ class MonitoringController:
         
         # Get ZIP file dates
         zip_file_dates = {}
-        for zip_info in zip_validation.get('validation_results', []):
-            zip_file = zip_info.get('zip_file', '')
-            zip_date = zip_info.get('file_date', '')
+        for zip_info in zip_validation.get('validation_details', []):
+            zip_file = zip_info.get('filename', '')
+            zip_date = zip_info.get('extracted_date', '')
             if zip_file and zip_date:
                 zip_file_dates[zip_file] = zip_date
         
@@ -189,10 +413,7 @@ class MonitoringController:
                 if zip_file:
                     # Get ZIP file date
                     zip_date = None
-                    for zip_info in zip_validation.get('validation_results', []):
-                        if zip_info.get('zip_file') == zip_file:
-                            zip_date = zip_info.get('file_date')
-                            break
+                    zip_date = zip_file_dates.get(zip_file)
                     
                     zip_entry = {
                         'zip_file': zip_file,
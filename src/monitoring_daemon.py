@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Monitoring Daemon Module
+Service monitoring backup tanpa GUI: scan, analisis, report dan notifikasi
+terjadwal berbasis asyncio di atas MonitoringController dan FolderMonitor.
+Modul berat (validator, email) di-import saat dibutuhkan sehingga CLI bisa
+start cepat tanpa PyQt5, tkinter maupun reportlab.
+
+Usage:
+    python monitor_daemon.py scan    [--folder PATH]
+    python monitor_daemon.py analyze [--folder PATH] [--days N] [--json]
+    python monitor_daemon.py report  [--folder PATH] [--days N] [--send]
+    python monitor_daemon.py serve   [--folder PATH] [--interval DETIK] [--no-watch]
+    python monitor_daemon.py hash    [--folder PATH] [--verify] [--json]
+"""
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import shutil
+import argparse
+import tempfile
+import configparser
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_CONFIG_FILE = 'config/config.ini'
+DEFAULT_SCAN_INTERVAL = 3600
+DEFAULT_DAYS_TO_CHECK = 7
+NOTIFY_POLICIES = ('issues', 'always', 'never')
+PDF_PREFIX = 'backup_monitoring_'
+OUTBOX_ATTACHMENT_PREFIX = 'backup_monitoring_outbox_'
+
+
+class DaemonConfig:
+    """Pengaturan daemon dari config.ini ([MONITORING], [NOTIFICATION], [DAEMON])"""
+
+    def __init__(self, config_file: str = DEFAULT_CONFIG_FILE):
+        self.folder = ''
+        self.scan_interval = DEFAULT_SCAN_INTERVAL
+        self.days_to_check = DEFAULT_DAYS_TO_CHECK
+        self.notify = 'issues'
+        self.watch = True
+
+        # config.ini memakai komentar inline (mis. "check_interval = 3600  # detik")
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config_path = config_file if os.path.isabs(config_file) else \
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), config_file)
+        try:
+            config.read(config_path)
+            if 'MONITORING' in config:
+                self.folder = config['MONITORING'].get('monitor_directory', self.folder)
+            if 'NOTIFICATION' in config:
+                self.scan_interval = config['NOTIFICATION'].getint('check_interval', self.scan_interval)
+            if 'DAEMON' in config:
+                section = config['DAEMON']
+                self.folder = section.get('folder', '') or self.folder
+                self.scan_interval = section.getint('scan_interval', self.scan_interval)
+                self.days_to_check = section.getint('days_to_check', self.days_to_check)
+                self.notify = section.get('notify', self.notify).strip().lower()
+                self.watch = section.getboolean('watch', self.watch)
+        except Exception as e:
+            print(f"Warning: Could not load daemon config: {e}")
+
+        if self.notify not in NOTIFY_POLICIES:
+            print(f"Warning: Unknown notify policy '{self.notify}', using issues")
+            self.notify = 'issues'
+
+
+def has_issues(monitoring_result: Dict) -> bool:
+    """True jika hasil monitoring punya error atau critical issue"""
+    overall = monitoring_result.get('overall_summary', {})
+    return bool(monitoring_result.get('errors') or overall.get('critical_issues'))
+
+
+def _temp_copy(path: str, prefix: str) -> str:
+    """Salin file ke file sementara baru (suffix sama)"""
+    fd, copy_path = tempfile.mkstemp(prefix=prefix, suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    shutil.copyfile(path, copy_path)
+    return copy_path
+
+
+def _remove_file(path: Optional[str]):
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MonitoringDaemon:
+    """
+    Service asyncio: analisis terjadwal setiap scan_interval detik, dipicu
+    lebih awal oleh FolderWatcher saat ada arsip baru, lalu kirim notifikasi
+    sesuai policy. Pekerjaan blocking dijalankan di thread executor;
+    notifikasi ditulis ke NotificationOutbox dan dikirim oleh sender outbox
+    di event loop yang sama, sehingga siklus monitoring tidak menunggu SMTP.
+    """
+
+    def __init__(self, folder: str, scan_interval: float = DEFAULT_SCAN_INTERVAL,
+                 days_to_check: int = DEFAULT_DAYS_TO_CHECK, notify: str = 'issues',
+                 watch: bool = True, controller=None, notifier=None, outbox_path: Optional[str] = None):
+        self.folder = folder
+        self.scan_interval = scan_interval
+        self.days_to_check = days_to_check
+        self.notify = notify
+        self.watch = watch
+        self._controller = controller
+        self._notifier = notifier
+        self._outbox = None
+        self._outbox_path = outbox_path
+        self._bus = None
+        self._stop = None
+        self.runs = 0
+        self.last_result = None
+
+    @property
+    def controller(self):
+        if self._controller is None:
+            from monitoring_controller import MonitoringController
+            self._controller = MonitoringController()
+        return self._controller
+
+    @property
+    def notifier(self):
+        if self._notifier is None:
+            from email_notifier import EmailNotifier
+            self._notifier = EmailNotifier()
+        return self._notifier
+
+    @property
+    def outbox(self):
+        if self._outbox is None:
+            from notification_outbox import NotificationOutbox, load_outbox_config
+            options = load_outbox_config()
+            if self._outbox_path:
+                options['outbox_path'] = self._outbox_path
+            self._outbox = NotificationOutbox(self._deliver, on_result=self._log_delivery, **options)
+        return self._outbox
+
+    @property
+    def bus(self):
+        """Notifier bus: satu hasil monitoring disebar ke channel di [CHANNELS] (email lewat outbox)"""
+        if self._bus is None:
+            from notifier_bus import NotifierBus, build_channels, load_channels_config
+            settings = load_channels_config()
+            renderers = {'text': self.controller.generate_monitoring_report}
+            if settings['attach_pdf']:
+                renderers['pdf'] = self._render_pdf
+            self._bus = NotifierBus(build_channels(settings, email_send=self._queue_email), renderers,
+                                    max_batch=settings['max_batch'], on_result=self._log_channel_result,
+                                    on_done=self._discard_pdf)
+        return self._bus
+
+    def _queue_email(self, subject: str, message: str, attachment_path: Optional[str] = None):
+        if attachment_path:
+            # Outbox mengirim belakangan: simpan salinan sendiri, PDF bus dihapus setelah semua channel selesai
+            attachment_path = _temp_copy(attachment_path, OUTBOX_ATTACHMENT_PREFIX)
+        notification_id = self.outbox.enqueue(subject, message, attachment_path)
+        if notification_id is None:
+            _remove_file(attachment_path)
+            # Duplikat bukan kegagalan: jangan dicoba ulang oleh notifier bus
+            return True, "Skipped: already queued in outbox"
+        return True, f"Queued in outbox (#{notification_id})"
+
+    @staticmethod
+    def _render_pdf(monitoring_result: Dict) -> Optional[str]:
+        """
+        PDF report dari record hasil monitoring (dibuat sekali, dipakai semua
+        channel); arsip tidak dianalisis ulang
+        """
+        if not monitoring_result.get('zip_validation_results', {}).get('validation_details'):
+            return None
+        from pdf_report_generator import PDFReportGenerator, iter_monitoring_records
+        fd, pdf_path = tempfile.mkstemp(prefix=PDF_PREFIX, suffix='.pdf')
+        os.close(fd)
+        details = monitoring_result['zip_validation_results']['validation_details']
+        if PDFReportGenerator().generate_report_from_records(iter_monitoring_records(monitoring_result), pdf_path,
+                                                             total_files=len(details)):
+            return pdf_path
+        _remove_file(pdf_path)
+        return None
+
+    @staticmethod
+    def _discard_pdf(rendered):
+        """Semua channel selesai dengan hasil ini: hapus PDF sementaranya"""
+        _remove_file(rendered.peek('pdf'))
+
+    @staticmethod
+    def _log_channel_result(channel: str, count: int, success: bool, message: str):
+        if success:
+            log(f"Notification [{channel}] x{count}: {message}")
+        else:
+            log(f"Notification [{channel}] x{count} failed: {message}")
+
+    def _deliver(self, subject: str, message: str, attachment_path: Optional[str] = None):
+        if attachment_path:
+            return self.notifier.send_notification(subject, message, attachment_path)
+        return self.notifier.send_notification(subject, message)
+
+    @staticmethod
+    def _log_delivery(notification: Dict, success: bool, message: str):
+        if success:
+            log(f"Notification sent: {notification['subject']}")
+        elif notification['status'] == 'failed':
+            log(f"Notification failed permanently after {notification['attempts']} attempts: {message}")
+        else:
+            log(f"Notification failed (attempt {notification['attempts']}), will retry: {message}")
+            return
+        # Salinan lampiran milik outbox tidak dibutuhkan lagi
+        attachment_path = notification.get('attachment_path')
+        if attachment_path and os.path.basename(attachment_path).startswith(OUTBOX_ATTACHMENT_PREFIX):
+            _remove_file(attachment_path)
+
+    def run_analysis(self) -> Dict:
+        """Satu siklus monitoring (blocking)"""
+        result = self.controller.monitor_backup_folder(self.folder, self.days_to_check)
+        self.runs += 1
+        self.last_result = result
+        return result
+
+    @staticmethod
+    def report_subject(monitoring_result: Dict) -> str:
+        overall = monitoring_result.get('overall_summary', {})
+        status = overall.get('monitoring_status', 'unknown').upper()
+        return f"Backup Monitoring {status} - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    def build_report(self, monitoring_result: Dict):
+        """(subject, message HTML) email report monitoring"""
+        report = self.controller.generate_monitoring_report(monitoring_result)
+        return self.report_subject(monitoring_result), f"<pre>{report}</pre>"
+
+    def send_report(self, monitoring_result: Dict):
+        """Kirim report monitoring lewat email sekarang (blocking). Returns: (success, message)"""
+        subject, message = self.build_report(monitoring_result)
+        return self.notifier.send_notification(subject, message)
+
+    def queue_report(self, monitoring_result: Dict):
+        """Publish report monitoring ke semua channel (tidak menunggu jaringan)"""
+        return self.bus.publish(monitoring_result, self.report_subject(monitoring_result))
+
+    def should_notify(self, monitoring_result: Dict) -> bool:
+        if self.notify == 'always':
+            return True
+        if self.notify == 'issues':
+            return has_issues(monitoring_result)
+        return False
+
+    async def run_cycle(self, reason: str = 'scheduled') -> Dict:
+        """Analisis + notifikasi di executor supaya event loop tetap responsif"""
+        loop = asyncio.get_running_loop()
+        log(f"Running {reason} check: {self.folder}")
+        result = await loop.run_in_executor(None, self.run_analysis)
+        overall = result.get('overall_summary', {})
+        log(f"Check finished: status={overall.get('monitoring_status', 'unknown')}, "
+            f"zip_files={len(result.get('zip_files_found', []))}, "
+            f"pending={len(result.get('pending_files', []))}")
+
+        if self.should_notify(result):
+            self.queue_report(result)
+            log(f"Notification queued for: {', '.join(self.bus.channels) or 'no channels'}")
+        return result
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    async def serve(self, max_cycles: Optional[int] = None):
+        """Loop service sampai stop() dipanggil (atau max_cycles tercapai)"""
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Windows / bukan main thread: pakai KeyboardInterrupt
+
+        watcher = None
+        if self.watch:
+            try:
+                from folder_watcher import FolderWatcher
+                watcher = FolderWatcher(self.folder)
+                watcher.start()
+                log(f"Folder watcher active ({watcher.backend})")
+            except Exception as e:
+                log(f"Folder watcher unavailable, using scheduled checks only: {e}")
+                watcher = None
+
+        outbox_task = None
+        if self.notify != 'never':
+            outbox_task = asyncio.create_task(self.outbox.serve())
+            self.bus.start()
+
+        reason = 'initial'
+        cycles = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    await self.run_cycle(reason)
+                except Exception as e:
+                    log(f"Monitoring cycle error: {e}")
+                cycles += 1
+                if max_cycles is not None and cycles >= max_cycles:
+                    break
+                reason = await self._wait_next(watcher)
+        finally:
+            if watcher is not None:
+                watcher.stop()
+            if outbox_task is not None:
+                # Batch yang masih tertahan rate limit dikirim dulu (email masuk outbox)
+                await loop.run_in_executor(None, self.bus.stop)
+                await self._stop_outbox(outbox_task)
+        log("Monitoring daemon stopped")
+
+    async def _stop_outbox(self, outbox_task, drain_timeout: float = 30):
+        """Hentikan sender outbox; notifikasi yang jatuh tempo dicoba kirim sekali lagi"""
+        self.outbox.stop()
+        await outbox_task
+        try:
+            await asyncio.wait_for(self.outbox.process_due(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            log("Outbox drain timed out; remaining notifications stay queued")
+
+    async def _wait_next(self, watcher) -> str:
+        """Tunggu jadwal berikutnya, arsip baru dari watcher, atau stop"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.scan_interval
+        while not self._stop.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return 'scheduled'
+            if watcher is None:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            changed = await loop.run_in_executor(None, watcher.wait_for_changes, min(remaining, 1.0))
+            if changed:
+                return 'new archive (' + ', '.join(os.path.basename(path) for path in changed) + ')'
+        return 'stopped'
+
+
+def log(message: str):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def cmd_scan(args, config: DaemonConfig) -> int:
+    from folder_monitor import FolderMonitor
+
+    monitor = FolderMonitor()
+    monitor.set_monitoring_path(args.folder)
+    zip_files, latest_date = monitor.get_latest_zip_files_by_date()
+    if args.json:
+        print(json.dumps({'folder': args.folder, 'latest_date': latest_date, 'zip_files': zip_files,
+                          'pending_files': monitor.pending_files}, indent=2, default=_json_default))
+        return 0
+
+    print(f"Folder: {args.folder}")
+    print(f"Latest date: {latest_date or '-'}")
+    for path in zip_files:
+        print(f"  {os.path.basename(path)}")
+    for entry in monitor.pending_files:
+        print(f"  {entry['filename']} (pending: {entry['reason']})")
+    return 0
+
+
+def cmd_analyze(args, config: DaemonConfig) -> int:
+    daemon = MonitoringDaemon(args.folder, days_to_check=args.days)
+    result = daemon.run_analysis()
+    if args.json:
+        print(json.dumps(result, indent=2, default=_json_default))
+    else:
+        overall = result.get('overall_summary', {})
+        print(f"Status: {overall.get('monitoring_status', 'unknown')}")
+        print(f"Health: {overall.get('overall_health', 'unknown')}")
+        print(f"ZIP files: {len(result.get('zip_files_found', []))}")
+        print(f"Pending: {len(result.get('pending_files', []))}")
+        for issue in overall.get('critical_issues', []):
+            print(f"  ! {issue}")
+    return 1 if has_issues(result) else 0
+
+
+def cmd_report(args, config: DaemonConfig) -> int:
+    daemon = MonitoringDaemon(args.folder, days_to_check=args.days)
+    result = daemon.run_analysis()
+    print(daemon.controller.generate_monitoring_report(result))
+    if args.send:
+        success, message = daemon.send_report(result)
+        print(message)
+        if not success:
+            return 2
+    return 1 if has_issues(result) else 0
+
+
+def cmd_serve(args, config: DaemonConfig) -> int:
+    daemon = MonitoringDaemon(args.folder, scan_interval=args.interval, days_to_check=args.days,
+                              notify=args.notify, watch=not args.no_watch)
+    log(f"Monitoring daemon started: folder={args.folder}, interval={args.interval}s, notify={args.notify}")
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        log("Monitoring daemon interrupted")
+    return 0
+
+
+def cmd_hash(args, config: DaemonConfig) -> int:
+    from dir_scanner import scan_directory
+    from file_hasher import STATUS_CORRUPTED, get_default_hasher
+
+    hasher = get_default_hasher()
+    paths = [record.path for record in scan_directory(args.folder)]
+    results = hasher.hash_files(paths, verify=args.verify)
+    duplicates = hasher.duplicates()
+    corrupted = [result.path for result in results if result.status == STATUS_CORRUPTED]
+    if args.json:
+        print(json.dumps({'folder': args.folder, 'files': [result._asdict() for result in results],
+                          'duplicates': duplicates, 'corrupted': corrupted}, indent=2, default=_json_default))
+    else:
+        print(f"Folder: {args.folder}")
+        for result in results:
+            source = 'cached' if result.cached else result.status
+            print(f"  {os.path.basename(result.path)}  sha256={result.digests['sha256'][:16]}  ({source})")
+        print(f"Hashed: {hasher.files_hashed} file, {hasher.bytes_hashed / (1024 * 1024):.1f} MB")
+        for group in duplicates:
+            print("  duplicate: " + ', '.join(os.path.basename(path) for path in group))
+        for path in corrupted:
+            print(f"  ! {os.path.basename(path)}: isi berubah tanpa perubahan ukuran/mtime")
+    return 1 if corrupted else 0
+
+
+def build_parser(config: DaemonConfig) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='monitor_daemon',
+                                     description='Headless backup monitoring (tanpa GUI)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(sub):
+        sub.add_argument('--folder', default=config.folder, help='Folder backup yang dimonitor')
+        sub.add_argument('--days', type=int, default=config.days_to_check, help='Jumlah hari ke belakang')
+        sub.add_argument('--json', action='store_true', help='Output JSON')
+
+    scan = subparsers.add_parser('scan', help='Daftar arsip ZIP terbaru (dan yang masih ditulis)')
+    add_common(scan)
+    scan.set_defaults(func=cmd_scan)
+
+    analyze = subparsers.add_parser('analyze', help='Validasi ZIP + database satu kali')
+    add_common(analyze)
+    analyze.set_defaults(func=cmd_analyze)
+
+    report = subparsers.add_parser('report', help='Cetak report monitoring, opsional kirim email')
+    add_common(report)
+    report.add_argument('--send', action='store_true', help='Kirim report lewat email')
+    report.set_defaults(func=cmd_report)
+
+    serve = subparsers.add_parser('serve', help='Jalankan service monitoring terjadwal')
+    add_common(serve)
+    serve.add_argument('--interval', type=float, default=config.scan_interval, help='Interval scan (detik)')
+    serve.add_argument('--notify', choices=NOTIFY_POLICIES, default=config.notify, help='Kapan kirim email')
+    serve.add_argument('--no-watch', action='store_true', default=not config.watch,
+                       help='Tanpa folder watcher, hanya jadwal')
+    serve.set_defaults(func=cmd_serve)
+
+    hash_parser = subparsers.add_parser('hash', help='Fingerprint arsip ZIP (SHA-256, BLAKE2b, CRC32)')
+    add_common(hash_parser)
+    hash_parser.add_argument('--verify', action='store_true',
+                             help='Hash ulang arsip yang tersimpan untuk deteksi bit-rot')
+    hash_parser.set_defaults(func=cmd_hash)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    config = DaemonConfig()
+    args = build_parser(config).parse_args(argv)
+    if not args.folder or not os.path.isdir(args.folder):
+        print(f"Error: folder backup tidak ditemukan: {args.folder or '-'} (gunakan --folder)", file=sys.stderr)
+        return 2
+    return args.func(args, config)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
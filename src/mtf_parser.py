@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+MTF Parser Module
+Parser native untuk descriptor block Microsoft Tape Format (MTF 1.00a) yang
+dipakai file .bak SQL Server. Menghasilkan field setara RESTORE HEADERONLY dan
+RESTORE FILELISTONLY tanpa sqlcmd, restore, maupun subprocess.
+
+Layer MTF (TAPE/SSET/VOLB/ESET) mengikuti spesifikasi publik. Isi stream
+konfigurasi SQL Server (MSCI) tidak terdokumentasi, sehingga dari stream itu
+hanya diambil string UTF-16 (nama database, collation, nama file logical dan
+physical). Field yang hanya ada di bagian biner MSCI (LSN, versi database,
+GUID) dilaporkan sebagai None.
+
+Dua mapping atribut SSET adalah heuristik, bukan bagian spesifikasi MTF
+maupun dokumentasi SQL Server:
+- SSET_INCREMENTAL (0x10) -> BackupType 2 "Transaction Log". Backup log SQL
+  Server menulis SSET incremental; tipe file/filegroup/partial (4, 6, 7, 8)
+  tidak bisa dibedakan dari layer MTF dan dilaporkan sebagai Database.
+- SSET_COPY (0x02) -> IsCopyOnly. Bit "copy" MTF dipakai untuk backup
+  COPY_ONLY; nilai asli RESTORE HEADERONLY ada di bagian biner MSCI.
+"""
+
+import os
+import re
+import struct
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+DBLK_HEADER = struct.Struct('<4sIHBBQQH6sI4sHHBBH')   # MTF_DB_HDR, 52 byte
+STREAM_HEADER = struct.Struct('<4sHHQHHH')             # MTF_STREAM_HDR, 22 byte
+TAPE_BODY = struct.Struct('<IIHHHH4s4s4s4sHH5sB')
+SSET_BODY = struct.Struct('<IHHHH4s4s4s4sQ5sBBbBB')
+VOLB_BODY = struct.Struct('<I4s4s4s5s')
+ESET_BODY = struct.Struct('<II8s8sHH5s')
+TAPE_ADDRESS = struct.Struct('<HH')
+
+DESCRIPTOR_BLOCKS = (b'TAPE', b'SSET', b'VOLB', b'DIRB', b'FILE', b'CFIL', b'ESPB',
+                     b'ESET', b'EOTM', b'SFMB', b'MSCI', b'MSDA', b'MQCI')
+PAD_STREAM = b'SPAD'
+CONFIG_STREAM_LIMIT = 1024 * 1024      # Stream > 1 MB dianggap data, tidak dibaca
+DEFAULT_BLOCK_SIZE = 512
+MAX_DESCRIPTOR_SIZE = 64 * 1024
+
+STRING_TYPE_ANSI = 1
+STRING_TYPE_UNICODE = 2
+
+# Bit atribut SSET (MTF 1.00a, 5.2.2)
+SSET_COPY_BIT = 0x00000002
+SSET_NORMAL_BIT = 0x00000004
+SSET_DIFFERENTIAL_BIT = 0x00000008
+SSET_INCREMENTAL_BIT = 0x00000010
+
+BACKUP_TYPE_DESCRIPTIONS = {
+    1: 'Database',
+    2: 'Transaction Log',
+    4: 'File or Filegroup',
+    5: 'Database Differential',
+    6: 'File Differential',
+    7: 'Partial',
+    8: 'Partial Differential'
+}
+
+# Urutan kolom output RESTORE HEADERONLY / FILELISTONLY (SQL Server 2017+)
+HEADERONLY_COLUMNS = (
+    'BackupName', 'BackupDescription', 'BackupType', 'ExpirationDate', 'Compressed',
+    'Position', 'DeviceType', 'UserName', 'ServerName', 'DatabaseName', 'DatabaseVersion',
+    'DatabaseCreationDate', 'BackupSize', 'FirstLSN', 'LastLSN', 'CheckpointLSN',
+    'DatabaseBackupLSN', 'BackupStartDate', 'BackupFinishDate', 'SortOrder', 'CodePage',
+    'UnicodeLocaleId', 'UnicodeComparisonStyle', 'CompatibilityLevel', 'SoftwareVendorId',
+    'SoftwareVersionMajor', 'SoftwareVersionMinor', 'SoftwareVersionBuild', 'MachineName',
+    'Flags', 'BindingID', 'RecoveryForkID', 'Collation', 'FamilyGUID', 'HasBulkLoggedData',
+    'IsSnapshot', 'IsReadOnly', 'IsSingleUser', 'HasBackupChecksums', 'IsDamaged',
+    'BeginsLogChain', 'HasIncompleteMetaData', 'IsForceOffline', 'IsCopyOnly',
+    'FirstRecoveryForkID', 'ForkPointLSN', 'RecoveryModel', 'DifferentialBaseLSN',
+    'DifferentialBaseGUID', 'BackupTypeDescription', 'BackupSetGUID', 'CompressedBackupSize',
+    'Containment', 'KeyAlgorithm', 'EncryptorThumbprint', 'EncryptorType',
+    'LastValidRestoreTime', 'TimeZone', 'CompressionAlgorithm'
+)
+
+FILELISTONLY_COLUMNS = (
+    'LogicalName', 'PhysicalName', 'Type', 'FileGroupName', 'Size', 'MaxSize', 'FileId',
+    'CreateLSN', 'DropLSN', 'UniqueId', 'ReadOnlyLSN', 'ReadWriteLSN', 'BackupSizeInBytes',
+    'SourceBlockSize', 'FileGroupId', 'LogGroupGUID', 'DifferentialBaseLSN',
+    'DifferentialBaseGUID', 'IsReadOnly', 'IsPresent', 'TDEThumbprint', 'SnapshotUrl'
+)
+
+_UTF16_STRING = re.compile(rb'(?:[\x20-\x7e]\x00){3,}')
+_DATABASE_FILE = re.compile(r'[\\/].+\.(mdf|ndf|ldf)$', re.IGNORECASE)
+_COLLATION = re.compile(r'^[A-Za-z0-9]+(?:_[A-Za-z0-9]+)*_C[IS]_A[IS]')
+
+
+def _checksum(data: bytes) -> int:
+    """XOR seluruh word 16-bit (checksum header DBLK dan stream MTF)"""
+    value = 0
+    for (word,) in struct.iter_unpack('<H', data):
+        value ^= word
+    return value
+
+
+def decode_mtf_date(raw: bytes) -> Optional[datetime]:
+    """Decode MTF_DATE_TIME (5 byte, packed 14/4/5/5/6/6 bit)"""
+    if len(raw) != 5 or not any(raw):
+        return None
+    packed = int.from_bytes(raw, 'big')
+    try:
+        return datetime((packed >> 26) & 0x3FFF, (packed >> 22) & 0xF, (packed >> 17) & 0x1F,
+                        (packed >> 12) & 0x1F, (packed >> 6) & 0x3F, packed & 0x3F)
+    except ValueError:
+        return None
+
+
+def is_mtf_backup(header: bytes) -> bool:
+    """Cek apakah buffer diawali descriptor block TAPE dengan checksum valid"""
+    return (len(header) >= DBLK_HEADER.size and header[:4] == b'TAPE'
+            and _checksum(header[:50]) == struct.unpack_from('<H', header, 50)[0])
+
+
+def _align(value: int, boundary: int) -> int:
+    return -(-value // boundary) * boundary
+
+
+class _Source:
+    """Adapter baca random-access: path, file object, atau reader dengan read(offset, size)"""
+
+    def __init__(self, source):
+        self._owned = None
+        if isinstance(source, (str, os.PathLike)):
+            self._owned = open(source, 'rb')
+            source = self._owned
+        if hasattr(source, 'seek'):
+            self._fp = source
+            self._reader = None
+            source.seek(0, os.SEEK_END)
+            self.size = source.tell()
+        else:
+            # Contoh: zip_sqlite.ZipMemberReader
+            self._fp = None
+            self._reader = source
+            self.size = source.size
+
+    def read(self, offset: int, size: int) -> bytes:
+        if offset >= self.size or size <= 0:
+            return b''
+        if self._reader is not None:
+            return self._reader.read(offset, min(size, self.size - offset))
+        self._fp.seek(offset)
+        return self._fp.read(size)
+
+    def close(self):
+        if self._owned is not None:
+            self._owned.close()
+
+
+class MTFParser:
+    """
+    Walker descriptor block MTF. Payload stream besar (data page database)
+    dilompati lewat offset sehingga parsing hanya membaca beberapa KB.
+    """
+
+    def __init__(self, headers_only: bool = False):
+        # headers_only: berhenti di stream data pertama (tanpa BackupFinishDate/BackupSize).
+        # Berguna untuk member ZIP DEFLATED di mana seek ke akhir berarti dekompresi penuh.
+        self.headers_only = headers_only
+
+    def parse(self, source) -> Dict[str, Any]:
+        """
+        Parse seluruh descriptor block dari file .bak
+
+        Args:
+            source: Path, file object biner, atau reader read(offset, size) + size
+
+        Returns:
+            Dictionary berisi media (TAPE), backup_sets (header + files), blocks, errors
+        """
+        start = time.perf_counter()
+        result = {
+            'is_mtf': False,
+            'media': {},
+            'backup_sets': [],
+            'blocks': [],
+            'errors': [],
+            'elapsed_seconds': 0.0
+        }
+
+        reader = _Source(source)
+        try:
+            self._walk(reader, result)
+        except Exception as e:
+            result['errors'].append(f"MTF parse error: {str(e)}")
+        finally:
+            reader.close()
+
+        for backup_set in result['backup_sets']:
+            self._finish_backup_set(backup_set)
+            backup_set.pop('_strings', None)
+            backup_set.pop('_start_offset', None)
+
+        result['elapsed_seconds'] = round(time.perf_counter() - start, 6)
+        return result
+
+    def _walk(self, reader: _Source, result: Dict):
+        block_size = DEFAULT_BLOCK_SIZE
+        current_set = None
+        pos = 0
+
+        while pos + DBLK_HEADER.size <= reader.size:
+            raw = reader.read(pos, DBLK_HEADER.size)
+            header = self._parse_dblk_header(raw)
+            if header is None:
+                if pos == 0:
+                    result['errors'].append("Not an MTF backup (no TAPE descriptor block)")
+                else:
+                    result['errors'].append(f"Invalid descriptor block at offset {pos}")
+                return
+
+            block_type = header['type']
+            body = reader.read(pos, max(header['first_event'], DBLK_HEADER.size))
+            block = {'type': block_type, 'offset': pos, 'streams': []}
+            result['blocks'].append(block)
+
+            if block_type == 'TAPE':
+                result['is_mtf'] = True
+                result['media'] = self._parse_tape(reader, pos, body, header)
+                block_size = result['media']['format_logical_block_size'] or DEFAULT_BLOCK_SIZE
+            elif block_type == 'SSET':
+                current_set = {
+                    'header': self._parse_sset(reader, pos, body, header),
+                    'files': [],
+                    '_strings': [],
+                    '_start_offset': pos
+                }
+                result['backup_sets'].append(current_set)
+            elif block_type == 'VOLB' and current_set is not None:
+                self._parse_volb(reader, pos, body, header, current_set['header'])
+            elif block_type == 'ESET' and current_set is not None:
+                self._parse_eset(body, current_set['header'])
+                current_set['header']['BackupSize'] = pos - current_set['_start_offset']
+                current_set = None
+
+            next_pos, stop = self._walk_streams(reader, pos + header['first_event'], block,
+                                                current_set)
+            if stop:
+                return
+            if next_pos is None:
+                next_pos = _align(pos + max(header['first_event'], DBLK_HEADER.size), block_size)
+            if block_type == 'EOTM' or next_pos <= pos:
+                return
+            pos = next_pos
+
+    def _walk_streams(self, reader: _Source, spos: int, block: Dict, current_set: Optional[Dict]):
+        """Iterasi stream dalam satu DBLK. Return (offset DBLK berikutnya, stop)"""
+        while True:
+            spos = _align(spos, 4)
+            raw = reader.read(spos, STREAM_HEADER.size)
+            if len(raw) < STREAM_HEADER.size or _checksum(raw[:20]) != struct.unpack_from('<H', raw, 20)[0]:
+                return None, False
+
+            stream_id, _, _, length, _, _, _ = STREAM_HEADER.unpack(raw)
+            payload_pos = spos + STREAM_HEADER.size
+            if stream_id == PAD_STREAM:
+                return payload_pos + length, False
+
+            stream_name = stream_id.decode('ascii', errors='replace')
+            block['streams'].append({'id': stream_name, 'offset': payload_pos, 'length': length})
+
+            if length <= CONFIG_STREAM_LIMIT:
+                if current_set is not None and block['type'] in ('SSET', 'VOLB', 'MSCI'):
+                    current_set['_strings'].extend(_utf16_strings(reader.read(payload_pos, length)))
+            elif self.headers_only:
+                return None, True
+
+            spos = payload_pos + length
+
+    @staticmethod
+    def _parse_dblk_header(raw: bytes) -> Optional[Dict]:
+        if len(raw) < DBLK_HEADER.size or raw[:4] not in DESCRIPTOR_BLOCKS:
+            return None
+        fields = DBLK_HEADER.unpack(raw)
+        if _checksum(raw[:50]) != fields[15]:
+            return None
+        return {
+            'type': fields[0].decode('ascii'),
+            'attributes': fields[1],
+            'first_event': fields[2],
+            'os_id': fields[3],
+            'os_version': fields[4],
+            'displayable_size': fields[5],
+            'format_logical_address': fields[6],
+            'control_block_id': fields[9],
+            'string_type': fields[13]
+        }
+
+    @staticmethod
+    def _read_string(reader: _Source, pos: int, body: bytes, address: bytes, string_type: int) -> Optional[str]:
+        size, offset = TAPE_ADDRESS.unpack(address)
+        if not size:
+            return None
+        if offset + size <= len(body):
+            raw = body[offset:offset + size]
+        elif offset + size <= MAX_DESCRIPTOR_SIZE:
+            raw = reader.read(pos + offset, size)
+        else:
+            return None
+        encoding = 'utf-16-le' if string_type == STRING_TYPE_UNICODE else 'cp1252'
+        return raw.decode(encoding, errors='replace').rstrip('\x00') or None
+
+    def _parse_tape(self, reader: _Source, pos: int, body: bytes, header: Dict) -> Dict:
+        fields = TAPE_BODY.unpack_from(body.ljust(TAPE_BODY.size + DBLK_HEADER.size, b'\x00'),
+                                       DBLK_HEADER.size)
+        string_type = header['string_type']
+        return {
+            'media_family_id': fields[0],
+            'media_sequence_number': fields[2],
+            'media_name': self._read_string(reader, pos, body, fields[6], string_type),
+            'media_description': self._read_string(reader, pos, body, fields[7], string_type),
+            'software_name': self._read_string(reader, pos, body, fields[9], string_type),
+            'format_logical_block_size': fields[10],
+            'software_vendor_id': fields[11],
+            'media_date': decode_mtf_date(fields[12]),
+            'mtf_major_version': fields[13]
+        }
+
+    def _parse_sset(self, reader: _Source, pos: int, body: bytes, header: Dict) -> Dict:
+        fields = SSET_BODY.unpack_from(body.ljust(SSET_BODY.size + DBLK_HEADER.size, b'\x00'),
+                                       DBLK_HEADER.size)
+        string_type = header['string_type']
+        attributes = fields[0]
+
+        if attributes & SSET_DIFFERENTIAL_BIT:
+            backup_type = 5
+        elif attributes & SSET_INCREMENTAL_BIT:
+            backup_type = 2
+        else:
+            backup_type = 1
+
+        backup_header = dict.fromkeys(HEADERONLY_COLUMNS)
+        backup_header.update({
+            'BackupName': self._read_string(reader, pos, body, fields[5], string_type),
+            'BackupDescription': self._read_string(reader, pos, body, fields[6], string_type),
+            'BackupType': backup_type,
+            'BackupTypeDescription': BACKUP_TYPE_DESCRIPTIONS[backup_type],
+            'Position': fields[4],
+            'DeviceType': 2,  # Disk
+            'UserName': self._read_string(reader, pos, body, fields[8], string_type),
+            'BackupStartDate': decode_mtf_date(fields[10]),
+            'SoftwareVendorId': fields[3],
+            'SoftwareVersionMajor': fields[11],
+            'SoftwareVersionMinor': fields[12],
+            'IsCopyOnly': bool(attributes & SSET_COPY_BIT),
+            'TimeZone': fields[13]
+        })
+        return backup_header
+
+    def _parse_volb(self, reader: _Source, pos: int, body: bytes, header: Dict, backup_header: Dict):
+        fields = VOLB_BODY.unpack_from(body.ljust(VOLB_BODY.size + DBLK_HEADER.size, b'\x00'),
+                                       DBLK_HEADER.size)
+        machine_name = self._read_string(reader, pos, body, fields[3], header['string_type'])
+        backup_header['MachineName'] = machine_name
+        # Instance default: ServerName sama dengan nama mesin
+        backup_header['ServerName'] = machine_name
+
+    @staticmethod
+    def _parse_eset(body: bytes, backup_header: Dict):
+        fields = ESET_BODY.unpack_from(body.ljust(ESET_BODY.size + DBLK_HEADER.size, b'\x00'),
+                                       DBLK_HEADER.size)
+        backup_header['BackupFinishDate'] = decode_mtf_date(fields[6])
+        backup_header['IsDamaged'] = fields[1] > 0
+
+    @staticmethod
+    def _finish_backup_set(backup_set: Dict):
+        """Isi DatabaseName, Collation, dan file list dari string stream konfigurasi"""
+        header = backup_set['header']
+        strings = backup_set['_strings']
+        backup_name = header.get('BackupName') or ''
+
+        names = []
+        for index, value in enumerate(strings):
+            if _DATABASE_FILE.search(value):
+                logical = strings[index - 1] if index > 0 else None
+                if logical is not None and (_DATABASE_FILE.search(logical) or _COLLATION.match(logical)):
+                    logical = None
+                entry = dict.fromkeys(FILELISTONLY_COLUMNS)
+                entry.update({
+                    'LogicalName': logical,
+                    'PhysicalName': value,
+                    'Type': 'L' if value.lower().endswith('.ldf') else 'D',
+                    'FileId': len(backup_set['files']) + 1
+                })
+                backup_set['files'].append(entry)
+            elif _COLLATION.match(value):
+                header['Collation'] = header['Collation'] or value
+            else:
+                names.append(value)
+
+        if header['DatabaseName'] is None:
+            for name in names:
+                if backup_name == name or backup_name.startswith(name + '_'):
+                    header['DatabaseName'] = name
+                    break
+        if header['DatabaseName'] is None:
+            data_files = [f['LogicalName'] for f in backup_set['files'] if f['Type'] == 'D' and f['LogicalName']]
+            if data_files:
+                header['DatabaseName'] = data_files[0]
+            elif '_backup_' in backup_name:
+                header['DatabaseName'] = backup_name.split('_backup_')[0]
+
+
+def _utf16_strings(data: bytes) -> List[str]:
+    return [match.decode('utf-16-le') for match in _UTF16_STRING.findall(data)]
+
+
+def parse_mtf(source, headers_only: bool = False) -> Dict[str, Any]:
+    """Parse file .bak MTF (lihat MTFParser.parse)"""
+    return MTFParser(headers_only=headers_only).parse(source)
+
+
+def read_headeronly(source, headers_only: bool = False) -> List[Dict[str, Any]]:
+    """Setara RESTORE HEADERONLY: satu dictionary per backup set"""
+    return [backup_set['header'] for backup_set in parse_mtf(source, headers_only)['backup_sets']]
+
+
+def read_filelistonly(source, position: int = 1) -> List[Dict[str, Any]]:
+    """Setara RESTORE FILELISTONLY untuk backup set pada `position`"""
+    for backup_set in parse_mtf(source, headers_only=True)['backup_sets']:
+        if backup_set['header']['Position'] == position:
+            return backup_set['files']
+    return []
+
+
+def _parse_sqlcmd_rows(text: str, columns) -> List[Dict[str, Any]]:
+    rows = []
+    for line in text.splitlines():
+        values = [value.strip() for value in line.split(',')]
+        if len(values) < len(columns):
+            continue
+        row = {}
+        for column, value in zip(columns, values):
+            if value == 'NULL' or value == '':
+                row[column] = None
+            elif re.fullmatch(r'-?\d+', value) and not column.endswith('LSN'):
+                row[column] = int(value)
+            elif re.fullmatch(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d+)?', value):
+                row[column] = datetime.strptime(value.split('.')[0], '%Y-%m-%d %H:%M:%S')
+            else:
+                row[column] = value
+        rows.append(row)
+    return rows
+
+
+def parse_headeronly_output(text: str) -> List[Dict[str, Any]]:
+    """Parse output `sqlcmd -s ,` dari RESTORE HEADERONLY ke dictionary per kolom"""
+    return _parse_sqlcmd_rows(text, HEADERONLY_COLUMNS)
+
+
+def parse_filelistonly_output(text: str) -> List[Dict[str, Any]]:
+    """Parse output `sqlcmd -s ,` dari RESTORE FILELISTONLY ke dictionary per kolom"""
+    return _parse_sqlcmd_rows(text, FILELISTONLY_COLUMNS)
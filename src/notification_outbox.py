@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Notification Outbox Module
+Antrian notifikasi persisten (SQLite). Kode analisis / monitoring hanya
+menulis ke outbox (tanpa menunggu jaringan); sender asyncio di background
+mengirim isinya dengan batas concurrency, retry dengan backoff eksponensial,
+dan dedup key supaya alert yang sama tidak terkirim berulang. Notifikasi
+yang belum terkirim tetap ada di disk saat aplikasi ditutup / SMTP mati dan
+dikirim ulang saat sender berjalan lagi.
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+import configparser
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_OUTBOX_FILE = 'config/notification_outbox.db'
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_BACKOFF_BASE = 30.0      # detik, digandakan setiap kegagalan
+DEFAULT_BACKOFF_MAX = 3600.0
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_RETENTION_DAYS = 30      # notifikasi terkirim/gagal disimpan selama ini (juga window dedup)
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+# sender(subject, message, attachment_path) -> (success, message), blocking
+SendFunction = Callable[[str, str, Optional[str]], Tuple[bool, str]]
+# on_result(notification, success, message)
+ResultCallback = Callable[[Dict, bool, str], None]
+
+
+class NotificationOutbox:
+    """
+    Outbox untuk satu channel (default 'email'). enqueue() hanya menulis ke
+    SQLite; pengiriman dilakukan serve() (coroutine, untuk aplikasi asyncio)
+    atau start() (thread background dengan event loop sendiri).
+    """
+
+    def __init__(self, sender: SendFunction, outbox_path: Optional[str] = None, channel: str = 'email',
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, retention_days: int = DEFAULT_RETENTION_DAYS,
+                 on_result: Optional[ResultCallback] = None):
+        if not outbox_path:
+            outbox_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), DEFAULT_OUTBOX_FILE)
+        self.outbox_path = outbox_path
+        self.sender = sender
+        self.channel = channel
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.retention_days = retention_days
+        self.on_result = on_result
+        self._conn = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wake = None
+        self._stop = None
+        self._thread = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka outbox (lazy), buat schema, dan kembalikan notifikasi yang terputus saat dikirim"""
+        if self._conn is None:
+            outbox_dir = os.path.dirname(self.outbox_path)
+            if outbox_dir:
+                os.makedirs(outbox_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.outbox_path, check_same_thread=False, timeout=10)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    dedup_key TEXT UNIQUE,
+                    subject TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    attachment_path TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    last_error TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (channel, status, next_attempt_at)")
+            # Proses sebelumnya berhenti di tengah pengiriman: kirim ulang
+            self._conn.execute("UPDATE outbox SET status = ? WHERE channel = ? AND status = ?",
+                               (STATUS_PENDING, self.channel, STATUS_SENDING))
+            cutoff = datetime.fromtimestamp(time.time() - self.retention_days * 86400).isoformat()
+            self._conn.execute("DELETE FROM outbox WHERE status IN (?, ?) AND updated_at < ?",
+                               (STATUS_SENT, STATUS_FAILED, cutoff))
+            self._conn.commit()
+        return self._conn
+
+    def enqueue(self, subject: str, message: str, attachment_path: Optional[str] = None,
+                dedup_key: Optional[str] = None) -> Optional[int]:
+        """
+        Simpan notifikasi ke outbox (tidak menunggu jaringan)
+
+        Args:
+            dedup_key: Notifikasi dengan key yang sama hanya dikirim sekali selama
+                       retention_days; key yang sebelumnya gagal permanen diantrikan ulang
+
+        Returns:
+            id notifikasi, atau None jika sudah ada di outbox (duplikat)
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute("""
+                INSERT INTO outbox (channel, dedup_key, subject, message, attachment_path, status,
+                                    attempts, next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
+                ON CONFLICT(dedup_key) DO UPDATE SET
+                    subject = excluded.subject, message = excluded.message,
+                    attachment_path = excluded.attachment_path, status = excluded.status,
+                    attempts = 0, next_attempt_at = excluded.next_attempt_at,
+                    updated_at = excluded.updated_at, last_error = NULL
+                WHERE outbox.status = ?
+            """, (self.channel, dedup_key, subject, message, attachment_path, STATUS_PENDING,
+                  time.time(), now, now, STATUS_FAILED))
+            conn.commit()
+            if cursor.rowcount == 0:
+                return None
+            if dedup_key is None:
+                notification_id = cursor.lastrowid
+            else:
+                notification_id = conn.execute("SELECT id FROM outbox WHERE dedup_key = ?",
+                                               (dedup_key,)).fetchone()[0]
+        self._notify_sender()
+        return notification_id
+
+    def _notify_sender(self):
+        """Bangunkan sender (jika sedang berjalan) supaya notifikasi baru langsung diproses"""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # loop sudah ditutup
+
+    def backoff_delay(self, attempts: int) -> float:
+        """Jeda sebelum percobaan berikutnya setelah attempts kali gagal"""
+        return min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+
+    def _claim_due(self, limit: int) -> List[Dict]:
+        """Ambil notifikasi yang jatuh tempo dan tandai sedang dikirim"""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute("""
+                SELECT id, dedup_key, subject, message, attachment_path, attempts FROM outbox
+                WHERE channel = ? AND status = ? AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id LIMIT ?
+            """, (self.channel, STATUS_PENDING, time.time(), limit)).fetchall()
+            claimed = []
+            for row in rows:
+                # Update bersyarat: outbox yang sama bisa dibaca beberapa proses
+                cursor = conn.execute("UPDATE outbox SET status = ? WHERE id = ? AND status = ?",
+                                      (STATUS_SENDING, row[0], STATUS_PENDING))
+                if cursor.rowcount:
+                    claimed.append({'id': row[0], 'dedup_key': row[1], 'subject': row[2], 'message': row[3],
+                                    'attachment_path': row[4], 'attempts': row[5]})
+            conn.commit()
+        return claimed
+
+    def _record_result(self, notification: Dict, success: bool, message: str):
+        attempts = notification['attempts'] + 1
+        now = datetime.now().isoformat()
+        if success:
+            status, next_attempt_at = STATUS_SENT, time.time()
+        elif attempts >= self.max_attempts:
+            status, next_attempt_at = STATUS_FAILED, time.time()
+        else:
+            status, next_attempt_at = STATUS_PENDING, time.time() + self.backoff_delay(attempts)
+        with self._lock:
+            self._connect().execute("""
+                UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, updated_at = ?, last_error = ?
+                WHERE id = ?
+            """, (status, attempts, next_attempt_at, now, None if success else message, notification['id']))
+            self._conn.commit()
+        notification.update(attempts=attempts, status=status, next_attempt_at=next_attempt_at)
+
+        if self.on_result is not None:
+            try:
+                self.on_result(notification, success, message)
+            except Exception as e:
+                print(f"Warning: Outbox result callback failed: {e}")
+
+    def _deliver(self, notification: Dict) -> Tuple[bool, str]:
+        try:
+            return self.sender(notification['subject'], notification['message'], notification['attachment_path'])
+        except Exception as e:
+            return False, str(e)
+
+    async def process_due(self) -> int:
+        """
+        Kirim semua notifikasi yang jatuh tempo (maks max_concurrency sekaligus)
+
+        Returns:
+            Jumlah notifikasi yang diproses
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(notification):
+            async with semaphore:
+                success, message = await loop.run_in_executor(None, self._deliver, notification)
+            self._record_result(notification, success, message)
+
+        processed = 0
+        while True:
+            batch = self._claim_due(self.max_concurrency * 4)
+            if not batch:
+                return processed
+            await asyncio.gather(*(send(notification) for notification in batch))
+            processed += len(batch)
+
+    async def serve(self):
+        """Sender loop di event loop yang sedang berjalan, sampai stop() dipanggil"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        try:
+            while not self._stop.is_set():
+                # Clear sebelum proses: enqueue / stop selama proses tetap membangunkan loop
+                self._wake.clear()
+                try:
+                    await self.process_due()
+                except Exception as e:
+                    print(f"Warning: Outbox sender error: {e}")
+                if self._stop.is_set():
+                    break
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+            self._wake = None
+
+    def stop(self):
+        loop, stop_event = self._loop, self._stop
+        if loop is None or stop_event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(stop_event.set)
+            loop.call_soon_threadsafe(self._wake.set)
+        except (RuntimeError, AttributeError):
+            pass
+
+    def start(self):
+        """Jalankan serve() di thread background (untuk aplikasi GUI / non-asyncio)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.serve()),
+                                        name='notification-outbox', daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None):
+        """Hentikan thread sender dan tunggu sampai selesai"""
+        self.stop()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def counts(self) -> Dict[str, int]:
+        """Jumlah notifikasi per status untuk channel ini"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM outbox WHERE channel = ? GROUP BY status", (self.channel,)).fetchall()
+        return dict(rows)
+
+    def close(self):
+        self.join(timeout=5)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def load_outbox_config(config_path: Optional[str] = None) -> Dict:
+    """Opsi NotificationOutbox dari section [OUTBOX] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    options = {}
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('OUTBOX'):
+            section = config['OUTBOX']
+            outbox_path = section.get('outbox_file', '') or None
+            if outbox_path and not os.path.isabs(outbox_path):
+                outbox_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), outbox_path)
+            options['outbox_path'] = outbox_path
+            options['max_concurrency'] = section.getint('max_concurrency', fallback=DEFAULT_MAX_CONCURRENCY)
+            options['max_attempts'] = section.getint('max_attempts', fallback=DEFAULT_MAX_ATTEMPTS)
+            options['backoff_base'] = section.getfloat('backoff_base_seconds', fallback=DEFAULT_BACKOFF_BASE)
+            options['backoff_max'] = section.getfloat('backoff_max_seconds', fallback=DEFAULT_BACKOFF_MAX)
+            options['poll_interval'] = section.getfloat('poll_interval', fallback=DEFAULT_POLL_INTERVAL)
+            options['retention_days'] = section.getint('retention_days', fallback=DEFAULT_RETENTION_DAYS)
+    except Exception as e:
+        print(f"Warning: Could not read outbox config: {e}")
+        options = {}
+    return options
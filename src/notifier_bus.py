@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Notifier Bus Module
+Satu hasil analisis disebar ke beberapa channel notifikasi (email, WhatsApp
+lewat wa_bot/server.js, webhook) lewat adapter. Render text/HTML/PDF untuk
+satu hasil dilakukan sekali dan dipakai bersama oleh semua channel. Setiap
+channel punya token bucket sendiri; hasil yang datang saat token habis
+ditahan dan dikirim sebagai satu batch begitu token tersedia lagi.
+"""
+
+import os
+import json
+import time
+import html
+import threading
+import configparser
+import urllib.error
+import urllib.request
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_BATCH = 20
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_HTTP_TIMEOUT = 10
+DEFAULT_WHATSAPP_URL = 'http://localhost:3000'
+WHATSAPP_MAX_CHARS = 4000
+
+# renderer(result) -> text / HTML / path PDF
+Renderer = Callable[[Dict[str, Any]], Optional[str]]
+
+
+class TokenBucket:
+    """Token bucket: rate_per_minute token per menit, maksimal burst token tersimpan"""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, int(burst))
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Ambil satu token jika ada"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def wait_time(self) -> float:
+        """Detik sampai token berikutnya tersedia"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                return 0.0
+            if self.rate <= 0:
+                return float('inf')
+            return (1 - self._tokens) / self.rate
+
+
+def default_text_renderer(result: Dict[str, Any]) -> str:
+    """Ringkasan text generik untuk hasil monitoring"""
+    overall = result.get('overall_summary', {})
+    lines = [f"Status: {overall.get('monitoring_status', result.get('status', 'unknown'))}",
+             f"Folder: {result.get('folder_path', result.get('monitoring_path', '-'))}",
+             f"ZIP files: {len(result.get('zip_files_found', result.get('zip_files', [])))}"]
+    for issue in overall.get('critical_issues', []) + list(result.get('errors', [])):
+        lines.append(f"! {issue}")
+    return '\n'.join(lines)
+
+
+class RenderedResult:
+    """
+    Satu hasil analisis + hasil render yang di-cache. Setiap format (text,
+    html, pdf) hanya di-render sekali, siapapun channel yang memintanya lebih dulu.
+    """
+
+    def __init__(self, result: Dict[str, Any], subject: str, renderers: Dict[str, Renderer]):
+        self.result = result
+        self.subject = subject
+        self.created_at = datetime.now()
+        self._renderers = renderers
+        self._rendered = {}
+        self._lock = threading.Lock()
+        self.render_counts = {}
+
+    def peek(self, kind: str) -> Optional[str]:
+        """Hasil render yang sudah ada (tanpa me-render)"""
+        with self._lock:
+            return self._rendered.get(kind)
+
+    def render(self, kind: str) -> Optional[str]:
+        with self._lock:
+            if kind not in self._rendered:
+                renderer = self._renderers.get(kind)
+                self._rendered[kind] = renderer(self.result) if renderer else None
+                self.render_counts[kind] = self.render_counts.get(kind, 0) + 1
+            return self._rendered[kind]
+
+    @property
+    def text(self) -> str:
+        return self.render('text') or ''
+
+    @property
+    def html(self) -> str:
+        rendered = self.render('html')
+        if rendered is None:
+            rendered = f"<pre>{html.escape(self.text)}</pre>"
+        return rendered
+
+    @property
+    def pdf_path(self) -> Optional[str]:
+        return self.render('pdf')
+
+
+class ChannelAdapter:
+    """
+    Base class adapter channel. Subclass mengimplementasikan send(batch) dan
+    mengembalikan (success, message) seperti notifier lain di aplikasi ini.
+    """
+
+    name = 'channel'
+
+    def __init__(self, rate_per_minute: float = 6, burst: int = 1):
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+
+    def send(self, batch: List[RenderedResult]) -> Tuple[bool, str]:
+        raise NotImplementedError
+
+    @staticmethod
+    def batch_subject(batch: List[RenderedResult]) -> str:
+        if len(batch) == 1:
+            return batch[0].subject
+        return f"{len(batch)} hasil monitoring - {batch[-1].subject}"
+
+
+class EmailChannel(ChannelAdapter):
+    """Email lewat callable send(subject, html, attachment_path), default EmailNotifier.send_notification"""
+
+    name = 'email'
+
+    def __init__(self, send: Optional[Callable[[str, str, Optional[str]], Tuple[bool, str]]] = None,
+                 attach_pdf: bool = False, rate_per_minute: float = 6, burst: int = 2):
+        super().__init__(rate_per_minute, burst)
+        self._send = send
+        self.attach_pdf = attach_pdf
+
+    def send(self, batch: List[RenderedResult]) -> Tuple[bool, str]:
+        if self._send is None:
+            try:
+                from email_notifier import EmailNotifier
+            except ImportError:
+                from src.email_notifier import EmailNotifier
+            self._send = EmailNotifier().send_notification
+        if len(batch) == 1:
+            body = batch[0].html
+        else:
+            body = '<hr>'.join(f"<h3>{html.escape(item.subject)}</h3>{item.html}" for item in batch)
+        attachment = batch[-1].pdf_path if self.attach_pdf else None
+        return self._send(self.batch_subject(batch), body, attachment)
+
+
+class _HTTPChannel(ChannelAdapter):
+    def __init__(self, timeout: float, rate_per_minute: float, burst: int):
+        super().__init__(rate_per_minute, burst)
+        self.timeout = timeout
+
+    def _post_json(self, url: str, payload: Dict, headers: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
+        data = json.dumps(payload, default=str).encode('utf-8')
+        request = urllib.request.Request(url, data=data, method='POST',
+                                         headers={'Content-Type': 'application/json', **(headers or {})})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as e:
+            return False, f"HTTP {e.code}: {e.read().decode('utf-8', 'replace')[:200]}"
+        except (urllib.error.URLError, OSError) as e:
+            return False, f"Gagal menghubungi {url}: {e}"
+        try:
+            parsed = json.loads(body) if body else {}
+        except ValueError:
+            parsed = {}
+        if isinstance(parsed, dict) and parsed.get('success') is False:
+            return False, str(parsed.get('error', 'unknown error'))
+        return True, "Notifikasi terkirim"
+
+
+class WhatsAppChannel(_HTTPChannel):
+    """
+    WhatsApp lewat endpoint POST /notify di wa_bot/server.js. Nomor tujuan
+    diatur di bot (WHATSAPP_PHONE_NUMBER); token dikirim di header
+    X-Notify-Token dan harus sama dengan NOTIFY_TOKEN bot.
+    """
+
+    name = 'whatsapp'
+
+    def __init__(self, base_url: str = DEFAULT_WHATSAPP_URL, token: str = '',
+                 timeout: float = DEFAULT_HTTP_TIMEOUT, rate_per_minute: float = 10, burst: int = 1):
+        super().__init__(timeout, rate_per_minute, burst)
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+
+    def send(self, batch: List[RenderedResult]) -> Tuple[bool, str]:
+        message = '\n\n'.join(f"*{item.subject}*\n{item.text}" for item in batch)
+        if len(message) > WHATSAPP_MAX_CHARS:
+            message = message[:WHATSAPP_MAX_CHARS - 20] + '\n...(terpotong)'
+        headers = {'X-Notify-Token': self.token} if self.token else None
+        return self._post_json(f"{self.base_url}/notify", {'message': message}, headers)
+
+
+class WebhookChannel(_HTTPChannel):
+    """POST JSON (subject, text, ringkasan setiap hasil) ke URL webhook"""
+
+    name = 'webhook'
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: float = DEFAULT_HTTP_TIMEOUT, rate_per_minute: float = 30, burst: int = 5):
+        super().__init__(timeout, rate_per_minute, burst)
+        self.url = url
+        self.headers = headers or {}
+
+    def send(self, batch: List[RenderedResult]) -> Tuple[bool, str]:
+        payload = {
+            'subject': self.batch_subject(batch),
+            'count': len(batch),
+            'results': [{'subject': item.subject, 'created_at': item.created_at.isoformat(), 'text': item.text}
+                        for item in batch]
+        }
+        return self._post_json(self.url, payload, self.headers)
+
+
+class NotifierBus:
+    """
+    Fan-out hasil analisis ke semua channel. publish() tidak menunggu
+    jaringan: hasil hanya ditambahkan ke antrian per channel, lalu pump()
+    (dari thread start() atau dipanggil manual) mengirimnya sesuai token bucket.
+    on_done(rendered) dipanggil setelah semua channel selesai dengan satu hasil
+    (terkirim atau gagal permanen), mis. untuk menghapus file PDF sementara.
+    """
+
+    def __init__(self, channels: List[ChannelAdapter], renderers: Optional[Dict[str, Renderer]] = None,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 on_result: Optional[Callable[[str, int, bool, str], None]] = None,
+                 on_done: Optional[Callable[[RenderedResult], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.channels = {channel.name: channel for channel in channels}
+        self.renderers = {'text': default_text_renderer}
+        self.renderers.update(renderers or {})
+        self.max_batch = max(1, int(max_batch))
+        self.max_attempts = max(1, int(max_attempts))
+        self.poll_interval = poll_interval
+        self.on_result = on_result
+        self.on_done = on_done
+        self._holders: Dict[int, int] = {}  # id(rendered) -> channel yang belum selesai
+        self.buckets = {name: TokenBucket(channel.rate_per_minute, channel.burst, clock)
+                        for name, channel in self.channels.items()}
+        self._pending: Dict[str, List[List]] = {name: [] for name in self.channels}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def publish(self, result: Dict[str, Any], subject: str) -> RenderedResult:
+        """Antrikan satu hasil analisis untuk semua channel"""
+        rendered = RenderedResult(result, subject, self.renderers)
+        with self._lock:
+            for queue in self._pending.values():
+                queue.append([rendered, 0])
+            if self._pending:
+                self._holders[id(rendered)] = len(self._pending)
+        if not self._pending:
+            self._done([rendered])
+        self._wake.set()
+        return rendered
+
+    def _release(self, finished: List[RenderedResult]):
+        """Satu channel selesai dengan hasil-hasil ini"""
+        done = []
+        with self._lock:
+            for rendered in finished:
+                remaining = self._holders.get(id(rendered), 1) - 1
+                if remaining > 0:
+                    self._holders[id(rendered)] = remaining
+                else:
+                    self._holders.pop(id(rendered), None)
+                    done.append(rendered)
+        self._done(done)
+
+    def _done(self, done: List[RenderedResult]):
+        if self.on_done is None:
+            return
+        for rendered in done:
+            try:
+                self.on_done(rendered)
+            except Exception as e:
+                print(f"Warning: Notifier bus cleanup callback failed: {e}")
+
+    def pending(self, channel: str) -> int:
+        with self._lock:
+            return len(self._pending[channel])
+
+    def pump(self, force: bool = False) -> int:
+        """
+        Kirim satu batch untuk setiap channel yang punya antrian dan token
+
+        Args:
+            force: Abaikan rate limit (dipakai saat flush / shutdown)
+
+        Returns:
+            Jumlah batch yang dikirim
+        """
+        sent = 0
+        for name, channel in self.channels.items():
+            with self._lock:
+                if not self._pending[name]:
+                    continue
+                if not force and not self.buckets[name].try_acquire():
+                    continue
+                batch, self._pending[name] = (self._pending[name][:self.max_batch],
+                                              self._pending[name][self.max_batch:])
+            try:
+                success, message = channel.send([entry[0] for entry in batch])
+            except Exception as e:
+                success, message = False, str(e)
+            sent += 1
+
+            retry = []
+            if not success:
+                retry = [entry for entry in batch if entry[1] + 1 < self.max_attempts]
+                for entry in retry:
+                    entry[1] += 1
+                with self._lock:
+                    self._pending[name] = retry + self._pending[name]
+            retried = {id(entry) for entry in retry}
+            self._release([entry[0] for entry in batch if id(entry) not in retried])
+            if self.on_result is not None:
+                try:
+                    self.on_result(name, len(batch), success, message)
+                except Exception as e:
+                    print(f"Warning: Notifier bus result callback failed: {e}")
+        return sent
+
+    def flush(self):
+        """Kirim semua antrian sekarang tanpa menunggu token (satu percobaan per item)"""
+        for name in self.channels:
+            with self._lock:
+                for entry in self._pending[name]:
+                    entry[1] = self.max_attempts - 1
+        while self.pump(force=True):
+            pass
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.pump()
+            waits = [self.buckets[name].wait_time() for name in self.channels if self.pending(name)]
+            timeout = min([self.poll_interval] + waits) if waits else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='notifier-bus', daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True, timeout: Optional[float] = 10):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if flush:
+            self.flush()
+
+
+def load_channels_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """Pengaturan channel dari section [CHANNELS] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    settings = {'channels': ['email'], 'email_per_minute': 6.0, 'attach_pdf': False,
+                'whatsapp_url': DEFAULT_WHATSAPP_URL, 'whatsapp_token': '', 'whatsapp_per_minute': 10.0,
+                'webhook_url': '', 'webhook_per_minute': 30.0, 'max_batch': DEFAULT_MAX_BATCH}
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('CHANNELS'):
+            section = config['CHANNELS']
+            channels = section.get('channels', 'email')
+            settings['channels'] = [name.strip().lower() for name in channels.split(',') if name.strip()]
+            settings['attach_pdf'] = section.getboolean('attach_pdf', fallback=False)
+            settings['whatsapp_url'] = section.get('whatsapp_url', DEFAULT_WHATSAPP_URL) or DEFAULT_WHATSAPP_URL
+            settings['whatsapp_token'] = section.get('whatsapp_token', '')
+            settings['webhook_url'] = section.get('webhook_url', '')
+            settings['max_batch'] = section.getint('max_batch', fallback=DEFAULT_MAX_BATCH)
+            for key in ('email_per_minute', 'whatsapp_per_minute', 'webhook_per_minute'):
+                settings[key] = section.getfloat(key, fallback=settings[key])
+    except Exception as e:
+        print(f"Warning: Could not read channels config: {e}")
+    return settings
+
+
+def build_channels(settings: Dict[str, Any],
+                   email_send: Optional[Callable[[str, str, Optional[str]], Tuple[bool, str]]] = None
+                   ) -> List[ChannelAdapter]:
+    """Adapter channel sesuai settings dari load_channels_config()"""
+    channels = []
+    for name in settings['channels']:
+        if name == 'email':
+            channels.append(EmailChannel(email_send, settings['attach_pdf'], settings['email_per_minute']))
+        elif name == 'whatsapp':
+            channels.append(WhatsAppChannel(settings['whatsapp_url'], settings['whatsapp_token'],
+                                            rate_per_minute=settings['whatsapp_per_minute']))
+        elif name == 'webhook':
+            if settings['webhook_url']:
+                channels.append(WebhookChannel(settings['webhook_url'],
+                                               rate_per_minute=settings['webhook_per_minute']))
+            else:
+                print("Warning: webhook channel enabled without webhook_url, skipping")
+        else:
+            print(f"Warning: Unknown notification channel '{name}', skipping")
+    return channels
@@ -7,12 +7,14 @@ import os
 import sys
 import json
 import zipfile
-import tempfile
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
-# PDF generation libraries
+# PDF generation libraries (tanpa pip install saat import; lihat PDFReportGenerator)
 try:
     from reportlab.lib.pagesizes import letter, A4
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
@@ -20,20 +22,16 @@ try:
     from reportlab.lib.units import inch
     from reportlab.lib import colors
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+    REPORTLAB_AVAILABLE = True
 except ImportError:
-    print("ReportLab not installed. Installing...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "reportlab"])
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+    REPORTLAB_AVAILABLE = False
 
-# Import our analyzers
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from src.bak_metadata_analyzer import BAKMetadataAnalyzer
+# Import our analyzers (nama modul top-level seperti modul src/ lain, supaya
+# verifier bersama tidak termuat dua kali sebagai src.zip_verifier)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bak_metadata_analyzer import BAKMetadataAnalyzer
+from zip_verifier import get_default_verifier
+from zip_central_directory import read_central_directory
 
 
 class ZipAnalyzer:
@@ -52,43 +50,44 @@ class ZipAnalyzer:
         try:
             stat = os.stat(target_path)
             
-            with zipfile.ZipFile(target_path, 'r') as zf:
-                file_list = zf.infolist()
-                
-                # Basic metadata
-                metadata = {
-                    'file_name': os.path.basename(target_path),
-                    'file_path': target_path,
-                    'file_size_bytes': stat.st_size,
-                    'file_size_mb': round(stat.st_size / (1024 * 1024), 2),
-                    'created_date': datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
-                    'modified_date': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
-                    'total_files': len(file_list),
-                    'compressed_size': sum(f.compress_size for f in file_list),
-                    'uncompressed_size': sum(f.file_size for f in file_list),
-                    'compression_ratio': 0,
-                    'files_info': []
-                }
-                
-                # Calculate compression ratio
-                if metadata['uncompressed_size'] > 0:
-                    metadata['compression_ratio'] = round(
-                        (1 - metadata['compressed_size'] / metadata['uncompressed_size']) * 100, 2
-                    )
-                
-                # File details
-                for file_info in file_list:
-                    metadata['files_info'].append({
-                        'filename': file_info.filename,
-                        'file_size': file_info.file_size,
-                        'compress_size': file_info.compress_size,
-                        'date_time': datetime(*file_info.date_time).strftime('%Y-%m-%d %H:%M:%S'),
-                        'is_dir': file_info.is_dir(),
-                        'crc': file_info.CRC
-                    })
-                
-                return metadata
-                
+            # Metadata dari central directory saja, tanpa membaca data member
+            file_list = read_central_directory(target_path).entries
+
+            # Basic metadata
+            metadata = {
+                'file_name': os.path.basename(target_path),
+                'file_path': target_path,
+                'file_size_bytes': stat.st_size,
+                'file_size_mb': round(stat.st_size / (1024 * 1024), 2),
+                'created_date': datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
+                'modified_date': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                'total_files': len(file_list),
+                'compressed_size': sum(f.compress_size for f in file_list),
+                'uncompressed_size': sum(f.file_size for f in file_list),
+                'compression_ratio': 0,
+                'files_info': []
+            }
+
+            # Calculate compression ratio
+            if metadata['uncompressed_size'] > 0:
+                metadata['compression_ratio'] = round(
+                    (1 - metadata['compressed_size'] / metadata['uncompressed_size']) * 100, 2
+                )
+
+            # File details
+            for file_info in file_list:
+                modified = file_info.modified
+                metadata['files_info'].append({
+                    'filename': file_info.filename,
+                    'file_size': file_info.file_size,
+                    'compress_size': file_info.compress_size,
+                    'date_time': modified.strftime('%Y-%m-%d %H:%M:%S') if modified else 'Unknown',
+                    'is_dir': file_info.is_dir(),
+                    'crc': file_info.crc
+                })
+
+            return metadata
+
         except Exception as e:
             return {
                 'error': f"Failed to analyze ZIP metadata: {str(e)}",
@@ -147,13 +146,21 @@ class ZipAnalyzer:
         try:
             with zipfile.ZipFile(target_path, 'r') as zf:
                 # Test ZIP integrity
-                bad_files = zf.testzip()
+                record = get_default_verifier().verify(target_path, zip_ref=zf)
+                if record['error']:
+                    return {
+                        'is_corrupted': True,
+                        'error': record['error'],
+                        'integrity_check': 'Failed',
+                        'test_method': 'ZipVerifier (single-pass CRC)'
+                    }
+                bad_files = record['bad_file']
                 
                 corruption_status = {
                     'is_corrupted': bad_files is not None,
                     'corrupted_file': bad_files if bad_files else None,
                     'integrity_check': 'Passed' if bad_files is None else 'Failed',
-                    'test_method': 'zipfile.testzip()'
+                    'test_method': 'ZipVerifier (single-pass CRC)'
                 }
                 
                 return corruption_status
@@ -188,35 +195,35 @@ class ZipAnalyzer:
                 
                 bak_analysis['total_bak_files'] = len(bak_analysis['bak_files_found'])
                 
-                # Analyze each BAK file
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    for bak_file in bak_analysis['bak_files_found'][:3]:  # Analyze first 3 BAK files
-                        try:
-                            # Extract BAK file to temp directory
-                            zf.extract(bak_file, temp_dir)
-                            bak_path = os.path.join(temp_dir, bak_file)
-                            
-                            # Analyze with BAKMetadataAnalyzer
-                            analyzer = BAKMetadataAnalyzer(bak_path)
-                            analysis = analyzer.analyze()
-                            
-                            bak_analysis['bak_analyses'][bak_file] = analysis
-                            
-                        except Exception as e:
-                            bak_analysis['bak_analyses'][bak_file] = {
-                                'error': f"Failed to analyze {bak_file}: {str(e)}"
-                            }
-                
+                # Analyze each BAK file langsung dari ZIP (hasil dibagi lewat analysis cache)
+                analyzer = BAKMetadataAnalyzer()
+                for bak_file in bak_analysis['bak_files_found'][:3]:  # Analyze first 3 BAK files
+                    try:
+                        analysis = analyzer.analyze_bak_file(bak_file, zf)
+                        if analysis.get('analysis_status') == 'failed':
+                            raise ValueError(analysis.get('error', 'analysis failed'))
+
+                        structure = analysis.get('file_structure', {})
+                        validation = analysis.get('validation', {})
+                        bak_analysis['bak_analyses'][bak_file] = {
+                            'is_valid_backup': validation.get('is_valid_bak', False),
+                            'file_size_mb': round(analysis.get('file_size_mb', 0), 2),
+                            'header_size': structure.get('header_size', 0),
+                            'data_blocks': structure.get('data_blocks', 0),
+                            'page_count': structure.get('page_count', 0),
+                            'estimated_backup_sets': structure.get('estimated_backup_sets', 0),
+                            'corruption_check': 'Corrupted' if validation.get('corruption_detected') else 'OK',
+                            'database_info': analysis.get('database_info', {})
+                        }
+
+                    except Exception as e:
+                        bak_analysis['bak_analyses'][bak_file] = {
+                            'error': f"Failed to analyze {bak_file}: {str(e)}"
+                        }
+
                 # Determine overall restore capability
-                if bak_analysis['total_bak_files'] > 0:
-                    valid_baks = sum(1 for analysis in bak_analysis['bak_analyses'].values() 
-                                   if analysis.get('is_valid_backup', False))
-                    if valid_baks > 0:
-                        bak_analysis['restore_capability'] = f"Possible ({valid_baks}/{bak_analysis['total_bak_files']} valid BAK files)"
-                    else:
-                        bak_analysis['restore_capability'] = "Unlikely (No valid BAK files found)"
-                else:
-                    bak_analysis['restore_capability'] = "No BAK files found"
+                bak_analysis['restore_capability'] = _restore_capability(
+                    bak_analysis['bak_analyses'], bak_analysis['total_bak_files'])
                 
                 return bak_analysis
                 
@@ -225,10 +232,182 @@ class ZipAnalyzer:
             return bak_analysis
 
 
+    def analyze_record(self, zip_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Semua analisis yang dibutuhkan satu bagian report, sebagai satu record
+        (bisa dihitung sekali lalu dipakai ulang oleh generate_report_from_records)
+        """
+        target_path = zip_path or self.zip_path
+        bak_analysis = self.analyze_bak_files(target_path)
+        return {
+            'zip_path': target_path,
+            'file_name': os.path.basename(target_path) if target_path else 'Unknown',
+            'metadata': self.analyze_zip_metadata(target_path),
+            'extraction': self.check_extraction_capability(target_path),
+            'corruption': self.check_corruption(target_path),
+            'bak_analysis': bak_analysis
+        }
+
+
+def _analyze_archive(zip_path: str) -> Dict[str, Any]:
+    """
+    Record analisis satu ZIP (ZIP I/O + analisis BAK)
+    Top-level function supaya bisa di-pickle oleh ProcessPoolExecutor
+    """
+    return ZipAnalyzer(zip_path).analyze_record()
+
+
+def _failed_archive_record(zip_path: str, message: str) -> Dict[str, Any]:
+    """Record pengganti untuk arsip yang gagal dianalisis di worker"""
+    return {
+        'zip_path': zip_path,
+        'file_name': os.path.basename(zip_path),
+        'metadata': {'error': message, 'file_name': os.path.basename(zip_path), 'file_path': zip_path},
+        'extraction': {'can_open': False, 'error': message, 'extraction_capability': 'Failed'},
+        'corruption': {'is_corrupted': True, 'error': message, 'integrity_check': 'Failed'},
+        'bak_analysis': {'bak_files_found': [], 'bak_analyses': {}, 'error': message}
+    }
+
+
+def _restore_capability(bak_analyses: Dict[str, Dict[str, Any]], total_bak_files: int) -> str:
+    """Kesimpulan kemampuan restore dari analisis setiap BAK"""
+    if total_bak_files <= 0:
+        return "No BAK files found"
+    valid_baks = sum(1 for analysis in bak_analyses.values() if analysis.get('is_valid_backup', False))
+    if valid_baks > 0:
+        return f"Possible ({valid_baks}/{total_bak_files} valid BAK files)"
+    return "Unlikely (No valid BAK files found)"
+
+
+def record_from_validation(zip_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Record report dari hasil ZipValidator.validate_zip_file (mis. hasil
+    monitoring yang sudah ada), tanpa menganalisis ulang arsip: hanya central
+    directory yang dibaca untuk metadata ukuran dan kompresi.
+    """
+    zip_path = zip_result.get('filepath', '')
+    if not zip_result.get('is_readable'):
+        return _failed_archive_record(zip_path, '; '.join(zip_result.get('errors', [])) or 'ZIP tidak dapat dibaca')
+
+    metadata = ZipAnalyzer(zip_path).analyze_zip_metadata()
+    total_files = metadata.get('total_files', 0)
+    bak_analyses = {}
+    for bak_file, info in zip_result.get('database_info', {}).items():
+        if info.get('error'):
+            bak_analyses[bak_file] = {'error': info['error']}
+            continue
+        errors = info.get('errors', [])
+        bak_analyses[bak_file] = {
+            'is_valid_backup': not errors and info.get('tables_count', 0) > 0,
+            'file_size_mb': info.get('file_size_mb', 0),
+            'database_type': info.get('database_type', 'unknown'),
+            'tables_count': info.get('tables_count', 0),
+            'key_tables': info.get('key_tables', {}),
+            'corruption_check': '; '.join(errors) if errors else 'OK'
+        }
+    bak_files = zip_result.get('bak_files', [])
+
+    return {
+        'zip_path': zip_path,
+        'file_name': zip_result.get('filename') or os.path.basename(zip_path),
+        'metadata': metadata,
+        # Lolos ZipVerifier (CRC setiap member) saat validasi
+        'extraction': {'can_open': True, 'can_list_files': True, 'total_files': total_files,
+                       'extractable_files': total_files, 'corrupted_files': [], 'extraction_errors': []},
+        'corruption': {'is_corrupted': False, 'corrupted_file': None, 'integrity_check': 'Passed',
+                       'test_method': 'ZipVerifier (single-pass CRC)'},
+        'bak_analysis': {'bak_files_found': bak_files, 'total_bak_files': len(bak_files),
+                         'bak_analyses': bak_analyses,
+                         'restore_capability': _restore_capability(bak_analyses, len(bak_files))}
+    }
+
+
+def iter_monitoring_records(monitoring_result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Record report untuk setiap ZIP di hasil MonitoringController.monitor_backup_folder"""
+    for zip_result in monitoring_result.get('zip_validation_results', {}).get('validation_details', []):
+        yield record_from_validation(zip_result)
+
+
+def iter_analysis_records(zip_files: List[str], workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Record analisis untuk setiap ZIP, dengan urutan sama seperti zip_files
+
+    Dengan workers > 1 analisis dijalankan di process pool. Hanya record
+    (dict biasa) yang dikirim balik ke proses utama; flowable ReportLab tetap
+    dibuat di proses utama saat halaman ditulis. Jumlah record yang sedang
+    dikerjakan / menunggu giliran dibatasi 2x workers, supaya memory tidak
+    bertambah mengikuti jumlah arsip.
+    """
+    workers = min(workers, len(zip_files))
+    if workers <= 1:
+        # Penanganan error sama dengan jalur paralel: satu ZIP rusak tidak menghentikan report
+        for zip_path in zip_files:
+            try:
+                record = _analyze_archive(zip_path)
+            except Exception as e:
+                record = _failed_archive_record(zip_path, f"Error processing {zip_path}: {str(e)}")
+            yield record
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        queued = iter(zip_files)
+        for zip_path in queued:
+            pending.append((zip_path, executor.submit(_analyze_archive, zip_path)))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            zip_path, future = pending.popleft()
+            try:
+                record = future.result()
+            except Exception as e:
+                record = _failed_archive_record(zip_path, f"Error processing {zip_path}: {str(e)}")
+            next_path = next(queued, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(_analyze_archive, next_path)))
+            yield record
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _FlowableStream(list):
+    """
+    Story untuk doc.build() yang diisi dari generator sedikit demi sedikit.
+    ReportLab mengambil flowable dari depan list selama len() > 0, jadi
+    flowable (dan record analisis di belakangnya) hanya dibuat saat halaman
+    sebelumnya sudah ditulis ke canvas, lalu dilepas setelah digambar.
+
+    Ini bergantung pada loop di BaseDocTemplate.build (dipatok oleh
+    test_pdf_streaming.py); jika build tidak menghabiskan stream,
+    ensure_consumed() menggagalkan report alih-alih menulis PDF terpotong.
+    """
+
+    def __init__(self, source: Iterable, low_water: int = 8):
+        super().__init__()
+        self._source = iter(source)
+        self._low_water = low_water
+
+    def ensure_consumed(self):
+        if self._source is not None or super().__len__():
+            raise RuntimeError("ReportLab did not consume the whole story stream (unsupported ReportLab version)")
+
+    def __len__(self):
+        while self._source is not None and super().__len__() < self._low_water:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return super().__len__()
+
+
 class PDFReportGenerator:
     """Generate comprehensive PDF reports for backup analysis"""
     
     def __init__(self):
+        if not REPORTLAB_AVAILABLE:
+            raise ImportError("ReportLab is required for PDF reports. Install it with: pip install reportlab")
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
     
@@ -261,64 +440,96 @@ class PDFReportGenerator:
             textColor=colors.darkred
         ))
     
-    def generate_report(self, zip_files: List[str], output_path: str) -> bool:
-        """Generate comprehensive PDF report for selected ZIP files"""
+    def generate_report(self, zip_files: List[str], output_path: str,
+                        records: Optional[Iterable[Dict[str, Any]]] = None, workers: int = 1) -> bool:
+        """
+        Generate comprehensive PDF report for selected ZIP files
+
+        Args:
+            zip_files: Daftar path ZIP
+            output_path: Path file PDF
+            records: Record analisis yang sudah dihitung (ZipAnalyzer.analyze_record),
+                     jika None setiap ZIP dianalisis saat bagiannya akan ditulis
+            workers: Jumlah proses untuk analisis arsip (1 = serial di proses ini)
+        """
+        if records is None:
+            records = iter_analysis_records(zip_files, workers)
+        return self.generate_report_from_records(records, output_path, total_files=len(zip_files))
+
+    def generate_report_from_records(self, records: Iterable[Dict[str, Any]], output_path: str,
+                                     total_files: Optional[int] = None,
+                                     progress_callback: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Generate PDF secara streaming dari record analisis. Record dikonsumsi
+        satu per satu (boleh generator), sehingga memory tidak bertambah
+        dengan jumlah arsip (500+ arsip untuk laporan bulanan).
+
+        Args:
+            records: Iterable record dari ZipAnalyzer.analyze_record
+            output_path: Path file PDF
+            total_files: Jumlah arsip untuk halaman judul (None jika tidak diketahui)
+            progress_callback: Dipanggil dengan jumlah arsip yang sudah masuk report
+        """
         try:
-            doc = SimpleDocTemplate(output_path, pagesize=A4)
-            story = []
-            
-            # Title page
-            story.append(Paragraph("Laporan Analisis Backup Database", self.styles['CustomTitle']))
-            story.append(Spacer(1, 20))
-            story.append(Paragraph(f"Tanggal: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", self.styles['Normal']))
-            story.append(Paragraph(f"Total File: {len(zip_files)}", self.styles['Normal']))
-            story.append(PageBreak())
-            
-            # Process each ZIP file
-            for i, zip_path in enumerate(zip_files, 1):
-                story.extend(self._generate_zip_report(zip_path, i))
-                if i < len(zip_files):
-                    story.append(PageBreak())
-            
-            # Build PDF
+            # pageCompression memperkecil halaman yang ditahan canvas sampai save()
+            doc = SimpleDocTemplate(output_path, pagesize=A4, pageCompression=1)
+            story = _FlowableStream(self._iter_story(records, total_files, progress_callback))
             doc.build(story)
+            story.ensure_consumed()
             return True
             
         except Exception as e:
             print(f"Error generating PDF report: {str(e)}")
             return False
-    
+
+    def _iter_story(self, records: Iterable[Dict[str, Any]], total_files: Optional[int],
+                    progress_callback: Optional[Callable[[int], None]] = None) -> Iterator:
+        """Flowable report: halaman judul lalu satu bagian per record"""
+        # Title page
+        yield Paragraph("Laporan Analisis Backup Database", self.styles['CustomTitle'])
+        yield Spacer(1, 20)
+        yield Paragraph(f"Tanggal: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", self.styles['Normal'])
+        if total_files is not None:
+            yield Paragraph(f"Total File: {total_files}", self.styles['Normal'])
+
+        # Process each ZIP file
+        for i, record in enumerate(records, 1):
+            yield PageBreak()
+            yield from self._generate_record_report(record, i)
+            if progress_callback is not None:
+                progress_callback(i)
+
     def _generate_zip_report(self, zip_path: str, file_number: int) -> List:
         """Generate report section for a single ZIP file"""
+        return self._generate_record_report(ZipAnalyzer(zip_path).analyze_record(), file_number)
+
+    def _generate_record_report(self, record: Dict[str, Any], file_number: int) -> List:
+        """Generate report section dari record analisis satu ZIP file"""
         story = []
-        analyzer = ZipAnalyzer(zip_path)
         
         # Section title
-        story.append(Paragraph(f"{file_number}. Analisis File: {os.path.basename(zip_path)}", 
+        story.append(Paragraph(f"{file_number}. Analisis File: {record.get('file_name', 'Unknown')}",
                               self.styles['CustomTitle']))
         story.append(Spacer(1, 20))
         
         # 1. ZIP Metadata Summary
         story.append(Paragraph("1. Summary Metadata File ZIP", self.styles['SectionHeader']))
-        metadata = analyzer.analyze_zip_metadata()
-        story.extend(self._create_metadata_section(metadata))
+        story.extend(self._create_metadata_section(record.get('metadata', {})))
         
         # 2. ZIP Backup Analysis Summary
         story.append(Paragraph("2. Analisis Detail File ZIP Backup", self.styles['SectionHeader']))
         
         # Extraction capability
         story.append(Paragraph("2.1 Kemampuan Ekstraksi", self.styles['SubHeader']))
-        extraction = analyzer.check_extraction_capability()
-        story.extend(self._create_extraction_section(extraction))
+        story.extend(self._create_extraction_section(record.get('extraction', {})))
         
         # Corruption status
         story.append(Paragraph("2.2 Status Corrupt", self.styles['SubHeader']))
-        corruption = analyzer.check_corruption()
-        story.extend(self._create_corruption_section(corruption))
+        story.extend(self._create_corruption_section(record.get('corruption', {})))
         
         # BAK validity and restore capability
         story.append(Paragraph("2.3 Kemampuan Restore & Validitas BAK", self.styles['SubHeader']))
-        bak_analysis = analyzer.analyze_bak_files()
+        bak_analysis = record.get('bak_analysis', {})
         story.extend(self._create_bak_validity_section(bak_analysis))
         
         # 3. Detailed BAK Analysis
@@ -442,14 +653,26 @@ class PDFReportGenerator:
                 ['Properti', 'Nilai'],
                 ['Validitas BAK', 'Valid' if analysis.get('is_valid_backup', False) else 'Tidak Valid'],
                 ['Kemampuan Restore', 'Mungkin' if analysis.get('is_valid_backup', False) else 'Tidak Mungkin'],
-                ['Ukuran File', f"{analysis.get('file_size_mb', 0)} MB"],
-                ['Signature', analysis.get('signature', 'N/A')],
-                ['Header Size', f"{analysis.get('header_size', 0)} bytes"],
-                ['Data Blocks', str(analysis.get('data_blocks', 0))],
-                ['Page Count', str(analysis.get('page_count', 0))],
-                ['Estimated Backup Sets', str(analysis.get('estimated_backup_sets', 0))],
-                ['Corruption Check', analysis.get('corruption_check', 'N/A')]
+                ['Ukuran File', f"{analysis.get('file_size_mb', 0)} MB"]
             ]
+            if 'database_type' in analysis:
+                # Record dari hasil validasi database (record_from_validation)
+                data.append(['Tipe Database', analysis['database_type']])
+                data.append(['Jumlah Tabel', str(analysis.get('tables_count', 0))])
+                for table_name, table_info in analysis.get('key_tables', {}).items():
+                    if isinstance(table_info, dict):
+                        count = table_info.get('record_count', 0)
+                        count = f"{count:,}" if isinstance(count, int) else str(count)
+                        data.append([table_name, f"{count} record, terbaru {table_info.get('latest_date') or 'N/A'}"])
+            else:
+                data.extend([
+                    ['Signature', analysis.get('signature', 'N/A')],
+                    ['Header Size', f"{analysis.get('header_size', 0)} bytes"],
+                    ['Data Blocks', str(analysis.get('data_blocks', 0))],
+                    ['Page Count', str(analysis.get('page_count', 0))],
+                    ['Estimated Backup Sets', str(analysis.get('estimated_backup_sets', 0))]
+                ])
+            data.append(['Corruption Check', analysis.get('corruption_check', 'N/A')])
             
             table = Table(data, colWidths=[2*inch, 3*inch])
             table.setStyle(TableStyle([
@@ -469,17 +692,23 @@ class PDFReportGenerator:
         return story
 
 
-def main():
-    """Test the PDF report generator"""
-    # Test with sample ZIP files
-    test_zip_files = [
-        r"D:\Gawean Rebinmas\App_Auto_Backup\Notiikasi_Database\BackupStaging.zip"
-    ]
-    
+def main(argv: Optional[List[str]] = None):
+    """Generate PDF report dari command line"""
+    parser = argparse.ArgumentParser(description='Generate PDF report untuk file backup ZIP')
+    parser.add_argument('zip_files', nargs='*',
+                        default=[r"D:\Gawean Rebinmas\App_Auto_Backup\Notiikasi_Database\BackupStaging.zip"])
+    parser.add_argument('-o', '--output', default='test_backup_report.pdf')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Analisis arsip di N proses paralel (default 1 = serial)')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Sama dengan --workers <jumlah CPU>')
+    args = parser.parse_args(argv)
+
+    workers = (os.cpu_count() or 1) if args.parallel else args.workers
     generator = PDFReportGenerator()
-    output_path = "test_backup_report.pdf"
+    output_path = args.output
     
-    success = generator.generate_report(test_zip_files, output_path)
+    success = generator.generate_report(args.zip_files, output_path, workers=workers)
     if success:
         print(f"PDF report generated successfully: {output_path}")
     else:
@@ -5,16 +5,31 @@ Versi cepat untuk mendeteksi dan mengecek database tanpa membuka seluruh file
 """
 
 import os
-import sqlite3
 import zipfile
-import tempfile
 import shutil
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from zip_verifier import get_default_verifier
+from zip_sqlite import UnsupportedQueryError, open_member_database
+from table_stats import TableStatistics, load_row_count_config
+from freshness import FreshnessResult, FreshnessStore, create_probe
+from schema_registry import SchemaRegistry, get_default_registry
+
+# Kolom yang namanya mengandung salah satu kata ini dianggap kolom tanggal
+DATE_COLUMN_KEYWORDS = ['DATE', 'TIME', 'DATETIME', 'CREATED_DATE', 'MODIFIED_DATE',
+                        'TASK_DATE', 'TRANSACTION_DATE', 'SCAN_DATE', 'LOG_DATE']
+
 class QuickDatabaseValidator:
-    def __init__(self):
+    def __init__(self, freshness_store: Optional[FreshnessStore] = None,
+                 registry: Optional[SchemaRegistry] = None):
         self.supported_databases = ['plantware', 'venus', 'staging']
+        self.zip_verifier = get_default_verifier()
+        # None: store [FRESHNESS] bersama (config/freshness_columns.db)
+        self.freshness_store = freshness_store
+        self.registry = registry if registry is not None else get_default_registry()
+        # Mode jumlah baris ([ROW_COUNTS]): exact, atau perkiraan untuk tabel non-kunci
+        self.row_count_options = load_row_count_config()
 
     def validate_backup_databases(self, zip_files: List[str]) -> Dict:
         """
@@ -72,13 +87,12 @@ class QuickDatabaseValidator:
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 # Cek integrity ZIP
-                try:
-                    test_result = zip_ref.testzip()
-                    if test_result is not None:
-                        result['errors'].append(f"ZIP file corrupted: {test_result}")
-                        return result
-                except Exception as e:
-                    result['errors'].append(f"ZIP integrity check failed: {e}")
+                verification = self.zip_verifier.verify(zip_path, zip_ref=zip_ref)
+                if verification['error']:
+                    result['errors'].append(f"ZIP integrity check failed: {verification['error']}")
+                    return result
+                if verification['bad_file'] is not None:
+                    result['errors'].append(f"ZIP file corrupted: {verification['bad_file']}")
                     return result
 
                 # Cari file database
@@ -164,67 +178,74 @@ class QuickDatabaseValidator:
 
             analysis['file_size_mb'] = round(file_info.file_size / (1024 * 1024), 2)
 
-            # Extract file header untuk deteksi
+            # Baca header untuk deteksi
             try:
                 with zip_ref.open(db_filename) as f:
                     header = f.read(100)  # Baca header
+            except Exception as e:
+                analysis['errors'].append(f"Error reading file: {e}")
+                return analysis
 
-                    # Cek SQLite signature
-                    if header.startswith(b'SQLite format 3\000'):
-                        # Buka database dengan SQLite
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as temp_file:
-                            # Copy file ke temp
-                            zip_ref.extract(db_filename, temp_dir=os.path.dirname(temp_file.name))
-                            temp_file_path = temp_file.name
-
-                        try:
-                            conn = sqlite3.connect(temp_file_path)
-                            cursor = conn.cursor()
-
-                            # Get all tables
-                            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                            tables = [row[0] for row in cursor.fetchall()]
-                            analysis['tables'] = tables
-
-                            # Detect database type
-                            analysis['database_type'] = self._detect_database_type(tables)
-
-                            # Get total records dari beberapa tabel utama
-                            total_records = 0
-                            latest_date = None
-
-                            for table in tables:
-                                try:
-                                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                                    count = cursor.fetchone()[0]
-                                    total_records += count
-
-                                    # Coba cari tanggal terbaru
-                                    latest_date = self._find_latest_date_in_table(cursor, table, latest_date)
+            # Cek SQLite signature
+            if header.startswith(b'SQLite format 3\000'):
+                try:
+                    # Buka langsung dari ZIP (tanpa ekstraksi ke disk)
+                    conn = open_member_database(zip_ref, db_filename)
+                    try:
+                        # Schema dibaca sekali; per tabel satu COUNT, tanggal terbaru lewat probe
+                        stats = TableStatistics(conn.cursor(), **self.row_count_options)
 
-                                except:
-                                    pass
+                        # Get all tables
+                        tables = stats.tables()
+                        analysis['tables'] = tables
 
-                            analysis['total_records'] = total_records
-                            if latest_date:
-                                analysis['latest_dates']['overall'] = latest_date
+                        # Detect database type
+                        analysis['database_type'] = self._detect_database_type(tables)
+                        probe = create_probe(stats, analysis['database_type'], self.freshness_store)
 
-                            conn.close()
+                        # Get total records dan tanggal terbaru dari semua tabel
+                        total_records = 0
+                        total_error = 0
+                        approximate = False
+                        latest_date = None
 
-                        except Exception as e:
-                            analysis['errors'].append(f"Database analysis error: {e}")
-                        finally:
-                            # Clean up
+                        for table in tables:
                             try:
-                                os.unlink(temp_file_path)
+                                table_stats = stats.table_stats(table)
+                                total_records += table_stats.record_count
+                                if table_stats.approximate:
+                                    approximate = True
+                                    if total_error is not None and table_stats.count_error is not None:
+                                        total_error += table_stats.count_error
+                                    else:
+                                        total_error = None
+
+                                # Coba cari tanggal terbaru (index / scan mundur, kolom yang diingat)
+                                freshness = probe.latest(table, stats.matching_columns(table, DATE_COLUMN_KEYWORDS))
+                                latest_date = self._find_latest_date_in_table(freshness, latest_date)
+
+                            except UnsupportedQueryError as e:
+                                # Member besar dibaca lewat page reader; total_records tanpa tabel ini
+                                analysis['errors'].append(f"{table}: {e}")
                             except:
                                 pass
 
-                    else:
-                        analysis['warnings'].append("File is not a SQLite database")
+                        analysis['total_records'] = total_records
+                        if approximate:
+                            # Sebagian jumlah record berupa perkiraan (mode estimasi / time budget)
+                            analysis['total_records_approximate'] = True
+                            analysis['total_records_error'] = total_error
+                        if latest_date:
+                            analysis['latest_dates']['overall'] = latest_date
+                        stats.close()
+                    finally:
+                        conn.close()
 
-            except Exception as e:
-                analysis['errors'].append(f"Error reading file: {e}")
+                except Exception as e:
+                    analysis['errors'].append(f"Database analysis error: {e}")
+
+            else:
+                analysis['warnings'].append("File is not a SQLite database")
 
         except Exception as e:
             analysis['errors'].append(f"Analysis error: {e}")
@@ -232,51 +253,16 @@ class QuickDatabaseValidator:
         return analysis
 
     def _detect_database_type(self, tables: List[str]) -> str:
-        """Detect database type based on table names"""
-        table_names_upper = [t.upper() for t in tables]
-
-        # Check for Plantware specific tables
-        plantware_indicators = ['PR_TASKREG', 'PR_TASK', 'PR_PROJECT', 'PR_USER', 'PR_DEPARTMENT']
-        if any(indicator in table_names_upper for indicator in plantware_indicators):
-            return 'plantware'
-
-        # Check for Venus specific tables
-        venus_indicators = ['TA_MACHINE', 'TA_TRANSACTION', 'TA_LOG', 'TA_EMPLOYEE']
-        if any(indicator in table_names_upper for indicator in venus_indicators):
-            return 'venus'
+        """Detect database type based on table names (schema registry bersama)"""
+        return self.registry.detect(tables)
 
-        # Check for Staging specific tables
-        staging_indicators = ['GWSCANNER', 'GW_LOG', 'SCANNER_DATA', 'GW_TRANSACTION']
-        if any(indicator in table_names_upper for indicator in staging_indicators):
-            return 'staging'
-
-        return 'unknown'
-
-    def _find_latest_date_in_table(self, cursor, table_name: str, current_latest: Optional[str]) -> Optional[str]:
-        """Cari tanggal terbaru di tabel"""
+    def _find_latest_date_in_table(self, freshness: FreshnessResult, current_latest: Optional[str]) -> Optional[str]:
+        """Tanggal terbaru hasil probe tabel dibanding tanggal terbaru sejauh ini"""
+        max_date = freshness.latest
         try:
-            # Coba beberapa kolom tanggal yang umum
-            date_columns = ['DATE', 'TIME', 'DATETIME', 'CREATED_DATE', 'MODIFIED_DATE',
-                           'TASK_DATE', 'TRANSACTION_DATE', 'SCAN_DATE', 'LOG_DATE']
-
-            # Get table columns
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [row[1] for row in cursor.fetchall()]
-
-            # Cari kolom yang mengandung tanggal
-            for col in columns:
-                col_upper = col.upper()
-                if any(date_col in col_upper for date_col in date_columns):
-                    try:
-                        cursor.execute(f"SELECT MAX({col}) FROM {table_name} WHERE {col} IS NOT NULL")
-                        max_date = cursor.fetchone()[0]
-                        if max_date:
-                            if current_latest is None or max_date > current_latest:
-                                current_latest = max_date
-                    except:
-                        pass
-
-        except Exception:
+            if max_date and (current_latest is None or max_date > current_latest):
+                current_latest = max_date
+        except TypeError:
             pass
 
         return current_latest
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Scan Index Module
+Index persisten (SQLite) untuk hasil scan file ZIP backup, supaya arsip yang
+tidak berubah tidak perlu di-testzip() ulang pada setiap siklus monitoring
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_INDEX_FILE = 'config/scan_index.db'
+BUSY_TIMEOUT = 30.0  # detik menunggu lock tulis dari proses lain (GUI + daemon)
+
+
+class ScanIndex:
+    """
+    Menyimpan verdict validasi, tanggal hasil parsing, dan daftar member
+    setiap arsip. Entry dianggap masih berlaku selama path, size, mtime dan
+    inode file tidak berubah.
+    """
+
+    def __init__(self, index_path: Optional[str] = None):
+        if not index_path:
+            index_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), DEFAULT_INDEX_FILE)
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka koneksi index (lazy) dan buat schema jika belum ada"""
+        if self._conn is None:
+            index_dir = os.path.dirname(self.index_path)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.index_path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS archives (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    is_valid INTEGER NOT NULL,
+                    file_date TEXT,
+                    members TEXT,
+                    error TEXT,
+                    checked_at TEXT
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(zip_path: str, stat_result: Optional[os.stat_result] = None) -> Dict:
+        """Identitas file yang dipakai untuk mendeteksi perubahan"""
+        if stat_result is None:
+            stat_result = os.stat(zip_path)
+        return {
+            'path': os.path.abspath(zip_path),
+            'size': stat_result.st_size,
+            'mtime_ns': stat_result.st_mtime_ns,
+            'inode': stat_result.st_ino
+        }
+
+    def lookup(self, zip_path: str, stat_result: Optional[os.stat_result] = None) -> Optional[Dict]:
+        """
+        Ambil entry index untuk arsip
+        Returns: Dictionary entry, atau None jika belum ada / file sudah berubah
+        """
+        try:
+            key = self._key(zip_path, stat_result)
+        except OSError:
+            return None
+
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT size, mtime_ns, inode, is_valid, file_date, members, error, checked_at "
+                "FROM archives WHERE path = ?",
+                (key['path'],)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        size, mtime_ns, inode, is_valid, file_date, members, error, checked_at = row
+        if (size, mtime_ns, inode) != (key['size'], key['mtime_ns'], key['inode']):
+            return None
+
+        return {
+            'path': key['path'],
+            'is_valid': bool(is_valid),
+            'file_date': file_date,
+            'members': json.loads(members) if members else [],
+            'error': error,
+            'checked_at': checked_at
+        }
+
+    def store(self, zip_path: str, is_valid: bool, file_date: Optional[str] = None,
+              members: Optional[List[Dict]] = None, error: Optional[str] = None,
+              stat_result: Optional[os.stat_result] = None):
+        """Simpan (atau timpa) hasil scan satu arsip"""
+        try:
+            key = self._key(zip_path, stat_result)
+        except OSError:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO archives "
+                "(path, size, mtime_ns, inode, is_valid, file_date, members, error, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key['path'], key['size'], key['mtime_ns'], key['inode'], int(bool(is_valid)),
+                 file_date, json.dumps(members or []), error,
+                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            conn.commit()
+
+    def prune(self, existing_paths: List[str]) -> int:
+        """Hapus entry untuk arsip yang sudah tidak ada. Returns: jumlah entry dihapus"""
+        keep = {os.path.abspath(p) for p in existing_paths}
+        with self._lock:
+            conn = self._connect()
+            indexed = [row[0] for row in conn.execute("SELECT path FROM archives")]
+            stale = [(p,) for p in indexed if p not in keep and not os.path.exists(p)]
+            if stale:
+                conn.executemany("DELETE FROM archives WHERE path = ?", stale)
+                conn.commit()
+        return len(stale)
+
+    def close(self):
+        """Tutup koneksi index"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Schema Registry Module
+Deteksi tipe database backup (Plantware, Venus, Staging, ...) di satu tempat.
+
+Nama tabel database di-hash menjadi fingerprint schema; fingerprint yang
+sudah pernah dilihat langsung dijawab dari memo, selebihnya dicocokkan
+dengan signature setiap tipe lewat irisan set (bukan list membership).
+Hasil per file backup juga disimpan selama size/mtime file tidak berubah,
+sehingga file yang sama tidak perlu dibuka ulang.
+
+Tipe tambahan (atau tabel tambahan untuk tipe bawaan) bisa didaftarkan
+lewat section [DATABASE_TYPES] di config.ini:
+    nama_tipe = TABEL_1, TABEL_2
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+import configparser
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from zip_sqlite import FileReader, SQLitePageReader
+
+UNKNOWN_TYPE = 'unknown'
+
+# Signature bawaan, urutan = prioritas jika tabel beberapa tipe ada sekaligus
+BUILTIN_SIGNATURES = OrderedDict([
+    ('plantware', ('PR_TASKREG', 'PR_TASK', 'PR_PROJECT', 'PR_USER', 'PR_DEPARTMENT')),
+    ('venus', ('TA_MACHINE', 'TA_TRANSACTION', 'TA_LOG', 'TA_EMPLOYEE')),
+    ('staging', ('GWSCANNER', 'GW_LOG', 'SCANNER_DATA', 'GW_TRANSACTION')),
+])
+
+
+def schema_fingerprint(tables: Iterable[str]) -> str:
+    """Hash SHA-256 dari set nama tabel (tanpa membedakan huruf besar/kecil dan urutan)"""
+    names = sorted({table.upper() for table in tables})
+    return hashlib.sha256('\n'.join(names).encode('utf-8')).hexdigest()
+
+
+class SchemaRegistry:
+    """
+    Registry signature tipe database.
+
+    Args:
+        signatures: nama tipe -> tabel penanda; satu tabel penanda cukup
+                    untuk mengenali tipe (default: BUILTIN_SIGNATURES)
+    """
+
+    def __init__(self, signatures: Optional[Dict[str, Iterable[str]]] = None):
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+        self._files = {}
+        self._signatures = OrderedDict()
+        for name, tables in (BUILTIN_SIGNATURES if signatures is None else signatures).items():
+            self.register(name, tables)
+
+    @property
+    def signatures(self) -> Dict[str, frozenset]:
+        return dict(self._signatures)
+
+    @property
+    def types(self) -> List[str]:
+        return list(self._signatures)
+
+    def register(self, name: str, tables: Iterable[str]):
+        """Tambah tipe baru, atau tambah tabel penanda tipe yang sudah ada"""
+        name = name.strip().lower()
+        tables = frozenset(table.strip().upper() for table in tables if table.strip())
+        self._signatures[name] = self._signatures.get(name, frozenset()) | tables
+        # Signature berubah: memo fingerprint / file tidak berlaku lagi
+        with self._lock:
+            self._fingerprints.clear()
+            self._files.clear()
+
+    @property
+    def version(self) -> str:
+        """Hash semua signature (bagian key cache hasil analisis)"""
+        text = ';'.join(f"{name}={','.join(sorted(tables))}" for name, tables in self._signatures.items())
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+    def cache_params(self) -> str:
+        """Bagian key cache analisis jika signature bukan bawaan (kosong untuk default)"""
+        builtin = OrderedDict((name, frozenset(tables)) for name, tables in BUILTIN_SIGNATURES.items())
+        if self._signatures == builtin:
+            return ''
+        return f":types:{self.version}"
+
+    def detect(self, tables: Iterable[str], default: str = UNKNOWN_TYPE) -> str:
+        """Tipe database dari daftar nama tabel, atau default jika tidak ada yang cocok"""
+        names = frozenset(table.upper() for table in tables)
+        fingerprint = schema_fingerprint(names)
+        with self._lock:
+            if fingerprint in self._fingerprints:
+                detected = self._fingerprints[fingerprint]
+                return detected if detected is not None else default
+
+        detected = next((name for name, signature in self._signatures.items() if signature & names), None)
+        with self._lock:
+            self._fingerprints[fingerprint] = detected
+        return detected if detected is not None else default
+
+    def detect_file(self, db_path: str, tables: Optional[Iterable[str]] = None,
+                    default: str = UNKNOWN_TYPE) -> str:
+        """
+        Tipe database file SQLite, disimpan per file (path + size + mtime).
+        Jika tables tidak diberikan, nama tabel dibaca dari sqlite_master lewat
+        page reader (tanpa membuka koneksi SQLite).
+        """
+        try:
+            stat_result = os.stat(db_path)
+        except OSError:
+            return default
+        key = (os.path.abspath(db_path), stat_result.st_size, stat_result.st_mtime_ns)
+        with self._lock:
+            if key in self._files:
+                detected = self._files[key]
+                return detected if detected is not None else default
+
+        if tables is None:
+            try:
+                reader = SQLitePageReader(FileReader(db_path))
+                try:
+                    tables = [entry['name'] for entry in reader.schema.values()]
+                finally:
+                    reader.reader.close()
+            except (sqlite3.Error, OSError, ValueError):
+                return default
+
+        detected = self.detect(tables, default=None)
+        with self._lock:
+            self._files[key] = detected
+        return detected if detected is not None else default
+
+
+def load_database_types_config(config_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Tipe database tambahan dari section [DATABASE_TYPES] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    types = OrderedDict()
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('DATABASE_TYPES'):
+            for name, value in config['DATABASE_TYPES'].items():
+                tables = [table.strip() for table in value.split(',') if table.strip()]
+                if tables:
+                    types[name] = tables
+    except Exception as e:
+        print(f"Warning: Could not read database types config: {e}")
+        types = OrderedDict()
+    return types
+
+
+_default_registry: Optional[SchemaRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry() -> SchemaRegistry:
+    """SchemaRegistry bersama: signature bawaan + [DATABASE_TYPES]"""
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                registry = SchemaRegistry()
+                for name, tables in load_database_types_config().items():
+                    registry.register(name, tables)
+                _default_registry = registry
+    return _default_registry
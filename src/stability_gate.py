@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Stability Gate Module
+Deteksi arsip ZIP yang masih ditulis oleh job backup. Arsip baru dianggap
+siap setelah ukuran/mtime stabil selama satu window dan end-of-central-
+directory (EOCD) ada di akhir file; sebelum itu statusnya 'pending' dan
+verifikasi penuh (testzip / CRC) ditunda ke siklus berikutnya.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+try:
+    from zip_central_directory import CENTRAL_DIR_SIGNATURE, ZipMetadataError, locate_central_directory
+except ImportError:
+    from src.zip_central_directory import CENTRAL_DIR_SIGNATURE, ZipMetadataError, locate_central_directory
+
+STATE_READY = 'ready'
+STATE_PENDING = 'pending'
+
+DEFAULT_STABILITY_WINDOW = 60.0     # detik tanpa perubahan ukuran/mtime
+DEFAULT_MAX_PENDING = 3600.0        # setelah ini arsip tanpa EOCD dilaporkan rusak
+
+
+def probe_eocd(zip_path: str) -> Optional[str]:
+    """
+    Cek murah apakah ZIP sudah lengkap: cari EOCD di ekor file dan pastikan
+    central directory yang ditunjuknya ada di dalam file.
+    Biasanya hanya membaca 4 KB terakhir (maksimal ~64 KB) + beberapa byte.
+
+    Returns:
+        None jika EOCD valid, atau pesan error
+    """
+    try:
+        with open(zip_path, 'rb') as f:
+            location = locate_central_directory(f)
+            if location.entries:
+                f.seek(location.cd_start)
+                if f.read(4) != CENTRAL_DIR_SIGNATURE:
+                    return "Central directory tidak valid"
+    except ZipMetadataError as e:
+        return str(e)
+    except OSError as e:
+        return f"Tidak bisa membaca file: {e}"
+
+    return None
+
+
+class StabilityGate:
+    """
+    Gate yang menahan arsip sampai penulisannya selesai.
+
+    Arsip 'ready' jika ukuran/mtime tidak berubah sejak observasi sebelumnya,
+    mtime-nya lebih tua dari window (atau sudah teramati stabil selama window),
+    dan EOCD probe lolos. Arsip tanpa EOCD yang tetap tidak berubah selama
+    window (atau lebih tua dari max_pending_seconds) dilepas sebagai 'ready'
+    agar verifikasi penuh melaporkannya sebagai rusak.
+    """
+
+    def __init__(self, window_seconds: float = DEFAULT_STABILITY_WINDOW,
+                 max_pending_seconds: float = DEFAULT_MAX_PENDING):
+        self.window_seconds = window_seconds
+        self.max_pending_seconds = max_pending_seconds
+        self._observed = {}   # abspath -> ((size, mtime_ns), waktu pertama terlihat)
+        self._lock = threading.Lock()
+
+    def check(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> Tuple[str, Optional[str]]:
+        """
+        Returns:
+            (state, reason): state STATE_READY / STATE_PENDING, reason untuk pending
+        """
+        if stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except OSError as e:
+                return STATE_PENDING, f"Tidak bisa membaca file: {e}"
+
+        now = time.time()
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+        key = os.path.abspath(file_path)
+        with self._lock:
+            previous = self._observed.get(key)
+            if previous is None or previous[0] != signature:
+                self._observed[key] = (signature, now)
+                stable_for = None
+            else:
+                stable_for = now - previous[1]
+
+        if previous is not None and stable_for is None:
+            return STATE_PENDING, "Ukuran/mtime masih berubah (file sedang ditulis)"
+
+        age = now - stat_result.st_mtime
+        observed_stable = stable_for is not None and stable_for >= self.window_seconds
+        if age < self.window_seconds and not observed_stable:
+            return STATE_PENDING, f"Dimodifikasi {max(age, 0):.0f} detik lalu, menunggu {self.window_seconds:.0f} detik stabil"
+
+        error = probe_eocd(file_path)
+        if error and not observed_stable and age < self.max_pending_seconds:
+            return STATE_PENDING, error
+
+        return STATE_READY, None
+
+    def is_ready(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> bool:
+        return self.check(file_path, stat_result)[0] == STATE_READY
+
+    def forget(self, file_path: str):
+        """Hapus observasi untuk file (mis. setelah file dihapus)"""
+        with self._lock:
+            self._observed.pop(os.path.abspath(file_path), None)
+
+    def pending_entry(self, file_path: str, reason: Optional[str]) -> Dict:
+        """Entry hasil untuk arsip yang ditunda"""
+        return {
+            'filename': os.path.basename(file_path),
+            'filepath': file_path,
+            'status': STATE_PENDING,
+            'reason': reason
+        }
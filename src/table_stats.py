@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Table Statistics Module
+Statistik tabel database backup untuk validator: schema (nama tabel,
+kolom, index) dibaca sekali per database, lalu per tabel cukup satu query
+agregat yang menggabungkan COUNT(*), MAX() setiap kolom tanggal dan jumlah
+record terbaru (kolom >= tanggal batas).
+
+Bekerja di atas cursor sqlite3 maupun PageReaderCursor (database besar di
+dalam ZIP); untuk page reader agregat dihitung dalam satu scan b-tree.
+
+Mode estimasi (section [ROW_COUNTS]): jumlah baris tabel non-kunci diambil
+dari sampel leaf page b-tree dengan batas error 95%, atau dari sqlite_stat1
+jika file database tidak bisa dibaca per page (mis. database in-memory).
+Tabel kunci analyzer Plantware/Venus/Staging selalu dihitung exact, dan
+time budget per database membatasi scan tabel lain.
+"""
+
+import os
+import time
+import random
+import sqlite3
+import configparser
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from zip_sqlite import FileReader, SQLitePageReader
+
+MODE_EXACT = 'exact'        # COUNT(*) semua tabel (selama time budget belum habis)
+MODE_ESTIMATE = 'estimate'  # tabel non-kunci cukup perkiraan
+ROW_COUNT_MODES = (MODE_EXACT, MODE_ESTIMATE)
+DEFAULT_SAMPLES = 64
+
+# Tabel yang dianalisis tanggalnya oleh analyzer Plantware/Venus/Staging: selalu exact
+KEY_TABLES = {
+    'plantware': ('PR_TASKREG', 'PR_TASK', 'PR_PROJECT'),
+    'venus': ('TA_MACHINE', 'TA_TRANSACTION'),
+    'staging': ('GWSCANNER', 'GW_TRANSACTION'),
+}
+KEY_TABLE_NAMES = frozenset(table for tables in KEY_TABLES.values() for table in tables)
+
+
+def quote_identifier(name: str) -> str:
+    """Identifier SQL yang aman untuk nama tabel/kolom apa pun"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class TableStats(NamedTuple):
+    """Hasil agregat satu tabel"""
+    table: str
+    record_count: int
+    latest_dates: Dict[str, Any]
+    recent_counts: Dict[str, int]
+    approximate: bool = False
+    count_error: Optional[int] = 0   # batas error 95% record_count (None = tidak diketahui, sqlite_stat1)
+
+    @property
+    def latest_date(self) -> Optional[Any]:
+        """Nilai MAX terbesar dari semua kolom tanggal (None jika tabel kosong)"""
+        values = [value for value in self.latest_dates.values() if value is not None]
+        return max(values, key=str) if values else None
+
+
+class TableStatistics:
+    """
+    Statistik semua tabel satu database lewat satu cursor.
+
+    Schema dibaca sekali (lazy) dan hasil per tabel disimpan, sehingga
+    pemanggil yang meminta tabel yang sama (mis. detail tabel lalu analisis
+    tabel kunci) tidak mengulang scan.
+
+    Args:
+        mode: MODE_EXACT atau MODE_ESTIMATE (jumlah baris tabel non-kunci)
+        time_budget: detik per database; setelah habis tabel non-kunci hanya
+                     diperkirakan dan kolom tanggalnya tidak di-scan (None = tanpa batas)
+        exact_tables: tabel yang selalu dihitung exact (default: KEY_TABLE_NAMES)
+        samples: jumlah leaf page yang di-sampling per tabel
+    """
+
+    def __init__(self, cursor, mode: str = MODE_EXACT, time_budget: Optional[float] = None,
+                 exact_tables: Optional[Iterable[str]] = None, samples: int = DEFAULT_SAMPLES,
+                 seed: Optional[int] = None):
+        if mode not in ROW_COUNT_MODES:
+            raise ValueError(f"Unknown row count mode: {mode}")
+        self.cursor = cursor
+        # PageReaderCursor: agregat langsung di page reader (subset SQL tidak cukup)
+        self.page_reader = getattr(cursor, 'page_reader', None)
+        self.mode = mode
+        self.time_budget = time_budget
+        exact_tables = KEY_TABLE_NAMES if exact_tables is None else exact_tables
+        self.exact_tables = frozenset(table.upper() for table in exact_tables)
+        self.samples = max(2, samples)
+        self._rng = random.Random(seed)
+        self._started = time.monotonic()
+        self._sampler = None
+        self._owns_sampler = False
+        self._schema = None
+        self._indexes = None
+        self._indexed = None
+        self._stat1 = None
+        self._stats = {}
+        self.queries = 0
+
+    def _execute(self, sql: str, parameters: Sequence = ()) -> List[Tuple]:
+        self.queries += 1
+        return self.cursor.execute(sql, tuple(parameters)).fetchall()
+
+    @property
+    def schema(self) -> 'OrderedDict[str, List[Tuple]]':
+        """Nama tabel -> baris PRAGMA table_info (cid, name, type, notnull, dflt_value, pk)"""
+        if self._schema is None:
+            self._schema = self._read_page_reader_schema() if self.page_reader is not None \
+                else self._read_schema()
+        return self._schema
+
+    def _read_schema(self) -> 'OrderedDict[str, List[Tuple]]':
+        schema = OrderedDict()
+        try:
+            rows = self._execute(
+                "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+                "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type = 'table' ORDER BY m.rowid, p.cid"
+            )
+            for table, *column in rows:
+                schema.setdefault(table, []).append(tuple(column))
+            # Tabel tanpa kolom yang terbaca (mis. virtual table) tetap dicatat
+            for (table,) in self._execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+                schema.setdefault(table, [])
+        except sqlite3.OperationalError:
+            # SQLite lama tanpa table-valued pragma: satu PRAGMA per tabel
+            for (table,) in self._execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+                schema[table] = [tuple(row) for row in
+                                 self._execute(f"PRAGMA table_info({quote_identifier(table)})")]
+        return schema
+
+    def _read_page_reader_schema(self) -> 'OrderedDict[str, List[Tuple]]':
+        schema = OrderedDict()
+        for entry in self.page_reader.schema.values():
+            schema[entry['name']] = [(index, name, col_type, 0, None, 1 if primary_key else 0)
+                                     for index, (name, col_type, primary_key) in enumerate(entry['columns'])]
+        return schema
+
+    def tables(self) -> List[str]:
+        return list(self.schema)
+
+    def has_table(self, table: str) -> bool:
+        return table in self.schema
+
+    def columns(self, table: str) -> List[Tuple]:
+        return self.schema.get(table, [])
+
+    def column_names(self, table: str) -> List[str]:
+        return [column[1] for column in self.columns(table)]
+
+    def existing_columns(self, table: str, candidates: Iterable[str]) -> List[str]:
+        """Kandidat kolom yang benar-benar ada di tabel (urutan kandidat)"""
+        names = set(self.column_names(table))
+        return [column for column in candidates if column in names]
+
+    def matching_columns(self, table: str, keywords: Iterable[str]) -> List[str]:
+        """Kolom yang namanya mengandung salah satu keyword (case-insensitive)"""
+        keywords = [keyword.upper() for keyword in keywords]
+        return [name for name in self.column_names(table)
+                if any(keyword in name.upper() for keyword in keywords)]
+
+    def indexes(self, table: str) -> List[Tuple]:
+        """Baris PRAGMA index_list tabel; semua tabel dibaca dalam satu query"""
+        if self.page_reader is not None:
+            return []
+        if self._indexes is None:
+            self._indexes = {}
+            try:
+                rows = self._execute(
+                    "SELECT m.name, i.* FROM sqlite_master AS m JOIN pragma_index_list(m.name) AS i "
+                    "WHERE m.type = 'table'"
+                )
+                for table_name, *index in rows:
+                    self._indexes.setdefault(table_name, []).append(tuple(index))
+            except sqlite3.OperationalError:
+                for table_name in self.schema:
+                    self._indexes[table_name] = [tuple(row) for row in self._execute(
+                        f"PRAGMA index_list({quote_identifier(table_name)})")]
+        return self._indexes.get(table, [])
+
+    def indexed_columns(self, table: str) -> List[str]:
+        """Kolom pertama setiap index (non-partial) tabel; semua tabel dibaca dalam satu query"""
+        if self.page_reader is not None:
+            return []
+        if self._indexed is None:
+            self._indexed = {}
+            try:
+                rows = self._execute(
+                    "SELECT m.name, c.name FROM sqlite_master AS m "
+                    "JOIN pragma_index_list(m.name) AS i JOIN pragma_index_info(i.name) AS c "
+                    "WHERE m.type = 'table' AND i.partial = 0 AND c.seqno = 0"
+                )
+            except sqlite3.OperationalError:
+                rows = []
+                for table_name in self.schema:
+                    for index in self.indexes(table_name):
+                        if index[-1]:
+                            continue
+                        info = self._execute(f"PRAGMA index_info({quote_identifier(index[1])})")
+                        rows.extend((table_name, column[2]) for column in info if column[0] == 0)
+            for table_name, column in rows:
+                if column is not None and column not in self._indexed.setdefault(table_name, []):
+                    self._indexed[table_name].append(column)
+        return self._indexed.get(table, [])
+
+    def approximate_count(self, table: str) -> Optional[int]:
+        """Jumlah baris dari sqlite_stat1 (ANALYZE), atau None jika tidak tersedia"""
+        if self._stat1 is None:
+            self._stat1 = {}
+            if self.page_reader is None and self.has_table('sqlite_stat1'):
+                try:
+                    # Angka pertama kolom stat = jumlah baris tabel
+                    for tbl, rows in self._execute(
+                            "SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 GROUP BY tbl"):
+                        if rows is not None:
+                            self._stat1[tbl] = rows
+                except sqlite3.Error:
+                    pass
+        return self._stat1.get(table)
+
+    @property
+    def over_budget(self) -> bool:
+        """True jika time budget database ini sudah habis"""
+        return self.time_budget is not None and time.monotonic() - self._started >= self.time_budget
+
+    def needs_exact(self, table: str) -> bool:
+        """Tabel kunci selalu exact; tabel lain exact hanya di MODE_EXACT selama budget masih ada"""
+        if table.upper() in self.exact_tables:
+            return True
+        return self.mode == MODE_EXACT and not self.over_budget
+
+    def _page_sampler(self) -> Optional[SQLitePageReader]:
+        """Page reader untuk sampling: page reader cursor, atau file database koneksi sqlite3"""
+        if self.page_reader is not None:
+            return self.page_reader
+        if self._sampler is None:
+            self._sampler = False
+            try:
+                path = next((row[2] for row in self._execute("PRAGMA database_list") if row[1] == 'main'), '')
+                # Database in-memory tidak punya file; WAL berisi page yang belum ada di file utama
+                wal_path = path + '-wal'
+                if path and os.path.isfile(path) and not (os.path.exists(wal_path) and os.path.getsize(wal_path)):
+                    self._sampler = SQLitePageReader(FileReader(path))
+                    self._owns_sampler = True
+            except (sqlite3.Error, OSError):
+                pass
+        return self._sampler or None
+
+    def estimate_count(self, table: str) -> Optional[TableStats]:
+        """
+        Perkiraan jumlah baris: sampling leaf page (dengan batas error), lalu
+        sqlite_stat1. None jika keduanya tidak tersedia.
+        """
+        sampler = self._page_sampler()
+        if sampler is not None:
+            try:
+                estimate = sampler.estimate_rows(table, self.samples, self._rng)
+                return TableStats(table, estimate.count, {}, {}, approximate=not estimate.exact,
+                                  count_error=estimate.error)
+            except sqlite3.Error:
+                pass
+        rows = self.approximate_count(table)
+        if rows is not None:
+            return TableStats(table, rows, {}, {}, approximate=True, count_error=None)
+        return None
+
+    def table_stats(self, table: str, date_columns: Sequence[str] = (), recent_since: Any = None,
+                    exact: Optional[bool] = None) -> TableStats:
+        """
+        COUNT(*), MAX(kolom tanggal) dan COUNT(kolom >= recent_since) dalam satu query.
+
+        Args:
+            date_columns: kolom tanggal; yang tidak ada di tabel diabaikan
+            recent_since: batas record terbaru (None = tidak dihitung)
+            exact: True = selalu COUNT(*); False = boleh perkiraan;
+                   None = ikut mode / tabel kunci / time budget (needs_exact)
+
+        Raises:
+            sqlite3.Error: tabel tidak ada / query gagal
+        """
+        if exact is None:
+            exact = self.needs_exact(table)
+        date_columns = self.existing_columns(table, dict.fromkeys(date_columns))
+        if date_columns and not exact and self.over_budget:
+            # Budget habis: tabel non-kunci tidak di-scan untuk tanggal
+            date_columns = []
+        key = (table, tuple(date_columns), recent_since if date_columns else None)
+        cached = self._stats.get(key) or (None if date_columns else self._stats.get((table, (), None)))
+        if cached is not None and not (exact and cached.approximate):
+            return cached
+
+        if not date_columns and not exact:
+            estimate = self.estimate_count(table)
+            if estimate is not None:
+                self._stats[key] = estimate
+                return estimate
+
+        if self.page_reader is not None:
+            self.queries += 1
+            count, maxima, recent = self.page_reader.aggregate(table, date_columns, recent_since)
+        else:
+            selects = ["COUNT(*)"]
+            parameters = []
+            for column in date_columns:
+                quoted = quote_identifier(column)
+                selects.append(f"MAX({quoted})")
+                if recent_since is not None:
+                    selects.append(f"COUNT(CASE WHEN {quoted} >= ? THEN 1 END)")
+                    parameters.append(recent_since)
+            row = self._execute(f"SELECT {', '.join(selects)} FROM {quote_identifier(table)}", parameters)[0]
+            count = row[0]
+            step = 2 if recent_since is not None else 1
+            maxima = [row[1 + step * i] for i in range(len(date_columns))]
+            recent = [row[2 + step * i] for i in range(len(date_columns))] if recent_since is not None else []
+
+        stats = TableStats(
+            table, count,
+            {column: value for column, value in zip(date_columns, maxima) if value is not None},
+            dict(zip(date_columns, recent)) if recent_since is not None else {}
+        )
+        self._stats[key] = stats
+        if date_columns:
+            self._stats[(table, (), None)] = stats._replace(latest_dates={}, recent_counts={})
+        return stats
+
+    def sample_rows(self, table: str, limit: int = 5) -> List[Tuple]:
+        """Beberapa baris pertama tabel (SELECT * LIMIT n)"""
+        if self.page_reader is not None:
+            return self.page_reader.sample_rows(table, limit)
+        return self._execute(f"SELECT * FROM {quote_identifier(table)} LIMIT ?", (limit,))
+
+    def close(self):
+        """Tutup file yang dibuka untuk sampling page (cursor tetap milik pemanggil)"""
+        if self._owns_sampler and self._sampler:
+            self._sampler.reader.close()
+        self._sampler = None
+        self._owns_sampler = False
+
+
+def load_row_count_config(config_path: Optional[str] = None) -> Dict:
+    """Opsi TableStatistics dari section [ROW_COUNTS] di config.ini"""
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config/config.ini')
+    options = {}
+    try:
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        config.read(config_path)
+        if config.has_section('ROW_COUNTS'):
+            section = config['ROW_COUNTS']
+            mode = section.get('mode', MODE_EXACT).strip().lower()
+            if mode in ROW_COUNT_MODES:
+                options['mode'] = mode
+            else:
+                print(f"Warning: Unknown row count mode '{mode}', using {MODE_EXACT}")
+            budget = section.getfloat('time_budget_seconds', fallback=0)
+            options['time_budget'] = budget if budget > 0 else None
+            options['samples'] = section.getint('samples', fallback=DEFAULT_SAMPLES)
+            extra = [t.strip().upper() for t in section.get('exact_tables', '').split(',') if t.strip()]
+            if extra:
+                options['exact_tables'] = KEY_TABLE_NAMES | set(extra)
+    except Exception as e:
+        print(f"Warning: Could not read row count config: {e}")
+        options = {}
+    return options
@@ -10,14 +10,34 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 import zipfile
 
+from analysis_cache import AnalysisCache, get_default_cache
+
 class TapeFileAnalyzer:
-    def __init__(self):
+    # Naikkan jika format hasil analisis berubah (invalidasi analysis cache)
+    CACHE_VERSION = '1'
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
         self.supported_formats = ['TAPE', 'PLANTWARE_BACKUP']
+        self.analysis_cache = cache if cache is not None else get_default_cache()
 
     def analyze_tape_file(self, file_path: str, original_filename: str = None) -> Dict:
         """
         Analisis file format TAPE
         """
+        try:
+            fingerprint = self.analysis_cache.file_fingerprint(file_path)
+        except OSError:
+            return self._analyze_tape_file(file_path, original_filename)
+
+        # Tanggal dari nama file ikut menentukan hasil
+        return self.analysis_cache.get_or_compute(
+            'tape_file', self.CACHE_VERSION, fingerprint,
+            lambda: self._analyze_tape_file(file_path, original_filename),
+            params=original_filename or os.path.basename(file_path)
+        )
+
+    def _analyze_tape_file(self, file_path: str, original_filename: str = None) -> Dict:
+        """Analisis tanpa cache (lihat analyze_tape_file)"""
         analysis = {
             'file_format': 'unknown',
             'filename': original_filename or os.path.basename(file_path),
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+ZIP Central Directory Reader
+Baca metadata member ZIP (nama, ukuran, CRC, timestamp, metode kompresi)
+langsung dari central directory: satu read ekor file untuk end-of-central-
+directory (EOCD, termasuk record Zip64) lalu paling banyak satu read untuk
+seluruh central directory (tidak perlu jika sudah tercakup di ekor). Data member tidak pernah dibaca, sehingga listing arsip multi-GB
+di share jaringan hanya butuh beberapa round trip per arsip.
+"""
+
+import os
+import struct
+from datetime import datetime
+from typing import BinaryIO, NamedTuple, Optional, Tuple
+
+EOCD_SIGNATURE = b'PK\x05\x06'
+EOCD_STRUCT = struct.Struct('<4s4H2LH')
+ZIP64_LOCATOR_SIGNATURE = b'PK\x06\x07'
+ZIP64_LOCATOR_STRUCT = struct.Struct('<4sLQL')
+ZIP64_EOCD_SIGNATURE = b'PK\x06\x06'
+ZIP64_EOCD_STRUCT = struct.Struct('<4sQ2H2L4Q')
+CENTRAL_DIR_SIGNATURE = b'PK\x01\x02'
+CENTRAL_DIR_STRUCT = struct.Struct('<4s4B4HL2L5H2L')
+MAX_COMMENT = 0xFFFF
+
+ZIP64_EXTRA_ID = 0x0001
+FLAG_UTF8 = 0x800
+
+# Ekor file yang dibaca pertama kali: cukup untuk EOCD + record Zip64 + komentar pendek.
+# Jika EOCD tidak ketemu (komentar panjang), ekor dibaca ulang sampai batas maksimal.
+INITIAL_TAIL = 4096
+
+COMPRESSION_NAMES = {
+    0: 'Stored',
+    8: 'Deflated',
+    12: 'BZIP2',
+    14: 'LZMA'
+}
+
+
+class ZipMetadataError(Exception):
+    """Struktur EOCD / central directory tidak valid"""
+
+
+class ZipEntry(NamedTuple):
+    """Metadata satu member ZIP dari central directory"""
+    filename: str
+    file_size: int
+    compress_size: int
+    crc: int
+    date_time: Tuple[int, int, int, int, int, int]
+    compress_type: int
+    flag_bits: int
+    header_offset: int
+
+    def is_dir(self) -> bool:
+        return self.filename.endswith('/')
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename)[1].lower()
+
+    @property
+    def modified(self) -> Optional[datetime]:
+        """Timestamp DOS member, atau None jika tidak valid"""
+        try:
+            return datetime(*self.date_time)
+        except ValueError:
+            return None
+
+
+class CentralDirectory(NamedTuple):
+    """Hasil baca central directory satu arsip"""
+    entries: Tuple[ZipEntry, ...]
+    file_size: int
+    cd_offset: int
+    cd_size: int
+    comment: bytes
+    zip64: bool
+
+    @property
+    def total_compressed(self) -> int:
+        return sum(entry.compress_size for entry in self.entries)
+
+    @property
+    def total_uncompressed(self) -> int:
+        return sum(entry.file_size for entry in self.entries)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Persentase penghematan (0-100) dari total ukuran member"""
+        total = self.total_uncompressed
+        return round((1 - self.total_compressed / total) * 100, 2) if total > 0 else 0
+
+    def names(self):
+        return [entry.filename for entry in self.entries]
+
+
+class _Location(NamedTuple):
+    entries: int
+    cd_start: int
+    cd_size: int
+    concat: int
+    comment: bytes
+    zip64: bool
+    tail: bytes
+    tail_start: int
+
+
+def _find_eocd(tail: bytes) -> Optional[Tuple[int, tuple]]:
+    """Posisi EOCD asli di tail: record yang komentarnya berakhir tepat di akhir file"""
+    position = tail.rfind(EOCD_SIGNATURE)
+    while position >= 0:
+        if position + EOCD_STRUCT.size <= len(tail):
+            fields = EOCD_STRUCT.unpack_from(tail, position)
+            if position + EOCD_STRUCT.size + fields[7] == len(tail):
+                return position, fields
+        position = tail.rfind(EOCD_SIGNATURE, 0, position)
+    return None
+
+
+def _read_at(f: BinaryIO, offset: int, size: int, tail: bytes, tail_start: int) -> bytes:
+    """Ambil bytes dari tail yang sudah dibaca jika tercakup, selain itu seek + read"""
+    if offset >= tail_start and offset + size <= tail_start + len(tail):
+        return tail[offset - tail_start:offset - tail_start + size]
+    f.seek(offset)
+    return f.read(size)
+
+
+def locate_central_directory(f: BinaryIO, file_size: Optional[int] = None) -> _Location:
+    """
+    Cari EOCD (dan record Zip64 jika ada) di ekor file.
+
+    Raises:
+        ZipMetadataError: jika EOCD / Zip64 tidak ditemukan atau tidak konsisten
+    """
+    if file_size is None:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+    if file_size < EOCD_STRUCT.size:
+        raise ZipMetadataError("File terlalu kecil untuk ZIP")
+
+    max_tail = min(file_size, MAX_COMMENT + EOCD_STRUCT.size)
+    tail_size = min(max_tail, INITIAL_TAIL)
+    while True:
+        tail_start = file_size - tail_size
+        f.seek(tail_start)
+        tail = f.read(tail_size)
+        found = _find_eocd(tail)
+        if found is not None or tail_size == max_tail:
+            break
+        tail_size = max_tail
+
+    if found is None:
+        raise ZipMetadataError("End of central directory tidak ditemukan (arsip belum lengkap)")
+
+    position, fields = found
+    eocd_offset = tail_start + position
+    entries, cd_size, cd_offset = fields[4], fields[5], fields[6]
+    comment = tail[position + EOCD_STRUCT.size:]
+    zip64 = False
+
+    # Record Zip64 dicek selalu, bukan hanya saat field EOCD bernilai 0xFFFF(FFFF):
+    # beberapa writer menulis Zip64 dengan nilai asli di EOCD biasa
+    locator_offset = eocd_offset - ZIP64_LOCATOR_STRUCT.size
+    locator = _read_at(f, locator_offset, ZIP64_LOCATOR_STRUCT.size, tail, tail_start) \
+        if locator_offset >= 0 else b''
+    if locator.startswith(ZIP64_LOCATOR_SIGNATURE) and len(locator) == ZIP64_LOCATOR_STRUCT.size:
+        zip64_offset = locator_offset - ZIP64_EOCD_STRUCT.size
+        record = _read_at(f, zip64_offset, ZIP64_EOCD_STRUCT.size, tail, tail_start) \
+            if zip64_offset >= 0 else b''
+        if len(record) < ZIP64_EOCD_STRUCT.size or not record.startswith(ZIP64_EOCD_SIGNATURE):
+            raise ZipMetadataError("Zip64 end of central directory rusak")
+        zip64_fields = ZIP64_EOCD_STRUCT.unpack(record)
+        entries, cd_size, cd_offset = zip64_fields[7], zip64_fields[8], zip64_fields[9]
+        eocd_offset = zip64_offset
+        zip64 = True
+    elif cd_offset == 0xFFFFFFFF or cd_size == 0xFFFFFFFF or entries == 0xFFFF:
+        raise ZipMetadataError("Zip64 locator tidak ditemukan")
+
+    # Central directory berakhir tepat sebelum EOCD (juga untuk arsip dengan prefix data)
+    cd_start = eocd_offset - cd_size
+    if cd_start < 0:
+        raise ZipMetadataError("Central directory melewati awal file")
+
+    return _Location(entries, cd_start, cd_size, cd_start - cd_offset, comment, zip64, tail, tail_start)
+
+
+def _parse_zip64_extra(extra: bytes, file_size: int, compress_size: int,
+                       header_offset: int) -> Tuple[int, int, int]:
+    """Ganti field 32-bit yang bernilai 0xFFFFFFFF dengan nilai dari extra field Zip64"""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack_from('<2H', extra, position)
+        data = extra[position + 4:position + 4 + length]
+        if header_id == ZIP64_EXTRA_ID:
+            values = list(struct.unpack_from(f'<{len(data) // 8}Q', data))
+            try:
+                if file_size == 0xFFFFFFFF:
+                    file_size = values.pop(0)
+                if compress_size == 0xFFFFFFFF:
+                    compress_size = values.pop(0)
+                if header_offset == 0xFFFFFFFF:
+                    header_offset = values.pop(0)
+            except IndexError:
+                raise ZipMetadataError("Extra field Zip64 rusak")
+            break
+        position += 4 + length
+    return file_size, compress_size, header_offset
+
+
+def parse_central_directory(data: bytes, expected_entries: int, concat: int = 0) -> Tuple[ZipEntry, ...]:
+    """Parse bytes central directory menjadi ZipEntry"""
+    entries = []
+    position = 0
+    size = CENTRAL_DIR_STRUCT.size
+    while position + size <= len(data):
+        fields = CENTRAL_DIR_STRUCT.unpack_from(data, position)
+        if fields[0] != CENTRAL_DIR_SIGNATURE:
+            raise ZipMetadataError("Central directory tidak valid")
+        (flag_bits, compress_type, dos_time, dos_date, crc, compress_size, file_size,
+         name_length, extra_length, comment_length) = fields[5:15]
+        header_offset = fields[18]
+
+        name_start = position + size
+        raw_name = data[name_start:name_start + name_length]
+        filename = raw_name.decode('utf-8' if flag_bits & FLAG_UTF8 else 'cp437')
+        extra = data[name_start + name_length:name_start + name_length + extra_length]
+
+        if 0xFFFFFFFF in (file_size, compress_size, header_offset):
+            file_size, compress_size, header_offset = _parse_zip64_extra(extra, file_size, compress_size,
+                                                                         header_offset)
+
+        date_time = ((dos_date >> 9) + 1980, (dos_date >> 5) & 0xF, dos_date & 0x1F,
+                     dos_time >> 11, (dos_time >> 5) & 0x3F, (dos_time & 0x1F) * 2)
+        entries.append(ZipEntry(filename, file_size, compress_size, crc, date_time, compress_type,
+                                flag_bits, header_offset + concat))
+        position = name_start + name_length + extra_length + comment_length
+
+    if len(entries) != expected_entries:
+        raise ZipMetadataError(
+            f"Central directory tidak lengkap: {len(entries)} dari {expected_entries} entri terbaca")
+    return tuple(entries)
+
+
+def read_central_directory(zip_path: str) -> CentralDirectory:
+    """
+    Metadata semua member ZIP tanpa membaca data member.
+
+    Raises:
+        ZipMetadataError: struktur ZIP tidak valid
+        OSError: file tidak bisa dibaca
+    """
+    with open(zip_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        location = locate_central_directory(f, file_size)
+        # Arsip dengan sedikit member: central directory sudah ada di ekor yang dibaca
+        data = _read_at(f, location.cd_start, location.cd_size, location.tail, location.tail_start)
+    if len(data) < location.cd_size:
+        raise ZipMetadataError("Central directory terpotong")
+
+    entries = parse_central_directory(data, location.entries, location.concat)
+    return CentralDirectory(entries, file_size, location.cd_start, location.cd_size, location.comment,
+                            location.zip64)
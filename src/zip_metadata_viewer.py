@@ -11,9 +11,13 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import time
 
+from zip_verifier import get_default_verifier
+from zip_central_directory import read_central_directory
+
 class ZipMetadataViewer:
     def __init__(self):
         self.latest_zips = []
+        self.zip_verifier = get_default_verifier()
     
     def check_zip_integrity(self, zip_path: str) -> Dict:
         """
@@ -46,11 +50,14 @@ class ZipMetadataViewer:
             
             # Test buka ZIP file
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Test integrity dengan testzip()
-                bad_file = zip_ref.testzip()
+                # Test integrity dengan verifier single-pass
+                record = self.zip_verifier.verify(zip_path, zip_ref=zip_ref)
+                bad_file = record['bad_file']
                 
-                if bad_file is not None:
-                    result['corrupted_files'].append(bad_file)
+                if record['error']:
+                    result['error'] = record['error']
+                elif bad_file is not None:
+                    result['corrupted_files'].extend(record['corrupted_files'])
                     result['error'] = f"File rusak ditemukan: {bad_file}"
                 else:
                     result['is_valid'] = True
@@ -118,63 +125,59 @@ class ZipMetadataViewer:
                 result['created_time'] = datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S')
                 result['modified_time'] = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
             
-            # Analisis isi ZIP
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                files_info = []
-                bak_files = []
-                directories = set()
-                file_types = {}
-                total_compressed = 0
-                total_uncompressed = 0
-                
-                for file_info in zip_ref.infolist():
-                    # Informasi file
-                    file_detail = {
-                        'filename': file_info.filename,
-                        'size_bytes': file_info.file_size,
-                        'size_mb': round(file_info.file_size / (1024 * 1024), 2),
-                        'compressed_size': file_info.compress_size,
-                        'compression_ratio': round((1 - file_info.compress_size / file_info.file_size) * 100, 2) if file_info.file_size > 0 else 0,
-                        'date_time': datetime(*file_info.date_time).strftime('%Y-%m-%d %H:%M:%S') if file_info.date_time else 'Unknown',
-                        'is_directory': file_info.filename.endswith('/'),
-                        'file_extension': os.path.splitext(file_info.filename)[1].lower()
-                    }
-                    
-                    files_info.append(file_detail)
-                    
-                    # Akumulasi ukuran
-                    total_compressed += file_info.compress_size
-                    total_uncompressed += file_info.file_size
-                    
-                    # Cek apakah file BAK
-                    if file_info.filename.lower().endswith('.bak'):
-                        bak_files.append(file_detail)
-                    
-                    # Direktori
-                    if file_info.filename.endswith('/'):
-                        directories.add(file_info.filename)
-                    else:
-                        # Tambahkan direktori parent
-                        parent_dir = os.path.dirname(file_info.filename)
-                        if parent_dir:
-                            directories.add(parent_dir + '/')
-                    
-                    # Tipe file
-                    ext = file_detail['file_extension']
-                    if ext:
-                        file_types[ext] = file_types.get(ext, 0) + 1
-                
-                # Update hasil
-                result['success'] = True
-                result['total_files'] = len(files_info)
-                result['total_compressed_size'] = total_compressed
-                result['total_uncompressed_size'] = total_uncompressed
-                result['compression_ratio'] = round((1 - total_compressed / total_uncompressed) * 100, 2) if total_uncompressed > 0 else 0
-                result['files'] = files_info
-                result['bak_files'] = bak_files
-                result['directories'] = sorted(list(directories))
-                result['file_types'] = file_types
-                
+            # Analisis isi ZIP dari central directory (data member tidak dibaca)
+            central_directory = read_central_directory(zip_path)
+            files_info = []
+            bak_files = []
+            directories = set()
+            file_types = {}
+
+            for entry in central_directory.entries:
+                modified = entry.modified
+                # Informasi file
+                file_detail = {
+                    'filename': entry.filename,
+                    'size_bytes': entry.file_size,
+                    'size_mb': round(entry.file_size / (1024 * 1024), 2),
+                    'compressed_size': entry.compress_size,
+                    'compression_ratio': round((1 - entry.compress_size / entry.file_size) * 100, 2) if entry.file_size > 0 else 0,
+                    'date_time': modified.strftime('%Y-%m-%d %H:%M:%S') if modified else 'Unknown',
+                    'crc': entry.crc,
+                    'is_directory': entry.is_dir(),
+                    'file_extension': entry.extension
+                }
+
+                files_info.append(file_detail)
+
+                # Cek apakah file BAK
+                if entry.filename.lower().endswith('.bak'):
+                    bak_files.append(file_detail)
+
+                # Direktori
+                if entry.is_dir():
+                    directories.add(entry.filename)
+                else:
+                    # Tambahkan direktori parent
+                    parent_dir = os.path.dirname(entry.filename)
+                    if parent_dir:
+                        directories.add(parent_dir + '/')
+
+                # Tipe file
+                ext = file_detail['file_extension']
+                if ext:
+                    file_types[ext] = file_types.get(ext, 0) + 1
+
+            # Update hasil
+            result['success'] = True
+            result['total_files'] = len(files_info)
+            result['total_compressed_size'] = central_directory.total_compressed
+            result['total_uncompressed_size'] = central_directory.total_uncompressed
+            result['compression_ratio'] = central_directory.compression_ratio
+            result['files'] = files_info
+            result['bak_files'] = bak_files
+            result['directories'] = sorted(list(directories))
+            result['file_types'] = file_types
+
         except Exception as e:
             result['error'] = str(e)
         
@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+"""
+ZIP SQLite Module
+Membaca database SQLite langsung dari member ZIP tanpa ekstraksi ke disk.
+Member STORED dibaca langsung dari arsip, member DEFLATED lewat cache
+dekompresi yang bisa di-seek (checkpoint state zlib).
+"""
+
+import os
+import re
+import math
+import random
+import struct
+import sqlite3
+import zlib
+import zipfile
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+BLOCK_SIZE = 64 * 1024                    # Unit cache dekompresi
+CHECKPOINT_INTERVAL = 4 * 1024 * 1024     # Jarak minimum antar checkpoint state zlib
+MAX_CHECKPOINTS = 256                     # ~40 KB per state zlib: maks ~10 MB per member
+BLOCK_CACHE_SIZE = 256                    # 256 x 64 KB = 16 MB
+COMPRESSED_READ_SIZE = 64 * 1024
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024  # Member <= limit di-deserialize ke memory (lebih besar: page reader)
+
+_TEXT_ENCODINGS = {1: 'utf-8', 2: 'utf-16-le', 3: 'utf-16-be'}
+
+
+class UnsupportedQueryError(sqlite3.OperationalError):
+    """Query atau tabel (mis. WITHOUT ROWID) di luar kemampuan page reader"""
+
+
+def checkpoint_interval(member_size: int) -> int:
+    """Jarak checkpoint untuk member: CHECKPOINT_INTERVAL, digandakan sampai jumlahnya <= MAX_CHECKPOINTS"""
+    interval = CHECKPOINT_INTERVAL
+    while member_size // interval > MAX_CHECKPOINTS:
+        interval *= 2
+    return interval
+
+
+class ZipMemberReader:
+    """
+    Random-access reader untuk satu member ZIP.
+    STORED: pread langsung dari file arsip.
+    DEFLATED: blok 64 KB hasil dekompresi di-cache (LRU) dan state zlib
+    disimpan secara berkala sehingga seek mundur tidak perlu dekompresi
+    ulang dari awal. Jarak checkpoint minimal CHECKPOINT_INTERVAL dan
+    dilebarkan untuk member besar, sehingga jumlahnya tidak lebih dari
+    MAX_CHECKPOINTS.
+    """
+
+    def __init__(self, zip_path: str, info: zipfile.ZipInfo,
+                 block_cache_size: int = BLOCK_CACHE_SIZE):
+        if info.flag_bits & 0x1:
+            raise NotImplementedError(f"Encrypted member not supported: {info.filename}")
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise NotImplementedError(f"Compression type {info.compress_type} not supported: {info.filename}")
+
+        self.name = info.filename
+        self.size = info.file_size
+        self.compress_size = info.compress_size
+        self.compress_type = info.compress_type
+        self._lock = threading.RLock()
+        self._fp = open(zip_path, 'rb')
+        self._data_offset = self._find_data_offset(info.header_offset)
+
+        # State dekompresi (hanya untuk DEFLATED)
+        self._block_cache = OrderedDict()
+        self._block_cache_size = block_cache_size
+        self._checkpoints = []
+        self._checkpoint_positions = []   # upos setiap checkpoint (urut naik, untuk bisect)
+        self.checkpoint_interval = checkpoint_interval(self.size)
+        if self.compress_type == zipfile.ZIP_DEFLATED:
+            self._checkpoints.append((0, 0, zlib.decompressobj(-zlib.MAX_WBITS)))
+            self._checkpoint_positions.append(0)
+            self._restore(self._checkpoints[0])
+
+    def _find_data_offset(self, header_offset: int) -> int:
+        """Lokasi awal data member (setelah local file header)"""
+        self._fp.seek(header_offset)
+        header = self._fp.read(zipfile.sizeFileHeader)
+        if len(header) != zipfile.sizeFileHeader or header[:4] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Bad local file header for {self.name}")
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        return header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+    def _read_raw(self, offset: int, size: int) -> bytes:
+        self._fp.seek(self._data_offset + offset)
+        return self._fp.read(size)
+
+    def _restore(self, checkpoint: Tuple[int, int, Any]):
+        upos, cpos, decompressor = checkpoint
+        self._decompressor = decompressor.copy()
+        self._upos = upos
+        self._cpos = cpos
+        self._pending = b''
+
+    def _decompress_block(self) -> bytes:
+        """Dekompresi satu blok berikutnya dari posisi cursor"""
+        parts = []
+        produced = 0
+        want = min(BLOCK_SIZE, self.size - self._upos)
+        while produced < want:
+            if not self._pending:
+                remaining = self.compress_size - self._cpos
+                if remaining <= 0:
+                    raise zipfile.BadZipFile(f"Truncated compressed data in {self.name}")
+                self._pending = self._read_raw(self._cpos, min(COMPRESSED_READ_SIZE, remaining))
+            out = self._decompressor.decompress(self._pending, want - produced)
+            tail = self._decompressor.unconsumed_tail
+            self._cpos += len(self._pending) - len(tail)
+            self._pending = tail
+            if out:
+                parts.append(out)
+                produced += len(out)
+            elif self._decompressor.eof:
+                raise zipfile.BadZipFile(f"Unexpected end of compressed data in {self.name}")
+        self._upos += produced
+
+        if self._upos % self.checkpoint_interval == 0 and self._upos > self._checkpoint_positions[-1]:
+            # Input setelah cpos dibaca ulang dari file saat checkpoint di-restore
+            self._checkpoints.append((self._upos, self._cpos, self._decompressor.copy()))
+            self._checkpoint_positions.append(self._upos)
+        return b''.join(parts)
+
+    def _get_block(self, index: int) -> bytes:
+        block = self._block_cache.get(index)
+        if block is not None:
+            self._block_cache.move_to_end(index)
+            return block
+
+        target = index * BLOCK_SIZE
+        checkpoint = self._checkpoints[bisect_right(self._checkpoint_positions, target) - 1]
+        # Lanjutkan dari cursor jika lebih dekat dari checkpoint, selain itu restore
+        if not (checkpoint[0] <= self._upos <= target):
+            self._restore(checkpoint)
+
+        while True:
+            current = self._upos // BLOCK_SIZE
+            data = self._decompress_block()
+            self._block_cache[current] = data
+            self._block_cache.move_to_end(current)
+            while len(self._block_cache) > self._block_cache_size:
+                self._block_cache.popitem(last=False)
+            if current == index:
+                return data
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Baca `size` byte mulai dari `offset` (data ter-dekompresi)"""
+        if offset >= self.size or size <= 0:
+            return b''
+        size = min(size, self.size - offset)
+
+        with self._lock:
+            if self.compress_type == zipfile.ZIP_STORED:
+                return self._read_raw(offset, size)
+
+            parts = []
+            end = offset + size
+            for index in range(offset // BLOCK_SIZE, (end - 1) // BLOCK_SIZE + 1):
+                block = self._get_block(index)
+                block_start = index * BLOCK_SIZE
+                parts.append(block[max(offset - block_start, 0):end - block_start])
+            return b''.join(parts)
+
+    def close(self):
+        with self._lock:
+            if self._fp:
+                self._fp.close()
+                self._fp = None
+            self._block_cache.clear()
+            self._checkpoints = []
+            self._checkpoint_positions = []
+
+
+class FileReader:
+    """Random-access reader file database biasa dengan antarmuka ZipMemberReader"""
+
+    def __init__(self, path: str):
+        self.name = path
+        self._lock = threading.Lock()
+        self._fp = open(path, 'rb')
+        self.size = os.fstat(self._fp.fileno()).st_size
+
+    def read(self, offset: int, size: int) -> bytes:
+        if offset >= self.size or size <= 0:
+            return b''
+        with self._lock:
+            self._fp.seek(offset)
+            return self._fp.read(size)
+
+    def close(self):
+        with self._lock:
+            if self._fp:
+                self._fp.close()
+                self._fp = None
+
+
+class RowEstimate(NamedTuple):
+    """Perkiraan jumlah baris tabel dari sampling leaf page b-tree"""
+    count: int
+    error: int          # setengah lebar interval kepercayaan 95% (0 = hasil exact)
+    leaf_pages: int
+    sampled_pages: int
+
+    @property
+    def exact(self) -> bool:
+        return self.error == 0 and self.sampled_pages == self.leaf_pages
+
+
+def _varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    """Decode varint SQLite (big-endian, maks 9 byte)"""
+    value = 0
+    for i in range(8):
+        byte = buf[pos + i]
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos + i + 1
+    return (value << 8) | buf[pos + 8], pos + 9
+
+
+def _serial_length(serial_type: int) -> int:
+    if serial_type >= 12:
+        return (serial_type - 12) // 2 if serial_type % 2 == 0 else (serial_type - 13) // 2
+    return (0, 1, 2, 3, 4, 6, 8, 8, 0, 0, 0, 0)[serial_type]
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Urutan perbandingan SQLite: NULL < angka < TEXT < BLOB"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, bytes(value))
+
+
+def _split_identifier(text: str) -> Tuple[str, str]:
+    """Pisahkan identifier (boleh di-quote) dari sisa teks"""
+    text = text.strip()
+    closing = {'"': '"', '[': ']', '`': '`', "'": "'"}.get(text[:1])
+    if closing:
+        end = text.find(closing, 1)
+        if end > 0:
+            return text[1:end], text[end + 1:]
+    parts = text.split(None, 1)
+    return parts[0], parts[1] if len(parts) > 1 else ''
+
+
+def _strip_identifier(name: str) -> str:
+    return _split_identifier(name)[0]
+
+
+def _parse_columns(sql: str) -> List[Tuple[str, str, bool]]:
+    """Ambil (nama, tipe, primary_key) kolom dari statement CREATE TABLE"""
+    start, end = sql.find('('), sql.rfind(')')
+    if start < 0 or end <= start:
+        return []
+
+    parts, depth, quote, current = [], 0, None, []
+    for ch in sql[start + 1:end]:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'`':
+            quote = ch
+        elif ch == '[':
+            quote = ']'
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append(''.join(current))
+
+    columns = []
+    for part in parts:
+        part = part.strip()
+        if not part or part.split(None, 1)[0].upper() in ('CONSTRAINT', 'PRIMARY', 'UNIQUE', 'CHECK', 'FOREIGN'):
+            continue
+        name, rest = _split_identifier(part)
+        type_words = []
+        for word in rest.split():
+            if word.upper() in ('PRIMARY', 'NOT', 'NULL', 'UNIQUE', 'CHECK', 'DEFAULT',
+                                'COLLATE', 'REFERENCES', 'GENERATED', 'AS', 'CONSTRAINT'):
+                break
+            type_words.append(word)
+        columns.append((name, ' '.join(type_words), 'PRIMARY KEY' in ' '.join(rest.upper().split())))
+    return columns
+
+
+class SQLitePageReader:
+    """
+    Pembaca file SQLite level page (read-only, pure Python).
+    Cukup untuk daftar tabel, kolom, COUNT(*) dan MAX()/filter per kolom
+    tanpa memuat database ke sqlite3.
+    """
+
+    def __init__(self, reader: ZipMemberReader):
+        self.reader = reader
+        header = reader.read(0, 100)
+        if not header.startswith(SQLITE_MAGIC):
+            raise sqlite3.DatabaseError("file is not a database")
+
+        page_size = struct.unpack('>H', header[16:18])[0]
+        self.page_size = 65536 if page_size == 1 else page_size
+        self.usable_size = self.page_size - header[20]
+        self.encoding = _TEXT_ENCODINGS.get(struct.unpack('>I', header[56:60])[0], 'utf-8')
+        # Page count di header hanya valid jika version-valid-for == change counter
+        if header[92:96] == header[24:28]:
+            self.page_count = struct.unpack('>I', header[28:32])[0]
+        else:
+            self.page_count = reader.size // self.page_size
+        self._schema = None
+
+    def _page(self, page_number: int) -> bytes:
+        return self.reader.read((page_number - 1) * self.page_size, self.page_size)
+
+    def _local_payload_size(self, payload_size: int, is_table: bool) -> int:
+        usable = self.usable_size
+        max_local = usable - 35 if is_table else ((usable - 12) * 64 // 255) - 23
+        if payload_size <= max_local:
+            return payload_size
+        min_local = ((usable - 12) * 32 // 255) - 23
+        local = min_local + ((payload_size - min_local) % (usable - 4))
+        return local if local <= max_local else min_local
+
+    def _payload(self, page: bytes, pos: int, payload_size: int) -> bytes:
+        local = self._local_payload_size(payload_size, is_table=True)
+        data = page[pos:pos + local]
+        if local >= payload_size:
+            return data
+
+        parts = [data]
+        remaining = payload_size - local
+        overflow = struct.unpack('>I', page[pos + local:pos + local + 4])[0]
+        while remaining > 0 and overflow:
+            overflow_page = self._page(overflow)
+            chunk = overflow_page[4:4 + min(remaining, self.usable_size - 4)]
+            parts.append(chunk)
+            remaining -= len(chunk)
+            overflow = struct.unpack('>I', overflow_page[:4])[0]
+        return b''.join(parts)
+
+    def _page_header(self, page_number: int) -> Tuple[bytes, int, int, int]:
+        """(page, offset header, tipe page, jumlah cell)"""
+        page = self._page(page_number)
+        offset = 100 if page_number == 1 else 0
+        return page, offset, page[offset], struct.unpack('>H', page[offset + 3:offset + 5])[0]
+
+    def _children(self, page: bytes, offset: int, cell_count: int) -> List[int]:
+        """Child page interior table b-tree (urut kiri ke kanan, termasuk right-most)"""
+        pointers = offset + 12
+        children = []
+        for i in range(cell_count):
+            cell = struct.unpack('>H', page[pointers + 2 * i:pointers + 2 * i + 2])[0]
+            children.append(struct.unpack('>I', page[cell:cell + 4])[0])
+        children.append(struct.unpack('>I', page[offset + 8:offset + 12])[0])
+        return children
+
+    def _iter_leaf_pages(self, root_page: int, reverse: bool = False) -> Iterator[Tuple[bytes, int, int]]:
+        """Yield (page, header_offset, cell_count) untuk setiap leaf table b-tree (reverse: rowid menurun)"""
+        stack = [root_page]
+        while stack:
+            page_number = stack.pop()
+            page, offset, page_type, cell_count = self._page_header(page_number)
+            if page_type == 0x0D:
+                yield page, offset, cell_count
+            elif page_type == 0x05:
+                children = self._children(page, offset, cell_count)
+                stack.extend(children if reverse else reversed(children))
+            else:
+                raise sqlite3.DatabaseError(f"Unexpected b-tree page type {page_type} on page {page_number}")
+
+    def leaf_page_numbers(self, root_page: int) -> List[int]:
+        """
+        Nomor semua leaf page tabel. Hanya interior page yang dibaca: kedalaman
+        b-tree diambil dari jalur paling kiri (semua leaf berada di level yang sama).
+        """
+        depth = 0
+        page_number = root_page
+        while True:
+            page, offset, page_type, cell_count = self._page_header(page_number)
+            if page_type == 0x0D:
+                break
+            if page_type != 0x05:
+                raise sqlite3.DatabaseError(f"Unexpected b-tree page type {page_type} on page {page_number}")
+            depth += 1
+            page_number = self._children(page, offset, cell_count)[0]
+
+        level = [root_page]
+        for _ in range(depth):
+            next_level = []
+            for page_number in level:
+                page, offset, page_type, cell_count = self._page_header(page_number)
+                if page_type != 0x05:
+                    raise sqlite3.DatabaseError(f"Unbalanced b-tree at page {page_number}")
+                next_level.extend(self._children(page, offset, cell_count))
+            level = next_level
+        return level
+
+    def estimate_rows(self, table: str, samples: int = 64, rng: Optional[random.Random] = None) -> RowEstimate:
+        """
+        Perkiraan COUNT(*) dari sampel leaf page: jumlah leaf page diketahui pasti
+        dari interior page, jumlah cell per leaf diambil dari sampel acak.
+        Tabel dengan leaf page <= samples dihitung exact.
+        """
+        entry = self.get_table(table)
+        leaves = self.leaf_page_numbers(entry['root_page'])
+        total = len(leaves)
+        if total <= samples:
+            count = sum(self._page_header(page_number)[3] for page_number in leaves)
+            return RowEstimate(count, 0, total, total)
+
+        rng = rng or random.Random()
+        # Urut nomor page supaya pembacaan (terutama member DEFLATED) maju berurutan
+        chosen = sorted(rng.sample(leaves, samples))
+        counts = [self._page_header(page_number)[3] for page_number in chosen]
+        mean = sum(counts) / samples
+        variance = sum((c - mean) ** 2 for c in counts) / (samples - 1)
+        # Standard error total dengan koreksi populasi terbatas
+        standard_error = total * math.sqrt(variance / samples * (total - samples) / (total - 1))
+        return RowEstimate(round(total * mean), math.ceil(1.96 * standard_error), total, samples)
+
+    def _iter_records(self, root_page: int, reverse: bool = False) -> Iterator[Tuple[int, bytes]]:
+        """Yield (rowid, payload) untuk setiap baris tabel (reverse: mulai dari rowid terbesar)"""
+        for page, offset, cell_count in self._iter_leaf_pages(root_page, reverse):
+            pointers = offset + 8
+            for i in (range(cell_count - 1, -1, -1) if reverse else range(cell_count)):
+                pos = struct.unpack('>H', page[pointers + 2 * i:pointers + 2 * i + 2])[0]
+                payload_size, pos = _varint(page, pos)
+                rowid, pos = _varint(page, pos)
+                if rowid >= 1 << 63:
+                    rowid -= 1 << 64
+                yield rowid, self._payload(page, pos, payload_size)
+
+    def _decode_record(self, payload: bytes, wanted: Optional[set] = None) -> List[Any]:
+        header_size, pos = _varint(payload, 0)
+        serial_types = []
+        while pos < header_size:
+            serial_type, pos = _varint(payload, pos)
+            serial_types.append(serial_type)
+
+        values = []
+        offset = header_size
+        for index, serial_type in enumerate(serial_types):
+            length = _serial_length(serial_type)
+            if wanted is None or index in wanted:
+                values.append(self._decode_value(serial_type, payload[offset:offset + length]))
+            else:
+                values.append(None)
+            offset += length
+        return values
+
+    def _decode_value(self, serial_type: int, data: bytes) -> Any:
+        if serial_type == 0:
+            return None
+        if 1 <= serial_type <= 6:
+            return int.from_bytes(data, 'big', signed=True)
+        if serial_type == 7:
+            return struct.unpack('>d', data)[0]
+        if serial_type in (8, 9):
+            return serial_type - 8
+        if serial_type >= 13 and serial_type % 2 == 1:
+            return data.decode(self.encoding, errors='replace')
+        return bytes(data)
+
+    @property
+    def schema(self) -> Dict[str, Dict]:
+        """Isi sqlite_master untuk tabel, key = nama tabel lowercase"""
+        if self._schema is None:
+            schema = OrderedDict()
+            for _, payload in self._iter_records(1):
+                entry_type, name, _, root_page, sql = (self._decode_record(payload) + [None] * 5)[:5]
+                if entry_type != 'table' or not root_page:
+                    continue
+                sql = sql or ''
+                columns = _parse_columns(sql)
+                rowid_alias = None
+                for index, (_, col_type, primary_key) in enumerate(columns):
+                    if primary_key and col_type.upper() == 'INTEGER':
+                        rowid_alias = index
+                schema[name.lower()] = {
+                    'name': name,
+                    'root_page': root_page,
+                    'sql': sql,
+                    'columns': columns,
+                    'rowid_alias': rowid_alias,
+                    'without_rowid': ' '.join(sql.upper().split()).endswith('WITHOUT ROWID')
+                }
+            self._schema = schema
+        return self._schema
+
+    def table_names(self) -> List[str]:
+        return [table['name'] for table in self.schema.values()]
+
+    def get_table(self, table: str) -> Dict:
+        # Nama mentah (mis. dari TableStatistics, boleh berisi spasi) atau identifier SQL
+        entry = self.schema.get(table.lower()) or self.schema.get(_strip_identifier(table).lower())
+        if entry is None:
+            raise sqlite3.OperationalError(f"no such table: {table}")
+        if entry['without_rowid']:
+            raise UnsupportedQueryError(f"WITHOUT ROWID table not supported by page reader: {table}")
+        return entry
+
+    def _column_index(self, entry: Dict, column: str) -> int:
+        for wanted in (column.lower(), _strip_identifier(column).lower()):
+            for index, (name, _, _) in enumerate(entry['columns']):
+                if name.lower() == wanted:
+                    return index
+        raise sqlite3.OperationalError(f"no such column: {column}")
+
+    def count_rows(self, table: str) -> int:
+        """COUNT(*) cukup dari jumlah cell di leaf page, tanpa decode record"""
+        entry = self.get_table(table)
+        return sum(cell_count for _, _, cell_count in self._iter_leaf_pages(entry['root_page']))
+
+    def iter_column(self, table: str, column: str, reverse: bool = False) -> Iterator[Any]:
+        entry = self.get_table(table)
+        index = self._column_index(entry, column)
+        for rowid, payload in self._iter_records(entry['root_page'], reverse):
+            if index == entry['rowid_alias']:
+                yield rowid
+                continue
+            values = self._decode_record(payload, {index})
+            yield values[index] if index < len(values) else None
+
+    def max_value(self, table: str, column: str) -> Any:
+        best = None
+        for value in self.iter_column(table, column):
+            if value is not None and (best is None or _sort_key(value) > _sort_key(best)):
+                best = value
+        return best
+
+    def count_greater_equal(self, table: str, column: str, threshold: Any) -> int:
+        threshold_key = _sort_key(threshold)
+        return sum(1 for value in self.iter_column(table, column)
+                   if value is not None and _sort_key(value) >= threshold_key)
+
+    def aggregate(self, table: str, columns: List[str],
+                  threshold: Any = None) -> Tuple[int, List[Any], List[int]]:
+        """
+        COUNT(*), MAX() dan COUNT(kolom >= threshold) beberapa kolom dalam satu scan tabel
+
+        Returns:
+            (jumlah baris, nilai MAX per kolom, jumlah >= threshold per kolom)
+        """
+        entry = self.get_table(table)
+        if not columns:
+            return self.count_rows(table), [], []
+
+        indexes = [self._column_index(entry, column) for column in columns]
+        wanted = set(indexes)
+        threshold_key = _sort_key(threshold) if threshold is not None else None
+        best_keys = [None] * len(indexes)
+        best = [None] * len(indexes)
+        at_least = [0] * len(indexes)
+        count = 0
+        for rowid, payload in self._iter_records(entry['root_page']):
+            count += 1
+            values = self._decode_record(payload, wanted)
+            for position, index in enumerate(indexes):
+                if index == entry['rowid_alias']:
+                    value = rowid
+                else:
+                    value = values[index] if index < len(values) else None
+                if value is None:
+                    continue
+                key = _sort_key(value)
+                if best_keys[position] is None or key > best_keys[position]:
+                    best_keys[position], best[position] = key, value
+                if threshold_key is not None and key >= threshold_key:
+                    at_least[position] += 1
+        return count, best, at_least
+
+    def sample_rows(self, table: str, limit: int = 5) -> List[Tuple]:
+        """Beberapa baris pertama (urutan rowid), setara SELECT * LIMIT n"""
+        entry = self.get_table(table)
+        rows = []
+        if limit <= 0:
+            return rows
+        for rowid, payload in self._iter_records(entry['root_page']):
+            values = self._decode_record(payload)
+            values += [None] * (len(entry['columns']) - len(values))
+            if entry['rowid_alias'] is not None:
+                values[entry['rowid_alias']] = rowid
+            rows.append(tuple(values[:len(entry['columns'])]))
+            if len(rows) >= limit:
+                break
+        return rows
+
+
+_IDENT = r'("[^"]+"|\[[^\]]+\]|`[^`]+`|\w+)'
+_QUERY_PATTERNS = [
+    ('list_tables', re.compile(r"SELECT name FROM sqlite_master WHERE type\s*=\s*'table'( ORDER BY name)?", re.I)),
+    ('find_table', re.compile(r"SELECT name FROM sqlite_master WHERE type\s*=\s*'table' AND name\s*=\s*'([^']+)'", re.I)),
+    ('count', re.compile(rf"SELECT COUNT\(\*\) FROM {_IDENT}", re.I)),
+    ('count_ge', re.compile(rf"SELECT COUNT\(\*\) FROM {_IDENT} WHERE {_IDENT}\s*>=\s*\?", re.I)),
+    ('max', re.compile(rf"SELECT MAX\({_IDENT}\) FROM {_IDENT}(?: WHERE {_IDENT} IS NOT NULL)?", re.I)),
+    ('table_info', re.compile(rf"PRAGMA table_info\(\s*{_IDENT}\s*\)", re.I)),
+    ('page_size', re.compile(r"PRAGMA page_size", re.I)),
+    ('page_count', re.compile(r"PRAGMA page_count", re.I)),
+]
+
+
+class PageReaderCursor:
+    """
+    Cursor minimal di atas SQLitePageReader untuk subset query yang dipakai
+    analyzer (daftar tabel, COUNT, MAX, filter >=, PRAGMA table_info).
+    Query lain memunculkan UnsupportedQueryError (turunan sqlite3.OperationalError).
+    """
+
+    def __init__(self, page_reader: SQLitePageReader):
+        self.page_reader = page_reader
+        self._rows = []
+
+    def execute(self, sql: str, parameters: Tuple = ()):
+        statement = ' '.join(sql.split()).rstrip(';').strip()
+        for kind, pattern in _QUERY_PATTERNS:
+            match = pattern.fullmatch(statement)
+            if match:
+                self._rows = self._run(kind, match.groups(), parameters)
+                return self
+        raise UnsupportedQueryError(f"Query not supported by page reader: {statement}")
+
+    def _run(self, kind: str, groups: Tuple, parameters: Tuple) -> List[Tuple]:
+        reader = self.page_reader
+        if kind == 'list_tables':
+            names = reader.table_names()
+            return [(name,) for name in (sorted(names) if groups[0] else names)]
+        if kind == 'find_table':
+            entry = reader.schema.get(groups[0].lower())
+            return [(entry['name'],)] if entry and entry['name'] == groups[0] else []
+        if kind == 'count':
+            return [(reader.count_rows(groups[0]),)]
+        if kind == 'count_ge':
+            return [(reader.count_greater_equal(groups[0], groups[1], parameters[0]),)]
+        if kind == 'max':
+            return [(reader.max_value(groups[1], groups[0]),)]
+        if kind == 'table_info':
+            entry = reader.schema.get(_strip_identifier(groups[0]).lower())
+            if entry is None:
+                return []
+            return [(index, name, col_type, 0, None, 1 if primary_key else 0)
+                    for index, (name, col_type, primary_key) in enumerate(entry['columns'])]
+        if kind == 'page_size':
+            return [(reader.page_size,)]
+        return [(reader.page_count,)]
+
+    def fetchone(self) -> Optional[Tuple]:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self) -> List[Tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self._rows = []
+
+
+class PageReaderConnection:
+    """Objek mirip sqlite3.Connection untuk SQLitePageReader"""
+
+    def __init__(self, reader: ZipMemberReader):
+        self.reader = reader
+        self.page_reader = SQLitePageReader(reader)
+
+    def cursor(self) -> PageReaderCursor:
+        return PageReaderCursor(self.page_reader)
+
+    def execute(self, sql: str, parameters: Tuple = ()) -> PageReaderCursor:
+        return self.cursor().execute(sql, parameters)
+
+    def close(self):
+        self.reader.close()
+
+
+def read_member_header(zip_ref: zipfile.ZipFile, member: str, size: int = 100) -> bytes:
+    """Baca beberapa byte awal member untuk deteksi format"""
+    with zip_ref.open(member, 'r') as stream:
+        return stream.read(size)
+
+
+def open_member_database(zip_ref: zipfile.ZipFile, member: str,
+                         memory_limit: int = DEFAULT_MEMORY_LIMIT):
+    """
+    Buka database SQLite di dalam ZIP tanpa ekstraksi ke disk
+
+    Member <= memory_limit di-deserialize ke sqlite3 in-memory (SQL penuh):
+    member dibaca langsung ke satu buffer, jadi puncak memori sekitar dua kali
+    ukuran member (buffer + salinan milik SQLite, buffer dilepas setelahnya).
+    Member lebih besar dibaca per page lewat PageReaderConnection.
+
+    Raises:
+        sqlite3.DatabaseError: Jika member bukan database SQLite
+    """
+    info = zip_ref.getinfo(member)
+    if not read_member_header(zip_ref, member, len(SQLITE_MAGIC)).startswith(SQLITE_MAGIC):
+        raise sqlite3.DatabaseError("file is not a database")
+
+    if info.file_size <= memory_limit and hasattr(sqlite3.Connection, 'deserialize'):
+        data = bytearray(info.file_size)
+        with zip_ref.open(info, 'r') as stream, memoryview(data) as view:
+            filled = 0
+            while filled < len(data):
+                count = stream.readinto(view[filled:])
+                if not count:
+                    raise sqlite3.DatabaseError(f"unexpected end of member {member}")
+                filled += count
+            stream.read(1)  # Sampai EOF supaya CRC member dicek
+        # Database mode WAL tidak bisa dibuka dari memory; tandai sebagai rollback journal
+        if data[18] == 2 or data[19] == 2:
+            data[18] = data[19] = 1
+        conn = sqlite3.connect(':memory:')
+        conn.deserialize(data)
+        return conn
+
+    return PageReaderConnection(ZipMemberReader(zip_ref.filename, info))
@@ -6,17 +6,26 @@ Modul untuk validasi file ZIP backup database
 
 import os
 import zipfile
-import tempfile
 import shutil
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
-import sqlite3
 import re
 
+from zip_verifier import get_default_verifier
+from zip_sqlite import open_member_database
+from analysis_cache import AnalysisCache, get_default_cache, member_fingerprint
+from schema_registry import get_default_registry
+from backup_connection import open_backup
+
 class ZipValidator:
-    def __init__(self):
+    # Naikkan jika format hasil analisis berubah (invalidasi analysis cache)
+    CACHE_VERSION = '1'
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
         self.temp_dir = None
         self.validation_results = {}
+        self.zip_verifier = get_default_verifier()
+        self.analysis_cache = cache if cache is not None else get_default_cache()
     
     def validate_zip_file(self, zip_path: str) -> Dict:
         """
@@ -57,10 +66,13 @@ class ZipValidator:
             # Test ZIP file integrity
             try:
                 with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    # Test ZIP integrity
-                    bad_file = zip_ref.testzip()
-                    if bad_file:
-                        result['errors'].append(f"ZIP corrupted: {bad_file}")
+                    # Test ZIP integrity (single-pass, record dipakai ulang)
+                    record = self.zip_verifier.verify(zip_path, zip_ref=zip_ref)
+                    if record['error']:
+                        result['errors'].append(record['error'])
+                        return result
+                    if record['bad_file']:
+                        result['errors'].append(f"ZIP corrupted: {record['bad_file']}")
                         return result
                     
                     result['is_readable'] = True
@@ -136,26 +148,30 @@ class ZipValidator:
         """Analyze .bak files in the ZIP"""
         database_info = {}
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            for bak_file in bak_files:
-                try:
-                    # Extract .bak file
-                    zip_ref.extract(bak_file, temp_dir)
-                    bak_path = os.path.join(temp_dir, bak_file)
-                    
-                    # Analyze database
-                    db_info = self._analyze_single_bak(bak_path)
-                    database_info[bak_file] = db_info
-                    
-                except Exception as e:
-                    database_info[bak_file] = {
-                        'error': f"Error analyzing {bak_file}: {str(e)}"
-                    }
+        for bak_file in bak_files:
+            try:
+                # Analyze database langsung dari member ZIP (tanpa ekstraksi ke disk)
+                db_info = self.analysis_cache.get_or_compute(
+                    'zip_validator_bak', self.CACHE_VERSION, member_fingerprint(zip_ref, bak_file),
+                    lambda: self._analyze_single_bak(
+                        os.path.join(zip_ref.filename, bak_file),
+                        file_size=zip_ref.getinfo(bak_file).file_size,
+                        connect=lambda: open_member_database(zip_ref, bak_file)
+                    ),
+                    # Tipe database tambahan dari config mengubah hasil deteksi
+                    params=get_default_registry().cache_params()
+                )
+                database_info[bak_file] = db_info
+                
+            except Exception as e:
+                database_info[bak_file] = {
+                    'error': f"Error analyzing {bak_file}: {str(e)}"
+                }
         
         return database_info
     
-    def _analyze_single_bak(self, bak_path: str) -> Dict:
-        """Analyze single .bak file"""
+    def _analyze_single_bak(self, bak_path: str, file_size: Optional[int] = None, connect=None) -> Dict:
+        """Analyze single .bak file (connect: factory koneksi untuk database di dalam ZIP)"""
         info = {
             'database_type': 'unknown',
             'tables_count': 0,
@@ -166,10 +182,12 @@ class ZipValidator:
         }
         
         try:
-            info['file_size_mb'] = round(os.path.getsize(bak_path) / (1024 * 1024), 2)
+            if file_size is None:
+                file_size = os.path.getsize(bak_path)
+            info['file_size_mb'] = round(file_size / (1024 * 1024), 2)
             
             # Try to connect as SQLite database
-            conn = sqlite3.connect(bak_path)
+            conn = connect() if connect else open_backup(bak_path)
             cursor = conn.cursor()
             
             # Get table list
@@ -198,17 +216,8 @@ class ZipValidator:
         return info
     
     def _detect_database_type(self, tables: List[str]) -> str:
-        """Detect database type based on table names"""
-        table_names_upper = [t.upper() for t in tables]
-        
-        if 'PR_TASKREG' in table_names_upper:
-            return 'plantware'
-        elif 'TA_MACHINE' in table_names_upper:
-            return 'venus'
-        elif 'GWSCANNER' in table_names_upper:
-            return 'staging'
-        else:
-            return 'unknown'
+        """Detect database type based on table names (schema registry bersama)"""
+        return get_default_registry().detect(tables)
     
     def _analyze_plantware_tables(self, cursor) -> Dict:
         """Analyze Plantware specific tables"""
@@ -316,8 +325,12 @@ class ZipValidator:
     
     def validate_multiple_zips(self, zip_paths: List[str]) -> Dict:
         """Validate multiple ZIP files"""
+        return self.summarize_validations([self.validate_zip_file(zip_path) for zip_path in zip_paths])
+    
+    def summarize_validations(self, validation_details: List[Dict]) -> Dict:
+        """Rangkum hasil validate_zip_file (urutan detail mengikuti input)"""
         results = {
-            'total_files': len(zip_paths),
+            'total_files': len(validation_details),
             'valid_files': 0,
             'invalid_files': 0,
             'files_with_bak': 0,
@@ -327,8 +340,7 @@ class ZipValidator:
             'summary': {}
         }
         
-        for zip_path in zip_paths:
-            validation_result = self.validate_zip_file(zip_path)
+        for validation_result in validation_details:
             results['validation_details'].append(validation_result)
             
             if validation_result['is_valid']:
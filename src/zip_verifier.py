@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+ZIP Verifier Module
+Engine verifikasi ZIP single-pass: setiap member didekompresi sekali secara
+streaming, dan dalam pass yang sama dilakukan cek CRC, hashing dan sniffing
+header. Analyzer BAK/SQLite tetap membaca member sendiri (butuh akses acak),
+hasilnya di-cache per member lewat AnalysisCache.
+"""
+
+import os
+import time
+import zipfile
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+CHUNK_SIZE = 1024 * 1024      # 1 MB per read
+HEADER_BYTES = 1024           # Header yang disimpan per member
+DEFAULT_HASH = 'sha256'
+DEFAULT_CACHE_SIZE = 128
+
+# Signature format file yang umum ada di dalam ZIP backup
+FILE_SIGNATURES = [
+    (b'SQLite format 3\x00', 'sqlite'),
+    (b'TAPE', 'tape'),
+    (b'PK\x03\x04', 'zip'),
+    (b'%PDF', 'pdf'),
+]
+
+
+def sniff_file_format(header: bytes) -> str:
+    """Tebak format file dari header bytes"""
+    for signature, file_format in FILE_SIGNATURES:
+        if header.startswith(signature):
+            return file_format
+    return 'unknown'
+
+
+class ZipVerifier:
+    """
+    Verifikasi integritas ZIP dalam satu kali baca dan hasilkan verification
+    record yang bisa dipakai ulang oleh FolderMonitor, ZipValidator, dsb.
+    Record di-cache per (path, size, mtime) sehingga satu siklus monitoring
+    hanya membaca setiap arsip satu kali.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, header_bytes: int = HEADER_BYTES,
+                 hash_algorithm: str = DEFAULT_HASH, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.chunk_size = chunk_size
+        self.header_bytes = header_bytes
+        self.hash_algorithm = hash_algorithm
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(zip_path: str, stat_result: os.stat_result) -> tuple:
+        return (os.path.abspath(zip_path), stat_result.st_size, stat_result.st_mtime_ns)
+
+    def get_cached(self, zip_path: str) -> Optional[Dict]:
+        """Ambil record dari cache jika arsip belum berubah"""
+        try:
+            key = self._cache_key(zip_path, os.stat(zip_path))
+        except OSError:
+            return None
+        with self._lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+            return record
+
+    def clear_cache(self):
+        """Kosongkan cache record"""
+        with self._lock:
+            self._cache.clear()
+
+    def _remember(self, key: tuple, record: Dict):
+        with self._lock:
+            self._cache[key] = record
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def verify(self, zip_path: str, zip_ref: Optional[zipfile.ZipFile] = None,
+               use_cache: bool = True) -> Dict:
+        """
+        Verifikasi ZIP dengan satu pass dekompresi
+
+        Args:
+            zip_path: Path ke file ZIP
+            zip_ref: ZipFile yang sudah terbuka (opsional, untuk menghindari open ulang)
+            use_cache: Pakai record dari cache jika arsip tidak berubah
+
+        Returns:
+            Dictionary verification record
+        """
+        record = {
+            'file_path': zip_path,
+            'file_size': 0,
+            'mtime_ns': 0,
+            'is_zip': False,
+            'is_valid': False,
+            'bad_file': None,
+            'corrupted_files': [],
+            'total_files': 0,
+            'total_uncompressed': 0,
+            'members': [],
+            'hash_algorithm': self.hash_algorithm,
+            'error': None,
+            'verified_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'elapsed_seconds': 0.0
+        }
+
+        try:
+            stat_result = os.stat(zip_path)
+        except OSError as e:
+            record['error'] = f"File tidak ditemukan: {e}"
+            return record
+
+        key = self._cache_key(zip_path, stat_result)
+        if use_cache:
+            cached = self.get_cached(zip_path)
+            if cached is not None:
+                return cached
+
+        record['file_size'] = stat_result.st_size
+        record['mtime_ns'] = stat_result.st_mtime_ns
+        started = time.perf_counter()
+
+        try:
+            if zip_ref is not None:
+                self._verify_members(zip_ref, record)
+            else:
+                with zipfile.ZipFile(zip_path, 'r') as zf:
+                    self._verify_members(zf, record)
+        except zipfile.BadZipFile as e:
+            record['error'] = f"File ZIP rusak atau tidak valid: {e}"
+        except Exception as e:
+            record['error'] = f"Error verifikasi ZIP: {e}"
+
+        record['elapsed_seconds'] = round(time.perf_counter() - started, 4)
+        if record['error'] is None:
+            self._remember(key, record)
+        return record
+
+    def _verify_members(self, zip_ref: zipfile.ZipFile, record: Dict):
+        """Baca setiap member satu kali dan isi record"""
+        infolist = zip_ref.infolist()
+        record['is_zip'] = True
+        record['total_files'] = len(infolist)
+
+        for info in infolist:
+            member = self._verify_member(zip_ref, info)
+            record['members'].append(member)
+            record['total_uncompressed'] += info.file_size
+            if not member['crc_ok']:
+                record['corrupted_files'].append(info.filename)
+
+        if record['corrupted_files']:
+            record['bad_file'] = record['corrupted_files'][0]
+        record['is_valid'] = record['bad_file'] is None
+
+    def _verify_member(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> Dict:
+        """Stream satu member: CRC, hash dan header dalam satu pass"""
+        member = {
+            'filename': info.filename,
+            'file_size': info.file_size,
+            'compress_size': info.compress_size,
+            'crc': info.CRC,
+            'crc_ok': False,
+            'digest': None,
+            'header': b'',
+            'file_format': 'directory' if info.is_dir() else 'unknown',
+            'error': None
+        }
+
+        if info.is_dir():
+            member['crc_ok'] = True
+            return member
+
+        hasher = hashlib.new(self.hash_algorithm)
+        try:
+            with zip_ref.open(info, 'r') as stream:
+                chunk = stream.read(self.chunk_size)
+                member['header'] = chunk[:self.header_bytes]
+                member['file_format'] = sniff_file_format(member['header'])
+
+                # ZipExtFile menghitung CRC-32 selama read dan memunculkan
+                # BadZipFile di akhir stream jika tidak cocok
+                while chunk:
+                    hasher.update(chunk)
+                    chunk = stream.read(self.chunk_size)
+
+            member['crc_ok'] = True
+            member['digest'] = hasher.hexdigest()
+        except Exception as e:
+            member['error'] = str(e)
+
+        return member
+
+
+_default_verifier = None
+_default_lock = threading.Lock()
+
+
+def get_default_verifier() -> ZipVerifier:
+    """Instance ZipVerifier bersama agar record terbagi antar modul"""
+    global _default_verifier
+    with _default_lock:
+        if _default_verifier is None:
+            _default_verifier = ZipVerifier()
+        return _default_verifier
+
+
+def summarize_members(record: Dict) -> List[Dict]:
+    """Ringkasan member yang bisa di-serialize (tanpa header bytes)"""
+    return [{
+        'filename': m['filename'],
+        'file_size': m['file_size'],
+        'compress_size': m['compress_size'],
+        'crc': m['crc'],
+        'digest': m['digest'],
+        'file_format': m['file_format']
+    } for m in record.get('members', [])]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test untuk AnalysisCache (cache hasil analisis berbasis CRC32 + ukuran + versi)
+"""
+
+import os
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from analysis_cache import AnalysisCache
+from bak_metadata_analyzer import BAKMetadataAnalyzer
+
+
+def test_memory_lru_and_disk_store(tmp_path):
+    cache_path = str(tmp_path / 'analysis_cache.db')
+    cache = AnalysisCache(cache_path, memory_entries=1)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return {'value': value}
+
+    assert cache.get_or_compute('demo', '1', (0x1234, 10), lambda: compute('a')) == {'value': 'a'}
+    assert cache.get_or_compute('demo', '1', (0x1234, 10), lambda: compute('x')) == {'value': 'a'}
+    cache.get_or_compute('demo', '1', (0x5678, 10), lambda: compute('b'))
+    assert len(cache._memory) == 1  # entry pertama tergusur dari memori (LRU)
+
+    # Instance baru (mis. setelah restart) membaca dari store di disk
+    reopened = AnalysisCache(cache_path)
+    assert reopened.get_or_compute('demo', '1', (0x1234, 10), lambda: compute('y')) == {'value': 'a'}
+    # Versi analyzer berbeda = entry berbeda
+    assert reopened.get_or_compute('demo', '2', (0x1234, 10), lambda: compute('c')) == {'value': 'c'}
+    assert calls == ['a', 'b', 'c']
+
+    # Hasil gagal tidak disimpan
+    cache.get_or_compute('demo', '1', (1, 1), lambda: {'analysis_status': 'failed', 'error': 'boom'})
+    assert cache.get(cache.make_key('demo', '1', 1, 1)) is None
+
+
+def test_zip_member_and_extracted_file_share_entry(tmp_path, monkeypatch):
+    bak_bytes = b'TAPE' + b'\x00' * 60 + b'Database: staging_PTRJ_iFES\x00' + b'\x01' * 20000
+    zip_path = str(tmp_path / 'BackupStaging_20251004.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('BackupStaging.bak', bak_bytes)
+    extracted = tmp_path / 'BackupStaging.bak'
+    extracted.write_bytes(bak_bytes)
+
+    analyzer = BAKMetadataAnalyzer(cache=AnalysisCache(str(tmp_path / 'cache.db')))
+    with zipfile.ZipFile(zip_path) as zf:
+        first = analyzer.analyze_bak_file('BackupStaging.bak', zf)
+    assert first['analysis_status'] == 'success'
+
+    def no_reanalysis(*args, **kwargs):
+        raise AssertionError("Analysis must be served from cache")
+
+    monkeypatch.setattr(analyzer, '_analyze_bak_file', no_reanalysis)
+    second = analyzer.analyze_bak_file(str(extracted))
+    assert second['filename'] == str(extracted)
+    assert second['database_info'] == first['database_info']
+    assert second['file_structure'] == first['file_structure']
+
+
+def test_file_crc_persisted_across_instances(tmp_path, monkeypatch):
+    import zlib
+    import analysis_cache
+
+    bak_path = tmp_path / 'BackupStaging.bak'
+    bak_path.write_bytes(b'TAPE' + b'\x02' * 50000)
+    cache_path = str(tmp_path / 'cache.db')
+    expected = (zlib.crc32(bak_path.read_bytes()), 50004)
+    assert AnalysisCache(cache_path).file_fingerprint(str(bak_path)) == expected
+
+    def no_crc(*args):
+        raise AssertionError("CRC must come from the store")
+
+    # Instance baru (proses baru) memakai CRC dari store, tanpa membaca file
+    monkeypatch.setattr(analysis_cache.zlib, 'crc32', no_crc)
+    assert AnalysisCache(cache_path).file_fingerprint(str(bak_path)) == expected
+
+    # File berubah: CRC dihitung ulang
+    monkeypatch.undo()
+    bak_path.write_bytes(b'TAPE' + b'\x03' * 60000)
+    assert AnalysisCache(cache_path).file_fingerprint(str(bak_path)) == (zlib.crc32(bak_path.read_bytes()), 60004)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test untuk koneksi backup read-only (immutable, pragma analitik, pool per file)
+"""
+
+import os
+import sys
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from backup_connection import (BackupConnectionPool, backup_uri, connect_backup,
+                               load_backup_connection_config)
+from database_validator import DatabaseValidator
+
+
+def _make_db(path, rows=100):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, SCAN_DATE TEXT)")
+    conn.executemany("INSERT INTO GWSCANNER (SCAN_DATE) VALUES (?)", [('2025-10-04',)] * rows)
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_read_only_with_pragmas(tmp_path):
+    db_path = _make_db(tmp_path / 'staging bak#1.bak')
+    assert backup_uri(db_path).endswith('?mode=ro&immutable=1')
+
+    conn = connect_backup(db_path, mmap_size=1024 * 1024, cache_size=2048)
+    assert conn.execute("SELECT COUNT(*) FROM GWSCANNER").fetchone()[0] == 100
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1024 * 1024
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM GWSCANNER")
+    conn.close()
+    assert sorted(os.listdir(tmp_path)) == ['staging bak#1.bak']
+
+    with pytest.raises(sqlite3.OperationalError):
+        connect_backup(str(tmp_path / 'missing.bak'))
+
+
+def test_pending_wal_still_read(tmp_path):
+    db_path = str(tmp_path / 'wal.db')
+    writer = sqlite3.connect(db_path)
+    writer.execute("PRAGMA journal_mode = WAL")
+    writer.execute("PRAGMA wal_autocheckpoint = 0")
+    writer.execute("CREATE TABLE T (X)")
+    writer.executemany("INSERT INTO T VALUES (?)", [(i,) for i in range(10)])
+    writer.commit()
+
+    # Isi masih di -wal: immutable akan melewatkannya, jadi dibuka mode=ro saja
+    conn = connect_backup(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM T").fetchone()[0] == 10
+    conn.close()
+    writer.close()
+
+
+def test_pool_reuses_per_file(tmp_path):
+    db_path = _make_db(tmp_path / 'staging.bak')
+    pool = BackupConnectionPool(pool_size=2)
+
+    first = pool.connect(db_path)
+    second = pool.connect(db_path)
+    assert first.connection is not second.connection
+    raw = {id(first.connection), id(second.connection)}
+    first.close()
+    second.close()
+    with pool.connection(db_path) as conn:
+        assert id(conn.connection) in raw
+        assert conn.execute("SELECT COUNT(*) FROM GWSCANNER").fetchone()[0] == 100
+    assert (pool.opened, pool.reused, pool.idle_count()) == (2, 1, 2)
+
+    # File berubah: koneksi idle lama dibuang
+    writer = sqlite3.connect(db_path)
+    writer.executemany("INSERT INTO GWSCANNER (SCAN_DATE) VALUES (?)", [('2025-10-05',)] * 5)
+    writer.commit()
+    writer.close()
+    os.utime(db_path, ns=(os.stat(db_path).st_mtime_ns + 10 ** 9,) * 2)
+    with pool.connection(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM GWSCANNER").fetchone()[0] == 105
+    assert pool.opened == 3 and pool.idle_count() == 1
+
+    # File sementara yang sudah dihapus tidak disimpan di pool
+    conn = pool.connect(db_path)
+    pool.close_all()
+    os.unlink(db_path)
+    conn.close()
+    assert pool.idle_count() == 0
+
+
+def test_validator_uses_read_only_connection(tmp_path):
+    db_path = _make_db(tmp_path / 'staging.bak')
+    analysis = DatabaseValidator()._analyze_database(db_path)
+    assert analysis['errors'] == [] and analysis['database_type'] == 'staging'
+    assert analysis['key_tables_info']['GWSCANNER']['total_records'] == 100
+    assert sorted(os.listdir(tmp_path)) == ['staging.bak']
+
+
+def test_backup_connection_config(tmp_path):
+    config = tmp_path / 'config.ini'
+    config.write_text("[BACKUP_CONNECTIONS]\nmmap_size_mb = 0\ncache_size_mb = 16  # KiB x 1024\n"
+                      "temp_store = file\nimmutable = false\npool_size = 2\n", encoding='utf-8')
+    options = load_backup_connection_config(str(config))
+    assert options == {'mmap_size': 0, 'cache_size': 16 * 1024, 'temp_store': 'file',
+                       'immutable': False, 'pool_size': 2}
+    assert load_backup_connection_config(str(tmp_path / 'missing.ini')) == {}
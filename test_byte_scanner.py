@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test untuk ByteScanner (scan header/signature tanpa loop per byte)
+"""
+
+import io
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from byte_scanner import ByteScanner, count_aligned_signature, extract_printable_strings
+from bak_metadata_analyzer import BAKMetadataAnalyzer
+
+
+def _naive_strings(data, min_length=4):
+    strings, current = [], ""
+    for byte in data:
+        if 32 <= byte <= 126:
+            current += chr(byte)
+        else:
+            if len(current) >= min_length:
+                strings.append(current)
+            current = ""
+    if len(current) >= min_length:
+        strings.append(current)
+    return strings
+
+
+def _sample_backup(blocks=64, block_size=8192):
+    rng = random.Random(7)
+    data = bytearray(rng.getrandbits(8) for _ in range(blocks * block_size))
+    for block in range(0, blocks, 3):
+        data[block * block_size:block * block_size + 4] = b'\x00\x01\x00\x00'
+    data[100:130] = b'Database: staging_PTRJ_iFES\x00\x00\x00'
+    return bytes(data)
+
+
+def test_extract_strings_matches_byte_loop():
+    data = _sample_backup(blocks=4)
+    assert extract_printable_strings(data) == _naive_strings(data)
+    assert BAKMetadataAnalyzer()._extract_strings(data, 6) == _naive_strings(data, 6)
+
+
+def test_aligned_signature_count():
+    data = _sample_backup()
+    naive = sum(1 for offset in range(0, len(data), 8192) if data[offset:offset + 4] == b'\x00\x01\x00\x00')
+    assert count_aligned_signature(data, b'\x00\x01\x00\x00', 8192) == naive == 22
+
+
+def test_signature_split_across_chunks_is_found():
+    data = bytearray(3 * 8192)
+    data[8190:8194] = b'SSET'
+    data[100:104] = b'TAPE'
+    scan = ByteScanner(chunk_size=8192).scan(io.BytesIO(bytes(data)))
+    assert scan['signatures']['SSET'] == {'count': 1, 'first_offset': 8190}
+    assert scan['signatures']['TAPE']['count'] == 1
+    assert scan['bytes_scanned'] == len(data)
+
+
+def test_full_scan_covers_whole_file():
+    data = _sample_backup(blocks=1024)  # 8 MB, di atas batas default 4 MB
+    limited = BAKMetadataAnalyzer()._analyze_file_structure(io.BytesIO(data), len(data))
+    full = BAKMetadataAnalyzer(full_scan=True)._analyze_file_structure(io.BytesIO(data), len(data))
+
+    assert limited['bytes_scanned'] == 4 * 1024 * 1024 and not limited['full_scan']
+    assert full['bytes_scanned'] == len(data) and full['full_scan']
+    assert full['data_blocks'] == len(range(0, 1024, 3))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test untuk scanner direktori berbasis os.scandir
+"""
+
+import os
+import sys
+import time
+import zipfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from dir_scanner import filter_latest_date, parse_filename_date, scan_directory
+from monitoring_controller import MonitoringController
+
+
+def _make_zip(path, mtime):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('notes.txt', 'backup')
+    os.utime(path, (mtime, mtime))
+
+
+def test_filename_dates():
+    assert parse_filename_date('BackupStaging 2025-10-04.zip') == datetime(2025, 10, 4)
+    assert parse_filename_date('Venus_2025_10_04.zip') == datetime(2025, 10, 4)
+    assert parse_filename_date('Staging_20251004.zip') == datetime(2025, 10, 4)
+    assert parse_filename_date('Plantware_04-10-2025.zip') == datetime(2025, 10, 4)
+    assert parse_filename_date('Plantware_99999999.zip') is None
+    assert parse_filename_date('backup.zip') is None
+
+
+def test_scan_records_sorted_and_grouped(tmp_path):
+    now = time.time()
+    _make_zip(str(tmp_path / 'Staging_20251004.zip'), now - 86400 * 3)
+    _make_zip(str(tmp_path / 'Venus.ZIP'), now - 60)
+    _make_zip(str(tmp_path / 'Staging.zip'), now - 120)
+    (tmp_path / 'notes.txt').write_text('skip')
+    (tmp_path / 'old').mkdir()
+    _make_zip(str(tmp_path / 'old' / 'nested.zip'), now)
+
+    records = scan_directory(str(tmp_path))
+    assert [r.name for r in records] == ['Venus.ZIP', 'Staging.zip', 'Staging_20251004.zip']
+    assert records[2].file_date == '2025-10-04'
+    assert records[0].size == os.path.getsize(records[0].path)
+
+    assert len(scan_directory(str(tmp_path), recursive=True)) == 4
+
+    latest, latest_date = filter_latest_date(records)
+    assert latest_date == records[0].modified_date
+    assert 'Staging_20251004.zip' not in [r.name for r in latest]
+
+
+def test_controller_scan_does_not_stat_per_file(tmp_path, monkeypatch):
+    finished = time.time() - 3600
+    for day in (3, 4):
+        _make_zip(str(tmp_path / f'Staging_2025100{day}.zip'), finished)
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError('unexpected stat call')
+
+    controller = MonitoringController()
+    monkeypatch.setattr(os.path, 'getmtime', no_stat)
+    files = controller._find_recent_zip_files(str(tmp_path), 36500)
+    assert sorted(os.path.basename(f) for f in files) == ['Staging_20251003.zip', 'Staging_20251004.zip']
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test untuk hashing service arsip (digest multi-algoritma, store per modifikasi)
+"""
+
+import os
+import sys
+import zlib
+import hashlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from file_hasher import (FileHasher, compute_digests, load_hashing_config, STATUS_NEW, STATUS_OK,
+                         STATUS_MODIFIED, STATUS_CORRUPTED)
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_digests_match_hashlib(tmp_path, use_mmap):
+    data = os.urandom(300000)
+    path = _write(tmp_path / 'a.zip', data)
+    digests = compute_digests(path, ('sha256', 'blake2b', 'crc32', 'md5'), chunk_size=65536, use_mmap=use_mmap)
+    assert digests == {'sha256': hashlib.sha256(data).hexdigest(), 'blake2b': hashlib.blake2b(data).hexdigest(),
+                       'crc32': f"{zlib.crc32(data):08x}", 'md5': hashlib.md5(data).hexdigest()}
+
+    empty = _write(tmp_path / 'empty.zip', b'')
+    assert compute_digests(empty, ('sha256',), use_mmap=use_mmap)['sha256'] == hashlib.sha256(b'').hexdigest()
+
+
+def test_hashed_once_per_modification(tmp_path):
+    path = _write(tmp_path / 'a.zip', b'backup-1')
+    hasher = FileHasher(store_path=str(tmp_path / 'hashes.db'), algorithms=('crc32',))
+    assert hasher.algorithms == ('sha256', 'crc32')
+
+    first = hasher.hash_file(path)
+    assert first.status == STATUS_NEW and not first.cached
+    assert hasher.hash_file(path).cached
+    assert hasher.files_hashed == 1
+
+    # Store bertahan antar instance
+    hasher.close()
+    reopened = FileHasher(store_path=str(tmp_path / 'hashes.db'), algorithms=('crc32',))
+    assert reopened.hash_file(path).cached
+
+    _write(tmp_path / 'a.zip', b'backup-2')
+    os.utime(path, ns=(first.mtime_ns + 10 ** 9, first.mtime_ns + 10 ** 9))
+    changed = reopened.hash_file(path)
+    assert changed.status == STATUS_MODIFIED
+    assert changed.digests['sha256'] == hashlib.sha256(b'backup-2').hexdigest()
+    reopened.close()
+
+
+def test_verify_detects_silent_change(tmp_path):
+    path = _write(tmp_path / 'a.zip', b'A' * 1000)
+    hasher = FileHasher(store_path=str(tmp_path / 'hashes.db'))
+    original = hasher.hash_file(path)
+    assert hasher.hash_file(path, verify=True).status == STATUS_OK
+
+    # Isi berubah, ukuran dan mtime dikembalikan (bit-rot)
+    _write(tmp_path / 'a.zip', b'A' * 999 + b'B')
+    os.utime(path, ns=(original.mtime_ns, original.mtime_ns))
+    assert hasher.hash_file(path).cached
+    assert hasher.hash_file(path, verify=True).status == STATUS_CORRUPTED
+    # Digest lama tetap tersimpan sebagai acuan
+    assert hasher.hash_file(path).digests == original.digests
+    hasher.close()
+
+
+def test_parallel_order_and_duplicates(tmp_path):
+    paths = [_write(tmp_path / f'{i}.zip', str(i % 3).encode() * 5000) for i in range(7)]
+    hasher = FileHasher(store_path=str(tmp_path / 'hashes.db'), workers=4)
+    results = hasher.hash_files(paths)
+    assert [r.path for r in results] == [os.path.abspath(p) for p in paths]
+    assert [r.digests['sha256'] for r in results] == \
+        [hashlib.sha256(str(i % 3).encode() * 5000).hexdigest() for i in range(7)]
+
+    groups = sorted(sorted(os.path.basename(p) for p in group) for group in hasher.duplicates())
+    assert groups == [['0.zip', '3.zip', '6.zip'], ['1.zip', '4.zip'], ['2.zip', '5.zip']]
+    hasher.close()
+
+
+def test_invalid_algorithm_and_config(tmp_path):
+    with pytest.raises(ValueError):
+        FileHasher(store_path=str(tmp_path / 'hashes.db'), algorithms=('nope',))
+
+    config = tmp_path / 'config.ini'
+    config.write_text("[HASHING]\nstore_file = hashes.db\nalgorithms = blake2b, crc32  # komentar\n"
+                      "workers = 2\nchunk_size_mb = 1\nuse_mmap = true\n", encoding='utf-8')
+    options = load_hashing_config(str(config))
+    assert options['algorithms'] == ['blake2b', 'crc32']
+    assert options['chunk_size'] == 1024 * 1024 and options['workers'] == 2 and options['use_mmap']
+    assert os.path.isabs(options['store_path'])
+    assert load_hashing_config(str(tmp_path / 'missing.ini')) == {}
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test untuk FolderWatcher (deteksi arsip baru + debounce file yang masih ditulis)
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from folder_watcher import FolderWatcher, _load_inotify
+
+
+def _watch(tmp_path, backend):
+    return FolderWatcher(str(tmp_path), debounce_seconds=0.5, poll_interval=0.1, backend=backend)
+
+
+@pytest.mark.parametrize('backend', ['polling', 'inotify'])
+def test_new_archive_reported_once_after_debounce(tmp_path, backend):
+    if backend == 'inotify' and _load_inotify() is None:
+        pytest.skip('inotify not available')
+
+    (tmp_path / 'existing.zip').write_bytes(b'PK old')
+    nested = tmp_path / 'sub'
+    nested.mkdir()
+
+    with _watch(tmp_path, backend) as watcher:
+        assert watcher.backend == backend
+        time.sleep(0.2)
+        (nested / 'BackupStaging 2025-10-05.zip').write_bytes(b'PK new')
+        (tmp_path / 'notes.txt').write_text('ignored')
+
+        changed = watcher.wait_for_changes(timeout=5)
+        assert changed == [str(nested / 'BackupStaging 2025-10-05.zip')]
+        assert watcher.wait_for_changes(timeout=1) == []
+
+
+def test_growing_file_held_until_stable(tmp_path):
+    with _watch(tmp_path, 'polling') as watcher:
+        target = tmp_path / 'BackupVenus.zip'
+        with open(target, 'wb') as f:
+            for _ in range(8):
+                f.write(b'x' * 1024)
+                f.flush()
+                time.sleep(0.2)
+                assert watcher.ready.empty()
+
+        assert watcher.wait_for_changes(timeout=5) == [str(target)]
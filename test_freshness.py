@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test untuk probe tanggal terbaru (discovery kolom, index / scan mundur, memori kolom)
+"""
+
+import os
+import sys
+import sqlite3
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from table_stats import TableStatistics
+from zip_sqlite import PageReaderConnection, ZipMemberReader
+from freshness import (FreshnessProbe, FreshnessStore, discover_date_columns, load_freshness_config,
+                       METHOD_INDEX, METHOD_TAIL_SCAN)
+
+
+def _make_db(path, rows=5000):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, TGLSCAN DATETIME, CREATED_DATE TEXT, "
+                  "NOTE TEXT)")
+    conn.execute("CREATE TABLE TA_LOG (LOG_DATE TEXT, UPDATE_FLAG TEXT, MESSAGE TEXT)")
+    conn.execute("CREATE INDEX idx_created ON GWSCANNER (CREATED_DATE)")
+    # Record kronologis: tanggal terbaru ada di ujung tabel
+    conn.executemany("INSERT INTO GWSCANNER (TGLSCAN, CREATED_DATE, NOTE) VALUES (?, ?, ?)",
+                     [(f"2025-{1 + i * 12 // rows:02d}-{1 + i % 28:02d} 08:00", '2024-12-31', 'x')
+                      for i in range(rows)])
+    conn.executemany("INSERT INTO TA_LOG VALUES (?, ?, ?)",
+                     [(f"2025-10-{1 + i % 4:02d}", 'Y', 'ok') for i in range(rows)])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_discovers_columns_and_picks_method(tmp_path):
+    db_path = _make_db(tmp_path / 'staging.db')
+    stats = TableStatistics(sqlite3.connect(db_path).cursor())
+    assert discover_date_columns(stats, 'GWSCANNER') == ['TGLSCAN', 'CREATED_DATE']
+    assert stats.indexed_columns('GWSCANNER') == ['CREATED_DATE']
+
+    probe = FreshnessProbe(stats, 'staging', tail_rows=500)
+    indexed = probe.latest('GWSCANNER', ['CREATED_DATE'])
+    assert (indexed.column, indexed.latest, indexed.method) == ('CREATED_DATE', '2024-12-31', METHOD_INDEX)
+
+    tail = probe.latest('GWSCANNER')
+    assert (tail.column, tail.method) == ('TGLSCAN', METHOD_TAIL_SCAN)
+    assert tail.latest == sqlite3.connect(db_path).execute("SELECT MAX(TGLSCAN) FROM GWSCANNER").fetchone()[0]
+    # Early exit: berhenti setelah satu blok tanpa tanggal yang lebih baru
+    assert tail.rows_read <= 1000
+
+    # UPDATE_FLAG cocok dengan nama tapi nilainya bukan tanggal
+    log = probe.latest('TA_LOG', ['UPDATE_FLAG'])
+    assert (log.column, log.latest) == ('LOG_DATE', '2025-10-04')
+
+
+def test_remembers_column_per_database_type(tmp_path):
+    db_path = _make_db(tmp_path / 'staging.db')
+    store = FreshnessStore(str(tmp_path / 'freshness.db'))
+    stats = TableStatistics(sqlite3.connect(db_path).cursor())
+    FreshnessProbe(stats, 'staging', store).latest('GWSCANNER', ['CREATED_DATE'])
+    assert store.lookup('staging', 'gwscanner') == 'CREATED_DATE'
+    assert store.lookup('venus', 'GWSCANNER') is None
+
+    # Run berikutnya: kolom yang diingat dicoba lebih dulu dari kandidat
+    store.close()
+    reopened = FreshnessStore(str(tmp_path / 'freshness.db'))
+    result = FreshnessProbe(TableStatistics(sqlite3.connect(db_path).cursor()), 'staging', reopened) \
+        .latest('GWSCANNER', ['TGLSCAN'])
+    assert result.column == 'CREATED_DATE'
+    reopened.close()
+
+
+def test_page_reader_reverse_scan(tmp_path):
+    db_path = _make_db(tmp_path / 'staging.db', rows=20000)
+    zip_path = str(tmp_path / 'Staging.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(db_path, 'staging.bak')
+
+    reference = sqlite3.connect(db_path)
+    with zipfile.ZipFile(zip_path) as zf:
+        conn = PageReaderConnection(ZipMemberReader(zip_path, zf.getinfo('staging.bak')))
+        reader = conn.cursor().page_reader
+        assert list(reader.iter_column('TA_LOG', 'LOG_DATE', reverse=True)) == \
+            [row[0] for row in reference.execute("SELECT LOG_DATE FROM TA_LOG ORDER BY rowid DESC")]
+
+        result = FreshnessProbe(TableStatistics(conn.cursor())).latest('GWSCANNER')
+        assert result.method == METHOD_TAIL_SCAN and result.rows_read < 20000
+        assert result.latest == reference.execute("SELECT MAX(TGLSCAN) FROM GWSCANNER").fetchone()[0]
+        conn.close()
+
+
+def test_freshness_config(tmp_path):
+    config = tmp_path / 'config.ini'
+    config.write_text("[FRESHNESS]\nstore_file = fresh.db\ntail_rows = 250  # blok\n", encoding='utf-8')
+    options = load_freshness_config(str(config))
+    assert options['tail_rows'] == 250 and os.path.isabs(options['store_path'])
+    assert load_freshness_config(str(tmp_path / 'missing.ini')) == {}
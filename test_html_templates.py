@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test untuk template engine HTML email (kompilasi + cache) dan model ringkasan
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from html_templates import Template, TemplateLoader, TemplateError, render_template
+from email_report_model import ArchiveSummary, BackupSummary, DigestSummary, DeepBakRow
+from enhanced_email_notifier import EnhancedEmailNotifier
+
+
+def _analysis(filename, corrupted=False, status='completed'):
+    return {
+        'analysis_status': status,
+        'zip_info': {'filename': filename, 'file_size_mb': 12.5, 'backup_date_from_filename': '2025-10-04'},
+        'validation': {'is_valid_zip': not corrupted, 'corruption_detected': corrupted,
+                       'file_integrity': 'Corrupted' if corrupted else 'Good',
+                       'warnings': ['CRC <mismatch>'] if corrupted else []},
+        'bak_analysis': {'total_bak_files': 1, 'summary': {'databases_found': ['db_ptrj']}},
+        'recommendations': ['a', 'b', 'c', 'd']
+    }
+
+
+def test_expressions_are_escaped_unless_safe():
+    template = Template("<p>{{ value }}</p>{{ raw|safe }}")
+    assert template.render(value='<b>&', raw='<i>x</i>') == "<p>&lt;b&gt;&amp;</p><i>x</i>"
+
+
+def test_control_flow():
+    template = Template("{% for n in items %}{% if n > 2 %}big{% elif n == 2 %}two{% else %}small{% endif %},{% endfor %}"
+                       "{# komentar tidak dirender #}")
+    assert template.render(items=[1, 2, 3]) == "small,two,big,"
+
+
+@pytest.mark.parametrize('source', ["{% if x %}open", "{% endfor %}", "{% if x %}{% endfor %}", "{% while x %}",
+                                    "{{ x + }}"])
+def test_invalid_templates_raise(source):
+    with pytest.raises(TemplateError):
+        Template(source)
+
+
+def test_loader_compiles_once(tmp_path):
+    (tmp_path / 'hello.html').write_text("Halo {{ name }}", encoding='utf-8')
+    loader = TemplateLoader(str(tmp_path))
+
+    assert loader.render('hello.html', name='A') == "Halo A"
+    assert loader.render('hello.html', {'name': 'B'}) == "Halo B"
+    assert loader.compile_count == 1
+
+    with pytest.raises(TemplateError):
+        loader.get_template('missing.html')
+
+
+def test_digest_summary_counts():
+    digest = DigestSummary.from_results([_analysis('a.zip'), _analysis('b.zip', corrupted=True),
+                                         _analysis('c.zip', status='failed')])
+    assert digest.total_files == 3
+    assert digest.successful_analyses == 2
+    assert digest.valid_zips == 2
+    assert digest.corrupted_files == 1
+    assert digest.total_size_mb == pytest.approx(37.5)
+    assert digest.archives[1].section_class == 'file-section status-danger'
+
+
+def test_multi_file_report_renders_digest():
+    html = EnhancedEmailNotifier()._generate_multi_file_html_report([_analysis('a.zip'),
+                                                                     _analysis('b.zip', corrupted=True)])
+    assert '<h3>1. a.zip</h3>' in html and '<h3>2. b.zip</h3>' in html
+    assert 'db_ptrj' in html
+    # Hanya 3 rekomendasi teratas per arsip
+    assert html.count('<li>d</li>') == 0 and html.count('<li>c</li>') == 2
+
+
+def test_comprehensive_report_renders_bak_details():
+    data = _analysis('a.zip', corrupted=True)
+    data['bak_analysis']['bak_analyses'] = [{'filename': 'x.bak', 'file_size_mb': 3,
+                                             'database_info': {'database_name': 'db_ptrj', 'estimated_records': 12345},
+                                             'validation': {'is_valid_bak': True}}]
+    archive = ArchiveSummary.from_analysis(data)
+    assert archive.integrity_class == 'status-danger'
+
+    html = EnhancedEmailNotifier()._generate_comprehensive_html_report(data)
+    assert '<li>CRC &lt;mismatch&gt;</li>' in html
+    assert '12,345' in html
+    assert 'File Content Analysis' not in html
+
+
+def test_deep_analysis_template_renders():
+    bak = DeepBakRow.from_extracted({'filename': 'staging.bak', 'size': 10, 'size_warning': True,
+                                     'extraction_failed': False}, lambda size: f"{size} B")
+    html = render_template('deep_analysis_email.html', generated_at='2025-10-04 08:00:00', total_files=1,
+                           valid_files=1, success_rate=100.0, critical_alerts=1, zip_summary={}, bak_summary={},
+                           size_validation={}, age_analysis={}, checklist_summary={},
+                           size_warnings=[{'filename': 'staging.bak', 'size': '10 B', 'backup_type': 'Staging'}],
+                           outdated_files=[], common_failures=[], zip_rows=[], bak_rows=[bak],
+                           recommendations=['Periksa ukuran'], exclude_plantware=True, monitoring_active=False)
+    assert 'DI BAWAH MINIMUM' in html
+    assert 'staging.bak (10 B) - Staging - Di bawah ukuran minimum' in html
+    assert 'Item Memerlukan Perhatian Segera' in html
+    assert '.container {' in html
+
+
+def _summary_results():
+    bak = {'file_name': 'staging<1>.bak', 'file_size_mb': 4, 'analysis_status': 'success',
+           'analysis': {'backup_type': 'Full', 'database_name': 'db_ptrj', 'backup_date': '2020-01-01',
+                        'database_info': {'record_count': 42}},
+           'validation': {'is_valid_bak': True}}
+    failed = {'file_name': 'venus.bak', 'analysis_status': 'failed', 'error': 'header rusak',
+              'analysis': {'error': 'header rusak'}}
+    zip_results = [{'zip_file': '/backup/Staging_20251004.zip', 'file_size_mb': 12.345,
+                    'integrity_check': {'is_valid': True}, 'bak_analyses': [bak, failed]},
+                   {'zip_file': '/backup/Venus_20251004.zip', 'file_size_mb': 1,
+                    'integrity_check': {'is_valid': False}, 'bak_analyses': []}]
+    return zip_results, [bak, failed]
+
+
+def test_backup_summary_model():
+    zip_results, bak_results = _summary_results()
+    summary = BackupSummary.from_results(zip_results, bak_results, modified_date=lambda path: '2025-10-04')
+    assert (summary.total_zip_files, summary.valid_zips, summary.total_bak_files, summary.valid_baks) == (2, 1, 2, 1)
+    assert summary.total_bak_size_mb == 4
+    assert [row.status for row in summary.bak_rows] == ['Valid', 'Error']
+    assert summary.bak_rows[0].record_count == 42
+    assert len(summary.recommendations) == 3
+
+    # Analisis BAK saja: ringkasan eksekutif dihitung dari hasil BAK
+    bak_only = BackupSummary.from_results(None, bak_results)
+    assert (bak_only.total_zip_files, bak_only.total_bak_files, bak_only.has_zip_results) == (0, 2, False)
+
+
+def test_backup_summary_template_renders():
+    zip_results, bak_results = _summary_results()
+    summary = BackupSummary.from_results(zip_results, bak_results, modified_date=lambda path: '2025-10-04')
+    html = render_template('backup_summary_email.html', summary=summary)
+    assert '<strong>📁 File 1:</strong> Staging_20251004.zip' in html
+    assert '<div class="value">1/2</div>' in html
+    assert '12.35</td>' in html
+    assert 'staging&lt;1&gt;.bak' in html
+    assert 'color: red; font-weight: bold;">Error</td>' in html
+    assert '<li>✅' not in html and 'Terdapat 1 file ZIP' in html
+
+    empty = render_template('backup_summary_email.html', summary=BackupSummary.from_results())
+    assert 'Tidak ada data analisis yang tersedia' in empty
+    assert 'Tidak ada data analisis ZIP' in empty and 'Tidak ada data analisis BAK' in empty
+    assert '<li>✅ Semua file backup dalam kondisi baik' in empty
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Test untuk MailTransport / DigestQueue terhadap server SMTP lokal
+(stand-in minimal berbasis socketserver, tanpa aiosmtpd)
+"""
+
+import os
+import sys
+import socket
+import smtplib
+import threading
+import time
+import socketserver
+from email import message_from_string
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from mail_transport import MailTransport, DigestQueue
+from email_notifier import EmailNotifier
+import mail_transport
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.sockets.append(self.request)
+            server.commands.append([])
+        self.reply('220 localhost stand-in')
+        message = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().rstrip('\r\n')
+            verb = command.split(' ', 1)[0].upper()
+            if message is None:
+                server.commands[-1].append(verb)
+            if message is not None:
+                if command == '.':
+                    server.messages.append('\n'.join(message))
+                    message = None
+                    self.reply('250 queued')
+                else:
+                    message.append(command)
+            elif verb in ('EHLO', 'HELO'):
+                self.reply('250-localhost')
+                if server.offer_starttls:
+                    self.reply('250-STARTTLS')
+                self.reply('250 AUTH PLAIN')
+            elif verb == 'STARTTLS' and server.offer_starttls:
+                self.reply('220 ready to start TLS')
+            elif verb == 'AUTH':
+                server.logins += 1
+                self.reply('235 authenticated')
+            elif verb == 'DATA':
+                message = []
+                self.reply('354 end with .')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, offer_starttls=True):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.offer_starttls = offer_starttls
+        self.commands = []      # verb per koneksi
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.sockets = []
+
+    def drop_connections(self):
+        """Putus semua koneksi dari sisi server (seperti idle timeout server)"""
+        with self.lock:
+            for sock in self.sockets:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self.sockets.clear()
+
+
+def _plain_starttls(self, *args, **kwargs):
+    """STARTTLS tanpa handshake TLS (stand-in tidak punya sertifikat)"""
+    if not self.has_extn('starttls'):
+        raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+    code, reply = self.docmd('STARTTLS')
+    self.helo_resp = self.ehlo_resp = None
+    self.esmtp_features = {}
+    self.does_esmtp = False
+    return code, reply
+
+
+def _start_server(monkeypatch, **options):
+    monkeypatch.setattr(smtplib.SMTP, 'starttls', _plain_starttls)
+    server = _SMTPServer(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    server = _start_server(monkeypatch)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def plain_smtp_server(monkeypatch):
+    server = _start_server(monkeypatch, offer_starttls=False)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _transport(server, **options):
+    return MailTransport('127.0.0.1', server.server_address[1], 'monitor@example.com', 'secret',
+                         timeout=5, **options)
+
+
+def test_connection_reused_for_multiple_messages(smtp_server):
+    transport = _transport(smtp_server)
+    for i in range(5):
+        transport.sendmail('monitor@example.com', 'ops@example.com', f'Subject: alert {i}\r\n\r\nbody')
+    transport.close()
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == 1
+    assert transport.connects == 1
+    verbs = smtp_server.commands[0]
+    assert verbs.index('STARTTLS') < verbs.index('AUTH')
+
+
+def test_login_refused_without_starttls(plain_smtp_server):
+    transport = _transport(plain_smtp_server)
+    with pytest.raises(smtplib.SMTPNotSupportedError):
+        transport.sendmail('monitor@example.com', 'ops@example.com', 'Subject: x\r\n\r\nbody')
+    transport.close()
+
+    # Password tidak pernah dikirim dalam plain text, dan tidak dicoba ulang
+    assert plain_smtp_server.logins == 0
+    assert plain_smtp_server.connections == 1
+    assert plain_smtp_server.messages == []
+
+
+def test_reconnects_after_server_drops_connection(smtp_server):
+    transport = _transport(smtp_server, health_check_after=0)
+    transport.sendmail('monitor@example.com', 'ops@example.com', 'Subject: one\r\n\r\nbody')
+    smtp_server.drop_connections()
+    transport.sendmail('monitor@example.com', 'ops@example.com', 'Subject: two\r\n\r\nbody')
+    transport.close()
+
+    assert len(smtp_server.messages) == 2
+    assert transport.connects == 2
+
+
+def test_backoff_between_failed_connects():
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    delays = []
+    transport = MailTransport('127.0.0.1', port, 'monitor@example.com', 'secret', timeout=1,
+                              max_attempts=4, backoff_base=1.0, sleep=delays.append)
+    with pytest.raises(OSError):
+        transport.sendmail('monitor@example.com', 'ops@example.com', 'Subject: x\r\n\r\nbody')
+
+    assert len(delays) == 3
+    assert delays[0] <= 1.0 < delays[1] <= 2.0 < delays[2] <= 4.0
+
+
+def test_alert_burst_sent_as_one_digest(smtp_server):
+    notifier = EmailNotifier()
+    notifier.sender_email = 'monitor@example.com'
+    notifier.sender_password = 'secret'
+    notifier.receiver_email = 'ops@example.com'
+    notifier.smtp_server = '127.0.0.1'
+    notifier.smtp_port = smtp_server.server_address[1]
+    notifier.digest_window_seconds = 60
+    try:
+        for name in ('ZIP Corrupt', 'BAK Tidak Valid', 'Backup Terlambat'):
+            success, _ = notifier.send_alert(name, f'Detail {name}')
+            assert success
+
+        queue = mail_transport.get_digest_queue(notifier._transport(), 'ops@example.com', 60)
+        assert queue.pending == 3
+        assert smtp_server.messages == []
+        assert queue.flush() == 3
+    finally:
+        mail_transport.close_all_transports()
+
+    assert len(smtp_server.messages) == 1
+    digest = message_from_string(smtp_server.messages[0])
+    assert digest['Subject'].startswith('Digest: 3 notifikasi')
+    html = digest.get_payload()[0].get_payload(decode=True).decode('utf-8')
+    for name in ('ZIP Corrupt', 'BAK Tidak Valid', 'Backup Terlambat'):
+        assert name in html
+
+
+def test_digest_window_flushes_on_timer(smtp_server):
+    transport = _transport(smtp_server)
+    queue = DigestQueue(transport, 'ops@example.com', window_seconds=0.2)
+    queue.submit('first', '<p>1</p>')
+    queue.submit('second', '<p>2</p>')
+    for _ in range(50):
+        if smtp_server.messages:
+            break
+        time.sleep(0.1)
+    transport.close()
+
+    assert len(smtp_server.messages) == 1
+    assert queue.digests_sent == 1
+
+
+def test_pending_digest_sent_when_transport_replaced(smtp_server):
+    old = _transport(smtp_server)
+    queue = mail_transport.get_digest_queue(old, 'ops@example.com', 60)
+    queue.submit('first', '<p>1</p>')
+    queue.submit('second', '<p>2</p>')
+
+    new = _transport(smtp_server)
+    try:
+        replaced = mail_transport.get_digest_queue(new, 'ops@example.com', 60)
+        assert replaced is not queue
+        assert queue.pending == 0
+    finally:
+        mail_transport.close_all_transports()
+        old.close()
+        new.close()
+
+    assert len(smtp_server.messages) == 1
+    assert message_from_string(smtp_server.messages[0])['Subject'].startswith('Digest: 2 notifikasi')
+    assert new.messages_sent == 1
+
+
+def test_failed_timer_flush_requeued_with_backoff(smtp_server):
+    transport = _transport(smtp_server)
+    real_sendmail = transport.sendmail
+    attempts = []
+
+    def flaky_sendmail(*args):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise smtplib.SMTPServerDisconnected('connection lost during flush')
+        real_sendmail(*args)
+
+    transport.sendmail = flaky_sendmail
+    queue = DigestQueue(transport, 'ops@example.com', window_seconds=0.1, retry_base=0.2)
+    queue.submit('first', '<p>1</p>')
+    queue.submit('second', '<p>2</p>')
+    for _ in range(50):
+        if queue.failures or smtp_server.messages:
+            break
+        time.sleep(0.05)
+    # Gagal di timer: pesan kembali ke antrian, tidak dibuang
+    assert queue.failures == 1 and queue.pending == 2
+    queue.submit('third', '<p>3</p>')
+
+    for _ in range(50):
+        if smtp_server.messages:
+            break
+        time.sleep(0.05)
+    transport.close()
+
+    assert len(attempts) == 2 and attempts[1] - attempts[0] >= 0.2
+    assert queue.failures == 0 and queue.pending == 0 and queue.digests_sent == 1
+    assert len(smtp_server.messages) == 1
+    assert message_from_string(smtp_server.messages[0])['Subject'].startswith('Digest: 3 notifikasi - first')
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test untuk monitoring daemon headless (CLI + service asyncio)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import zipfile
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from monitoring_daemon import MonitoringDaemon
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _make_zip(folder, name):
+    path = os.path.join(str(folder), name)
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('notes.txt', 'backup')
+    finished = time.time() - 3600
+    os.utime(path, (finished, finished))
+    return path
+
+
+def test_cli_analyze_without_gui_modules(tmp_path):
+    _make_zip(tmp_path, 'Staging_20251004.zip')
+    script = (
+        "import sys; sys.path.insert(0, 'src'); import scan_index; scan_index.DEFAULT_INDEX_FILE = sys.argv[2];"
+        "sys.argv = ['monitor_daemon.py', 'scan', '--json', '--folder', sys.argv[1]];"
+        "import monitoring_daemon; code = monitoring_daemon.main(sys.argv[1:]);"
+        "heavy = [m for m in ('tkinter', 'PyQt5', 'reportlab') if m in sys.modules];"
+        "print('HEAVY', heavy); sys.exit(code)"
+    )
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', script, str(tmp_path), str(tmp_path / 'index.db')], cwd=ROOT,
+                          capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - started
+
+    assert proc.returncode == 0, proc.stderr
+    output, heavy = proc.stdout.rsplit('HEAVY', 1)
+    assert heavy.strip() == '[]'
+    assert [os.path.basename(p) for p in json.loads(output)['zip_files']] == ['Staging_20251004.zip']
+    assert elapsed < 10
+
+
+class _Notifier:
+    def __init__(self):
+        self.sent = []
+
+    def send_notification(self, subject=None, message=""):
+        self.sent.append(subject)
+        return True, "Email berhasil dikirim"
+
+
+def test_serve_runs_cycles_and_notifies(tmp_path):
+    _make_zip(tmp_path, 'Staging_20251004.zip')
+    notifier = _Notifier()
+    daemon = MonitoringDaemon(str(tmp_path), scan_interval=0.2, days_to_check=36500,
+                              notify='always', watch=False, notifier=notifier,
+                              outbox_path=str(tmp_path / 'outbox.db'))
+
+    asyncio.run(asyncio.wait_for(daemon.serve(max_cycles=2), timeout=60))
+
+    assert daemon.runs == 2
+    assert len(notifier.sent) == 2
+    assert daemon.last_result['zip_files_found'] == [os.path.join(str(tmp_path), 'Staging_20251004.zip')]
+
+
+def test_duplicate_email_reported_as_skipped(tmp_path):
+    class _DuplicateOutbox:
+        def enqueue(self, subject, message, attachment_path=None, dedup_key=None):
+            return None
+
+    daemon = MonitoringDaemon(str(tmp_path), outbox_path=str(tmp_path / 'outbox.db'))
+    daemon._outbox = _DuplicateOutbox()
+    success, message = daemon._queue_email('Backup Monitoring', 'body')
+
+    assert success
+    assert message == "Skipped: already queued in outbox"
+
+
+def test_pdf_built_from_monitoring_records_and_removed(tmp_path, monkeypatch):
+    pytest.importorskip('reportlab')
+    import pdf_report_generator
+    from notifier_bus import NotifierBus, EmailChannel
+
+    zip_path = _make_zip(tmp_path, 'Staging_20251004.zip')
+    result = {'zip_validation_results': {'validation_details': [{
+        'filename': 'Staging_20251004.zip', 'filepath': zip_path, 'is_valid': True, 'is_readable': True,
+        'has_bak_files': True, 'file_size_mb': 0.01, 'bak_files': ['staging.bak'],
+        'database_info': {'staging.bak': {'database_type': 'staging', 'tables_count': 3, 'file_size_mb': 0.01,
+                                          'key_tables': {'GWSCANNER': {'record_count': 1200,
+                                                                       'latest_date': '2025-10-04'}},
+                                          'errors': []}},
+        'errors': [], 'warnings': []}]}}
+
+    def no_reanalysis(*args, **kwargs):
+        raise AssertionError("PDF must be built from the monitoring records")
+
+    monkeypatch.setattr(pdf_report_generator.ZipAnalyzer, 'analyze_record', no_reanalysis)
+    monkeypatch.setattr(pdf_report_generator.ZipAnalyzer, 'analyze_bak_files', no_reanalysis)
+
+    daemon = MonitoringDaemon(str(tmp_path), outbox_path=str(tmp_path / 'outbox.db'))
+    attachments = []
+
+    def send(subject, body, attachment_path):
+        assert os.path.getsize(attachment_path) > 0
+        attachments.append(attachment_path)
+        return True, 'ok'
+
+    bus = NotifierBus([EmailChannel(send, attach_pdf=True)],
+                      renderers={'pdf': daemon._render_pdf}, on_done=daemon._discard_pdf)
+    bus.publish(result, 'Backup Monitoring')
+    bus.pump()
+
+    assert attachments and attachments[0].endswith('.pdf')
+    assert not os.path.exists(attachments[0])
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test untuk parser MTF native (pengganti RESTORE HEADERONLY / FILELISTONLY).
+Nilai yang diharapkan diambil dari fixture output sqlcmd di Folder_Notifikasi.
+
+File .bak sintetis dirakit byte per byte pada offset MTF 1.00a (bukan lewat
+struct milik parser), sehingga kesalahan layout di parser tidak ikut
+tersembunyi di fixture.
+"""
+
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from mtf_parser import (decode_mtf_date, is_mtf_backup, parse_filelistonly_output,
+                        parse_headeronly_output, parse_mtf, read_filelistonly, read_headeronly)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'Folder_Notifikasi')
+BLOCK_SIZE = 512
+
+# MTF_DATE_TIME dirakit manual dari bit 14/4/5/5/6/6 (tahun/bulan/hari/jam/menit/detik):
+# 2025-10-04 09:00:01 -> 00011111101001 1010 00100 01001 000000 000001
+BACKUP_START_DATE = bytes.fromhex('1fa6889001')
+BACKUP_FINISH_DATE = bytes.fromhex('1fa688900a')   # 2025-10-04 09:00:10
+
+# Offset field MTF 1.00a (relatif terhadap awal DBLK)
+DBLK_HEADER_SIZE = 52
+STREAM_HEADER_SIZE = 22
+
+
+def _load_fixture(name, parser):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return parser(f.read())
+
+
+def _xor(data):
+    value = 0
+    for (word,) in struct.iter_unpack('<H', data):
+        value ^= word
+    return value
+
+
+def _align(value, boundary):
+    return -(-value // boundary) * boundary
+
+
+def _stream(stream_id, payload):
+    """MTF_STREAM_HDR: id @0, length @8 (u64), checksum @20 = XOR word 0..9"""
+    header = bytearray(STREAM_HEADER_SIZE)
+    header[0:4] = stream_id
+    struct.pack_into('<Q', header, 8, len(payload))
+    struct.pack_into('<H', header, 20, _xor(header[:20]))
+    return bytes(header) + payload
+
+
+def _dblk(block_type, body_size, fields=(), strings=(), streams=()):
+    """
+    Satu descriptor block: header + body + area string + stream + SPAD.
+    fields: (offset, format, value); strings: (offset alamat TAPE_ADDRESS, teks).
+    """
+    base = DBLK_HEADER_SIZE + body_size
+    area = b''
+    block = bytearray(base)
+    for offset, value in strings:
+        encoded = value.encode('utf-16-le') if value else b''
+        struct.pack_into('<HH', block, offset, len(encoded), base + len(area) if encoded else 0)
+        area += encoded
+    for offset, fmt, value in fields:
+        struct.pack_into(fmt, block, offset, value)
+
+    first_event = _align(base + len(area), 4)
+    block[0:4] = block_type
+    struct.pack_into('<H', block, 8, first_event)     # offset event pertama
+    block[10] = 14                                    # OS id (Windows NT)
+    block[48] = 2                                     # string type: Unicode
+    struct.pack_into('<H', block, 50, _xor(block[:50]))
+
+    data = (bytes(block) + area).ljust(first_event, b'\x00')
+    for stream_id, payload in streams:
+        data = data.ljust(_align(len(data), 4), b'\x00') + _stream(stream_id, payload)
+    data = data.ljust(_align(len(data), 4), b'\x00')
+    pad = _align(len(data) + STREAM_HEADER_SIZE, BLOCK_SIZE) - len(data) - STREAM_HEADER_SIZE
+    return data + _stream(b'SPAD', b'\x00' * pad)
+
+
+def _build_backup(path, header, files, sset_attributes=0x04, data_size=2 * 1024 * 1024):
+    """File .bak sintetis: TAPE, SSET, VOLB, MSCI, MSDA, ESET"""
+    config = header['DatabaseName'].encode('utf-16-le') + b'\x01\x02\x00\x00\xff\x00'
+    config += header['Collation'].encode('utf-16-le') + b'\x00\x00\x34\x12'
+    for entry in files:
+        config += entry['LogicalName'].encode('utf-16-le') + b'\x00\x00\x01\x00'
+        config += entry['PhysicalName'].encode('utf-16-le') + b'\x00\x00\x02\x00'
+
+    blocks = [
+        # MTF_TAPE: family id @52, media seq @60, software name @80, block size @84,
+        # vendor @86, media date @88, major version @93
+        _dblk(b'TAPE', 42,
+              fields=[(52, '<I', 0x1234), (60, '<H', 1), (84, '<H', BLOCK_SIZE),
+                      (86, '<H', header['SoftwareVendorId']), (88, '5s', BACKUP_START_DATE), (93, 'B', 1)],
+              strings=[(80, 'Microsoft SQL Server')]),
+        # MTF_SSET: attributes @52, vendor @60, number @62, name/desc/user @64/68/76,
+        # write date @88, software major/minor @93/94, time zone @95
+        _dblk(b'SSET', 46,
+              fields=[(52, '<I', sset_attributes), (60, '<H', header['SoftwareVendorId']),
+                      (62, '<H', header['Position']), (88, '5s', BACKUP_START_DATE),
+                      (93, 'B', header['SoftwareVersionMajor']), (94, 'B', header['SoftwareVersionMinor']),
+                      (95, 'b', header['TimeZone'])],
+              strings=[(64, header['BackupName']), (68, header['BackupDescription'] or ''),
+                       (76, header['UserName'])]),
+        # MTF_VOLB: machine name @64, write date @68
+        _dblk(b'VOLB', 21, fields=[(68, '5s', BACKUP_START_DATE)],
+              strings=[(64, header['MachineName'])]),
+        _dblk(b'MSCI', 21, streams=[(b'MSCI', config)]),
+        _dblk(b'MSDA', 21, streams=[(b'MSDA', b'\x5a' * data_size)]),
+        # MTF_ESET: corrupt file count @56, SSET number @78, write date @80
+        _dblk(b'ESET', 33, fields=[(78, '<H', header['Position']), (80, '5s', BACKUP_FINISH_DATE)])
+    ]
+    with open(path, 'wb') as f:
+        f.write(b''.join(blocks))
+    return sum(len(block) for block in blocks[1:-1])
+
+
+def test_golden_bytes_match_fixture_values():
+    expected = _load_fixture('backup_header.txt', parse_headeronly_output)[0]
+    assert decode_mtf_date(BACKUP_START_DATE) == expected['BackupStartDate']
+    assert decode_mtf_date(BACKUP_FINISH_DATE) == expected['BackupFinishDate']
+
+    tape = _dblk(b'TAPE', 42)
+    assert tape[:4] == b'TAPE' and tape[10] == 14 and tape[48] == 2
+    assert is_mtf_backup(tape[:DBLK_HEADER_SIZE])
+    corrupted = tape[:12] + b'\xff' + tape[13:DBLK_HEADER_SIZE]
+    assert not is_mtf_backup(corrupted)
+
+
+def test_headeronly_matches_fixture(tmp_path):
+    expected = _load_fixture('backup_header.txt', parse_headeronly_output)[0]
+    files = _load_fixture('backup_filelist.txt', parse_filelistonly_output)
+    bak_path = str(tmp_path / 'staging.bak')
+    backup_size = _build_backup(bak_path, expected, files)
+
+    result = parse_mtf(bak_path)
+    assert result['is_mtf'] and result['errors'] == []
+    assert [b['type'] for b in result['blocks']] == ['TAPE', 'SSET', 'VOLB', 'MSCI', 'MSDA', 'ESET']
+    assert result['media']['software_name'] == 'Microsoft SQL Server'
+
+    header = read_headeronly(bak_path)[0]
+    for column in ('BackupName', 'BackupDescription', 'BackupType', 'Position', 'DeviceType',
+                   'UserName', 'ServerName', 'DatabaseName', 'BackupStartDate', 'BackupFinishDate',
+                   'SoftwareVendorId', 'SoftwareVersionMajor', 'SoftwareVersionMinor',
+                   'MachineName', 'Collation', 'BackupTypeDescription', 'TimeZone'):
+        assert header[column] == expected[column], column
+    assert header['IsCopyOnly'] == bool(expected['IsCopyOnly'])
+    assert header['BackupSize'] == backup_size
+
+    file_list = read_filelistonly(bak_path)
+    assert [(f['LogicalName'], f['PhysicalName'], f['Type']) for f in file_list] == \
+        [(f['LogicalName'], f['PhysicalName'], f['Type']) for f in files]
+
+
+def test_headers_only_skips_data_streams(tmp_path):
+    expected = _load_fixture('backup_header.txt', parse_headeronly_output)[0]
+    files = _load_fixture('backup_filelist.txt', parse_filelistonly_output)
+    bak_path = str(tmp_path / 'staging.bak')
+    _build_backup(bak_path, expected, files)
+
+    result = parse_mtf(bak_path, headers_only=True)
+    header = result['backup_sets'][0]['header']
+    assert header['DatabaseName'] == 'staging_PTRJ_iFES_Plantware'
+    assert header['BackupFinishDate'] is None
+    assert result['blocks'][-1]['type'] == 'MSDA'
+
+
+def test_non_mtf_file_reported(tmp_path):
+    path = tmp_path / 'plantware.bak'
+    path.write_bytes(b'SQLite format 3\x00' + b'\x00' * 4080)
+
+    assert not is_mtf_backup(path.read_bytes()[:64])
+    result = parse_mtf(str(path))
+    assert not result['is_mtf'] and result['backup_sets'] == []
+    assert 'Not an MTF backup' in result['errors'][0]
+
+
+@pytest.mark.parametrize('attributes, backup_type, description, copy_only', [
+    (0x04, 1, 'Database', False),                  # SSET_NORMAL
+    (0x08, 5, 'Database Differential', False),     # SSET_DIFFERENTIAL
+    (0x10, 2, 'Transaction Log', False),           # SSET_INCREMENTAL (heuristik)
+    (0x04 | 0x02, 1, 'Database', True),            # SSET_COPY -> IsCopyOnly (heuristik)
+    (0x10 | 0x02, 2, 'Transaction Log', True),
+])
+def test_sset_attribute_heuristics(tmp_path, attributes, backup_type, description, copy_only):
+    expected = _load_fixture('backup_header.txt', parse_headeronly_output)[0]
+    files = _load_fixture('backup_filelist.txt', parse_filelistonly_output)
+    bak_path = str(tmp_path / 'staging.bak')
+    _build_backup(bak_path, expected, files, sset_attributes=attributes, data_size=4096)
+
+    header = read_headeronly(bak_path)[0]
+    assert (header['BackupType'], header['BackupTypeDescription'], header['IsCopyOnly']) == \
+        (backup_type, description, copy_only)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test untuk NotificationOutbox (antrian notifikasi persisten + sender asyncio)
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from notification_outbox import NotificationOutbox, STATUS_SENDING
+
+
+class _Sender:
+    def __init__(self, results=None, delay=0.0):
+        self.results = list(results or [])
+        self.delay = delay
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, subject, message, attachment_path=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.sent.append(subject)
+        return self.results.pop(0) if self.results else (True, "Email berhasil dikirim")
+
+
+def test_enqueue_and_send(tmp_path):
+    sender = _Sender()
+    outbox = NotificationOutbox(sender, str(tmp_path / 'outbox.db'))
+    outbox.enqueue('Report 1', '<p>ok</p>')
+    outbox.enqueue('Report 2', '<p>ok</p>')
+
+    assert asyncio.run(outbox.process_due()) == 2
+    assert sender.sent == ['Report 1', 'Report 2']
+    assert outbox.counts() == {'sent': 2}
+
+
+def test_failed_send_retried_with_backoff_then_failed(tmp_path):
+    results = []
+    sender = _Sender(results=[(False, 'SMTP down')] * 3)
+    outbox = NotificationOutbox(sender, str(tmp_path / 'outbox.db'), backoff_base=60, max_attempts=3,
+                                on_result=lambda n, ok, msg: results.append((n['attempts'], n['status'])))
+    outbox.enqueue('Alert', '<p>x</p>')
+
+    asyncio.run(outbox.process_due())
+    assert results == [(1, 'pending')]
+    # Belum jatuh tempo: tidak dicoba lagi
+    assert asyncio.run(outbox.process_due()) == 0
+
+    outbox.backoff_base = 0
+    outbox._connect().execute("UPDATE outbox SET next_attempt_at = 0")
+    asyncio.run(outbox.process_due())
+    assert results[-1] == (3, 'failed')
+    assert len(sender.sent) == 3
+    assert outbox.counts() == {'failed': 1}
+    assert outbox.backoff_delay(1) == 0
+
+
+def test_backoff_is_exponential_and_capped(tmp_path):
+    outbox = NotificationOutbox(_Sender(), str(tmp_path / 'outbox.db'), backoff_base=30, backoff_max=100)
+    assert [outbox.backoff_delay(n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+def test_dedup_key(tmp_path):
+    sender = _Sender(results=[(False, 'SMTP down')])
+    outbox = NotificationOutbox(sender, str(tmp_path / 'outbox.db'), max_attempts=1)
+
+    first = outbox.enqueue('Alert', '<p>x</p>', dedup_key='alert:2025-10-04')
+    assert first is not None
+    assert outbox.enqueue('Alert', '<p>x</p>', dedup_key='alert:2025-10-04') is None
+
+    asyncio.run(outbox.process_due())
+    assert outbox.counts() == {'failed': 1}
+    # Gagal permanen: boleh diantrikan ulang dengan key yang sama
+    assert outbox.enqueue('Alert', '<p>x</p>', dedup_key='alert:2025-10-04') == first
+    asyncio.run(outbox.process_due())
+    assert outbox.counts() == {'sent': 1}
+    assert outbox.enqueue('Alert', '<p>x</p>', dedup_key='alert:2025-10-04') is None
+
+
+def test_queue_survives_restart(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    outbox = NotificationOutbox(_Sender(), path)
+    outbox.enqueue('Queued', '<p>1</p>')
+    interrupted = outbox.enqueue('Interrupted', '<p>2</p>')
+    outbox._connect().execute("UPDATE outbox SET status = ? WHERE id = ?", (STATUS_SENDING, interrupted))
+    outbox._connect().commit()
+    outbox.close()
+
+    sender = _Sender()
+    restarted = NotificationOutbox(sender, path)
+    assert asyncio.run(restarted.process_due()) == 2
+    assert sorted(sender.sent) == ['Interrupted', 'Queued']
+
+
+def test_background_sender_limits_concurrency_and_never_blocks_enqueue(tmp_path):
+    sender = _Sender(delay=0.2)
+    outbox = NotificationOutbox(sender, str(tmp_path / 'outbox.db'), max_concurrency=2, poll_interval=0.1)
+    outbox.start()
+    try:
+        started = time.perf_counter()
+        for i in range(6):
+            outbox.enqueue(f'Report {i}', '<p>ok</p>')
+        assert time.perf_counter() - started < 0.5
+
+        deadline = time.monotonic() + 10
+        while len(sender.sent) < 6 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        outbox.close()
+
+    assert len(sender.sent) == 6
+    assert sender.max_active == 2
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test untuk NotifierBus: fan-out ke channel, render sekali, token bucket +
+batching, dan adapter WhatsApp/webhook terhadap stub HTTP server lokal
+(pengganti wa_bot/server.js)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from notifier_bus import (NotifierBus, EmailChannel, WhatsAppChannel, WebhookChannel, TokenBucket,
+                          build_channels)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests.append((self.path, payload))
+        self.server.tokens.append(self.headers.get('X-Notify-Token'))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps({'success': status == 200}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.requests = []
+    server.tokens = []
+    server.statuses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _result(status='critical'):
+    return {'folder_path': '/backup', 'zip_files_found': ['/backup/Staging_20251004.zip'],
+            'overall_summary': {'monitoring_status': status, 'critical_issues': ['BAK tidak valid']}}
+
+
+def test_result_fans_out_and_renders_once(stub_server):
+    base_url = f"http://127.0.0.1:{stub_server.server_address[1]}"
+    emails = []
+    text_calls = []
+
+    def render_text(result):
+        text_calls.append(result)
+        return 'LAPORAN MONITORING\nStatus: CRITICAL'
+
+    bus = NotifierBus([EmailChannel(lambda subject, body, attachment: emails.append((subject, body)) or (True, 'ok')),
+                       WhatsAppChannel(base_url, token='s3cret'),
+                       WebhookChannel(base_url + '/hook')],
+                      renderers={'text': render_text})
+    rendered = bus.publish(_result(), 'Backup Monitoring CRITICAL')
+
+    assert bus.pump() == 3
+    assert len(text_calls) == 1
+    assert rendered.render_counts == {'text': 1, 'html': 1}
+
+    assert emails[0][0] == 'Backup Monitoring CRITICAL'
+    assert 'Status: CRITICAL' in emails[0][1]
+    paths = dict(stub_server.requests)
+    assert 'phone' not in paths['/notify']
+    assert stub_server.tokens[[path for path, _ in stub_server.requests].index('/notify')] == 's3cret'
+    assert 'Status: CRITICAL' in paths['/notify']['message']
+    assert paths['/hook']['count'] == 1
+
+
+def test_rate_limited_results_sent_as_batch():
+    clock = _Clock()
+    sent = []
+    channel = EmailChannel(lambda subject, body, attachment: sent.append(subject) or (True, 'ok'),
+                           rate_per_minute=1, burst=1)
+    bus = NotifierBus([channel], clock=clock)
+
+    for i in range(3):
+        bus.publish(_result(), f'Alert {i}')
+        bus.pump()
+    assert sent == ['Alert 0']
+    assert bus.pending('email') == 2
+    assert bus.buckets['email'].wait_time() == pytest.approx(60)
+
+    clock.now += 60
+    assert bus.pump() == 1
+    assert sent == ['Alert 0', '2 hasil monitoring - Alert 2']
+    assert bus.pending('email') == 0
+
+
+def test_whatsapp_failure_is_retried(stub_server):
+    stub_server.statuses = [500]
+    results = []
+    bus = NotifierBus([WhatsAppChannel(f"http://127.0.0.1:{stub_server.server_address[1]}", burst=5)],
+                      on_result=lambda channel, count, ok, msg: results.append(ok))
+    bus.publish(_result(), 'Alert')
+
+    bus.pump()
+    assert results == [False]
+    assert bus.pending('whatsapp') == 1
+    bus.pump()
+    assert results == [False, True]
+    assert len(stub_server.requests) == 2
+
+
+def test_whatsapp_server_down_does_not_raise():
+    channel = WhatsAppChannel('http://127.0.0.1:9', timeout=1)
+    success, message = channel.send([NotifierBus([channel]).publish(_result(), 'Alert')])
+    assert not success
+    assert 'Gagal menghubungi' in message
+
+
+def test_token_bucket_refill():
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_minute=30, burst=2, clock=clock)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 2
+    assert bucket.try_acquire()
+
+
+def test_background_bus_flushes_on_stop():
+    sent = []
+    bus = NotifierBus([EmailChannel(lambda s, b, a: sent.append(s) or (True, 'ok'), rate_per_minute=1, burst=1)])
+    bus.start()
+    bus.publish(_result(), 'First')
+    deadline = time.monotonic() + 5
+    while not sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    bus.publish(_result(), 'Second')
+    # Token habis: Second menunggu sampai stop() mem-flush antrian
+    assert bus.pending('email') == 1
+    bus.stop()
+    assert sent == ['First', 'Second']
+
+
+def test_build_channels_skips_webhook_without_url():
+    settings = {'channels': ['email', 'whatsapp', 'webhook'], 'attach_pdf': False, 'email_per_minute': 6,
+                'whatsapp_url': 'http://localhost:3000', 'whatsapp_token': '', 'whatsapp_per_minute': 10,
+                'webhook_url': '', 'webhook_per_minute': 30, 'max_batch': 20}
+    assert [channel.name for channel in build_channels(settings)] == ['email', 'whatsapp']
+
+
+def test_on_done_after_every_channel_finished(stub_server):
+    base_url = f"http://127.0.0.1:{stub_server.server_address[1]}"
+    stub_server.statuses = [500]
+    done = []
+    bus = NotifierBus([EmailChannel(lambda s, b, a: (True, 'ok')), WhatsAppChannel(base_url, burst=5)],
+                      on_done=done.append)
+    rendered = bus.publish(_result(), 'Alert')
+
+    bus.pump()
+    # WhatsApp gagal dan masih akan dicoba ulang: hasil belum selesai
+    assert done == []
+    bus.pump()
+    assert done == [rendered]
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test untuk validasi paralel per arsip di MonitoringController
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import zipfile
+import multiprocessing
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import monitoring_controller
+from analysis_cache import AnalysisCache
+from monitoring_controller import MonitoringController, WORKER_MEMORY_ESTIMATE, memory_capped_workers
+
+
+def _make_zips(folder, count):
+    paths = []
+    for day in range(1, count + 1):
+        path = os.path.join(str(folder), f'Staging_202510{day:02d}.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('notes.txt', f'backup {day}')
+        paths.append(path)
+    return paths
+
+
+def test_results_keep_input_order(tmp_path):
+    zip_files = _make_zips(tmp_path, 6)
+
+    controller = MonitoringController(cache=AnalysisCache(str(tmp_path / 'cache.db')))
+    controller.executor_mode = 'thread'
+    controller.max_workers = 4
+    zip_results, db_results = controller._validate_archives(zip_files)
+
+    assert [r['filepath'] for r in zip_results] == zip_files
+    assert [r['zip_file'] for r in db_results] == [os.path.basename(p) for p in zip_files]
+    assert all(r['is_valid'] for r in zip_results)
+
+    summary = controller.zip_validator.summarize_validations(zip_results)
+    assert summary['total_files'] == 6 and summary['valid_files'] == 6
+
+
+def test_archive_timeout_reported(tmp_path, monkeypatch):
+    zip_files = _make_zips(tmp_path, 3)
+    slow_path = zip_files[1]
+    real_validate = monitoring_controller._validate_archive
+
+    def fake_validate(zip_path, *args):
+        if zip_path == slow_path:
+            time.sleep(2)
+        return real_validate(zip_path, *args)
+
+    monkeypatch.setattr(monitoring_controller, '_validate_archive', fake_validate)
+
+    controller = MonitoringController(cache=AnalysisCache(str(tmp_path / 'cache.db')))
+    controller.executor_mode = 'thread'
+    controller.max_workers = 3
+    controller.archive_timeout = 0.3
+    zip_results, db_results = controller._validate_archives(zip_files)
+
+    assert zip_results[0]['is_valid'] and zip_results[2]['is_valid']
+    assert not zip_results[1]['is_valid']
+    assert 'Timeout' in zip_results[1]['errors'][0]
+    assert 'Timeout' in db_results[1]['errors'][0]
+
+
+def _slow_first_archive(monkeypatch, zip_files, seconds):
+    real_validate = monitoring_controller._validate_archive
+
+    def fake_validate(zip_path, *args):
+        if zip_path == zip_files[0]:
+            time.sleep(seconds)
+        return real_validate(zip_path, *args)
+
+    monkeypatch.setattr(monitoring_controller, '_validate_archive', fake_validate)
+
+
+def test_queue_continues_after_timeout_with_one_worker(tmp_path, monkeypatch):
+    zip_files = _make_zips(tmp_path, 3)
+    _slow_first_archive(monkeypatch, zip_files, 2)
+
+    controller = MonitoringController(cache=AnalysisCache(str(tmp_path / 'cache.db')))
+    controller.executor_mode = 'thread'
+    controller.max_workers = 1
+    controller.archive_timeout = 0.3
+    zip_results, _ = controller._validate_archives(zip_files)
+
+    assert 'Timeout' in zip_results[0]['errors'][0]
+    # Arsip di belakang arsip yang timeout tetap divalidasi, tidak dibuang
+    assert zip_results[1]['is_valid'] and zip_results[2]['is_valid']
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason='monkeypatch hanya terbawa ke worker lewat fork')
+def test_timed_out_process_worker_is_terminated(tmp_path, monkeypatch):
+    zip_files = _make_zips(tmp_path, 3)
+    _slow_first_archive(monkeypatch, zip_files, 60)
+
+    controller = MonitoringController(cache=AnalysisCache(str(tmp_path / 'cache.db')))
+    controller.executor_mode = 'process'
+    controller.max_workers = 2
+    controller.archive_timeout = 0.5
+    started = time.monotonic()
+    zip_results, db_results = controller._validate_archives(zip_files)
+
+    assert time.monotonic() - started < 30
+    assert 'Timeout' in zip_results[0]['errors'][0] and 'Timeout' in db_results[0]['errors'][0]
+    assert zip_results[1]['is_valid'] and zip_results[2]['is_valid']
+    assert multiprocessing.active_children() == []
+
+
+def _make_database_zips(folder, count):
+    db_path = os.path.join(str(folder), 'staging.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, SCAN_DATE TEXT)")
+    conn.executemany("INSERT INTO GWSCANNER (SCAN_DATE) VALUES (?)", [('2025-10-04',)] * 200)
+    conn.commit()
+    conn.close()
+    paths = []
+    for day in range(1, count + 1):
+        path = os.path.join(str(folder), f'Staging_202510{day:02d}.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.write(db_path, 'staging.bak')
+            zf.writestr('notes.txt', f'backup {day}')
+        paths.append(path)
+    return paths
+
+
+def test_process_workers_reused_with_shared_cache(tmp_path):
+    zip_files = _make_database_zips(tmp_path, 8)
+    cache_path = str(tmp_path / 'cache.db')
+
+    controller = MonitoringController(cache=AnalysisCache(cache_path))
+    controller.executor_mode = 'process'
+    controller.max_workers = 3
+    controller.archive_timeout = 60
+    started_workers = []
+    start_worker = controller._start_worker
+
+    def counting_start_worker(context):
+        started_workers.append(1)
+        return start_worker(context)
+
+    controller._start_worker = counting_start_worker
+    zip_results, db_results = controller._validate_archives(zip_files)
+
+    assert [r['filepath'] for r in zip_results] == zip_files
+    assert all(r['is_valid'] and not r['errors'] for r in zip_results)
+    assert all(not r['errors'] for r in db_results)
+    assert all(r['databases']['staging']['key_tables_info']['GWSCANNER']['total_records'] == 200
+               for r in db_results)
+    # Satu worker (validator + koneksi cache) per slot, bukan per arsip
+    assert len(started_workers) == 3
+    assert multiprocessing.active_children() == []
+    with sqlite3.connect(cache_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] > 0
+
+
+def test_workers_capped_by_memory_budget():
+    budget_mb = 3 * WORKER_MEMORY_ESTIMATE / (1024 * 1024)
+    assert memory_capped_workers(16, budget_mb) == 3
+    assert memory_capped_workers(2, budget_mb) == 2
+    assert memory_capped_workers(16, 1) == 1
+    assert memory_capped_workers(16, 0) == 16
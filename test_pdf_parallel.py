@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test untuk analisis arsip paralel di PDFReportGenerator (process pool)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+pytest.importorskip('reportlab')
+
+from create_test_zip import create_test_zip
+from src import pdf_report_generator
+from src.pdf_report_generator import PDFReportGenerator, iter_analysis_records
+import analysis_cache  # src/ ada di sys.path setelah import pdf_report_generator
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    # Worker process (fork) mewarisi cache ini, bukan config/analysis_cache.db
+    monkeypatch.setattr(analysis_cache, '_default_cache',
+                        analysis_cache.AnalysisCache(str(tmp_path / 'cache.db')))
+
+
+@pytest.fixture
+def archives(tmp_path):
+    paths = []
+    for i in range(6):
+        zip_path = str(tmp_path / f'BackupStaging_{i}.zip')
+        create_test_zip(zip_path, payload_kb=4, seed=i, verbose=False)
+        paths.append(zip_path)
+    return paths
+
+
+def test_parallel_records_keep_order(archives):
+    serial = list(iter_analysis_records(archives, workers=1))
+    parallel = list(iter_analysis_records(archives, workers=3))
+
+    assert [r['file_name'] for r in parallel] == [os.path.basename(p) for p in archives]
+    for expected, actual in zip(serial, parallel):
+        assert actual['corruption']['is_corrupted'] == expected['corruption']['is_corrupted'] is False
+        assert actual['bak_analysis']['bak_files_found'] == expected['bak_analysis']['bak_files_found']
+        assert actual['metadata']['total_files'] == expected['metadata']['total_files']
+
+
+def test_parallel_report_matches_serial_page_count(archives, tmp_path):
+    generator = PDFReportGenerator()
+    serial_pdf = str(tmp_path / 'serial.pdf')
+    parallel_pdf = str(tmp_path / 'parallel.pdf')
+
+    assert generator.generate_report(archives, serial_pdf)
+    assert generator.generate_report(archives, parallel_pdf, workers=2)
+
+    def pages(path):
+        with open(path, 'rb') as f:
+            return f.read().count(b'/Type /Page\n')
+
+    assert pages(parallel_pdf) == pages(serial_pdf) >= len(archives)
+
+
+def test_serial_path_turns_failures_into_error_records(archives, monkeypatch):
+    real_analyze = pdf_report_generator._analyze_archive
+
+    def flaky_analyze(zip_path):
+        if zip_path == archives[1]:
+            raise OSError("disk read failed")
+        return real_analyze(zip_path)
+
+    monkeypatch.setattr(pdf_report_generator, '_analyze_archive', flaky_analyze)
+    records = list(iter_analysis_records(archives, workers=1))
+
+    assert [r['file_name'] for r in records] == [os.path.basename(p) for p in archives]
+    assert 'disk read failed' in records[1]['corruption']['error']
+    assert records[1]['corruption']['is_corrupted']
+    assert not records[2]['corruption']['is_corrupted']
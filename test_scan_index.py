@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script untuk ScanIndex dan integrasinya dengan FolderMonitor
+"""
+
+import os
+import sys
+import time
+import zipfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from scan_index import ScanIndex
+from folder_monitor import FolderMonitor
+
+
+def _make_zip(path, payload=b'data'):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('backup.bak', payload)
+
+
+def test_lookup_invalidated_on_change(tmp_path):
+    """Entry index hanya berlaku selama size/mtime/inode sama"""
+    index = ScanIndex(str(tmp_path / 'index.db'))
+    zip_path = str(tmp_path / 'Backup_2025-10-04.zip')
+    _make_zip(zip_path)
+
+    assert index.lookup(zip_path) is None
+    index.store(zip_path, True, '2025-10-04', [{'filename': 'backup.bak'}])
+
+    entry = index.lookup(zip_path)
+    assert entry['is_valid'] is True
+    assert entry['file_date'] == '2025-10-04'
+    assert entry['members'][0]['filename'] == 'backup.bak'
+
+    # Tulis ulang dengan isi berbeda -> entry tidak berlaku lagi
+    time.sleep(0.01)
+    _make_zip(zip_path, b'other data with different size')
+    assert index.lookup(zip_path) is None
+    index.close()
+
+
+def test_folder_monitor_skips_unchanged_archives(tmp_path):
+    """Scan kedua tidak memanggil testzip() untuk arsip yang tidak berubah"""
+    backup_dir = tmp_path / 'backup'
+    backup_dir.mkdir()
+    _make_zip(str(backup_dir / 'Staging_20251004.zip'))
+    _make_zip(str(backup_dir / 'Staging_20251003.zip'))
+    # Arsip sudah selesai ditulis (lolos stability gate)
+    finished = time.time() - 3600
+    for name in os.listdir(backup_dir):
+        os.utime(backup_dir / name, (finished, finished))
+
+    monitor = FolderMonitor(scan_index=ScanIndex(str(tmp_path / 'index.db')))
+    monitor.set_monitoring_path(str(backup_dir))
+
+    files, latest = monitor.get_latest_zip_files_by_date()
+    assert latest == '2025-10-04'
+    assert len(files) == 1
+
+    inspected = []
+    original = monitor._inspect_zip_file
+    monitor._inspect_zip_file = lambda path: inspected.append(path) or original(path)
+
+    files, latest = monitor.get_latest_zip_files_by_date()
+    assert latest == '2025-10-04'
+    assert inspected == []
+    monitor.scan_index.close()
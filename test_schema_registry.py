@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test untuk schema registry (deteksi tipe database bersama, tipe tambahan dari config)
+"""
+
+import os
+import sys
+import sqlite3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from schema_registry import SchemaRegistry, load_database_types_config, schema_fingerprint
+from folder_monitor import FolderMonitor
+from freshness import FreshnessStore
+from scan_index import ScanIndex
+
+
+def test_detects_builtin_types():
+    registry = SchemaRegistry()
+    assert registry.detect(['pr_task', 'OTHER']) == 'plantware'
+    assert registry.detect(['TA_LOG']) == 'venus'
+    assert registry.detect(['GW_TRANSACTION', 'x']) == 'staging'
+    assert registry.detect(['USERS']) == 'unknown'
+    assert registry.detect([], default='generic_sqlite') == 'generic_sqlite'
+    # Prioritas: Plantware menang jika tabel beberapa tipe ada sekaligus
+    assert registry.detect(['GWSCANNER', 'PR_TASKREG']) == 'plantware'
+    assert schema_fingerprint(['a', 'B']) == schema_fingerprint(['b', 'A'])
+    assert registry.cache_params() == ''
+
+
+def test_config_adds_types(tmp_path):
+    config = tmp_path / 'config.ini'
+    config.write_text("[DATABASE_TYPES]\npayroll = PY_EMPLOYEE, PY_SALARY  # komentar\nvenus = TA_SHIFT\n",
+                      encoding='utf-8')
+    registry = SchemaRegistry()
+    assert registry.detect(['PY_SALARY']) == 'unknown'
+    for name, tables in load_database_types_config(str(config)).items():
+        registry.register(name, tables)
+    assert registry.detect(['PY_SALARY']) == 'payroll'
+    assert registry.detect(['ta_shift']) == 'venus'
+    assert registry.types == ['plantware', 'venus', 'staging', 'payroll']
+    assert registry.cache_params().startswith(':types:')
+    assert load_database_types_config(str(tmp_path / 'missing.ini')) == {}
+
+
+def test_detect_file_cached_per_modification(tmp_path):
+    db_path = str(tmp_path / 'backup.bak')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+
+    registry = SchemaRegistry()
+    assert registry.detect_file(db_path) == 'staging'
+    assert registry.detect_file(str(tmp_path / 'missing.bak')) == 'unknown'
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE GWSCANNER")
+    conn.execute("CREATE TABLE TA_MACHINE (ID INTEGER PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+    os.utime(db_path, ns=(os.stat(db_path).st_mtime_ns + 10 ** 9,) * 2)
+    assert registry.detect_file(db_path) == 'venus'
+
+    # FolderMonitor memakai tabel dari koneksi yang sudah terbuka
+    monitor = FolderMonitor(scan_index=ScanIndex(str(tmp_path / 'index.db')),
+                            freshness_store=FreshnessStore(str(tmp_path / 'freshness.db')), registry=registry)
+    assert monitor._analyze_single_bak(db_path)['database_type'] == 'Venus'
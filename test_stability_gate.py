@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test untuk StabilityGate (arsip ZIP yang masih ditulis tidak dianalisis)
+"""
+
+import os
+import sys
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from stability_gate import STATE_PENDING, STATE_READY, StabilityGate, probe_eocd
+from monitoring_controller import MonitoringController
+
+
+def _make_zip(path, size=200000, age=3600):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        zf.writestr('backup.bak', os.urandom(size))
+        zf.comment = b'PK\x05\x06 in comment'
+    finished = time.time() - age
+    os.utime(path, (finished, finished))
+    return path
+
+
+def _truncate(path, keep):
+    with open(path, 'r+b') as f:
+        f.truncate(keep)
+    finished = time.time() - 3600
+    os.utime(path, (finished, finished))
+
+
+def test_eocd_probe(tmp_path):
+    complete = _make_zip(str(tmp_path / 'complete.zip'))
+    assert probe_eocd(complete) is None
+
+    partial = _make_zip(str(tmp_path / 'partial.zip'))
+    _truncate(partial, os.path.getsize(partial) // 2)
+    assert 'End of central directory' in probe_eocd(partial)
+
+
+def test_gate_defers_recent_and_truncated_archives(tmp_path):
+    gate = StabilityGate(window_seconds=30, max_pending_seconds=7200)
+
+    assert gate.check(_make_zip(str(tmp_path / 'done.zip')))[0] == STATE_READY
+    assert gate.check(_make_zip(str(tmp_path / 'fresh.zip'), age=0))[0] == STATE_PENDING
+
+    # Salinan yang mempertahankan mtime lama tapi belum lengkap
+    copying = _make_zip(str(tmp_path / 'copying.zip'))
+    _truncate(copying, 4096)
+    state, reason = gate.check(copying)
+    assert state == STATE_PENDING and 'End of central directory' in reason
+
+    # Ukuran berubah di antara dua observasi
+    _truncate(copying, 8192)
+    assert gate.check(copying)[0] == STATE_PENDING
+
+    # Tidak berubah dan lebih tua dari max_pending: dilepas agar dilaporkan rusak
+    assert StabilityGate(window_seconds=30, max_pending_seconds=60).check(copying)[0] == STATE_READY
+
+
+def test_controller_reports_pending_files(tmp_path):
+    _make_zip(str(tmp_path / 'Staging_20251004.zip'))
+    _make_zip(str(tmp_path / 'Staging_20251005.zip'), age=0)
+
+    controller = MonitoringController()
+    pending = []
+    files = controller._find_recent_zip_files(str(tmp_path), 36500, pending)
+
+    assert [os.path.basename(f) for f in files] == ['Staging_20251004.zip']
+    assert [entry['filename'] for entry in pending] == ['Staging_20251005.zip']
+    assert pending[0]['status'] == STATE_PENDING
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test untuk startup cepat: subsystem berat di-load saat dipakai, bukan saat import
+"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from benchmark_startup import DEFAULT_BUDGET, heavy_modules_loaded, measure_import
+from lazy_import import LazyAttribute
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_lazy_attribute_imports_on_first_use():
+    lazy = LazyAttribute('json.tool', 'main')
+    sys.modules.pop('json.tool', None)
+    assert not lazy.is_loaded and 'json.tool' not in sys.modules
+
+    assert callable(lazy.resolve())
+    assert lazy.is_loaded and 'json.tool' in sys.modules
+
+
+def test_modules_import_without_side_effects():
+    _, modules, _ = measure_import('bak_file_reader')
+    assert 'pandas' not in modules
+
+    # Tanpa ReportLab: import tetap jalan (tanpa pip install), error baru muncul saat dipakai
+    code = (
+        "import sys; sys.modules['reportlab'] = None; sys.path.insert(0, '.');"
+        "import src.pdf_report_generator as m; assert not m.REPORTLAB_AVAILABLE;"
+        "exec('try:\\n m.PDFReportGenerator()\\nexcept ImportError as e:\\n print(e)')"
+    )
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    assert 'pip install reportlab' in proc.stdout and 'Installing' not in proc.stdout
+
+
+def test_backup_monitor_qt_startup_budget():
+    pytest.importorskip('PyQt5.QtWidgets')
+    seconds, modules, _ = measure_import('backup_monitor_qt')
+    assert heavy_modules_loaded(modules) == []
+    assert seconds < DEFAULT_BUDGET
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test untuk statistik tabel (schema sekali baca, satu query agregat per tabel)
+"""
+
+import os
+import sys
+import sqlite3
+import zipfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from table_stats import TableStatistics
+from zip_sqlite import PageReaderConnection, ZipMemberReader
+from bak_file_reader import BAKFileReader
+from quick_database_validator import QuickDatabaseValidator
+from freshness import FreshnessStore
+from schema_registry import SchemaRegistry
+
+
+def _make_staging_db(path, rows=500):
+    today = datetime.now()
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, SCAN_DATE TEXT, CREATED_DATE TEXT, NOTE TEXT)")
+    conn.execute('CREATE TABLE "GW LOG" (LOG_DATE TEXT, MESSAGE TEXT)')
+    conn.execute("CREATE INDEX idx_scan_date ON GWSCANNER (SCAN_DATE)")
+    conn.executemany(
+        "INSERT INTO GWSCANNER (SCAN_DATE, CREATED_DATE, NOTE) VALUES (?, ?, ?)",
+        [((today - timedelta(days=i)).strftime('%Y-%m-%d'), None if i % 3 else '2025-01-01', 'x' * (i % 40))
+         for i in range(rows)]
+    )
+    conn.executemany('INSERT INTO "GW LOG" VALUES (?, ?)', [('2025-06-01', 'ok'), (None, 'kosong')])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_one_aggregate_query_per_table(tmp_path):
+    db_path = _make_staging_db(tmp_path / 'staging.db')
+    cursor = sqlite3.connect(db_path).cursor()
+    stats = TableStatistics(cursor)
+    since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+
+    assert stats.tables() == ['GWSCANNER', 'GW LOG']
+    assert stats.column_names('GWSCANNER') == ['ID', 'SCAN_DATE', 'CREATED_DATE', 'NOTE']
+    queries_after_schema = stats.queries
+
+    result = stats.table_stats('GWSCANNER', ['SCAN_DATE', 'CREATED_DATE', 'MISSING'], recent_since=since)
+    assert stats.queries == queries_after_schema + 1
+    assert result.record_count == 500
+    assert result.latest_dates == {'SCAN_DATE': datetime.now().strftime('%Y-%m-%d'), 'CREATED_DATE': '2025-01-01'}
+    assert result.recent_counts['SCAN_DATE'] == \
+        cursor.execute("SELECT COUNT(*) FROM GWSCANNER WHERE SCAN_DATE >= ?", (since,)).fetchone()[0]
+
+    # Jumlah record dipakai ulang tanpa query baru
+    assert stats.table_stats('GWSCANNER').record_count == 500
+    assert stats.queries == queries_after_schema + 1
+
+    log = stats.table_stats('GW LOG', stats.matching_columns('GW LOG', ['date']))
+    assert (log.record_count, log.latest_dates) == (2, {'LOG_DATE': '2025-06-01'})
+    assert [index[1] for index in stats.indexes('GWSCANNER')] == ['idx_scan_date']
+    assert len(stats.sample_rows('GWSCANNER', 5)) == 5
+
+
+def test_approximate_count_from_sqlite_stat1(tmp_path):
+    db_path = _make_staging_db(tmp_path / 'staging.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("ANALYZE")
+    conn.commit()
+
+    # Database in-memory (member ZIP kecil) tidak bisa di-sampling per page: pakai sqlite_stat1
+    memory = sqlite3.connect(':memory:')
+    memory.deserialize(conn.serialize())
+    stats = TableStatistics(memory.cursor())
+    estimate = stats.table_stats('GWSCANNER', exact=False)
+    assert estimate.approximate and estimate.record_count == 500 and estimate.count_error is None
+    exact = stats.table_stats('GWSCANNER')
+    assert not exact.approximate and exact.record_count == 500
+
+
+def _make_large_db(path, rows=60000):
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA page_size = 1024")
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, SCAN_DATE TEXT)")
+    conn.execute("CREATE TABLE SCANNER_DATA (ID INTEGER PRIMARY KEY, PAYLOAD TEXT)")
+    conn.executemany("INSERT INTO GWSCANNER (SCAN_DATE) VALUES (?)", [('2025-10-04',)] * 2000)
+    conn.executemany("INSERT INTO SCANNER_DATA (PAYLOAD) VALUES (?)",
+                     [('x' * (i % 97),) for i in range(rows)])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_estimate_mode_samples_pages_with_bounds(tmp_path):
+    db_path = _make_large_db(tmp_path / 'large.db')
+    cursor = sqlite3.connect(db_path).cursor()
+    stats = TableStatistics(cursor, mode='estimate', samples=32, seed=7)
+
+    estimate = stats.table_stats('SCANNER_DATA')
+    assert estimate.approximate and estimate.count_error > 0
+    assert abs(estimate.record_count - 60000) <= 2 * estimate.count_error
+    # Tabel kunci tetap exact
+    key = stats.table_stats('GWSCANNER')
+    assert not key.approximate and key.record_count == 2000
+    stats.close()
+
+    # Time budget habis: tabel non-kunci tidak di-scan tanggalnya, tabel kunci tetap lengkap
+    budget = TableStatistics(cursor, time_budget=0, samples=32, seed=7)
+    assert budget.table_stats('SCANNER_DATA', ['PAYLOAD']).latest_dates == {}
+    assert budget.table_stats('GWSCANNER', ['SCAN_DATE']).latest_dates == {'SCAN_DATE': '2025-10-04'}
+    budget.close()
+
+
+def test_page_reader_matches_sqlite(tmp_path):
+    db_path = _make_staging_db(tmp_path / 'staging.db', rows=2000)
+    zip_path = str(tmp_path / 'Staging.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(db_path, 'staging.bak')
+    since = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+
+    reference = TableStatistics(sqlite3.connect(db_path).cursor())
+    with zipfile.ZipFile(zip_path) as zf:
+        conn = PageReaderConnection(ZipMemberReader(zip_path, zf.getinfo('staging.bak')))
+        stats = TableStatistics(conn.cursor())
+        assert stats.schema == reference.schema
+        for table in stats.tables():
+            columns = stats.matching_columns(table, ['date']) + ['ID']
+            assert stats.table_stats(table, columns, since) == reference.table_stats(table, columns, since)
+            assert stats.sample_rows(table, 3) == reference.sample_rows(table, 3)
+        conn.close()
+
+
+def test_bak_reader_and_quick_validator_use_stats(tmp_path):
+    db_path = _make_staging_db(tmp_path / 'staging.db')
+    zip_path = str(tmp_path / 'Staging_20251004.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(db_path, 'staging.bak')
+
+    # memory_limit=0: database dibaca lewat page reader
+    with zipfile.ZipFile(zip_path) as zf:
+        result = BAKFileReader(memory_limit=0, registry=SchemaRegistry())._read_bak_member(zf, 'staging.bak')
+    assert result['success'], result['errors']
+    table = result['tables']['GWSCANNER']
+    assert table['record_count'] == 500 and len(table['sample_data']) == 5
+    assert table['date_columns'] == ['SCAN_DATE', 'CREATED_DATE']
+    assert result['database_info']['detected_type'] == 'staging'
+
+    quick = QuickDatabaseValidator(freshness_store=FreshnessStore(str(tmp_path / 'freshness.db')),
+                                   registry=SchemaRegistry())._validate_single_zip_quick(zip_path)
+    assert quick['errors'] == []
+    assert quick['databases']['staging']['total_records'] == 502
+    assert quick['latest_dates']['staging'] == datetime.now().strftime('%Y-%m-%d')
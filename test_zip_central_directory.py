@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test untuk pembaca central directory ZIP (metadata tanpa membaca data member)
+"""
+
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from zip_central_directory import ZipMetadataError, read_central_directory
+from stability_gate import probe_eocd
+from zip_metadata_viewer import ZipMetadataViewer
+
+
+def _make_zip(path, members, comment=b'', compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(path, 'w', compression) as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+        zf.comment = comment
+    return path
+
+
+def _assert_matches_zipfile(path):
+    central_directory = read_central_directory(path)
+    with zipfile.ZipFile(path) as zf:
+        expected = zf.infolist()
+    assert [e.filename for e in central_directory.entries] == [i.filename for i in expected]
+    for entry, info in zip(central_directory.entries, expected):
+        assert (entry.file_size, entry.compress_size, entry.crc, entry.date_time, entry.compress_type,
+                entry.header_offset) == (info.file_size, info.compress_size, info.CRC, info.date_time,
+                                         info.compress_type, info.header_offset)
+    return central_directory
+
+
+def test_matches_zipfile(tmp_path):
+    path = _make_zip(str(tmp_path / 'backup.zip'), [('db/staging.bak', b'TAPE' + os.urandom(5000)),
+                                                    ('db/', b''), ('catatan_ü.txt', b'x' * 1000)])
+    central_directory = _assert_matches_zipfile(path)
+    assert central_directory.entries[1].is_dir()
+    assert central_directory.entries[0].extension == '.bak'
+    assert not central_directory.zip64
+
+
+def test_long_comment_and_prefixed_data(tmp_path):
+    # Komentar > tail awal memaksa read ekor kedua
+    path = _make_zip(str(tmp_path / 'comment.zip'), [('a.bak', b'a' * 100)], comment=b'PK\x05\x06' * 2000)
+    assert read_central_directory(path).comment.startswith(b'PK\x05\x06')
+
+    # Data di depan arsip (mis. self-extractor): offset member tetap benar
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('a.bak', b'a' * 100)
+    prefixed = tmp_path / 'prefixed.zip'
+    prefixed.write_bytes(b'\0' * 3000 + buffer.getvalue())
+    _assert_matches_zipfile(str(prefixed))
+
+
+def test_zip64_records_and_extra_fields(tmp_path, monkeypatch):
+    # Batas Zip64 diturunkan supaya zipfile menulis EOCD Zip64 + extra field tanpa file 4 GB
+    monkeypatch.setattr(zipfile, 'ZIP64_LIMIT', 100)
+    monkeypatch.setattr(zipfile, 'ZIP_FILECOUNT_LIMIT', 2)
+    path = _make_zip(str(tmp_path / 'zip64.zip'), [(f'part{i}.bak', os.urandom(500)) for i in range(4)],
+                     compression=zipfile.ZIP_STORED)
+    monkeypatch.undo()
+
+    central_directory = _assert_matches_zipfile(path)
+    assert central_directory.zip64
+    assert central_directory.total_uncompressed == 2000
+    assert probe_eocd(path) is None
+
+
+def test_truncated_archive_raises(tmp_path):
+    path = _make_zip(str(tmp_path / 'partial.zip'), [('a.bak', os.urandom(20000))])
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 30)
+    with pytest.raises(ZipMetadataError):
+        read_central_directory(path)
+
+
+def test_viewer_metadata_from_central_directory(tmp_path):
+    path = _make_zip(str(tmp_path / 'BackupStaging_20251004.zip'),
+                     [('staging.bak', b'\0' * 10000), ('logs/run.log', b'ok')])
+    metadata = ZipMetadataViewer().extract_zip_metadata(path)
+    assert metadata['success'] and metadata['total_files'] == 2
+    assert [f['filename'] for f in metadata['bak_files']] == ['staging.bak']
+    assert metadata['directories'] == ['logs/']
+    assert metadata['compression_ratio'] > 90
+
+    broken = tmp_path / 'broken.zip'
+    broken.write_bytes(b'not a zip file at all')
+    assert not ZipMetadataViewer().extract_zip_metadata(str(broken))['success']
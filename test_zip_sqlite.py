@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test untuk analisis SQLite langsung dari member ZIP (tanpa ekstraksi)
+"""
+
+import os
+import sys
+import sqlite3
+import zipfile
+import functools
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import zip_sqlite
+import zip_validator
+import database_validator
+import quick_database_validator
+from analysis_cache import AnalysisCache
+from freshness import FreshnessStore
+from schema_registry import SchemaRegistry
+from zip_sqlite import (BLOCK_SIZE, PageReaderConnection, UnsupportedQueryError, ZipMemberReader,
+                        checkpoint_interval, open_member_database)
+from database_validator import DatabaseValidator
+
+
+def _make_staging_db(path, rows=3000):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE GWSCANNER (ID INTEGER PRIMARY KEY, SCAN_DATE TEXT, NOTE TEXT)")
+    conn.executemany(
+        "INSERT INTO GWSCANNER (SCAN_DATE, NOTE) VALUES (?, ?)",
+        [(f"2025-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}", 'x' * (5000 if i % 50 == 0 else 20))
+         for i in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.mark.parametrize('compression', [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_page_reader_matches_sqlite(tmp_path, compression):
+    db_path = _make_staging_db(tmp_path / 'staging.db')
+    zip_path = str(tmp_path / 'Staging_20251004.zip')
+    with zipfile.ZipFile(zip_path, 'w', compression) as zf:
+        zf.write(db_path, 'staging.bak')
+
+    reference = sqlite3.connect(db_path).cursor()
+    with zipfile.ZipFile(zip_path) as zf:
+        conn = PageReaderConnection(ZipMemberReader(zip_path, zf.getinfo('staging.bak')))
+        cursor = conn.cursor()
+        for sql, params in [
+            ("SELECT name FROM sqlite_master WHERE type='table'", ()),
+            ("SELECT COUNT(*) FROM GWSCANNER", ()),
+            ("SELECT MAX(SCAN_DATE) FROM GWSCANNER", ()),
+            ("SELECT MAX(ID) FROM GWSCANNER", ()),
+            ("SELECT COUNT(*) FROM GWSCANNER WHERE SCAN_DATE >= ?", ('2025-10-01',)),
+        ]:
+            assert cursor.execute(sql, params).fetchall() == reference.execute(sql, params).fetchall()
+        conn.close()
+
+        # Member kecil dibuka sebagai sqlite3 in-memory (SQL penuh)
+        memory_conn = open_member_database(zf, 'staging.bak')
+        assert isinstance(memory_conn, sqlite3.Connection)
+        assert memory_conn.execute("SELECT COUNT(*) FROM GWSCANNER").fetchone() == (3000,)
+
+
+@pytest.mark.parametrize('compression', [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_wal_member_deserialized_from_single_buffer(tmp_path, compression):
+    db_path = _make_staging_db(tmp_path / 'staging.db', rows=500)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+    zip_path = str(tmp_path / 'Staging_20251004.zip')
+    with zipfile.ZipFile(zip_path, 'w', compression) as zf:
+        zf.write(db_path, 'staging.bak')
+
+    with zipfile.ZipFile(zip_path) as zf:
+        memory_conn = open_member_database(zf, 'staging.bak')
+        assert isinstance(memory_conn, sqlite3.Connection)
+        assert memory_conn.execute("SELECT COUNT(*) FROM GWSCANNER").fetchone() == (500,)
+        memory_conn.close()
+
+        # Di atas memory_limit: page reader, tanpa memuat member ke memori
+        page_conn = open_member_database(zf, 'staging.bak', memory_limit=0)
+        assert isinstance(page_conn, PageReaderConnection)
+        page_conn.close()
+
+
+def test_database_validator_does_not_extract(tmp_path, monkeypatch):
+    db_path = _make_staging_db(tmp_path / 'staging.db')
+    zip_path = str(tmp_path / 'Staging_20251004.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(db_path, 'staging.bak')
+
+    def no_extract(*args, **kwargs):
+        raise AssertionError("ZIP member must not be extracted to disk")
+
+    monkeypatch.setattr(zipfile.ZipFile, 'extract', no_extract)
+    result = DatabaseValidator(cache=AnalysisCache(enabled=False))._validate_single_zip(zip_path)
+
+    assert result['errors'] == []
+    staging = result['databases']['staging']['key_tables_info']['GWSCANNER']
+    assert staging['total_records'] == 3000
+    assert staging['latest_dates']['SCAN_DATE'] == '2025-12-28'
+
+
+def test_checkpoints_capped_for_large_members(tmp_path, monkeypatch):
+    # Member 20 GB: interval dilebarkan, jumlah checkpoint tetap <= MAX_CHECKPOINTS
+    assert (20 * 1024 ** 3) // checkpoint_interval(20 * 1024 ** 3) <= zip_sqlite.MAX_CHECKPOINTS
+    assert checkpoint_interval(1024) == zip_sqlite.CHECKPOINT_INTERVAL
+
+    monkeypatch.setattr(zip_sqlite, 'CHECKPOINT_INTERVAL', BLOCK_SIZE)
+    monkeypatch.setattr(zip_sqlite, 'MAX_CHECKPOINTS', 4)
+    payload = os.urandom(BLOCK_SIZE * 2) * 16   # 32 blok
+    zip_path = str(tmp_path / 'payload.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('payload.bak', payload)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        reader = ZipMemberReader(zip_path, zf.getinfo('payload.bak'), block_cache_size=2)
+    assert reader.checkpoint_interval == BLOCK_SIZE * 8
+    assert reader.read(0, len(payload)) == payload
+    assert len(reader._checkpoints) <= 5
+    # Seek mundur: restore dari checkpoint terdekat (bisect), hasil tetap sama
+    for offset in (BLOCK_SIZE * 20 + 7, BLOCK_SIZE * 9, 3, BLOCK_SIZE * 31):
+        assert reader.read(offset, 1000) == payload[offset:offset + 1000]
+    reader.close()
+
+
+def test_validators_report_queries_outside_page_reader_subset(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'staging.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE GWSCANNER (ID TEXT PRIMARY KEY, SCAN_DATE TEXT) WITHOUT ROWID")
+    conn.execute("CREATE TABLE GW_LOG (ID INTEGER PRIMARY KEY, LOG_DATE TEXT)")
+    conn.executemany("INSERT INTO GWSCANNER VALUES (?, ?)", [(str(i), '2025-10-04') for i in range(100)])
+    conn.commit()
+    conn.close()
+    zip_path = str(tmp_path / 'Staging_20251004.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(db_path, 'staging.bak')
+
+    with zipfile.ZipFile(zip_path) as zf:
+        cursor = open_member_database(zf, 'staging.bak', memory_limit=0).cursor()
+        with pytest.raises(UnsupportedQueryError):
+            cursor.execute("SELECT * FROM GW_LOG ORDER BY LOG_DATE")
+
+    # Paksa page reader (seperti member di atas memory limit)
+    page_reader = functools.partial(open_member_database, memory_limit=0)
+    for module in (zip_validator, database_validator, quick_database_validator):
+        monkeypatch.setattr(module, 'open_member_database', page_reader)
+    message = 'WITHOUT ROWID table not supported by page reader: GWSCANNER'
+
+    result = zip_validator.ZipValidator(cache=AnalysisCache(enabled=False)).validate_zip_file(zip_path)
+    assert result['database_info']['staging.bak']['key_tables']['GWSCANNER'] == {'error': message}
+
+    result = DatabaseValidator(cache=AnalysisCache(enabled=False))._validate_single_zip(zip_path)
+    assert result['databases']['staging']['key_tables_info']['GWSCANNER'] == {'error': message}
+
+    quick = quick_database_validator.QuickDatabaseValidator(
+        freshness_store=FreshnessStore(str(tmp_path / 'freshness.db')), registry=SchemaRegistry()
+    )._validate_single_zip_quick(zip_path)
+    assert quick['databases']['staging']['errors'] == [f'GWSCANNER: {message}']
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test untuk ZipVerifier (verifikasi ZIP single-pass)
+"""
+
+import os
+import sys
+import hashlib
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from zip_verifier import ZipVerifier
+
+PAYLOAD = b'SQLite format 3\x00' + b'plantware-data-' * 4096
+
+
+def _make_zip(path, compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(path, 'w', compression) as zf:
+        zf.writestr('PlantwareP3.bak', PAYLOAD)
+        zf.writestr('notes.txt', b'backup ok')
+    return str(path)
+
+
+def test_verify_builds_reusable_record(tmp_path):
+    zip_path = _make_zip(tmp_path / 'PlantwareP3_20251004.zip')
+    verifier = ZipVerifier(chunk_size=4096)
+
+    record = verifier.verify(zip_path)
+    assert record['is_valid'] and record['bad_file'] is None
+    bak = record['members'][0]
+    assert bak['file_format'] == 'sqlite'
+    assert bak['digest'] == hashlib.sha256(PAYLOAD).hexdigest()
+    assert bak['header'] == PAYLOAD[:1024]
+
+    # Arsip tidak berubah -> record yang sama dipakai ulang
+    assert verifier.verify(zip_path) is record
+
+
+def test_crc_mismatch_reported(tmp_path):
+    zip_path = _make_zip(tmp_path / 'Staging_20251004.zip', compression=zipfile.ZIP_STORED)
+    with open(zip_path, 'r+b') as f:
+        data = f.read()
+        offset = data.index(b'backup ok')
+        f.seek(offset)
+        f.write(b'BACKUP OK')
+
+    record = ZipVerifier().verify(zip_path)
+    assert not record['is_valid']
+    assert record['bad_file'] == 'notes.txt'
+    assert record['corrupted_files'] == ['notes.txt']
+    assert record['members'][0]['crc_ok']
+
+
+def test_zip_validator_reports_verifier_error(tmp_path):
+    from analysis_cache import AnalysisCache
+    from zip_validator import ZipValidator
+
+    class _FailingVerifier:
+        def verify(self, zip_path, zip_ref=None):
+            return {'error': 'Error verifikasi ZIP: disk read failed', 'bad_file': None}
+
+    zip_path = _make_zip(tmp_path / 'Staging_20251004.zip')
+    validator = ZipValidator(cache=AnalysisCache(cache_path=str(tmp_path / 'cache.db')))
+    validator.zip_verifier = _FailingVerifier()
+    result = validator.validate_zip_file(zip_path)
+
+    assert not result['is_valid'] and not result['is_readable']
+    assert result['errors'] == ['Error verifikasi ZIP: disk read failed']
+
+
+def test_pdf_report_generator_shares_default_verifier():
+    sys.path.insert(0, os.path.dirname(__file__))
+    import zip_verifier
+    from src import pdf_report_generator
+
+    assert 'src.zip_verifier' not in sys.modules
+    assert pdf_report_generator.get_default_verifier is zip_verifier.get_default_verifier
+
+
+def test_pdf_corruption_check_reports_verifier_error(tmp_path, monkeypatch):
+    sys.path.insert(0, os.path.dirname(__file__))
+    from src import pdf_report_generator
+
+    class _FailingVerifier:
+        def verify(self, zip_path, zip_ref=None):
+            return {'error': 'File ZIP rusak atau tidak valid: Truncated file header', 'bad_file': None}
+
+    zip_path = _make_zip(tmp_path / 'Staging_20251004.zip')
+    monkeypatch.setattr(pdf_report_generator, 'get_default_verifier', lambda: _FailingVerifier())
+    status = pdf_report_generator.ZipAnalyzer().check_corruption(zip_path)
+
+    assert status['is_corrupted'] and status['integrity_check'] == 'Failed'
+    assert status['error'] == 'File ZIP rusak atau tidak valid: Truncated file header'
+
+
+def test_pdf_corruption_check_truncated_zip(tmp_path):
+    sys.path.insert(0, os.path.dirname(__file__))
+    from src import pdf_report_generator
+
+    zip_path = _make_zip(tmp_path / 'Staging_20251004.zip')
+    with open(zip_path, 'r+b') as f:
+        f.truncate(os.path.getsize(zip_path) // 2)
+
+    status = pdf_report_generator.ZipAnalyzer().check_corruption(zip_path)
+    assert status['is_corrupted'] and status['integrity_check'] == 'Failed'
+    assert status['error']
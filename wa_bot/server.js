@@ -1,3 +1,4 @@
+const crypto = require('crypto');
 const express = require('express');
 const axios = require('axios');
 const dotenv = require('dotenv');
@@ -8,6 +9,10 @@ dotenv.config();
 
 const app = express();
 const PORT = process.env.PORT || 3000;
+// Default hanya localhost; set HOST=0.0.0.0 untuk membuka dashboard ke jaringan
+const HOST = process.env.HOST || '127.0.0.1';
+// Token bersama untuk POST /notify (sama dengan whatsapp_token di [CHANNELS] config.ini)
+const NOTIFY_TOKEN = process.env.NOTIFY_TOKEN || '';
 
 // Middleware
 app.use(express.json());
@@ -84,6 +89,34 @@ app.post('/check', async (req, res) => {
   }
 });
 
+function tokenMatches(token) {
+  const expected = Buffer.from(NOTIFY_TOKEN);
+  const given = Buffer.from(String(token || ''));
+  return given.length === expected.length && crypto.timingSafeEqual(given, expected);
+}
+
+// Notifikasi dari Python notifier bus (src/notifier_bus.py, WhatsAppChannel).
+// Selalu dikirim ke WHATSAPP_PHONE_NUMBER; pemanggil tidak bisa memilih nomor tujuan.
+app.post('/notify', async (req, res) => {
+  if (!NOTIFY_TOKEN) {
+    return res.status(503).json({ success: false, error: 'NOTIFY_TOKEN is not configured' });
+  }
+  if (!tokenMatches(req.get('X-Notify-Token'))) {
+    return res.status(401).json({ success: false, error: 'invalid notify token' });
+  }
+  const { message } = req.body || {};
+  if (!message) {
+    return res.status(400).json({ success: false, error: 'message is required' });
+  }
+  try {
+    const result = await sendWhatsAppMessage(message, process.env.WHATSAPP_PHONE_NUMBER);
+    res.json({ success: true, result });
+  } catch (error) {
+    console.error('Error in /notify endpoint:', error);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
 app.get('/status', (req, res) => {
   res.json({ 
     status: 'running', 
@@ -93,8 +126,8 @@ app.get('/status', (req, res) => {
 });
 
 // Start the server
-app.listen(PORT, () => {
-  console.log(`Server is running on port ${PORT}`);
+app.listen(PORT, HOST, () => {
+  console.log(`Server is running on ${HOST}:${PORT}`);
   
   // Initial check
   checkBackupStatus();
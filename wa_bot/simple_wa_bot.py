@@ -130,20 +130,39 @@ class SimpleWhatsAppNotifier:
         
         return current_data
 
-    def run_periodic_check(self, interval_minutes=30):
+    def run_periodic_check(self, interval_minutes=30, watch_path=None):
         """
-        Jalankan pengecekan berkala
+        Jalankan pengecekan berkala. Jika watch_path diberikan, arsip ZIP baru
+        di folder tersebut memicu pengecekan tanpa menunggu interval berikutnya.
         """
         print(f"Starting periodic backup checks every {interval_minutes} minutes...")
         print("Press Ctrl+C to stop\n")
-        
+
+        watcher = None
+        if watch_path:
+            import os
+            import sys
+            sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+            from folder_watcher import FolderWatcher
+            watcher = FolderWatcher(watch_path)
+            watcher.start()
+            print(f"Watching {watch_path} for new backups ({watcher.backend})")
+
         try:
             while True:
                 self.check_backup_status()
                 print(f"\nNext check in {interval_minutes} minutes...")
-                time.sleep(interval_minutes * 60)  # Convert to seconds
+                if watcher is None:
+                    time.sleep(interval_minutes * 60)  # Convert to seconds
+                    continue
+                changed_files = watcher.wait_for_changes(timeout=interval_minutes * 60)
+                if changed_files:
+                    print(f"New backup detected: {', '.join(changed_files)}")
         except KeyboardInterrupt:
             print("\n\nStopping periodic checks...")
+        finally:
+            if watcher is not None:
+                watcher.stop()
 
 def main():
     print("Starting Simple WhatsApp Bot for Database Backup Monitoring")